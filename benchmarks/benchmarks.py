@@ -0,0 +1,120 @@
+###############################################################################
+#   benchmarks.py: airspeed velocity (asv) benchmarks of orbit integration
+#
+#   Run these using `asv run` in the top-level directory (see
+#   asv.conf.json); for each benchmark, asv records the wall time (time_*),
+#   the peak memory (peakmem_*), or the returned value (track_*, here the
+#   relative error in the energy or Jacobi integral)
+#
+#   galpy is only imported in the setup of each benchmark, after setting the
+#   number of OpenMP threads (which is read when the C extension is loaded)
+###############################################################################
+import os
+import sys
+
+import numpy
+
+# Potentials, integration methods, numbers of orbits, and numbers of OpenMP
+# threads to benchmark
+_POTENTIALS= ['MWPotential2014','McMillan17','DehnenBar+spiral','SCF']
+_METHODS= ['leapfrog_c','symplec4_c','dopr54_c','dop853_c','odeint']
+_NORBITS= [1,100,10000,100000]
+_NTHREADS= sorted({1,2,4,os.cpu_count() or 1})
+# Times at which to output the orbits: ~3 rotation periods at R=1 for the
+# comparison of methods and potentials and ~1.5 rotation periods when
+# scaling to large numbers of orbits
+_TIMES= numpy.linspace(0.,20.,201)
+_TIMES_SCALING= numpy.linspace(0.,10.,101)
+
+def _set_nthreads(nthreads):
+    """Set the number of OpenMP threads used by galpy's C extension"""
+    if 'galpy' in sys.modules \
+            and os.environ.get('OMP_NUM_THREADS') != str(nthreads):
+        # asv skips benchmarks that raise NotImplementedError in setup
+        raise NotImplementedError('The number of OpenMP threads cannot be changed after galpy has been imported; run the benchmarks with launch_method="spawn"')
+    os.environ['OMP_NUM_THREADS']= str(nthreads)
+    return None
+
+def _potential(name):
+    """Return the potential and its pattern speed (for the Jacobi integral)"""
+    from galpy import potential
+    if name == 'MWPotential2014':
+        return (potential.MWPotential2014,0.)
+    elif name == 'McMillan17':
+        from galpy.potential.mwpotentials import McMillan17
+        return (McMillan17,0.)
+    elif name == 'DehnenBar+spiral':
+        # Bar is fully grown at t=0 and the spiral arms rotate with the bar,
+        # such that the Jacobi integral is conserved
+        bar= potential.DehnenBarPotential()
+        spiral= potential.SpiralArmsPotential(amp=0.5,omega=bar.OmegaP())
+        return (potential.MWPotential2014+[bar,spiral],bar.OmegaP())
+    elif name == 'SCF':
+        # Flattened Hernquist halo expanded in basis functions
+        hp= potential.TriaxialHernquistPotential(normalize=1.,a=2.,
+                                                 b=1.,c=0.7)
+        Acos, Asin= potential.scf_compute_coeffs_axi(hp.dens,10,10,a=2.)
+        return (potential.SCFPotential(Acos=Acos,Asin=Asin,a=2.),0.)
+
+def _initial_conditions(norbits,seed=1):
+    """Draw initial conditions [R,vR,vT,z,vz,phi] for a disk-like population of orbits (with a fixed random seed, such that they are the same for each run)"""
+    rng= numpy.random.default_rng(seed)
+    return numpy.array([rng.uniform(0.5,2.,norbits),
+                        rng.normal(0.,0.15,norbits),
+                        rng.normal(0.9,0.15,norbits),
+                        rng.normal(0.,0.05,norbits),
+                        rng.normal(0.,0.1,norbits),
+                        rng.uniform(0.,2.*numpy.pi,norbits)]).T
+
+class OrbitIntegration:
+    """Integration of a set of orbits using different methods in different potentials, using a single thread"""
+    params= (_METHODS,_POTENTIALS)
+    param_names= ['method','potential']
+    timeout= 600.
+    norbits= 10
+
+    def setup(self,method,potname):
+        if method == 'odeint' and potname == 'McMillan17':
+            # Evaluating the McMillan17 forces in Python takes minutes
+            raise NotImplementedError('odeint is too slow in McMillan17')
+        _set_nthreads(1)
+        from galpy.orbit import Orbit
+        self.pot, self.omegap= _potential(potname)
+        self.orbits= Orbit(_initial_conditions(self.norbits))
+
+    def time_integrate(self,method,potname):
+        self.orbits.integrate(_TIMES,self.pot,method=method,progressbar=False)
+
+    def peakmem_integrate(self,method,potname):
+        self.orbits.integrate(_TIMES,self.pot,method=method,progressbar=False)
+
+    def track_energy_error(self,method,potname):
+        """Maximum relative error in the energy (the Jacobi integral for the rotating bar and spiral arms) over all orbits and times"""
+        self.orbits.integrate(_TIMES,self.pot,method=method,progressbar=False)
+        EJ= self.orbits.Jacobi(_TIMES,pot=self.pot,OmegaP=self.omegap,
+                               use_physical=False)
+        return float(numpy.amax(numpy.fabs(EJ/EJ[:,:1]-1.)))
+    track_energy_error.unit= 'relative error'
+
+class OrbitIntegrationScaling:
+    """Integration of ensembles of 1 to 100,000 orbits with the C integrators in MWPotential2014, using 1 to all available OpenMP threads"""
+    params= (['symplec4_c','dop853_c'],_NORBITS,_NTHREADS)
+    param_names= ['method','norbits','nthreads']
+    timeout= 1200.
+    number= 1
+    repeat= (1,5,60.)
+
+    def setup(self,method,norbits,nthreads):
+        _set_nthreads(nthreads)
+        from galpy.orbit import Orbit
+        from galpy.potential import MWPotential2014
+        self.pot= MWPotential2014
+        self.orbits= Orbit(_initial_conditions(norbits))
+
+    def time_integrate(self,method,norbits,nthreads):
+        self.orbits.integrate(_TIMES_SCALING,self.pot,method=method,
+                              progressbar=False)
+
+    def peakmem_integrate(self,method,norbits,nthreads):
+        self.orbits.integrate(_TIMES_SCALING,self.pot,method=method,
+                              progressbar=False)
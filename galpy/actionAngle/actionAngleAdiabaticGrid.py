@@ -102,7 +102,8 @@ class actionAngleAdiabaticGrid(actionAngle):
                                                               0.,numpy.sqrt(2.*this[x]*thisEzZmaxs[x]),
                                                            _justjz=True,
                                                            **kwargs)[2]),
-                                       range(nR*nEz),numcores=numcores)
+                                       range(nR*nEz),numcores=numcores,
+                                       as_array=True)
                 jz= numpy.reshape(jz,(nR,nEz))
                 jzEzzmax[0:nR]= jz[:,nEz-1]
             else:
@@ -168,7 +169,7 @@ class actionAngleAdiabaticGrid(actionAngle):
                                                             _justjr=True,
                                                             **kwargs)[0]),
                                         range((nEr-1)*nLz),
-                                        numcores=numcores)
+                                        numcores=numcores,as_array=True)
                 jr[:,0:-1]= numpy.reshape(mjr,(nLz,nEr-1))
                 jrERRa[0:nLz]= jr[:,0]
             else:
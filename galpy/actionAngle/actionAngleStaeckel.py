@@ -16,9 +16,9 @@ import warnings
 import numpy
 from scipy import integrate, optimize
 
-from ..potential import (MWPotential, epifreq, evaluateR2derivs,
-                         evaluateRzderivs, evaluatez2derivs, omegac,
-                         verticalfreq)
+from ..potential import (CompiledPotential, MWPotential, epifreq,
+                         evaluateR2derivs, evaluateRzderivs, evaluatez2derivs,
+                         omegac, verticalfreq)
 from ..potential.Potential import (_check_c, _evaluatePotentials,
                                    _evaluateRforces, _evaluatezforces)
 from ..potential.Potential import flatten as flatten_potential
@@ -75,6 +75,8 @@ class actionAngleStaeckel(actionAngle):
         if ext_loaded and (('c' in kwargs and kwargs['c'])
                            or not 'c' in kwargs):
             self._c= _check_c(self._pot)
+            # Cache the parsed potential for repeated calls to the C code
+            if self._c: self._cpot= CompiledPotential(self._pot)
             if 'c' in kwargs and kwargs['c'] and not self._c:
                 warnings.warn("C module not used because potential does not have a C implementation",galpyWarning) #pragma: no cover
         else:
@@ -143,12 +145,12 @@ class actionAngleStaeckel(actionAngle):
                     E= numpy.array([_evaluatePotentials(self._pot,R[ii],z[ii])
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(\
-                        E,Lz,self._pot,delta)[0]
+                        E,Lz,self._cpot,delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, err= actionAngleStaeckel_c.actionAngleStaeckel_c(\
-                self._pot,delta,R,vR,vT,z,vz,u0=u0,order=order)
+                self._cpot,delta,R,vR,vT,z,vz,u0=u0,order=order)
             if err == 0:
                 return (jr,Lz,jz)
             else: #pragma: no cover
@@ -237,12 +239,12 @@ class actionAngleStaeckel(actionAngle):
                     E= numpy.array([_evaluatePotentials(self._pot,R[ii],z[ii])
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(\
-                        E,Lz,self._pot,delta)[0]
+                        E,Lz,self._cpot,delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, Omegar, Omegaphi, Omegaz, err= actionAngleStaeckel_c.actionAngleFreqStaeckel_c(\
-                self._pot,delta,R,vR,vT,z,vz,u0=u0,order=order)
+                self._cpot,delta,R,vR,vT,z,vz,u0=u0,order=order)
             # Adjustments for close-to-circular orbits
             indx= numpy.isnan(Omegar)*(jr < 10.**-3.)+numpy.isnan(Omegaz)*(jz < 10.**-3.) #Close-to-circular and close-to-the-plane orbits
             if numpy.sum(indx) > 0:
@@ -315,12 +317,12 @@ class actionAngleStaeckel(actionAngle):
                     E= numpy.array([_evaluatePotentials(self._pot,R[ii],z[ii])
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(\
-                        E,Lz,self._pot,delta)[0]
+                        E,Lz,self._cpot,delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, Omegar, Omegaphi, Omegaz, angler, anglephi,anglez, err= actionAngleStaeckel_c.actionAngleFreqAngleStaeckel_c(\
-                self._pot,delta,R,vR,vT,z,vz,phi,u0=u0,order=order)
+                self._cpot,delta,R,vR,vT,z,vz,phi,u0=u0,order=order)
             # Adjustments for close-to-circular orbits
             indx= numpy.isnan(Omegar)*(jr < 10.**-3.)+numpy.isnan(Omegaz)*(jz < 10.**-3.) #Close-to-circular and close-to-the-plane orbits
             if numpy.sum(indx) > 0:
@@ -411,13 +413,13 @@ class actionAngleStaeckel(actionAngle):
                     E= numpy.array([_evaluatePotentials(self._pot,R[ii],z[ii])
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(\
-                        E,Lz,self._pot,delta)[0]
+                        E,Lz,self._cpot,delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             umin, umax, vmin, err= \
                 actionAngleStaeckel_c.actionAngleUminUmaxVminStaeckel_c(\
-                self._pot,delta,R,vR,vT,z,vz,u0=u0)
+                self._cpot,delta,R,vR,vT,z,vz,u0=u0)
             if err == 0:
                 return (umin,umax,vmin)
             else: #pragma: no cover
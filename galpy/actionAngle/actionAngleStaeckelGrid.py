@@ -8,8 +8,13 @@
 #
 #      methods:
 #             __call__: returns (jr,lz,jz)
+#             save: save the grid to disk
+#             load: load a grid from disk
 #
 ###############################################################################
+import hashlib
+import os
+
 import numpy
 from scipy import interpolate, ndimage, optimize
 
@@ -22,11 +27,17 @@ from .actionAngle import actionAngle
 from .actionAngleStaeckel_c import _ext_loaded as ext_loaded
 
 _PRINTOUTSIDEGRID= False
+_RAMAX= 200./8.
+# Arrays that make up the grid, saved to and loaded from disk
+_GRIDARRAYS= ['Lzs','RL','ERL','ERa','u0','thisv','jr','jz','jrLzE','jzLzE',
+              'jrFiltered','jzFiltered']
+_GRIDARRAYS_ECC= ['ecc','zmax','rperi','rap','zmaxLzE','rperiLzE','rapLzE',
+                  'eccFiltered','zmaxFiltered','rperiFiltered','rapFiltered']
 class actionAngleStaeckelGrid(actionAngle):
     """Action-angle formalism for axisymmetric potentials using Binney (2012)'s Staeckel approximation, grid-based interpolation"""
     def __init__(self,pot=None,delta=None,Rmax=5.,
                  nE=25,npsi=25,nLz=30,numcores=1,
-                 interpecc=False,
+                 interpecc=False,_load=None,
                  **kwargs):
         """
         NAME:
@@ -44,7 +55,7 @@ class actionAngleStaeckelGrid(actionAngle):
 
            interpecc= (False) if True, also interpolate the approximate eccentricity, zmax, rperi, and rapo
 
-           numcores= number of cpus to use to parallellize
+           numcores= number of cpus to use to parallellize (over Lz when not using C; the C code is parallelized using OpenMP)
 
            ro= distance from vantage point to GC (kpc; can be Quantity)
 
@@ -77,34 +88,38 @@ class actionAngleStaeckelGrid(actionAngle):
         self._Rmin= 0.01
         #Set up the actionAngleStaeckel object that we will use to interpolate
         self._aA= actionAngleStaeckel.actionAngleStaeckel(pot=self._pot,delta=self._delta,c=self._c)
-        #Build grid
         self._Lzmin= 0.01
+        self._nE= nE
+        self._npsi= npsi
+        self._nLz= nLz
+        self._interpecc= interpecc
+        if not _load is None:
+            # Load the grid from disk
+            path, mmap_mode= _load
+            for name in _GRIDARRAYS+(_GRIDARRAYS_ECC if interpecc else []):
+                setattr(self,f'_{name}',
+                        numpy.load(os.path.join(path,f'{name}.npy'),
+                                   mmap_mode=mmap_mode))
+            self.thisv= self._thisv
+            self._Lzmax= self._Lzs[-1]
+            self._setup_interpolation()
+            self._check_consistent_units()
+            return None
+        #Build grid
         self._Lzs= numpy.linspace(self._Lzmin,
                                   self._Rmax\
                                       *potential.vcirc(self._pot,self._Rmax),
                                   nLz)
         self._Lzmax= self._Lzs[-1]
-        self._nLz= nLz
         #Calculate E_c(R=RL), energy of circular orbit
         self._RL= numpy.array([potential.rl(self._pot,l) for l in self._Lzs])
-        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                 self._RL,k=3)
         self._ERL= _evaluatePotentials(self._pot,self._RL,
                                        numpy.zeros(self._nLz))\
                                        +self._Lzs**2./2./self._RL**2.
-        self._ERLmax= numpy.amax(self._ERL)+1.
-        self._ERLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                  numpy.log(-(self._ERL-self._ERLmax)),k=3)
-        self._Ramax= 200./8.
-        self._ERa= _evaluatePotentials(self._pot,self._Ramax,0.) +self._Lzs**2./2./self._Ramax**2.
+        self._ERa= _evaluatePotentials(self._pot,_RAMAX,0.) +self._Lzs**2./2./_RAMAX**2.
         #self._EEsc= numpy.array([self._ERL[ii]+potential.vesc(self._pot,self._RL[ii])**2./4. for ii in range(nLz)])
-        self._ERamax= numpy.amax(self._ERa)+1.
-        self._ERaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                  numpy.log(-(self._ERa-self._ERamax)),k=3)
         y= numpy.linspace(0.,1.,nE)
-        self._nE= nE
         psis= numpy.linspace(0.,1.,npsi)*numpy.pi/2.
-        self._npsi= npsi
         jr= numpy.zeros((nLz,nE,npsi))
         jz= numpy.zeros((nLz,nE,npsi))
         u0= numpy.zeros((nLz,nE))
@@ -129,7 +144,7 @@ class actionAngleStaeckelGrid(actionAngle):
                 mu0= multi.parallel_map((lambda x: self.calcu0(thisE[x],
                                                                thisLzs[x])),
                                         range(nE*nLz),
-                                        numcores=numcores)
+                                        numcores=numcores,as_array=True)
             else:
                 mu0= list(map((lambda x: self.calcu0(thisE[x],
                                                      thisLzs[x])),
@@ -140,19 +155,45 @@ class actionAngleStaeckelGrid(actionAngle):
                                         u0.flatten(),
                                         thisR.flatten()),(nLz,nE))
         self.thisv= thisv
+        self._thisv= thisv
         #reshape
         thisLzs= numpy.reshape(thisLzs,(nLz,nE))
         thispsi= numpy.tile(psis,(nLz,nE,1)).flatten()
         thisLzs= numpy.tile(thisLzs.T,(npsi,1,1)).T.flatten()
         thisR= numpy.tile(thisR.T,(npsi,1,1)).T.flatten()
         thisv= numpy.tile(thisv.T,(npsi,1,1)).T.flatten()
-        mjr, mlz, mjz= self._aA(thisR, #R
-                                thisv*numpy.cos(thispsi), #vR
-                                thisLzs/thisR, #vT
-                                numpy.zeros(len(thisR)), #z
-                                thisv*numpy.sin(thispsi), #vz
-                                fixed_quad=True)
-        if interpecc:
+        if not self._c and numcores > 1:
+            # Compute the actions for each Lz in parallel
+            def _slice_actions(ii):
+                indx= slice(ii*nE*npsi,(ii+1)*nE*npsi)
+                out= self._aA(thisR[indx], #R
+                              thisv[indx]*numpy.cos(thispsi[indx]), #vR
+                              thisLzs[indx]/thisR[indx], #vT
+                              numpy.zeros(nE*npsi), #z
+                              thisv[indx]*numpy.sin(thispsi[indx]), #vz
+                              fixed_quad=True)
+                if interpecc:
+                    out+= self._aA.EccZmaxRperiRap(thisR[indx], #R
+                                                   thisv[indx]*numpy.cos(thispsi[indx]), #vR
+                                                   thisLzs[indx]/thisR[indx], #vT
+                                                   numpy.zeros(nE*npsi), #z
+                                                   thisv[indx]*numpy.sin(thispsi[indx])) #vz
+                return numpy.array(out)
+            mout= multi.parallel_map(_slice_actions,range(nLz),
+                                     numcores=numcores,as_array=True)
+            mjr= mout[:,0].flatten()
+            mjz= mout[:,2].flatten()
+            if interpecc:
+                mecc, mzmax, mrperi, mrap= (mout[:,ii].flatten()
+                                            for ii in range(3,7))
+        else:
+            mjr, mlz, mjz= self._aA(thisR, #R
+                                    thisv*numpy.cos(thispsi), #vR
+                                    thisLzs/thisR, #vT
+                                    numpy.zeros(len(thisR)), #z
+                                    thisv*numpy.sin(thispsi), #vz
+                                    fixed_quad=True)
+        if interpecc and (self._c or numcores <= 1):
             mecc, mzmax, mrperi, mrap=\
                 self._aA.EccZmaxRperiRap(thisR, #R
                                          thisv*numpy.cos(thispsi), #vR
@@ -228,16 +269,11 @@ class actionAngleStaeckelGrid(actionAngle):
             rap[(rap > 1.)]= 1.
             rap[numpy.isnan(rap)]= 0.
             rap[numpy.isinf(rap)]= 1.
-        #First interpolate the maxima
         self._jr= jr
         self._jz= jz
         self._u0= u0
         self._jrLzE= jrLzE
         self._jzLzE= jzLzE
-        self._jrLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(jrLzE+10.**-5.),k=3)
-        self._jzLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(jzLzE+10.**-5.),k=3)
         if interpecc:
             self._ecc= ecc
             self._zmax= zmax
@@ -246,20 +282,6 @@ class actionAngleStaeckelGrid(actionAngle):
             self._zmaxLzE= zmaxLzE
             self._rperiLzE= rperiLzE
             self._rapLzE= rapLzE
-            self._zmaxLzInterp=\
-                interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                         numpy.log(zmaxLzE+10.**-5.),k=3)
-            self._rperiLzInterp=\
-                interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                         numpy.log(rperiLzE+10.**-5.),k=3)
-            self._rapLzInterp=\
-                interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                         numpy.log(rapLzE+10.**-5.),k=3)
-        #Interpolate u0
-        self._logu0Interp= interpolate.RectBivariateSpline(self._Lzs,
-                                                           y,
-                                                           numpy.log(u0),
-                                                           kx=3,ky=3,s=0.)
         #spline filter jr and jz, such that they can be used with ndimage.map_coordinates
         self._jrFiltered= ndimage.spline_filter(numpy.log(self._jr+10.**-10.),order=3)
         self._jzFiltered= ndimage.spline_filter(numpy.log(self._jz+10.**-10.),order=3)
@@ -268,10 +290,103 @@ class actionAngleStaeckelGrid(actionAngle):
             self._zmaxFiltered= ndimage.spline_filter(numpy.log(self._zmax+10.**-10.),order=3)
             self._rperiFiltered= ndimage.spline_filter(numpy.log(self._rperi+10.**-10.),order=3)
             self._rapFiltered= ndimage.spline_filter(numpy.log(self._rap+10.**-10.),order=3)
+        self._setup_interpolation()
         # Check the units
         self._check_consistent_units()
         return None
 
+    def _setup_interpolation(self):
+        """Set up the interpolation of the quantities on the grid in Lz and E"""
+        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                 self._RL,k=3)
+        self._ERLmax= numpy.amax(self._ERL)+1.
+        self._ERLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                  numpy.log(-(self._ERL-self._ERLmax)),k=3)
+        self._Ramax= _RAMAX
+        self._ERamax= numpy.amax(self._ERa)+1.
+        self._ERaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                  numpy.log(-(self._ERa-self._ERamax)),k=3)
+        #First interpolate the maxima
+        self._jrLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(self._jrLzE+10.**-5.),k=3)
+        self._jzLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(self._jzLzE+10.**-5.),k=3)
+        if self._interpecc:
+            self._zmaxLzInterp=\
+                interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                         numpy.log(self._zmaxLzE+10.**-5.),k=3)
+            self._rperiLzInterp=\
+                interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                         numpy.log(self._rperiLzE+10.**-5.),k=3)
+            self._rapLzInterp=\
+                interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                         numpy.log(self._rapLzE+10.**-5.),k=3)
+        #Interpolate u0
+        self._logu0Interp= interpolate.RectBivariateSpline(self._Lzs,
+                                                           numpy.linspace(0.,1.,self._nE),
+                                                           numpy.log(self._u0),
+                                                           kx=3,ky=3,s=0.)
+        return None
+
+    def save(self,path):
+        """
+        NAME:
+           save
+        PURPOSE:
+           save the grid to disk, such that it can be loaded (and memory-mapped) with actionAngleStaeckelGrid.load instead of being re-computed
+        INPUT:
+           path - directory to save the grid in (created if it does not exist; each array of the grid is saved as a .npy file)
+        OUTPUT:
+           (none)
+        HISTORY:
+           2026-10-18 - Written - agent
+        """
+        os.makedirs(path,exist_ok=True)
+        for name in _GRIDARRAYS+(_GRIDARRAYS_ECC if self._interpecc else []):
+            numpy.save(os.path.join(path,f'{name}.npy'),
+                       numpy.asarray(getattr(self,f'_{name}')))
+        # Write the metadata last, such that an incomplete grid cannot be loaded
+        numpy.savez(os.path.join(path,'metadata.npz'),
+                    hash=_grid_hash(self._pot,self._delta,self._Rmax,
+                                    self._nE,self._npsi,self._nLz,
+                                    self._interpecc),
+                    delta=self._delta,Rmax=self._Rmax,nE=self._nE,
+                    npsi=self._npsi,nLz=self._nLz,interpecc=self._interpecc)
+        return None
+
+    @classmethod
+    def load(cls,path,pot=None,mmap_mode='r',**kwargs):
+        """
+        NAME:
+           load
+        PURPOSE:
+           load a grid saved with actionAngleStaeckelGrid.save
+        INPUT:
+           path - directory that the grid was saved in
+
+           pot= potential or list of potentials (must be the same as that used to compute the grid, which is checked using a hash of the potential and grid parameters)
+
+           mmap_mode= ('r') mode with which to memory-map the arrays of the grid (see numpy.load; None: read them into memory)
+
+           c=, ro=, vo= as for actionAngleStaeckelGrid
+        OUTPUT:
+           instance
+        HISTORY:
+           2026-10-18 - Written - agent
+        """
+        if pot is None:
+            raise OSError("Must specify pot= for actionAngleStaeckelGrid")
+        pot= flatten_potential(pot)
+        with numpy.load(os.path.join(path,'metadata.npz')) as data:
+            meta= {key:data[key][()] for key in data.files}
+        if _grid_hash(pot,meta['delta'],meta['Rmax'],meta['nE'],meta['npsi'],
+                      meta['nLz'],meta['interpecc']) != meta['hash']:
+            raise ValueError(f"actionAngleStaeckelGrid in {path} was computed for a different potential")
+        return cls(pot=pot,delta=float(meta['delta']),Rmax=float(meta['Rmax']),
+                   nE=int(meta['nE']),npsi=int(meta['npsi']),
+                   nLz=int(meta['nLz']),interpecc=bool(meta['interpecc']),
+                   _load=(path,mmap_mode),**kwargs)
+
     def _evaluate(self,*args,**kwargs):
         """
         NAME:
@@ -660,6 +775,18 @@ class actionAngleStaeckelGrid(actionAngle):
         return out
 
 
+def _grid_hash(pot,delta,Rmax,nE,npsi,nLz,interpecc):
+    """Hash of the potential (its type and its values on a grid in (R,z)) and of the grid parameters, used to check that a saved grid was computed for the same setup"""
+    Rs, zs= numpy.meshgrid(numpy.linspace(0.01,Rmax,21),
+                           numpy.linspace(0.,Rmax,21))
+    Phis= _evaluatePotentials(pot,Rs.flatten(),zs.flatten())
+    pottypes= [type(p).__name__ for p in (pot if isinstance(pot,list) else [pot])]
+    return hashlib.md5(' '.join(pottypes
+                                +['%.10g' % x for x in Phis]
+                                +['%.10g' % x for x in [delta,Rmax]]
+                                +[str(int(x)) for x in [nE,npsi,nLz,interpecc]])
+                       .encode()).hexdigest()
+
 def _u0Eq(logu,delta,pot,E,Lz22):
     """The equation that needs to be minimized to find u0"""
     u= numpy.exp(logu)
@@ -0,0 +1,236 @@
+/*
+  C code for evaluating the quasi-isothermal DF and its velocity moments at
+  a large number of (R,z) points in parallel, using the Staeckel
+  approximation for the actions
+*/
+#ifdef _WIN32
+#include <Python.h>
+#endif
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <math.h>
+#include <gsl/gsl_spline.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+#define CHUNKSIZE 1
+//Potentials
+#include <galpy_potentials.h>
+#include <actionAngle.h>
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+//Macros to export functions in DLL on different OS
+#if defined(_WIN32)
+#define EXPORT __declspec(dllexport)
+#elif defined(__GNUC__)
+#define EXPORT __attribute__((visibility("default")))
+#else
+// Just do nothing?
+#define EXPORT
+#endif
+// Maximum number of phase-space points for which the actions are computed
+// at once (the (R,z) points are processed in blocks of at most this many
+// velocity-grid points to limit the memory use)
+#define QDF_MAXBLOCK 262144
+/*
+  Function declarations
+*/
+void actionAngleStaeckel_actions(int,double *,double *,double *,double *,
+				 double *,double *,int,int *,double *,
+				 tfuncs_type_arr,int,double *,int,
+				 double *,double *,int *);
+/*
+  Actual functions, inlines first
+*/
+static inline double Rz_to_u(double R, double z, double delta){
+  double d12, d22;
+  d12= (z+delta)*(z+delta)+R*R;
+  d22= (z-delta)*(z-delta)+R*R;
+  return acosh(0.5/delta*(sqrt(d12)+sqrt(d22)));
+}
+static inline double qdf_eval(double jr,double lz,double jz,
+			      double * qdfargs,
+			      gsl_spline * rgSpline,
+			      gsl_spline * kappaSpline,
+			      gsl_spline * nuSpline,
+			      gsl_interp_accel * rgAcc,
+			      gsl_interp_accel * kappaAcc,
+			      gsl_interp_accel * nuAcc){
+  // qdfargs= [hr,lnsr,lnsz,hsr,hsz,refr,lo,cutcounter]
+  double rg, kappa, nu, Omega, lnsr, lnsz, out;
+  if ( ( *(qdfargs+7) > 0.5 && lz < 0. )
+       || lz < rgSpline->x[0]
+       || lz > rgSpline->x[rgSpline->size-1] )
+    return 0.;
+  rg= gsl_spline_eval(rgSpline,lz,rgAcc);
+  kappa= gsl_spline_eval(kappaSpline,lz,kappaAcc);
+  nu= gsl_spline_eval(nuSpline,lz,nuAcc);
+  Omega= fabs(lz)/rg/rg;
+  lnsr= *(qdfargs+1) + ( *(qdfargs+5) - rg ) / *(qdfargs+3);
+  lnsz= *(qdfargs+2) + ( *(qdfargs+5) - rg ) / *(qdfargs+4);
+  out= exp( log(Omega) + ( *(qdfargs+5) - rg ) / *qdfargs - 2. * lnsr
+	    - log(M_PI) - log(kappa) + log(1.+tanh(lz / *(qdfargs+6)))
+	    - kappa * jr * exp(-2. * lnsr)
+	    + log(nu) - log(2. * M_PI) - 2. * lnsz - nu * jz * exp(-2. * lnsz));
+  return isnan(out) ? 0. : out;
+}
+/*
+  MAIN FUNCTIONS
+ */
+EXPORT void quasiisothermaldf_vmomentdensity(int nRz,
+					     double *R,
+					     double *z,
+					     double *sigmaR1,
+					     double *sigmaz1,
+					     int ngl,
+					     double *vRgl,
+					     double *vRglw,
+					     double *vTgl,
+					     double *vTglw,
+					     double *vzgl,
+					     double *vzglw,
+					     int nmoments,
+					     double *moments,
+					     double *qdfargs,
+					     int ntab,
+					     double *lztab,
+					     double *rgtab,
+					     double *kappatab,
+					     double *nutab,
+					     int npot,
+					     int * pot_type,
+					     double * pot_args,
+					     tfuncs_type_arr pot_tfuncs,
+					     double delta,
+					     int order,
+					     int actions_flag,
+					     double *jrs,
+					     double *jzs,
+					     double *out,
+					     int * err){
+  // Computes sum_{vR,vT,vz} vR^n vT^m vz^o qdf(R,vR,vT,z,vz) w_vR w_vT w_vz
+  // for each (R,z) point and each moment (n,m,o) in moments; the velocity
+  // grid is vR= sigmaR1 x vRgl, vT= vTgl, vz= sigmaz1 x vzgl
+  // actions_flag: 0: compute the actions, 1: compute the actions and store
+  // them in jrs and jzs [nRz*ngl^3], 2: use the actions in jrs and jzs
+  int ii, jj, kk, ll, mm, tid, nthreads, nblock, iblock, ngl3, indx;
+  double tvR, tvT, tvz, tf;
+  double *jr, *jz;
+  ngl3= ngl * ngl * ngl;
+  nblock= QDF_MAXBLOCK / ngl3;
+  if ( nblock < 1 ) nblock= 1;
+  if ( nblock > nRz ) nblock= nRz;
+#ifdef _OPENMP
+  nthreads = omp_get_max_threads();
+#else
+  nthreads = 1;
+#endif
+  // Set up the interpolation of rg, kappa, and nu as a function of Lz
+  gsl_spline * rgSpline= gsl_spline_alloc(gsl_interp_cspline,ntab);
+  gsl_spline * kappaSpline= gsl_spline_alloc(gsl_interp_cspline,ntab);
+  gsl_spline * nuSpline= gsl_spline_alloc(gsl_interp_cspline,ntab);
+  gsl_spline_init(rgSpline,lztab,rgtab,ntab);
+  gsl_spline_init(kappaSpline,lztab,kappatab,ntab);
+  gsl_spline_init(nuSpline,lztab,nutab,ntab);
+  gsl_interp_accel ** accs= (gsl_interp_accel **) malloc ( 3 * nthreads * sizeof(gsl_interp_accel *) );
+  for (tid=0; tid < 3 * nthreads; tid++)
+    *(accs+tid)= gsl_interp_accel_alloc();
+  // Phase-space points and actions of one block of (R,z) points
+  double *tR= NULL, *tvRs= NULL, *tvTs= NULL, *tz= NULL, *tvzs= NULL;
+  double *tu0= NULL, *tjr= NULL, *tjz= NULL;
+  if ( actions_flag != 2 ) {
+    tR= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tvRs= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tvTs= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tz= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tvzs= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tu0= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+  }
+  if ( actions_flag == 0 ) {
+    tjr= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+    tjz= (double *) malloc ( nblock * ngl3 * sizeof(double) );
+  }
+  *err= 0;
+  UNUSED int chunk= CHUNKSIZE;
+  for (iblock=0; iblock < nRz; iblock+= nblock) {
+    if ( iblock + nblock > nRz ) nblock= nRz - iblock;
+    if ( actions_flag == 0 ) {
+      jr= tjr;
+      jz= tjz;
+    }
+    else {
+      jr= jrs + iblock * ngl3;
+      jz= jzs + iblock * ngl3;
+    }
+    if ( actions_flag != 2 ) {
+      // Set up the velocity grid at each (R,z) in this block
+#pragma omp parallel for schedule(static,chunk) private(ii,jj,kk,ll,indx)
+      for (ii=0; ii < nblock; ii++) {
+	for (jj=0; jj < ngl; jj++) { // vR
+	  for (kk=0; kk < ngl; kk++) { // vT
+	    for (ll=0; ll < ngl; ll++) { // vz
+	      indx= ii * ngl3 + ( jj * ngl + kk ) * ngl + ll;
+	      *(tR+indx)= *(R+iblock+ii);
+	      *(tz+indx)= *(z+iblock+ii);
+	      *(tvRs+indx)= *(sigmaR1+iblock+ii) * *(vRgl+jj);
+	      *(tvTs+indx)= *(vTgl+kk);
+	      *(tvzs+indx)= *(sigmaz1+iblock+ii) * *(vzgl+ll);
+	      *(tu0+indx)= Rz_to_u(*(R+iblock+ii),*(z+iblock+ii),delta);
+	    }
+	  }
+	}
+      }
+      // Compute the actions for all of them at once
+      actionAngleStaeckel_actions(nblock * ngl3,tR,tvRs,tvTs,tz,tvzs,tu0,
+				  npot,pot_type,pot_args,pot_tfuncs,
+				  1,&delta,order,jr,jz,err);
+    }
+    // Evaluate the DF and sum the moments for each (R,z)
+#pragma omp parallel for schedule(static,chunk) \
+  private(ii,jj,kk,ll,mm,tid,indx,tvR,tvT,tvz,tf)
+    for (ii=0; ii < nblock; ii++) {
+#ifdef _OPENMP
+      tid= omp_get_thread_num();
+#else
+      tid= 0;
+#endif
+      for (mm=0; mm < nmoments; mm++)
+	*(out+(iblock+ii)*nmoments+mm)= 0.;
+      for (jj=0; jj < ngl; jj++) { // vR
+	tvR= *(sigmaR1+iblock+ii) * *(vRgl+jj);
+	for (kk=0; kk < ngl; kk++) { // vT
+	  tvT= *(vTgl+kk);
+	  for (ll=0; ll < ngl; ll++) { // vz
+	    tvz= *(sigmaz1+iblock+ii) * *(vzgl+ll);
+	    indx= ii * ngl3 + ( jj * ngl + kk ) * ngl + ll;
+	    tf= qdf_eval(*(jr+indx),*(R+iblock+ii) * tvT,*(jz+indx),
+			 qdfargs,rgSpline,kappaSpline,nuSpline,
+			 *(accs+3*tid),*(accs+3*tid+1),*(accs+3*tid+2))
+	      * *(vRglw+jj) * *(vTglw+kk) * *(vzglw+ll);
+	    for (mm=0; mm < nmoments; mm++)
+	      *(out+(iblock+ii)*nmoments+mm)+= tf
+		* pow(tvR,*(moments+3*mm))
+		* pow(tvT,*(moments+3*mm+1))
+		* pow(tvz,*(moments+3*mm+2));
+	  }
+	}
+      }
+    }
+  }
+  for (tid=0; tid < 3 * nthreads; tid++)
+    gsl_interp_accel_free(*(accs+tid));
+  free(accs);
+  gsl_spline_free(rgSpline);
+  gsl_spline_free(kappaSpline);
+  gsl_spline_free(nuSpline);
+  free(tR);
+  free(tvRs);
+  free(tvTs);
+  free(tz);
+  free(tvzs);
+  free(tu0);
+  free(tjr);
+  free(tjz);
+}
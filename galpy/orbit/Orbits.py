@@ -23,7 +23,7 @@ elif _SCIPY_VERSION < parse_version('0.19'): #pragma: no cover
 else:
     from scipy.special import logsumexp
 
-from ..potential import (LcE, PotentialError, _isNonAxi,
+from ..potential import (CompiledPotential, LcE, PotentialError, _isNonAxi,
                          evaluatelinearPotentials, evaluateplanarPotentials,
                          evaluatePotentials)
 from ..potential import flatten as flatten_potential
@@ -36,12 +36,21 @@ from ..util._optional_deps import (_APY3, _APY_COORD_LOADED, _APY_GE_31,
                                    _NUMEXPR_LOADED)
 from ..util.conversion import physical_compatible, physical_conversion
 from ..util.coords import _K
-from .integrateFullOrbit import integrateFullOrbit, integrateFullOrbit_c
+from .integrateFullOrbit import (_batched_member, _has_batched,
+                                 integrateFullOrbit, integrateFullOrbit_c,
+                                 integrateFullOrbit_dense_c,
+                                 integrateFullOrbit_dxdv,
+                                 integrateFullOrbit_events_c,
+                                 integrateFullOrbit_reduce_c)
 from .integrateLinearOrbit import (_ext_loaded, integrateLinearOrbit,
                                    integrateLinearOrbit_c)
-from .integratePlanarOrbit import (integratePlanarOrbit,
+from .integratePlanarOrbit import (_EVENT_TYPES, _REDUCE_QUANTITIES,
+                                   _REDUCE_STATS, integratePlanarOrbit,
                                    integratePlanarOrbit_c,
-                                   integratePlanarOrbit_dxdv)
+                                   integratePlanarOrbit_dense_c,
+                                   integratePlanarOrbit_dxdv,
+                                   integratePlanarOrbit_events_c,
+                                   integratePlanarOrbit_reduce_c)
 
 ext_loaded= _ext_loaded
 if _APY_LOADED:
@@ -64,6 +73,9 @@ try:
 except KeyError:
     import multiprocessing
     _NUMCORES= multiprocessing.cpu_count()
+# Size (in number of doubles) of the intermediate buffer used when integrating
+# into an out-of-core store in chunks
+_OUT_CHUNK_BUFSIZE= 2**24
 # named_objects file
 def _named_objects_key_formatting(name):
     # Remove punctuation, spaces, and make lowercase
@@ -902,6 +914,14 @@ class Orbit:
             integrate_kwargs['orbit']= \
                 copy.deepcopy(self.orbit[flat_indx_array])
             integrate_kwargs['_pot']= self._pot
+            if hasattr(self,'_dense'):
+                integrate_kwargs['_dense']= self._dense[flat_indx_array]
+            if hasattr(self,'_orbit_vsign'):
+                integrate_kwargs['_orbit_vsign']= self._orbit_vsign
+            if hasattr(self,'_events'):
+                integrate_kwargs['_events']= \
+                    {event: self._events[event][flat_indx_array]
+                     for event in self._events}
         else: integrate_kwargs= None
         # Other things to transfer
         misc_kwargs= {}
@@ -1027,7 +1047,11 @@ class Orbit:
 
     def integrate(self,t,pot,method='symplec4_c',progressbar=True,
                   dt=None,numcores=_NUMCORES,
-                  force_map=False):
+                  force_map=False,dense_output=False,out=None,
+                  events=None,event_phi=0.,storage_dtype=numpy.float64,
+                  tfunc_grid=None,resume=False,checkpoint=None,
+                  checkpoint_every=None,return_stats=False,
+                  schedule='dynamic',chunksize=None):
         """
         NAME:
 
@@ -1041,7 +1065,7 @@ class Orbit:
 
             t - list of times at which to output (0 has to be in this!) (can be Quantity)
 
-            pot - potential instance or list of instances
+            pot - potential instance or list of instances; can contain BatchedPotential instances with one member for each orbit, in which case each orbit is integrated in the potential with each BatchedPotential replaced by its own member, all in a single call to the C code (only for 3D orbits and the C integrators, without dense_output, events, or storage_dtype)
 
             method = 'odeint' for scipy's odeint
                      'leapfrog' for a simple leapfrog implementation
@@ -1053,18 +1077,44 @@ class Orbit:
                      'dopr54_c' for a 5-4 Dormand-Prince integrator in C
                      'dop853' for a 8-5-3 Dormand-Prince integrator in Python
                      'dop853_c' for a 8-5-3 Dormand-Prince integrator in C
+                     'ttleapfrog_c', 'ttsymplec4_c' for 2nd and 4th order time-transformed symplectic integrators in C, whose stepsize is proportional to the distance from the center, such that it automatically shrinks near pericenter; efficient for very eccentric orbits in cuspy potentials (for 1D orbits, leapfrog_c and symplec4_c are used instead)
+                     'leapfrog_lockstep', 'symplec4_lockstep', 'symplec6_lockstep' for the leapfrog and 4th and 6th order symplectic integrators advancing all orbits in lockstep with a shared stepsize in Python, such that the forces are evaluated for all orbits in a single call per force evaluation; much faster than 'leapfrog' for many orbits in potentials that are not implemented in C but whose forces can be evaluated for arrays of positions
 
             progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
 
-            dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (only works for the C integrators that use a fixed stepsize) (can be Quantity)
+            dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (only works for the C and lockstep integrators that use a fixed stepsize) (can be Quantity)
 
             numcores - number of cores to use for Python-based multiprocessing (pure Python or using force_map=True); default = OMP_NUM_THREADS
 
             force_map= (False) if True, force use of Python-based multiprocessing (not recommended)
 
+            dense_output= (False) if True, keep the accepted steps of the adaptive integrator and their interpolation coefficients, such that the orbit can be evaluated at any time in [t[0],t[-1]] using the continuous solution of the integrator rather than by interpolating the output at t (which then does not need to be dense); only for method='dopr54_c' and 'dop853_c' and for 2D and 3D orbits
+
+            out= (None) if set, store the integrated orbits out of core: either a filename, in which case the orbits are written to a memory-mapped .npy file, or a writeable, C-contiguous numpy.memmap with shape (size,len(t),phasedim) and dtype storage_dtype; the C integrators write directly into this store and the Orbit's outputs are read from it lazily
+
+            events= (None) list of events to find while integrating, using root finding on the continuous solution of the integrator: 'peri' (pericenters), 'apo' (apocenters), 'zcross' (crossings of z=0; 3D orbits only), 'phi' (crossings of the half-plane at azimuth event_phi); get the events using getEvents; only for method='dopr54_c' and 'dop853_c' and for 2D and 3D orbits
+
+            event_phi= (0.) azimuth of the half-plane for 'phi' events (can be Quantity)
+
+            storage_dtype= (numpy.float64) floating-point type in which to store the integrated orbits (e.g., numpy.float32 to halve the memory footprint); the integration itself is always done in double precision and the C integrators convert their output in chunks of orbits, while all outputs other than getOrbit are computed in double precision from the stored orbits
+
+            tfunc_grid= (None) if set, tabulate the Python functions of time used by potentials (e.g., the amplitude of a TimeDependentAmplitudeWrapperPotential or the frame motion of a NonInertialFrameForce) on this grid of times and evaluate them in C using cubic-spline interpolation, which avoids calling back into Python during the integration; either an array of times (can be Quantity) or an integer number of equally-spaced times between min(t) and max(t); functions are clamped to their values at the ends of the grid; only used by the C integrators
+
+            resume= (False) if True and the Orbit was integrated before, continue the integration from the last stored phase-space point of each orbit and append the times t to the stored orbit (if t does not start at the last stored time, the integration starts at the last stored time; t needs to continue past the last stored time in the same direction as the stored times); when the orbit is stored in a storage_dtype other than numpy.float64, the integration continues from the stored, lower-precision phase-space point; cannot be combined with dense_output, events, or out
+
+            checkpoint= (None) if set, filename of a checkpoint file (.npz) to which the integrated orbits are written every checkpoint_every output times; if this file exists when integrate is called with the same initial conditions and times (e.g., when re-running a batch job that was killed), the integration continues from the checkpoint; the file is removed when the integration completes; cannot be combined with dense_output, events, or out
+
+            checkpoint_every= (None) number of output times between checkpoints (default: len(t)//10)
+
+            return_stats= (False) if True, return the work done by the C integrator for each orbit (only for the C integrators, without force_map, dense_output, events, resume, or checkpoint)
+
+            schedule= ('dynamic') how the C integrators distribute the orbits over the OpenMP threads: 'dynamic' (threads take the next orbits in their input order) or 'cost' (threads take the orbits longest-first, estimating the cost of each orbit from its dynamical time at its initial position; reduces the time that threads sit idle at the end when integrating orbits of very different cost, e.g., orbits near the center of a cuspy halo together with orbits in the outer halo); not used for dense_output or events
+
+            chunksize= (None) number of orbits that each OpenMP thread takes at a time (default: 1); larger values reduce the scheduling overhead for many orbits that are each cheap to integrate
+
         OUTPUT:
 
-            None (get the actual orbit using getOrbit())
+            None (get the actual orbit using getOrbit()); if return_stats, a dictionary with arrays with the work done for each orbit: 'nsteps' (number of (accepted) steps), 'nrejected' (number of rejected steps of the adaptive integrators), 'nfev' (number of force evaluations, including those to estimate the stepsize), 'dt_min' (minimum absolute time step; Quantity if t is a Quantity), 'walltime' (wall time in s spent integrating the orbit), and 'thread' (OpenMP thread that integrated the orbit)
 
         HISTORY:
 
@@ -1072,12 +1122,79 @@ class Orbit:
 
             2018-12-26 - Written to use OpenMP C implementation - Bovy (UofT)
 
+            2026-10-18 - Added dense_output - agent
+
+            2026-10-18 - Added out for out-of-core storage - agent
+
+            2026-10-18 - Added event detection - agent
+
+            2026-10-18 - Added storage_dtype - agent
+
+            2026-10-18 - Added tfunc_grid - agent
+
+            2026-10-18 - Added resume and checkpoint - agent
+
+            2026-10-18 - Added lockstep integrators - agent
+
+            2026-10-18 - Added per-orbit members of BatchedPotentials - agent
+
+            2026-10-18 - Added time-transformed symplectic integrators - agent
+
+            2026-10-18 - Added return_stats - agent
+
+            2026-10-18 - Added schedule and chunksize - agent
+
         """
         if method.lower() not in ['odeint', 'leapfrog', 'dop853', 'leapfrog_c',
                 'symplec4_c', 'symplec6_c', 'rk4_c', 'rk6_c',
-                'dopr54_c', 'dop853_c']:
+                'dopr54_c', 'dop853_c', 'ttleapfrog_c', 'ttsymplec4_c',
+                'leapfrog_lockstep', 'symplec4_lockstep',
+                'symplec6_lockstep']:
             raise ValueError(f'{method:s} is not a valid `method`')
+        if return_stats and (not '_c' in method.lower() or force_map
+                             or dense_output or not events is None
+                             or resume or not checkpoint is None):
+            raise ValueError('return_stats=True is only supported for the C integrators, without force_map, dense_output, events, resume, or checkpoint')
+        if schedule not in ['dynamic','cost']:
+            raise ValueError(f"schedule={schedule} is not a valid schedule; use 'dynamic' or 'cost'")
+        if resume or not checkpoint is None:
+            if dense_output or not events is None or not out is None:
+                raise ValueError('resume and checkpoint cannot be combined with dense_output, events, or out')
+            return self._integrate_resumable(\
+                t,pot,resume=resume,checkpoint=checkpoint,
+                checkpoint_every=checkpoint_every,method=method,
+                progressbar=progressbar,dt=dt,numcores=numcores,
+                force_map=force_map,storage_dtype=storage_dtype,
+                tfunc_grid=tfunc_grid,schedule=schedule,chunksize=chunksize)
+        storage_dtype= numpy.dtype(storage_dtype)
+        if not numpy.issubdtype(storage_dtype,numpy.floating):
+            raise ValueError(f'storage_dtype={storage_dtype} is not a floating-point type')
+        if dense_output and method.lower() not in ['dopr54_c','dop853_c']:
+            raise ValueError('dense_output=True is only supported for method=\'dopr54_c\' and \'dop853_c\'')
+        if dense_output and self.dim() == 1:
+            raise ValueError('dense_output=True is only supported for 2D and 3D orbits')
+        if not events is None:
+            if isinstance(events,str): events= [events]
+            if method.lower() not in ['dopr54_c','dop853_c']:
+                raise ValueError('events are only supported for method=\'dopr54_c\' and \'dop853_c\'')
+            if self.dim() == 1:
+                raise ValueError('events are only supported for 2D and 3D orbits')
+            if dense_output:
+                raise ValueError('events cannot be combined with dense_output=True')
+            for event in events:
+                if event not in _EVENT_TYPES \
+                        or (event == 'zcross' and self.dim() == 2):
+                    raise ValueError(f'{event} is not a valid event for {self.dim():d}D orbits')
+            event_phi= conversion.parse_angle(event_phi)
+        # Keep a CompiledPotential to pass its cached parsed form to C
+        c_pot= pot if isinstance(pot,CompiledPotential) else None
         pot= flatten_potential(pot)
+        batched= _has_batched(pot)
+        if batched and (self.dim() != 3 or not '_c' in method.lower()
+                        or force_map or dense_output or not events is None
+                        or storage_dtype != numpy.float64):
+            raise NotImplementedError('Orbit integration in BatchedPotentials, with one member for each orbit, is only supported for 3D orbits and the C integrators, without dense_output, events, or storage_dtype')
+        if batched: c_pot= None
         _check_potential_dim(self,pot)
         _check_consistent_units(self,pot)
         # Parse t
@@ -1093,8 +1210,12 @@ class Orbit:
                           galpyWarning)
         if not _check_integrate_dt(t,dt):
             raise ValueError('dt input (integrator stepsize) for Orbit.integrate must be an integer divisor of the output stepsize')
+        tfunc_grid= _parse_tfunc_grid(tfunc_grid,t,self._ro,self._vo)
         # Delete attributes for interpolation and rperi etc. determination
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_orbit_vsign'): delattr(self,'_orbit_vsign')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
+        if hasattr(self,'_events'): delattr(self,'_events')
         if hasattr(self,'rs'): delattr(self,'rs')
         if self.dim() == 2:
             thispot= toPlanarPotential(pot)
@@ -1102,9 +1223,22 @@ class Orbit:
             thispot= pot
         self.t= numpy.array(t)
         self._pot= thispot
+        if c_pot is None: c_pot= self._pot
+        if not out is None:
+            store= _parse_out_store(out,(self.size,len(self.t),
+                                         self.phasedim()),
+                                    dtype=storage_dtype)
+        elif storage_dtype != numpy.float64:
+            store= numpy.empty((self.size,len(self.t),self.phasedim()),
+                               dtype=storage_dtype)
+        else:
+            store= None
         #First check that the potential has C
         if '_c' in method:
-            if not ext_loaded or not _check_c(self._pot):
+            if not ext_loaded or not _check_c(_batched_member(self._pot,0)
+                                              if batched else self._pot):
+                if batched:
+                    raise NotImplementedError('Orbit integration in BatchedPotentials requires the C extension and potentials that are implemented in C')
                 if ('leapfrog' in method or 'symplec' in method):
                     method= 'leapfrog'
                 else:
@@ -1113,6 +1247,19 @@ class Orbit:
                     warnings.warn("Cannot use C integration because C extension not loaded (using %s instead)" % (method), galpyWarning)
                 else:
                     warnings.warn("Cannot use C integration because some of the potentials are not implemented in C (using %s instead)" % (method), galpyWarning)
+                if dense_output:
+                    warnings.warn("dense_output=True is only supported for the C integrators, returning the orbit at the times t only", galpyWarning)
+                    dense_output= False
+                if not events is None:
+                    warnings.warn("events are only supported for the C integrators, not finding any events", galpyWarning)
+                    events= None
+        # The time transformation of the time-transformed integrators is
+        # centered on the origin, which for 1D orbits only shrinks the step
+        # at each midplane crossing
+        if self.dim() == 1 and method.lower() in ['ttleapfrog_c',
+                                                  'ttsymplec4_c']:
+            method= method.lower()[2:]
+            warnings.warn("The time-transformed symplectic integrators are not efficient for 1D orbits (using %s instead)" % (method), galpyWarning)
         # Now check that we aren't trying to integrate a dissipative force
         # with a symplectic integrator
         if _isDissipative(self._pot) and ('leapfrog' in method
@@ -1122,6 +1269,9 @@ class Orbit:
             else:
                 method= 'odeint'
             warnings.warn("Cannot use symplectic integration because some of the included forces are dissipative (using non-symplectic integrator %s instead)" % (method), galpyWarning)
+        if return_stats and (not '_c' in method or not ext_loaded):
+            raise NotImplementedError('return_stats=True requires the C extension and potentials that are implemented in C')
+        stats= numpy.empty((self.size,6)) if return_stats else None
         # Implementation with parallel_map in Python
         if not '_c' in method or not ext_loaded or force_map:
             if self.dim() == 1:
@@ -1139,12 +1289,50 @@ class Orbit:
         else:
             warnings.warn("Using C implementation to integrate orbits",
                           galpyWarningVerbose)
-            if self.dim() == 1:
-                out, msg= integrateLinearOrbit_c(self._pot,
+            if not store is None and not dense_output and events is None \
+                    and (self.phasedim() == 3 or self.phasedim() == 5
+                         or store.dtype != numpy.float64):
+                # Integrate in chunks of orbits, because the C code needs
+                # to output the dummy phi that is not in the store or
+                # outputs double precision that needs to be converted
+                if self.dim() == 1:
+                    integrate_c= integrateLinearOrbit_c
+                elif self.dim() == 2:
+                    integrate_c= integratePlanarOrbit_c
+                else:
+                    integrate_c= integrateFullOrbit_c
+                dummy_phi= self.phasedim() == 3 or self.phasedim() == 5
+                store_chunksize= max(1,_OUT_CHUNK_BUFSIZE
+                                     //(len(self.t)*(self.phasedim()
+                                                     +dummy_phi)))
+                msg= numpy.zeros(self.size,dtype=numpy.int32)
+                for ii in range(0,self.size,store_chunksize):
+                    if dummy_phi:
+                        vxvvs= numpy.pad(self.vxvv[ii:ii+store_chunksize],
+                                         ((0,0),(0,1)),
+                                         'constant',constant_values=0)
+                    else:
+                        vxvvs= numpy.copy(self.vxvv[ii:ii+store_chunksize])
+                    tout, msg[ii:ii+store_chunksize]= \
+                        integrate_c(c_pot,vxvvs,t,method,
+                                    progressbar=progressbar,dt=dt,
+                                    tfunc_grid=tfunc_grid,
+                                    stats=None if stats is None
+                                    else stats[ii:ii+store_chunksize],
+                                    schedule=schedule,chunksize=chunksize)
+                    store[ii:ii+store_chunksize]= tout[:,:,:-1] if dummy_phi \
+                        else tout
+                out= store
+            elif self.dim() == 1:
+                out, msg= integrateLinearOrbit_c(c_pot,
                                                  numpy.copy(self.vxvv),
                                                  t,method,
                                                  progressbar=progressbar,
-                                                 dt=dt)
+                                                 dt=dt,result=store,
+                                                 tfunc_grid=tfunc_grid,
+                                                 stats=stats,
+                                                 schedule=schedule,
+                                                 chunksize=chunksize)
             else:
                 if self.phasedim() == 3 \
                    or self.phasedim() == 5:
@@ -1153,21 +1341,62 @@ class Orbit:
                                      'constant',constant_values=0)
                 else:
                     vxvvs= numpy.copy(self.vxvv)
-                if self.dim() == 2:
-                    out, msg= integratePlanarOrbit_c(self._pot,vxvvs,
+                if dense_output:
+                    if self.dim() == 2:
+                        integrate_dense= integratePlanarOrbit_dense_c
+                    else:
+                        integrate_dense= integrateFullOrbit_dense_c
+                    out, msg, tsteps, coeffs, nsteps= \
+                        integrate_dense(c_pot,vxvvs,self.t,method,
+                                        progressbar=progressbar,
+                                        tfunc_grid=tfunc_grid)
+                    self._dense= _DenseOutput(tsteps,coeffs,nsteps,
+                                              self.phasedim())
+                elif not events is None:
+                    if self.dim() == 2:
+                        integrate_events= integratePlanarOrbit_events_c
+                    else:
+                        integrate_events= integrateFullOrbit_events_c
+                    out, msg, nevents, tevents, ievents, yevents= \
+                        integrate_events(c_pot,vxvvs,self.t,method,
+                                         events,event_phi=event_phi,
+                                         progressbar=progressbar,
+                                         tfunc_grid=tfunc_grid)
+                    if self.phasedim() == 3 \
+                            or self.phasedim() == 5:
+                        yevents= yevents[:,:,:-1]
+                    self._events= {}
+                    for event in events:
+                        self._events[event]= _collect_events(\
+                            tevents,ievents,yevents,_EVENT_TYPES[event])
+                elif self.dim() == 2:
+                    out, msg= integratePlanarOrbit_c(c_pot,vxvvs,
                                                      t,method,
                                                      progressbar=progressbar,
-                                                     dt=dt)
+                                                     dt=dt,result=store,
+                                                     tfunc_grid=tfunc_grid,
+                                                     stats=stats,
+                                                     schedule=schedule,
+                                                     chunksize=chunksize)
                 else:
-                    out, msg= integrateFullOrbit_c(self._pot,vxvvs,
+                    out, msg= integrateFullOrbit_c(c_pot,vxvvs,
                                                    t,method,
                                                    progressbar=progressbar,
-                                                   dt=dt)
+                                                   dt=dt,result=store,
+                                                   tfunc_grid=tfunc_grid,
+                                                   stats=stats,
+                                                   schedule=schedule,
+                                                   chunksize=chunksize)
 
                 if self.phasedim() == 3 \
                    or self.phasedim() == 5:
                     out= out[:,:,:-1]
         # Store orbit internally
+        if not store is None:
+            if not out is store:
+                store[...]= out
+            if isinstance(store,numpy.memmap): store.flush()
+            out= store
         self.orbit= out
         # Check whether r ever < minr if dynamical friction is included
         # and warn if so
@@ -1212,8 +1441,220 @@ class Orbit:
                               """if you wish (min/max r = {:.3f},{:.3f}"""\
                               .format(self.rperi(),self.rap()),
                           galpyWarning)
+        if return_stats:
+            return _parse_integrator_stats(stats,self._integrate_t_asQuantity,
+                                           self._ro,self._vo)
         return None
 
+    def _integrate_resumable(self,t,pot,resume=False,checkpoint=None,
+                             checkpoint_every=None,**integrate_kwargs):
+        """Integrate the orbits, continuing a previous integration if resume and writing and continuing from checkpoints if checkpoint is set, by integrating the times in segments"""
+        integrate_t_asQuantity= _APY_LOADED and isinstance(t,units.Quantity)
+        if integrate_t_asQuantity:
+            t= conversion.parse_time(t,ro=self._ro,vo=self._vo)
+        t= numpy.atleast_1d(numpy.array(t,dtype='float'))
+        if resume and hasattr(self,'orbit'):
+            integrate_t_asQuantity= self._integrate_t_asQuantity
+            if t[0] != self.t[-1]:
+                t= numpy.concatenate(([self.t[-1]],t))
+            # The new times need to continue the stored times monotonically
+            direction= numpy.sign(self.t[-1]-self.t[0]) if len(self.t) > 1 \
+                else numpy.sign(t[1]-t[0]) if len(t) > 1 else 1.
+            if numpy.any(direction*numpy.diff(t) <= 0.):
+                raise ValueError(f'With resume=True, the times t need to continue the previously integrated times (which end at t={self.t[-1]}) in the same direction')
+            tall= numpy.concatenate((self.t,t[1:]))
+            ndone= len(self.t)
+        else:
+            tall= t
+            ndone= 0
+        if checkpoint is None:
+            checkpoint_every= len(tall)
+        elif checkpoint_every is None:
+            checkpoint_every= max(1,len(tall)//10)
+        elif int(checkpoint_every) < 1:
+            raise ValueError('checkpoint_every must be a positive integer')
+        checkpoint_every= int(checkpoint_every)
+        if not checkpoint is None and os.path.exists(checkpoint):
+            with numpy.load(checkpoint) as data:
+                tdone= data['t']
+                if data['vxvv'].shape != self.vxvv.shape \
+                        or numpy.any(data['vxvv'] != self.vxvv) \
+                        or len(tdone) > len(tall) \
+                        or numpy.any(tdone != tall[:len(tdone)]):
+                    raise ValueError(f'Checkpoint file {checkpoint} does not match the initial conditions and times of this integration; remove it to start over')
+                if len(tdone) > ndone:
+                    self.t= tdone
+                    self.orbit= data['orbit']
+                    ndone= len(tdone)
+                    for attr in ['_orbInterp','_orbit_vsign','_dense',
+                                 '_events','rs']:
+                        if hasattr(self,attr): delattr(self,attr)
+                    # Set the potential as integrate would
+                    thispot= flatten_potential(pot)
+                    self._pot= toPlanarPotential(thispot) \
+                        if self.dim() == 2 else thispot
+        while ndone < len(tall):
+            if ndone == 0:
+                nnext= min(len(tall),checkpoint_every+1)
+                self.integrate(tall[:nnext],pot,**integrate_kwargs)
+            else:
+                nnext= min(len(tall),ndone+checkpoint_every)
+                self._continue_integration(tall[ndone-1:nnext],pot,
+                                           **integrate_kwargs)
+            ndone= nnext
+            if not checkpoint is None and ndone < len(tall):
+                _write_checkpoint(checkpoint,self.t,self.orbit,self.vxvv)
+        if not checkpoint is None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self._integrate_t_asQuantity= integrate_t_asQuantity
+        return None
+
+    def _continue_integration(self,t,pot,**integrate_kwargs):
+        """Continue the integration from the last stored phase-space point at t[0]= self.t[-1] to the times t, appending these to the stored orbit"""
+        prev_t= self.t
+        prev_orbit= self.orbit
+        vxvv= self.vxvv
+        try:
+            self.vxvv= numpy.array(prev_orbit[:,-1],dtype=numpy.float64)
+            self.integrate(t,pot,**integrate_kwargs)
+        finally:
+            self.vxvv= vxvv
+        self.t= numpy.concatenate((prev_t,self.t[1:]))
+        self.orbit= numpy.concatenate((prev_orbit,self.orbit[:,1:]),axis=1)
+        return None
+
+    def integrate_reduce(self,t,pot,reducers,method='symplec4_c',
+                         progressbar=True,dt=None,numcores=_NUMCORES,
+                         hist_bins=None,hist_range=None,use_physical=True,
+                         tfunc_grid=None):
+        """
+        NAME:
+
+            integrate_reduce
+
+        PURPOSE:
+
+            integrate this Orbit instance, but only return summary statistics of each orbit rather than storing the orbit at all times
+
+        INPUT:
+
+            t - list of times at which the orbit is sampled for the summary statistics (0 has to be in this!) (can be Quantity)
+
+            pot - potential instance or list of instances
+
+            reducers - list of summary statistics 'quantity_stat' with quantity in 'R', 'z', 'r', 'E', 'Lz' and stat in 'min', 'max', 'mean', or 'var' (e.g., 'r_max' or 'E_var'); statistics are computed over the times t
+
+            method= ('symplec4_c') integration method (see integrate)
+
+            progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+
+            dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (only works for the C integrators that use a fixed stepsize) (can be Quantity)
+
+            numcores - number of cores to use for Python-based multiprocessing (pure Python); default = OMP_NUM_THREADS
+
+            hist_bins= (None) if set, [nR,nz] number of bins in R and z of a histogram of the number of times t that all orbits together spend in each (R,z) bin
+
+            hist_range= [[Rmin,Rmax],[zmin,zmax]] range of the (R,z) histogram (can be Quantity)
+
+            use_physical= (True) if False, don't convert the statistics to physical units even if ro and vo are set (the output is never a Quantity)
+
+            tfunc_grid= (None) if set, tabulate the Python functions of time used by potentials on this grid for the C integrators (see integrate)
+
+        OUTPUT:
+
+            dictionary with an array [*input_shape] for each reducer and, if hist_bins is set, the histogram [nR,nz] under 'hist'
+
+        HISTORY:
+
+            2026-10-18 - Written - agent
+
+        """
+        if self.dim() == 1:
+            raise ValueError('integrate_reduce is only supported for 2D and 3D orbits')
+        if method.lower() not in ['odeint', 'leapfrog', 'dop853', 'leapfrog_c',
+                'symplec4_c', 'symplec6_c', 'rk4_c', 'rk6_c',
+                'dopr54_c', 'dop853_c', 'ttleapfrog_c', 'ttsymplec4_c',
+                'leapfrog_lockstep', 'symplec4_lockstep',
+                'symplec6_lockstep']:
+            raise ValueError(f'{method:s} is not a valid `method`')
+        if isinstance(reducers,str): reducers= [reducers]
+        for reducer in reducers:
+            if len(reducer.split('_')) != 2 \
+                    or not reducer.split('_')[0] in _REDUCE_QUANTITIES \
+                    or not reducer.split('_')[1] in _REDUCE_STATS:
+                raise ValueError(f'{reducer} is not a valid reducer')
+        c_pot= pot if isinstance(pot,CompiledPotential) else None
+        pot= flatten_potential(pot)
+        _check_potential_dim(self,pot)
+        _check_consistent_units(self,pot)
+        # Parse t
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            t= conversion.parse_time(t,ro=self._ro,vo=self._vo)
+        if _APY_LOADED and not dt is None and isinstance(dt,units.Quantity):
+            dt= conversion.parse_time(dt,ro=self._ro,vo=self._vo)
+        if not _check_integrate_dt(t,dt):
+            raise ValueError('dt input (integrator stepsize) for Orbit.integrate_reduce must be an integer divisor of the output stepsize')
+        tfunc_grid= _parse_tfunc_grid(tfunc_grid,t,self._ro,self._vo)
+        if not hist_bins is None:
+            hist_range= [[conversion.parse_length(hist_range[0][0],ro=self._ro),
+                          conversion.parse_length(hist_range[0][1],ro=self._ro)],
+                         [conversion.parse_length(hist_range[1][0],ro=self._ro),
+                          conversion.parse_length(hist_range[1][1],ro=self._ro)]]
+        t= numpy.array(t)
+        if self.dim() == 2:
+            thispot= toPlanarPotential(pot)
+        else:
+            thispot= pot
+        if '_c' in method and (not ext_loaded or not _check_c(thispot)):
+            method= 'leapfrog' if ('leapfrog' in method or 'symplec' in method) \
+                else 'odeint'
+            warnings.warn("Cannot use C integration because some of the potentials are not implemented in C (using %s instead)" % (method), galpyWarning)
+        if _isDissipative(thispot) and ('leapfrog' in method
+                                        or 'symplec' in method):
+            method= 'dopr54_c' if '_c' in method else 'odeint'
+            warnings.warn("Cannot use symplectic integration because some of the included forces are dissipative (using non-symplectic integrator %s instead)" % (method), galpyWarning)
+        if '_c' in method:
+            if self.phasedim() == 3 or self.phasedim() == 5:
+                #We hack this by putting in a dummy phi=0
+                vxvvs= numpy.pad(self.vxvv,((0,0),(0,1)),
+                                 'constant',constant_values=0)
+            else:
+                vxvvs= numpy.copy(self.vxvv)
+            if self.dim() == 2:
+                integrate_reduce= integratePlanarOrbit_reduce_c
+            else:
+                integrate_reduce= integrateFullOrbit_reduce_c
+            reduced, hist, msg= integrate_reduce(thispot if c_pot is None
+                                                 else c_pot,
+                                                 vxvvs,t,method,
+                                                 reducers,hist_bins=hist_bins,
+                                                 hist_range=hist_range,
+                                                 progressbar=progressbar,
+                                                 dt=dt,tfunc_grid=tfunc_grid)
+        else:
+            orb= Orbit(self.vxvv)
+            orb.integrate(t,thispot,method=method,progressbar=progressbar,
+                          numcores=numcores,dt=dt)
+            reduced, hist= _reduce_orbits(orb,thispot,reducers,
+                                          hist_bins,hist_range)
+        # Convert to physical units if necessary and reshape
+        out= {}
+        for ii,reducer in enumerate(reducers):
+            quantity, stat= reducer.split('_')
+            fac= 1.
+            if use_physical and quantity in ['R','z','r'] and self._roSet:
+                fac= self._ro
+            elif use_physical and quantity == 'E' and self._voSet:
+                fac= self._vo**2.
+            elif use_physical and quantity == 'Lz' \
+                    and self._roSet and self._voSet:
+                fac= self._ro*self._vo
+            if stat == 'var': fac= fac**2.
+            out[reducer]= numpy.reshape(reduced[:,ii]*fac,self.shape)
+        if not hist is None:
+            out['hist']= hist
+        return out
+
     def integrate_dxdv(self,dxdv,t,pot,method='dopr54_c',
                        progressbar=True,dt=None,
                        numcores=_NUMCORES,force_map=False,
@@ -1229,7 +1670,7 @@ class Orbit:
 
         INPUT:
 
-           dxdv - [dR,dvR,dvT,dphi], shape=(*input_shape,4)
+           dxdv - [dR,dvR,dvT,dphi] for planar orbits or [dR,dvR,dvT,dz,dvz,dphi] for 3D orbits, shape=(*input_shape,4/6)
 
            t - list of times at which to output (0 has to be in this!) (can be Quantity)
 
@@ -1249,7 +1690,7 @@ class Orbit:
 
            rectOut= (False) if True, output dxdv (that in orbit_dxdv) is in rectangular coordinates
 
-           numcores - number of cores to use for Python-based multiprocessing (pure Python or using force_map=True); default = OMP_NUM_THREADS
+           numcores - number of cores to use for Python-based multiprocessing (pure Python or using force_map=True); default = OMP_NUM_THREADS (the C integrators for 3D orbits use OpenMP instead)
 
            force_map= (False) if True, force use of Python-based multiprocessing (not recommended)
 
@@ -1265,9 +1706,11 @@ class Orbit:
 
            2019-05-21 - Parallelized and incorporated into new Orbits class - Bovy (UofT)
 
+           2026-10-18 - Added 3D orbits, integrated with OpenMP in C - agent
+
         """
-        if not self.phasedim() == 4:
-            raise AttributeError('integrate_dxdv is only implemented for 4D (planar) orbits')
+        if not self.phasedim() == 4 and not self.phasedim() == 6:
+            raise AttributeError('integrate_dxdv is only implemented for 4D (planar) and 6D (full) orbits')
         if method.lower() not in ['odeint', 'dop853', 'rk4_c', 'rk6_c',
                                   'dopr54_c', 'dop853_c']:
             if 'leapfrog' in method.lower() or 'symplec' in method.lower():
@@ -1292,15 +1735,22 @@ class Orbit:
             dxdv= numpy.atleast_2d(dxdv)
         # Delete attributes for interpolation and rperi etc. determination
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_orbit_vsign'): delattr(self,'_orbit_vsign')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
+        if hasattr(self,'_events'): delattr(self,'_events')
         if hasattr(self,'rs'): delattr(self,'rs')
         if self.dim() == 2:
             thispot= toPlanarPotential(pot)
+        else:
+            thispot= pot
         self.t= numpy.array(t)
         self._pot_dxdv= thispot
         self._pot= thispot
         #First check that the potential has C
         if '_c' in method:
-            allHasC= _check_c(pot) and _check_c(pot,dxdv=True)
+            # 3D integration uses the Jacobian of the C forces
+            allHasC= _check_c(pot) \
+                and (self.dim() == 3 or _check_c(pot,dxdv=True))
             if not ext_loaded or \
                     (not allHasC and not 'leapfrog' in method and not 'symplec' in method):
                 method= 'odeint'
@@ -1315,9 +1765,14 @@ class Orbit:
                                                     t,method,rectIn,rectOut,
                                                     progressbar=progressbar,
                                                     numcores=numcores,dt=dt)
+            else:
+                out, msg= integrateFullOrbit_dxdv(self._pot,self.vxvv,dxdv,
+                                                  t,method,rectIn,rectOut,
+                                                  progressbar=progressbar,
+                                                  numcores=numcores,dt=dt)
         # Store orbit internally
         self.orbit_dxdv= out
-        self.orbit= self.orbit_dxdv[...,:4]
+        self.orbit= self.orbit_dxdv[...,:self.phasedim()]
         return None
 
     def flip(self,inplace=False):
@@ -1355,8 +1810,17 @@ class Orbit:
                     self.orbit[...,2]= -self.orbit[...,2]
                 if self.phasedim() > 4:
                     self.orbit[...,4]= -self.orbit[...,4]
+                # Stored velocities are now minus the time derivatives
+                self._orbit_vsign= -getattr(self,'_orbit_vsign',1.)
                 if hasattr(self,"_orbInterp"):
-                    delattr(self,"_orbInterp")
+                    self._orbInterp.flip_velocities()
+                if hasattr(self,"_dense"):
+                    self._dense.flip_velocities()
+                if hasattr(self,"_events"):
+                    for event in self._events:
+                        self._events[event][...,2:4]*= -1.
+                        if self.phasedim() > 4:
+                            self._events[event][...,5]*= -1.
             return None
         orbSetupKwargs= {'ro':self._ro,
                          'vo':self._vo,
@@ -1407,13 +1871,15 @@ class Orbit:
 
         OUTPUT:
 
-           array orbit[*input_shape,nt,nphasedim]
+           array orbit[*input_shape,nt,nphasedim] (a read-only view of the store when integrated with out=; in the storage_dtype used in integrate)
 
         HISTORY:
 
            2019-03-02 - Written - Bovy (UofT)
 
         """
+        if isinstance(self.orbit,numpy.memmap):
+            return _readonly_view(self.orbit)
         return self.orbit.copy()
 
     @shapeDecorator
@@ -1441,7 +1907,36 @@ class Orbit:
            2019-05-21 - Written - Bovy (UofT)
 
         """
-        return self.orbit_dxdv[...,4:].copy()
+        return self.orbit_dxdv[...,self.phasedim():].copy()
+
+    @shapeDecorator
+    def getEvents(self,event):
+        """
+
+        NAME:
+
+           getEvents
+
+        PURPOSE:
+
+           return the events found during the integration (with integrate(events=...))
+
+        INPUT:
+
+           event - type of event: 'peri', 'apo', 'zcross', or 'phi'
+
+        OUTPUT:
+
+           array events[*input_shape,nevent,1+nphasedim] with the time and the phase-space position [t,R,vR,vT(,z,vz)(,phi)] at each event; orbits with fewer events than the maximum are padded with NaN
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        if not hasattr(self,'_events') or not event in self._events:
+            raise AttributeError(f"Integrate the orbit with events=['{event}'] first")
+        return self._events[event].copy()
 
     @physical_conversion('energy')
     @shapeDecorator
@@ -2085,7 +2580,7 @@ class Orbit:
 
         INPUT:
 
-           analytic(= False) compute this analytically
+           analytic(= False) compute this analytically (if False and the orbit was integrated with events=['apo'], the apocenters found during integration are included)
 
            pot - potential to use for analytical calculation
 
@@ -2120,7 +2615,9 @@ class Orbit:
         if not hasattr(self,'orbit'):
             raise AttributeError("Integrate the orbit first or use analytic=True for approximate eccentricity")
         rs= self.r(self.t,use_physical=False,dontreshape=True)
-        return numpy.amax(rs,axis=-1)
+        return numpy.maximum(numpy.amax(rs,axis=-1),
+                             self._event_extreme_r('apo',numpy.amax,
+                                                   -numpy.inf))
 
     @physical_conversion('position')
     @shapeDecorator
@@ -2136,7 +2633,7 @@ class Orbit:
 
         INPUT:
 
-           analytic(= False) compute this analytically
+           analytic(= False) compute this analytically (if False and the orbit was integrated with events=['peri'], the pericenters found during integration are included)
 
            pot - potential to use for analytical calculation
 
@@ -2171,7 +2668,21 @@ class Orbit:
         if not hasattr(self,'orbit'):
             raise AttributeError("Integrate the orbit first or use analytic=True for approximate eccentricity")
         rs= self.r(self.t,use_physical=False,dontreshape=True)
-        return numpy.amin(rs,axis=-1)
+        return numpy.minimum(numpy.amin(rs,axis=-1),
+                             self._event_extreme_r('peri',numpy.amin,
+                                                   numpy.inf))
+
+    def _event_extreme_r(self,event,func,fill):
+        """Extreme (func=numpy.amin/amax) spherical radius at the events of a given type, fill for orbits without such events"""
+        if not hasattr(self,'_events') or not event in self._events:
+            return fill
+        events= self._events[event]
+        if self.phasedim() > 4:
+            rs= numpy.sqrt(events[...,1]**2.+events[...,4]**2.)
+        else:
+            rs= events[...,1]
+        return func(numpy.where(numpy.isnan(rs),fill,rs),axis=-1,
+                    initial=fill)
 
     @physical_conversion('position')
     @shapeDecorator
@@ -4519,6 +5030,7 @@ class Orbit:
         HISTORY:
            2019-02-01 - Started - Bovy (UofT)
            2019-02-18 - Written interpolation part - Bovy (UofT)
+           2026-10-18 - Switched to lazy cubic Hermite interpolation - agent
         """
         if len(args) == 0 or (not hasattr(self,'t') and args[0] == 0. ):
             return numpy.array(self.vxvv).T
@@ -4547,10 +5059,17 @@ class Orbit:
             # Not doing hasattr in above elif, bc currently slow due to overwrite of __getattribute__
             warnings.warn("You specified integration times as a Quantity, but are evaluating at times not specified as a Quantity; assuming that time given is in natural (internal) units (multiply time by unit to get output at physical time)",galpyWarning)
         if t_exact_integration_times: # Common case where one wants all integrated times
+            if self.orbit.dtype != numpy.float64:
+                # Always compute outputs in double precision
+                return self.orbit.T.astype(numpy.float64)
+            elif isinstance(self.orbit,numpy.memmap):
+                # Don't load out-of-core orbits into memory
+                return _readonly_view(self.orbit.T)
             return self.orbit.T.copy()
         elif isinstance(t,(int,float,numpy.number)) and hasattr(self,'t') \
                 and t in list(self.t):
-            return numpy.array(self.orbit[:,list(self.t).index(t),:]).T
+            return numpy.array(self.orbit[:,list(self.t).index(t),:],
+                               dtype=numpy.float64).T
         else:
             if isinstance(t,(int,float,numpy.number)):
                 nt= 1
@@ -4560,6 +5079,9 @@ class Orbit:
             if numpy.any(t > numpy.nanmax(self.t)) \
                     or numpy.any(t < numpy.nanmin(self.t)):
                 raise ValueError('Found time value not in the integration time domain')
+            if hasattr(self,'_dense'):
+                out= self._dense(t)
+                return out[:,0] if nt == 1 else out
             try:
                 self._setupOrbitInterp()
             except:
@@ -4571,27 +5093,8 @@ class Orbit:
                         raise LookupError("Orbit interpolaton failed; integrate on finer grid")
                     out[:,jj]= self.orbit[:,indx].T
                 return out #should always have nt > 1, bc otherwise covered by above
-            out= numpy.empty((self.phasedim(),nt,self.size))
-            # Evaluating RectBivariateSpline on grid requires sorted arrays
-            sindx= numpy.argsort(t)
-            t= t[sindx]
-            usindx= numpy.argsort(sindx) # to later unsort
-            if self.phasedim() == 4 or self.phasedim() == 6:
-                #Unpack interpolated x and y to R and phi
-                x= self._orbInterp[0](t,self._orb_indx_4orbInterp)
-                y= self._orbInterp[-1](t,self._orb_indx_4orbInterp)
-                out[0]= numpy.sqrt(x*x+y*y)
-                out[-1]= numpy.arctan2(y,x)
-                for ii in range(1,self.phasedim()-1):
-                    out[ii]= self._orbInterp[ii](t,self._orb_indx_4orbInterp)
-            else:
-                for ii in range(self.phasedim()):
-                    out[ii]= self._orbInterp[ii](t,self._orb_indx_4orbInterp)
-            if nt == 1:
-                return out[:,0]
-            else:
-                t= t[usindx]
-                return out[:,usindx]
+            out= self._orbInterp(t)
+            return out[:,0] if nt == 1 else out
 
     def toPlanar(self):
         """
@@ -4667,52 +5170,10 @@ class Orbit:
 
     def _setupOrbitInterp(self):
         if hasattr(self,"_orbInterp"): return None
-        # Setup one interpolation / phasedim, for all orbits simultaneously
-        # First check that times increase
-        if hasattr(self,"t"): #Orbit has been integrated
-            if self.t[1] < self.t[0]: #must be backward
-                sindx= numpy.argsort(self.t)
-                # sort
-                self.t= self.t[sindx]
-                self.orbit= self.orbit[:,sindx]
-                usindx= numpy.argsort(sindx) # to later unsort
-        orbInterp= []
-        orb_indx= numpy.arange(self.size)
-        for ii in range(self.phasedim()):
-            if (self.phasedim() == 4 or self.phasedim() == 6) and ii == 0:
-                #Interpolate x and y rather than R and phi to avoid issues w/ phase wrapping
-                if self.size == 1:
-                    orbInterp.append(_1DInterp(\
-                          self.t,
-                          self.orbit[0,:,0]*numpy.cos(self.orbit[0,:,-1])))
-                else:
-                    orbInterp.append(interpolate.RectBivariateSpline(\
-                          self.t,orb_indx,
-                          (self.orbit[:,:,0]*numpy.cos(self.orbit[:,:,-1])).T,
-                          ky=1,s=0.))
-            elif (self.phasedim() == 4 or self.phasedim() == 6) and \
-                    ii == self.phasedim()-1:
-                if self.size == 1:
-                    orbInterp.append(_1DInterp(\
-                          self.t,
-                          self.orbit[0,:,0]*numpy.sin(self.orbit[0,:,-1])))
-                else:
-                    orbInterp.append(interpolate.RectBivariateSpline(\
-                          self.t,orb_indx,
-                          (self.orbit[:,:,0]*numpy.sin(self.orbit[:,:,-1])).T,
-                          ky=1,s=0.))
-            else:
-                if self.size == 1:
-                    orbInterp.append(_1DInterp(self.t,self.orbit[0,:,ii]))
-                else:
-                    orbInterp.append(interpolate.RectBivariateSpline(\
-                            self.t,orb_indx,self.orbit[:,:,ii].T,ky=1,s=0.))
-        self._orbInterp= orbInterp
-        self._orb_indx_4orbInterp= orb_indx
-        try: #unsort
-            self.t= self.t[usindx]
-            self.orbit= self.orbit[:,usindx]
-        except: pass
+        # Setup cubic Hermite interpolation in time, for all orbits
+        # simultaneously; this is evaluated lazily from the stored orbits
+        self._orbInterp= _HermiteInterp(self.t,self.orbit,
+                                        vsign=getattr(self,'_orbit_vsign',1.))
         return None
 
     def _parse_plot_quantity(self,quant,**kwargs):
@@ -5617,12 +6078,196 @@ require(['Plotly'], function (Plotly) {{
                     setup_trace1=setup_trace1,setup_trace2=setup_trace2,
                     setup_trace3=setup_trace3, trace_num_list= [ii for ii in range(self.size * len(d1s))]))
 
-class _1DInterp:
-    """Class to simulate 2D interpolation when using a single orbit"""
-    def __init__(self,t,y,k=3):
-        self._ip= interpolate.InterpolatedUnivariateSpline(t,y,k=k)
-    def __call__(self,t,indx):
-        return self._ip(t)[:,None]
+def _write_checkpoint(filename,t,orbit,vxvv):
+    """Write a checkpoint of an orbit integration atomically to filename"""
+    tmpfilename= f'{filename}.tmp'
+    with open(tmpfilename,'wb') as savefile:
+        numpy.savez(savefile,t=t,orbit=orbit,vxvv=vxvv)
+    os.replace(tmpfilename,filename)
+    return None
+
+class _HermiteInterp:
+    """Class to interpolate integrated orbits in time using cubic Hermite
+    interpolation of the positions and velocities, only using the stored
+    orbit at the times bracketing the requested times"""
+    def __init__(self,t,orbit,vsign=1.,nstencil=5):
+        # t: integration times, orbit: [norb,nt,phasedim] (not copied),
+        # vsign: sign of the stored velocities wrt the time derivatives
+        if len(t) < 2:
+            raise ValueError('Need at least two times to interpolate')
+        self._sindx= numpy.argsort(t)
+        self._t= numpy.asarray(t)[self._sindx]
+        self._orbit= orbit
+        self._vsign= vsign
+        self._phasedim= orbit.shape[-1]
+        # Stencil of nodes used to estimate the time derivatives of the
+        # velocities at each node
+        nt= len(self._t)
+        nstencil= min(nstencil,nt)
+        start= numpy.clip(numpy.arange(nt)-nstencil//2,0,nt-nstencil)
+        self._stencil= start[:,None]+numpy.arange(nstencil)
+        # Weights of the derivative at each node of the polynomial through
+        # the stencil (this is better conditioned than using the positions)
+        tau= self._t[self._stencil]-self._t[:,None]
+        scale= numpy.amax(numpy.fabs(tau),axis=1)[:,None]
+        self._wder= numpy.linalg.inv((tau/scale)[...,None]
+                                     **numpy.arange(nstencil))[:,1]/scale
+    def __call__(self,t):
+        """Evaluate all orbits at times t, output shape = [phasedim,nt,norb]"""
+        t= numpy.atleast_1d(t)
+        indx= numpy.clip(numpy.searchsorted(self._t,t,side='right')-1,
+                         0,len(self._t)-2)
+        # Only load the nodes that are necessary from the stored orbits
+        nodes= numpy.unique(self._stencil[numpy.concatenate((indx,indx+1))])
+        pos,vel,other= _phase_to_hermite(\
+            numpy.asarray(self._orbit[:,self._sindx[nodes]],
+                          dtype=numpy.float64),vsign=self._vsign)
+        # Interpolate the positions using the velocities and the velocities
+        # and other coordinates using their finite-difference derivatives
+        npos= pos.shape[-1]
+        vals= numpy.concatenate((vel,other),axis=-1)
+        def node_data(ii):
+            dvals= numpy.sum(self._wder[ii][...,None]
+                             *vals[:,numpy.searchsorted(nodes,
+                                                        self._stencil[ii])],
+                             axis=2)
+            nindx= numpy.searchsorted(nodes,ii)
+            return pos[:,nindx], vals[:,nindx], dvals
+        p0,v0,dv0= node_data(indx)
+        p1,v1,dv1= node_data(indx+1)
+        h= (self._t[indx+1]-self._t[indx])[:,None]
+        s= (t-self._t[indx])[:,None]/h
+        h00= (1.+2.*s)*(1.-s)**2.
+        h10= s*(1.-s)**2.*h
+        h01= s**2.*(3.-2.*s)
+        h11= s**2.*(s-1.)*h
+        ipos= h00*p0+h10*v0[...,:npos]+h01*p1+h11*v1[...,:npos]
+        ivals= h00*v0+h10*dv0+h01*v1+h11*dv1
+        out= _hermite_to_phase(ipos,ivals[...,:npos],ivals[...,npos:],
+                               self._phasedim,vsign=self._vsign)
+        return numpy.swapaxes(out,1,2)
+    def flip_velocities(self):
+        """Flip the velocities of all orbits"""
+        self._vsign*= -1.
+        return None
+
+def _phase_to_hermite(vxvv,vsign=1.):
+    """Convert phase-space coordinates [...,phasedim] to positions and
+    velocities [...,npos] that are each other's time derivative and other
+    coordinates [...,nother] (the angular momentum R vT when phi is not
+    given, which is smoother than vT); vsign= sign of the stored velocities"""
+    phasedim= vxvv.shape[-1]
+    if phasedim == 2:
+        return vxvv[...,:1], vsign*vxvv[...,1:], vxvv[...,:0]
+    elif phasedim == 3:
+        return (vxvv[...,:1],vsign*vxvv[...,1:2],
+                vsign*vxvv[...,:1]*vxvv[...,2:])
+    elif phasedim == 5:
+        return (vxvv[...,[0,3]],vsign*vxvv[...,[1,4]],
+                vsign*vxvv[...,:1]*vxvv[...,2:3])
+    R,vR,vT,phi= vxvv[...,0],vsign*vxvv[...,1],vsign*vxvv[...,2],vxvv[...,-1]
+    cp= numpy.cos(phi)
+    sp= numpy.sin(phi)
+    pos= [R*cp,R*sp]
+    vel= [vR*cp-vT*sp,vR*sp+vT*cp]
+    if phasedim == 6:
+        pos.append(vxvv[...,3])
+        vel.append(vsign*vxvv[...,4])
+    return (numpy.stack(pos,axis=-1),numpy.stack(vel,axis=-1),
+            vxvv[...,:0])
+
+def _hermite_to_phase(pos,vel,other,phasedim,vsign=1.):
+    """Inverse of _phase_to_hermite, output shape= [phasedim,...]"""
+    vel= vsign*vel
+    other= vsign*other
+    if phasedim == 2:
+        return numpy.stack((pos[...,0],vel[...,0]))
+    elif phasedim == 3:
+        return numpy.stack((pos[...,0],vel[...,0],other[...,0]/pos[...,0]))
+    elif phasedim == 5:
+        return numpy.stack((pos[...,0],vel[...,0],other[...,0]/pos[...,0],
+                            pos[...,1],vel[...,1]))
+    x,y,vx,vy= pos[...,0],pos[...,1],vel[...,0],vel[...,1]
+    phi= numpy.arctan2(y,x)
+    cp= numpy.cos(phi)
+    sp= numpy.sin(phi)
+    out= [numpy.sqrt(x**2.+y**2.),vx*cp+vy*sp,-vx*sp+vy*cp]
+    if phasedim == 6:
+        out.extend([pos[...,2],vel[...,2]])
+    out.append(phi)
+    return numpy.stack(out)
+
+class _DenseOutput:
+    """Class to evaluate the continuous solution of the adaptive C integrators
+    from the accepted steps and their dense-output coefficients"""
+    def __init__(self,tsteps,coeffs,nsteps,phasedim):
+        # tsteps: concatenated step boundaries of all orbits (nsteps+1 each)
+        # coeffs: concatenated coefficients (sum(nsteps),ncoeffs,rect. dim)
+        self._tsteps= tsteps
+        self._coeffs= coeffs
+        self._nsteps= nsteps
+        self._phasedim= phasedim
+        self._t0= tsteps[0]
+        self._tf= tsteps[nsteps[0]]
+        self._soffsets= numpy.concatenate(([0],numpy.cumsum(nsteps)))
+        # Step boundaries for all orbits mapped to a single sorted array
+        # (spacing of 4, because the last step may overshoot the end time)
+        self._keys= 4.*numpy.repeat(numpy.arange(len(nsteps)),nsteps+1)\
+            +(tsteps-self._t0)/(self._tf-self._t0)
+    def __call__(self,t):
+        """Evaluate all orbits at times t, output shape = [phasedim,nt,norb]"""
+        t= numpy.atleast_1d(t)
+        norb= len(self._nsteps)
+        orb_indx= numpy.tile(numpy.arange(norb),(len(t),1))
+        tindx= numpy.searchsorted(self._keys,
+                                  4.*orb_indx+((t-self._t0)
+                                               /(self._tf-self._t0))[:,None],
+                                  side='right')-1
+        # Clip to the steps of each orbit, step index= tsteps index - orbit
+        tindx= numpy.clip(tindx,(self._soffsets[:-1]+numpy.arange(norb)),
+                          (self._soffsets[1:]+numpy.arange(norb)-1))
+        sindx= tindx-orb_indx
+        s= ((t[:,None]-self._tsteps[tindx])
+            /(self._tsteps[tindx+1]-self._tsteps[tindx]))[...,None]
+        s1= 1.-s
+        coeffs= self._coeffs[sindx]
+        ncoeffs= coeffs.shape[-2]
+        rect= coeffs[...,ncoeffs-1,:]
+        for ii in range(ncoeffs-2,-1,-1):
+            rect= coeffs[...,ii,:]+(s if ii % 2 == 0 else s1)*rect
+        # Convert from rectangular to galpy's cylindrical coordinates
+        out= numpy.empty((self._phasedim,len(t),norb))
+        if self._phasedim > 4:
+            x,y,z,vx,vy,vz= rect.T
+        else:
+            x,y,vx,vy= rect.T
+        phi= numpy.arctan2(y,x)
+        cp= numpy.cos(phi)
+        sp= numpy.sin(phi)
+        out[0]= numpy.sqrt(x**2.+y**2.).T
+        out[1]= (vx*cp+vy*sp).T
+        out[2]= (-vx*sp+vy*cp).T
+        if self._phasedim > 4:
+            out[3]= z.T
+            out[4]= vz.T
+        if self._phasedim % 2 == 0:
+            out[-1]= phi.T
+        return out
+    def __getitem__(self,indx):
+        """Get the dense output of a subset of the orbits"""
+        indx= numpy.atleast_1d(numpy.arange(len(self._nsteps))[indx])
+        tindx= numpy.concatenate(\
+            [numpy.arange(self._soffsets[ii]+ii,self._soffsets[ii+1]+ii+1)
+             for ii in indx])
+        sindx= numpy.concatenate(\
+            [numpy.arange(self._soffsets[ii],self._soffsets[ii+1])
+             for ii in indx])
+        return _DenseOutput(self._tsteps[tindx],self._coeffs[sindx],
+                            self._nsteps[indx],self._phasedim)
+    def flip_velocities(self):
+        """Flip the velocities of all orbits in-place"""
+        self._coeffs[...,self._coeffs.shape[-1]//2:]*= -1.
+        return None
 
 def _from_name_oneobject(name,obs):
     """
@@ -6043,6 +6688,88 @@ def _parse_radec_kwargs(orb,kwargs,vel=False,dontpop=False):
         vo= orb._vo
     return (obs,ro,vo)
 
+def _parse_out_store(out,shape,dtype=numpy.float64):
+    """Parse the out= input to Orbit.integrate into a store for the orbits"""
+    if isinstance(out,(str,os.PathLike)):
+        return numpy.lib.format.open_memmap(out,mode='w+',
+                                            dtype=dtype,shape=shape)
+    elif not isinstance(out,numpy.ndarray):
+        raise TypeError('out= input to Orbit.integrate needs to be a filename or a numpy.memmap')
+    elif out.shape != shape or out.dtype != dtype \
+            or not out.flags['C_CONTIGUOUS'] or not out.flags['WRITEABLE']:
+        raise ValueError(f'out= input to Orbit.integrate needs to be a writeable, C-contiguous array with shape {shape} and dtype {dtype}')
+    return out
+
+def _parse_tfunc_grid(tfunc_grid,t,ro,vo):
+    """Parse the tfunc_grid= input to Orbit.integrate into an array of times"""
+    if tfunc_grid is None:
+        return None
+    if isinstance(tfunc_grid,(int,numpy.integer)):
+        tfunc_grid= numpy.linspace(numpy.amin(t),numpy.amax(t),tfunc_grid)
+    else:
+        tfunc_grid= numpy.array(conversion.parse_time(tfunc_grid,ro=ro,vo=vo),
+                                dtype=numpy.float64).flatten()
+    if len(tfunc_grid) < 3 or numpy.any(numpy.diff(tfunc_grid) <= 0.):
+        raise ValueError('tfunc_grid needs to be a strictly increasing grid of at least 3 times')
+    return tfunc_grid
+
+def _reduce_orbits(orb,pot,reducers,hist_bins,hist_range):
+    """Compute the summary statistics of Orbit.integrate_reduce for an integrated Orbit"""
+    R= orb.R(orb.t,use_physical=False,dontreshape=True)
+    if orb.dim() == 3:
+        z= orb.z(orb.t,use_physical=False,dontreshape=True)
+    else:
+        z= numpy.zeros_like(R)
+    reduced= numpy.empty((len(R),len(reducers)))
+    for ii,reducer in enumerate(reducers):
+        quantity, stat= reducer.split('_')
+        if quantity == 'R':
+            q= R
+        elif quantity == 'z':
+            q= z
+        elif quantity == 'r':
+            q= numpy.sqrt(R**2.+z**2.)
+        elif quantity == 'E':
+            q= orb.E(orb.t,pot=pot,use_physical=False,dontreshape=True)
+        elif quantity == 'Lz':
+            q= R*orb.vT(orb.t,use_physical=False,dontreshape=True)
+        reduced[:,ii]= {'min':numpy.amin,'max':numpy.amax,
+                        'mean':numpy.mean,'var':numpy.var}[stat](q,axis=-1)
+    if hist_bins is None:
+        return (reduced,None)
+    hist= numpy.histogram2d(R.flatten(),z.flatten(),bins=hist_bins,
+                            range=hist_range)[0]
+    return (reduced,hist)
+
+def _collect_events(tevents,ievents,yevents,event_type):
+    """Collect the events of a given type into an array [norb,nevent,1+phasedim] of (t,vxvv), padded with NaN"""
+    indx= ievents == event_type
+    nevents= numpy.sum(indx,axis=1)
+    out= numpy.full((len(tevents),numpy.amax(nevents,initial=0),
+                     1+yevents.shape[-1]),numpy.nan)
+    for ii in range(len(tevents)):
+        out[ii,:nevents[ii],0]= tevents[ii,indx[ii]]
+        out[ii,:nevents[ii],1:]= yevents[ii,indx[ii]]
+    return out
+
+def _parse_integrator_stats(stats,asQuantity,ro,vo):
+    """Convert the [norb,6] array of work counters written by the C integrators into a dictionary of arrays"""
+    out= {'nsteps':stats[:,0].astype('int'),
+          'nrejected':stats[:,1].astype('int'),
+          'nfev':stats[:,2].astype('int'),
+          'dt_min':stats[:,3],
+          'walltime':stats[:,4],
+          'thread':stats[:,5].astype('int')}
+    if asQuantity:
+        out['dt_min']= out['dt_min']*conversion.time_in_Gyr(vo,ro)*units.Gyr
+    return out
+
+def _readonly_view(arr):
+    """Return a read-only view of an array"""
+    out= arr.view()
+    out.flags.writeable= False
+    return out
+
 def _check_integrate_dt(t,dt):
     """Check that the stepsize in t is an integer x dt"""
     if dt is None:
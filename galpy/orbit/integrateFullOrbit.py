@@ -8,21 +8,30 @@ from scipy import integrate
 
 from .. import potential
 from ..potential.Potential import (_evaluatephitorques, _evaluateRforces,
-                                   _evaluatezforces)
+                                   _evaluatezforces, evaluatephi2derivs,
+                                   evaluatephizderivs, evaluateR2derivs,
+                                   evaluateRphiderivs, evaluateRzderivs,
+                                   evaluatez2derivs)
 from ..util import _load_extension_libs, galpyWarning, symplecticode
 from ..util._optional_deps import _TQDM_LOADED
 from ..util.leung_dop853 import dop853
 from ..util.multi import parallel_map
-from .integratePlanarOrbit import (_parse_integrator, _parse_scf_pot,
-                                   _parse_tol, _prep_tfuncs)
+from .integratePlanarOrbit import (_LOCKSTEP_ORDERS, _add_tfuncs,
+                                   _cost_potential, _integrate_dense_c,
+                                   _integrate_events_c, _integrate_reduce_c,
+                                   _parse_integrator, _parse_scf_pot,
+                                   _parse_schedule, _parse_tol, _prep_tfuncs)
 
 if _TQDM_LOADED:
     import tqdm
 
 _lib, _ext_loaded= _load_extension_libs.load_libgalpy()
 
-def _parse_pot(pot,potforactions=False,potfortorus=False):
+def _parse_pot(pot,potforactions=False,potfortorus=False,tfunc_grid=None):
     """Parse the potential so it can be fed to C"""
+    if isinstance(pot,potential.CompiledPotential):
+        return pot._parse('full',potforactions=potforactions,
+                          potfortorus=potfortorus,tfunc_grid=tfunc_grid)
     #Figure out what's in pot
     if not isinstance(pot,list):
         pot= [pot]
@@ -208,9 +217,9 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
                     pot_args.extend([1,hz.get('h',0.0375)])
         elif isinstance(p, potential.SpiralArmsPotential):
             pot_type.append(27)
-            pot_args.extend([len(p._Cs), p._amp, p._N, p._sin_alpha, p._tan_alpha, p._r_ref, p._phi_ref,
+            pot_args.extend([len(p._Cs0), p._amp, p._N, p._sin_alpha, p._tan_alpha, p._r_ref, p._phi_ref,
                              p._Rs, p._H, p._omega])
-            pot_args.extend(p._Cs)
+            pot_args.extend(p._Cs0)
         # 30: PerfectEllipsoidPotential, done with others above
         # 31: KGPotential
         # 32: IsothermalDiskPotential
@@ -253,25 +262,34 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
                 else:
                     pot_args.extend([0.,0.,0.])
             if p._lin_acc:
-                pot_tfuncs.extend([p._a0[0],p._a0[1],p._a0[2]])
+                _add_tfuncs(pot_args,pot_tfuncs,
+                            [p._a0[0],p._a0[1],p._a0[2]],tfunc_grid)
                 if p._rot_acc:
-                    pot_tfuncs.extend([p._x0[0],p._x0[1],p._x0[2]])
-                    pot_tfuncs.extend([p._v0[0],p._v0[1],p._v0[2]])
+                    _add_tfuncs(pot_args,pot_tfuncs,
+                                [p._x0[0],p._x0[1],p._x0[2],
+                                 p._v0[0],p._v0[1],p._v0[2]],tfunc_grid)
             if p._Omega_as_func:
                 if p._omegaz_only:
-                    pot_tfuncs.extend([p._Omega,p._Omegadot])
+                    _add_tfuncs(pot_args,pot_tfuncs,
+                                [p._Omega,p._Omegadot],tfunc_grid)
                 else:
-                    pot_tfuncs.extend([p._Omega[0],p._Omega[1],p._Omega[2],
-                                       p._Omegadot[0],p._Omegadot[1],p._Omegadot[2]])
+                    _add_tfuncs(pot_args,pot_tfuncs,
+                                [p._Omega[0],p._Omega[1],p._Omega[2],
+                                 p._Omegadot[0],p._Omegadot[1],
+                                 p._Omegadot[2]],tfunc_grid)
         elif isinstance(p,potential.NullPotential):
             pot_type.append(40)
             # No arguments, zero forces
+        elif isinstance(p,potential.JITPotential):
+            pot_type.append(41)
+            pot_args.extend(p._c_args())
         ############################## WRAPPERS ###############################
         elif isinstance(p,potential.DehnenSmoothWrapperPotential):
             pot_type.append(-1)
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -282,7 +300,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             # Not sure how to easily avoid this duplication
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -293,7 +312,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             # Not sure how to easily avoid this duplication
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -303,7 +323,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             pot_type.append(-5)
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -313,7 +334,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             pot_type.append(-6)
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -329,7 +351,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             pot_type.append(-7)
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._dens_pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -349,7 +372,8 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             # Not sure how to easily avoid this duplication
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -365,19 +389,72 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             # Not sure how to easily avoid this duplication
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
                 _parse_pot(p._pot,
-                           potforactions=potforactions,potfortorus=potfortorus)
+                           potforactions=potforactions,potfortorus=potfortorus,
+                           tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
             pot_tfuncs.extend(wrap_pot_tfuncs)
             pot_args.append(p._amp)
-            pot_tfuncs.append(p._A)
+            _add_tfuncs(pot_args,pot_tfuncs,[p._A],tfunc_grid)
     pot_type= numpy.array(pot_type,dtype=numpy.int32,order='C')
     pot_args= numpy.array(pot_args,dtype=numpy.float64,order='C')
     return (npot,pot_type,pot_args,pot_tfuncs)
 
+def _has_batched(pot):
+    """Determine whether a (list of) potential(s) contains BatchedPotential instances"""
+    if isinstance(pot,potential.CompiledPotential):
+        pot= pot.pot
+    return numpy.any([isinstance(p,potential.BatchedPotential)
+                      for p in potential.flatten([pot])])
+
+def _batched_member(pot,indx):
+    """Return the (list of) potential(s) with each BatchedPotential replaced by its indx-th member"""
+    if isinstance(pot,potential.CompiledPotential):
+        pot= pot.pot
+    if isinstance(pot,list):
+        return [_batched_member(p,indx) for p in pot]
+    elif isinstance(pot,potential.BatchedPotential):
+        return pot[indx]
+    return pot
+
+def _parse_pot_table(pot,nobj,tfunc_grid=None):
+    """Parse a potential that contains BatchedPotential instances into a table of potential arguments with one row for each of the nobj orbits, such that orbit i is integrated in the i-th member of each BatchedPotential"""
+    if isinstance(pot,potential.CompiledPotential):
+        pot= pot.pot
+    nbatch= {len(p) for p in potential.flatten([pot])
+             if isinstance(p,potential.BatchedPotential)}
+    if nbatch != {nobj}:
+        raise ValueError('The length of all BatchedPotential instances needs to be equal to the number of orbits')
+    parsed= [_parse_pot(_batched_member(pot,ii),tfunc_grid=tfunc_grid)
+             for ii in range(nobj)]
+    npot, pot_type, pot_args, pot_tfuncs= parsed[0]
+    for tnpot, tpot_type, tpot_args, tpot_tfuncs in parsed[1:]:
+        if tnpot != npot or numpy.any(tpot_type != pot_type) \
+                or len(tpot_args) != len(pot_args) \
+                or len(tpot_tfuncs) != len(pot_tfuncs):
+            raise ValueError('All members of a BatchedPotential need to be parsed into the same number of arguments for the C code (e.g., have expansion coefficients of the same size)')
+    pot_args= numpy.array([p[2] for p in parsed],dtype=numpy.float64,
+                          order='C')
+    pot_tfuncs= [f for p in parsed for f in p[3]]
+    return (npot,pot_type,pot_args,pot_tfuncs)
+
+def _orbit_cost(pot,yo,t):
+    """Estimate the relative cost of integrating orbits yo [N,6] as the inverse of their dynamical time sqrt(r/|F|) at time t (using the first member of any BatchedPotential)"""
+    if _has_batched(pot):
+        pot= _batched_member(pot,0)
+    pot= _cost_potential(pot)
+    R, z, phi= yo[:,0], yo[:,3], yo[:,5]
+    force= numpy.sqrt(_evaluateRforces(pot,R,z,phi=phi,t=t)**2.
+                      +_evaluatezforces(pot,R,z,phi=phi,t=t)**2.
+                      +(_evaluatephitorques(pot,R,z,phi=phi,t=t)/R)**2.)
+    with numpy.errstate(divide='ignore',invalid='ignore'):
+        return numpy.sqrt(force/numpy.sqrt(R**2.+z**2.))
+
 def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
-                         progressbar=True,dt=None):
+                         progressbar=True,dt=None,result=None,
+                         tfunc_grid=None,stats=None,
+                         schedule='dynamic',chunksize=None):
     """
     NAME:
        integrateFullOrbit_c
@@ -391,6 +468,12 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        rtol, atol
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
        dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+       result= (None) if set, array with shape (N,len(t),6) and dtype float64 (e.g., a numpy.memmap) that the C code writes the result to directly
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+       stats= (None) if set, array with shape (N,6) and dtype float64 that the C code writes the work done by the integrator for each orbit to: the number of (accepted) steps, the number of rejected steps, the number of force evaluations, the minimum absolute time step, the wall time, and the thread that integrated the orbit
+       schedule= ('dynamic') how to distribute the orbits over the OpenMP threads: 'dynamic' (threads take the next orbits in their input order) or 'cost' (threads take the orbits longest-first, estimating the cost of each orbit from its dynamical time at its initial position, which reduces the time that threads sit idle at the end for orbits of very different cost)
+       chunksize= (None) number of orbits that a thread takes at a time (default: 1)
+       If pot contains BatchedPotential instances of length N, orbit i is integrated in the potential with each BatchedPotential replaced by its i-th member
     OUTPUT:
        (y,err)
        y : array, shape (N,len(t),6)  or (len(t),6) if N = 1
@@ -401,20 +484,35 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        2011-11-13 - Written - Bovy (IAS)
        2018-12-21 - Adapted to allow multiple objects - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Allow one member of BatchedPotentials per orbit - agent
+       2026-10-18 - Add stats - agent
+       2026-10-18 - Add schedule and chunksize - agent
     """
     if len(yo.shape) == 1: single_obj= True
     else: single_obj= False
     yo= numpy.atleast_2d(yo)
     nobj= len(yo)
     rtol, atol= _parse_tol(rtol,atol)
-    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot)
+    if _has_batched(pot):
+        npot, pot_type, pot_args, pot_tfuncs= \
+            _parse_pot_table(pot,nobj,tfunc_grid=tfunc_grid)
+        pot_args_stride= pot_args.shape[1]
+        pot_tfuncs_stride= len(pot_tfuncs)//nobj
+    else:
+        npot, pot_type, pot_args, pot_tfuncs= \
+            _parse_pot(pot,tfunc_grid=tfunc_grid)
+        pot_args_stride= 0
+        pot_tfuncs_stride= 0
     pot_tfuncs= _prep_tfuncs(pot_tfuncs)
     int_method_c= _parse_integrator(int_method)
+    order, chunksize= _parse_schedule(schedule,chunksize,_orbit_cost,
+                                      pot,yo,t[0])
     if dt is None:
         dt= -9999.99
 
     #Set up result array
-    result= numpy.empty((nobj,len(t),6))
+    if result is None:
+        result= numpy.empty((nobj,len(t),6))
     err= numpy.zeros(nobj,dtype=numpy.int32)
 
     #Set up progressbar
@@ -437,11 +535,16 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ctypes.c_void_p,
+                               ctypes.c_int,
+                               ctypes.c_int,
                                ctypes.c_double,
                                ctypes.c_double,
                                ctypes.c_double,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_void_p,
+                               ctypes.c_int,
                                ctypes.c_int,
                                ctypes.c_void_p]
 
@@ -452,6 +555,9 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
     t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
     result= numpy.require(result,dtype=numpy.float64,requirements=['C','W'])
     err= numpy.require(err,dtype=numpy.int32,requirements=['C','W'])
+    if not stats is None:
+        stats= numpy.require(stats,dtype=numpy.float64,
+                             requirements=['C','W'])
 
     #Run the C code
     integrationFunc(ctypes.c_int(nobj),
@@ -462,11 +568,18 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                     pot_type,
                     pot_args,
                     pot_tfuncs,
+                    ctypes.c_int(pot_args_stride),
+                    ctypes.c_int(pot_tfuncs_stride),
                     ctypes.c_double(dt),
                     ctypes.c_double(rtol),
                     ctypes.c_double(atol),
                     result,
                     err,
+                    None if stats is None
+                    else stats.ctypes.data_as(ctypes.c_void_p),
+                    None if order is None
+                    else order.ctypes.data_as(ctypes.c_void_p),
+                    ctypes.c_int(chunksize),
                     ctypes.c_int(int_method_c),
                     pbar_c)
 
@@ -483,42 +596,168 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
     if single_obj: return (result[0],err[0])
     else: return (result,err)
 
-def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None): #pragma: no cover because not included in v1, uncover when included
+def integrateFullOrbit_dense_c(pot,yo,t,int_method,rtol=None,atol=None,
+                               progressbar=True,
+                               tfunc_grid=None):
     """
     NAME:
-       integrateFullOrbit_dxdv_c
+       integrateFullOrbit_dense_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit, keeping the dense output of the adaptive integrator
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], can be [N,6] or [6]
+       t - set of times at which one wants the result (the dense output covers [t[0],t[-1]])
+       int_method= 'dopr54_c' or 'dop853_c'
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (y,err,tsteps,coeffs,nsteps)
+       y : array, shape (N,len(t),6)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+       tsteps: boundaries of the accepted steps of all orbits, concatenated (sum(nsteps+1))
+       coeffs: dense-output coefficients in rectangular coordinates of all steps, concatenated (sum(nsteps),ncoeffs,6)
+       nsteps: number of accepted steps for each orbit
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_dense_c(_lib.integrateFullOrbit_dense,6,
+                              npot,pot_type,pot_args,pot_tfuncs,
+                              yo,t,int_method,rtol=rtol,atol=atol,
+                              progressbar=progressbar)
+
+def integrateFullOrbit_events_c(pot,yo,t,int_method,events,event_phi=0.,
+                                rtol=None,atol=None,progressbar=True,
+                                tfunc_grid=None):
+    """
+    NAME:
+       integrateFullOrbit_events_c
     PURPOSE:
-       C integrate an ode for a planarOrbit+phase space volume dxdv
+       C integrate an ode for a FullOrbit, finding events along the way using the dense output of the adaptive integrator
     INPUT:
        pot - Potential or list of such instances
-       yo - initial condition [q,p]
-       dyo - initial condition [dq,dp]
+       yo - initial condition [q,p], can be [N,6] or [6]
        t - set of times at which one wants the result
+       int_method= 'dopr54_c' or 'dop853_c'
+       events - list of events to find: 'peri', 'apo', 'zcross', 'phi'
+       event_phi= (0.) azimuth of the half-plane for 'phi' events
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (y,err,nevents,tevents,ievents,yevents)
+       y : array, shape (N,len(t),6)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+       nevents: number of events found for each orbit (N)
+       tevents: times of the events (N,max(nevents)), padded with NaN
+       ievents: types of the events (N,max(nevents)), padded with -1
+       yevents: phase-space positions at the events (N,max(nevents),6), padded with NaN
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_events_c(_lib.integrateFullOrbit_events,6,
+                               npot,pot_type,pot_args,pot_tfuncs,
+                               yo,t,int_method,events,event_phi=event_phi,
+                               rtol=rtol,atol=atol,progressbar=progressbar)
+
+def integrateFullOrbit_reduce_c(pot,yo,t,int_method,reducers,
+                                hist_bins=None,hist_range=None,
+                                rtol=None,atol=None,progressbar=True,dt=None,
+                                tfunc_grid=None):
+    """
+    NAME:
+       integrateFullOrbit_reduce_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit, only returning summary statistics of each orbit
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], can be [N,6] or [6]
+       t - set of times at which the orbit is sampled for the summary statistics
        int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       reducers - list of 'quantity_stat' with quantity in 'R', 'z', 'r', 'E', 'Lz' and stat in 'min', 'max', 'mean', 'var'
+       hist_bins= (None) if set, [nR,nz] number of bins of a histogram of the (R,z) occupancy of all orbits
+       hist_range= [[Rmin,Rmax],[zmin,zmax]] range of the histogram
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (reduced,hist,err)
+       reduced: array, shape (N,len(reducers))
+       hist: array, shape (nR,nz) (None if hist_bins is None)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_reduce_c(_lib.integrateFullOrbit_reduce,
+                               npot,pot_type,pot_args,pot_tfuncs,
+                               yo,t,int_method,reducers,
+                               hist_bins=hist_bins,hist_range=hist_range,
+                               rtol=rtol,atol=atol,progressbar=progressbar,
+                               dt=dt)
+
+def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
+                              progressbar=True,dt=None):
+    """
+    NAME:
+       integrateFullOrbit_dxdv_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit+phase space volume dxdv
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p] in rectangular coordinates, can be [N,6] or [6]
+       dyo - initial condition [dq,dp] in rectangular coordinates, can be [N,6] or [6]
+       t - set of times at which one wants the result
+       int_method= 'rk4_c', 'rk6_c', 'dopr54_c', or 'dop853_c'
        rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
     OUTPUT:
        (y,err)
-       y : array, shape (len(y0), len(t))
-       Array containing the value of y for each desired time in t, \
+       y : array, shape (N,len(t),12) or (len(t),12) if N = 1
+       Array containing the value of [q,p,dq,dp] in rectangular coordinates for each desired time in t, \
        with the initial value y0 in the first row.
        err: error message if not zero, 1: maximum step reduction happened for adaptive integrators
     HISTORY:
        2011-11-13 - Written - Bovy (IAS)
+       2026-10-18 - Adapted to allow multiple objects - agent
     """
+    if len(yo.shape) == 1: single_obj= True
+    else: single_obj= False
+    yo= numpy.hstack((numpy.atleast_2d(yo),numpy.atleast_2d(dyo)))
+    nobj= len(yo)
     rtol, atol= _parse_tol(rtol,atol)
     npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot)
     pot_tfuncs= _prep_tfuncs(pot_tfuncs)
     int_method_c= _parse_integrator(int_method)
-    yo= numpy.concatenate((yo,dyo))
+    if dt is None:
+        dt= -9999.99
 
     #Set up result array
-    result= numpy.empty((len(t),12))
-    err= ctypes.c_int(0)
+    result= numpy.empty((nobj,len(t),12))
+    err= numpy.zeros(nobj,dtype=numpy.int32)
+
+    #Set up progressbar
+    progressbar*= _TQDM_LOADED
+    if nobj > 1 and progressbar:
+        pbar= tqdm.tqdm(total=nobj,leave=False)
+        pbar_func_ctype= ctypes.CFUNCTYPE(None)
+        pbar_c= pbar_func_ctype(pbar.update)
+    else: # pragma: no cover
+        pbar_c= None
 
     #Set up the C code
     ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
     integrationFunc= _lib.integrateFullOrbit_dxdv
-    integrationFunc.argtypes= [ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+    integrationFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ctypes.c_int,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ctypes.c_int,
@@ -527,9 +766,11 @@ def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None): #pra
                                ctypes.c_void_p,
                                ctypes.c_double,
                                ctypes.c_double,
+                               ctypes.c_double,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.c_int]
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ctypes.c_void_p]
 
     #Array requirements, first store old order
     f_cont= [yo.flags['F_CONTIGUOUS'],
@@ -537,28 +778,37 @@ def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None): #pra
     yo= numpy.require(yo,dtype=numpy.float64,requirements=['C','W'])
     t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
     result= numpy.require(result,dtype=numpy.float64,requirements=['C','W'])
+    err= numpy.require(err,dtype=numpy.int32,requirements=['C','W'])
 
     #Run the C code
-    integrationFunc(yo,
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
                     ctypes.c_int(len(t)),
                     t,
                     ctypes.c_int(npot),
                     pot_type,
                     pot_args,
                     pot_tfuncs,
-                    ctypes.c_double(rtol),ctypes.c_double(atol),
+                    ctypes.c_double(dt),
+                    ctypes.c_double(rtol),
+                    ctypes.c_double(atol),
                     result,
-                    ctypes.byref(err),
-                    ctypes.c_int(int_method_c))
+                    err,
+                    ctypes.c_int(int_method_c),
+                    pbar_c)
+
+    if nobj > 1 and progressbar:
+        pbar.close()
 
-    if int(err.value) == -10: #pragma: no cover
+    if numpy.any(err == -10): #pragma: no cover
         raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
     #Reset input arrays
     if f_cont[0]: yo= numpy.asfortranarray(yo)
     if f_cont[1]: t= numpy.asfortranarray(t)
 
-    return (result,err.value)
+    if single_obj: return (result[0],err[0])
+    else: return (result,err)
 
 def integrateFullOrbit(pot,yo,t,int_method,rtol=None,atol=None,
                        numcores=1,progressbar=True,dt=None):
@@ -571,11 +821,11 @@ def integrateFullOrbit(pot,yo,t,int_method,rtol=None,atol=None,
        pot - Potential or list of such instances
        yo - initial condition [q,p], shape [N,5] or [N,6]
        t - set of times at which one wants the result
-       int_method= 'leapfrog', 'odeint', or 'dop853'
+       int_method= 'leapfrog', 'odeint', 'dop853', or 'leapfrog_lockstep', 'symplec4_lockstep', 'symplec6_lockstep' (which integrate all orbits in lockstep, evaluating the forces for all orbits at once)
        rtol, atol= tolerances (not always used...)
        numcores= (1) number of cores to use for multi-processing
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
-       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based and lockstep integrators)
     OUTPUT:
        (y,err)
        y : array, shape (N,len(t),5/6)
@@ -586,6 +836,7 @@ def integrateFullOrbit(pot,yo,t,int_method,rtol=None,atol=None,
        2010-08-01 - Written - Bovy (NYU)
        2019-04-09 - Adapted to allow multiple objects and parallel mapping - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Added lockstep integrators - agent
     """
     nophi= False
     if not int_method.lower() == 'dop853' and not int_method == 'odeint':
@@ -593,7 +844,33 @@ def integrateFullOrbit(pot,yo,t,int_method,rtol=None,atol=None,
             nophi= True
             #We hack this by putting in a dummy phi=0
             yo= numpy.pad(yo,((0,0),(0,1)),'constant',constant_values=0)
-    if int_method.lower() == 'leapfrog':
+    if int_method.lower() in _LOCKSTEP_ORDERS:
+        rtol, atol= _parse_tol(rtol,atol)
+        #go to the rectangular frame
+        this_yo= numpy.array([yo[:,0]*numpy.cos(yo[:,5]),
+                              yo[:,0]*numpy.sin(yo[:,5]),
+                              yo[:,3],
+                              yo[:,1]*numpy.cos(yo[:,5])
+                                  -yo[:,2]*numpy.sin(yo[:,5]),
+                              yo[:,2]*numpy.cos(yo[:,5])
+                                  +yo[:,1]*numpy.sin(yo[:,5]),
+                              yo[:,4]]).T
+        #integrate all orbits at once
+        tmp_out= symplecticode.symplec_lockstep(\
+            _rectForce_lockstep,this_yo,t,
+            order=_LOCKSTEP_ORDERS[int_method.lower()],dt=dt,args=(pot,),
+            rtol=rtol,atol=atol)
+        #go back to the cylindrical frame
+        R= numpy.sqrt(tmp_out[:,:,0]**2.+tmp_out[:,:,1]**2.)
+        phi= numpy.arctan2(tmp_out[:,:,1],tmp_out[:,:,0])
+        out= numpy.empty_like(tmp_out)
+        out[:,:,0]= R
+        out[:,:,1]= tmp_out[:,:,3]*numpy.cos(phi)+tmp_out[:,:,4]*numpy.sin(phi)
+        out[:,:,2]= tmp_out[:,:,4]*numpy.cos(phi)-tmp_out[:,:,3]*numpy.sin(phi)
+        out[:,:,3]= tmp_out[:,:,2]
+        out[:,:,4]= tmp_out[:,:,5]
+        out[:,:,5]= phi
+    elif int_method.lower() == 'leapfrog':
         if rtol is None: rtol= 1e-8
         def integrate_for_map(vxvv):
             #go to the rectangular frame
@@ -667,15 +944,119 @@ def integrateFullOrbit(pot,yo,t,int_method,rtol=None,atol=None,
         def integrate_for_map(vxvv):
             return integrateFullOrbit_c(pot,numpy.copy(vxvv),
                                         t,int_method,dt=dt)[0]
-    if len(yo) == 1: # Can't map a single value...
+    if int_method.lower() in _LOCKSTEP_ORDERS:
+        pass # all orbits were integrated at once above
+    elif len(yo) == 1: # Can't map a single value...
         out= numpy.atleast_3d(integrate_for_map(yo[0]).T).T
     else:
-        out= numpy.array(parallel_map(integrate_for_map,yo,numcores=numcores,
-                                       progressbar=progressbar))
+        out= parallel_map(integrate_for_map,yo,numcores=numcores,
+                          progressbar=progressbar,as_array=True)
     if nophi:
         out= out[:,:,:5]
     return out, numpy.zeros(len(yo))
 
+def integrateFullOrbit_dxdv(pot,yo,dyo,t,int_method,
+                            rectIn,rectOut,
+                            rtol=None,atol=None,
+                            progressbar=True,dt=None,numcores=1):
+    """
+    NAME:
+       integrateFullOrbit_dxdv
+    PURPOSE:
+       Integrate an ode for a FullOrbit+phase space volume dxdv
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], shape [N,6]
+       dyo - initial condition [dq,dp], shape [N,6]
+       t - set of times at which one wants the result
+       int_method= 'odeint', 'dop853', 'dopr54_c', 'dop853_c', 'rk4_c', 'rk6_c'
+       rectIn= (False) if True, input dyo is in rectangular coordinates
+       rectOut= (False) if True, output dyo is in rectangular coordinates
+       rtol, atol= tolerances (not always used...)
+       numcores= (1) number of cores to use for multi-processing (Python integrators only; the C integrators use OpenMP)
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+    OUTPUT:
+       (y,err)
+       y : array, shape (N,len(t),12)
+       Array containing the value of y for each desired time in t, \
+       with the initial value y0 in the first row.
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    #go to the rectangular frame
+    cp= numpy.cos(yo[:,5])
+    sp= numpy.sin(yo[:,5])
+    this_yo= numpy.array([yo[:,0]*cp,
+                          yo[:,0]*sp,
+                          yo[:,3],
+                          yo[:,1]*cp-yo[:,2]*sp,
+                          yo[:,2]*cp+yo[:,1]*sp,
+                          yo[:,4]]).T
+    if not rectIn:
+        this_dyo= numpy.array([cp*dyo[:,0]-yo[:,0]*sp*dyo[:,5],
+                               sp*dyo[:,0]+yo[:,0]*cp*dyo[:,5],
+                               dyo[:,3],
+                               -(yo[:,1]*sp+yo[:,2]*cp)*dyo[:,5]
+                                 +cp*dyo[:,1]-sp*dyo[:,2],
+                               (yo[:,1]*cp-yo[:,2]*sp)*dyo[:,5]
+                                 +sp*dyo[:,1]+cp*dyo[:,2],
+                               dyo[:,4]]).T
+    else:
+        this_dyo= dyo
+    if '_c' in int_method:
+        out, err= integrateFullOrbit_dxdv_c(pot,this_yo,this_dyo,t,
+                                            int_method,rtol=rtol,atol=atol,
+                                            progressbar=progressbar,dt=dt)
+    else:
+        if rtol is None: rtol= 1e-8
+        if int_method.lower() == 'dop853':
+            integrator= dop853
+            extra_kwargs= {}
+        else:
+            integrator= integrate.odeint
+            extra_kwargs= {'rtol':rtol}
+        def integrate_for_map(vxvv):
+            return integrator(_EOM_dxdv,vxvv,t=t,args=(pot,),
+                              **extra_kwargs)
+        this_yo= numpy.hstack((this_yo,this_dyo))
+        if len(this_yo) == 1: # Can't map a single value...
+            out= numpy.atleast_3d(integrate_for_map(this_yo[0]).T).T
+        else:
+            out= parallel_map(integrate_for_map,this_yo,
+                              progressbar=progressbar,
+                              numcores=numcores,as_array=True)
+        err= numpy.zeros(len(yo))
+    #go back to the cylindrical frame
+    R= numpy.sqrt(out[...,0]**2.+out[...,1]**2.)
+    phi= numpy.arccos(out[...,0]/R)
+    phi[(out[...,1] < 0.)]= 2.*numpy.pi-phi[(out[...,1] < 0.)]
+    cp= numpy.cos(phi)
+    sp= numpy.sin(phi)
+    vR= out[...,3]*cp+out[...,4]*sp
+    vT= out[...,4]*cp-out[...,3]*sp
+    z= numpy.copy(out[...,2])
+    out[...,2]= vT
+    out[...,3]= z
+    out[...,4]= out[...,5]
+    out[...,0]= R
+    out[...,1]= vR
+    out[...,5]= phi
+    if not rectOut:
+        dR= cp*out[...,6]+sp*out[...,7]
+        dphi= (cp*out[...,7]-sp*out[...,6])/R
+        dvR= cp*out[...,9]+sp*out[...,10]+vT*dphi
+        dvT= cp*out[...,10]-sp*out[...,9]-vR*dphi
+        dz= numpy.copy(out[...,8])
+        out[...,6]= dR
+        out[...,7]= dvR
+        out[...,8]= dvT
+        out[...,9]= dz
+        out[...,10]= out[...,11]
+        out[...,11]= dphi
+    return out, err
+
 def _RZEOM(y,t,pot,l2):
     """
     NAME:
@@ -753,3 +1134,83 @@ def _rectForce(x,pot,t=0.):
     return numpy.array([cosphi*Rforce-1./R*sinphi*phitorque,
                      sinphi*Rforce+1./R*cosphi*phitorque,
                      _evaluatezforces(pot,R,x[2],phi=phi,t=t)])
+
+def _rectForce_lockstep(x,pot,t=0.):
+    """
+    NAME:
+       _rectForce_lockstep
+    PURPOSE:
+       returns the force in the rectangular frame for many objects at once
+    INPUT:
+       x - current positions, shape (3,N)
+       t - current time
+       pot - (list of) Potential instance(s)
+    OUTPUT:
+       force, shape (3,N)
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    #x is rectangular so calculate R and phi
+    R= numpy.sqrt(x[0]**2.+x[1]**2.)
+    phi= numpy.arctan2(x[1],x[0])
+    sinphi= x[1]/R
+    cosphi= x[0]/R
+    #calculate forces
+    Rforce= _evaluateRforces(pot,R,x[2],phi=phi,t=t)
+    phitorque= _evaluatephitorques(pot,R,x[2],phi=phi,t=t)
+    return numpy.array([cosphi*Rforce-1./R*sinphi*phitorque,
+                        sinphi*Rforce+1./R*cosphi*phitorque,
+                        _evaluatezforces(pot,R,x[2],phi=phi,t=t)])
+
+def _EOM_dxdv(x,t,pot):
+    """
+    NAME:
+       _EOM_dxdv
+    PURPOSE:
+       implements the EOM, i.e., the right-hand side of the differential
+       equation, for integrating phase space differences, rectangular
+    INPUT:
+       x - current phase-space position
+       t - current time
+       pot - (list of) Potential instance(s)
+    OUTPUT:
+       dy/dt
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    #x is rectangular so calculate R and phi
+    R= numpy.sqrt(x[0]**2.+x[1]**2.)
+    phi= numpy.arccos(x[0]/R)
+    sinphi= x[1]/R
+    cosphi= x[0]/R
+    if x[1] < 0.: phi= 2.*numpy.pi-phi
+    #calculate forces and second derivatives
+    Rforce= _evaluateRforces(pot,R,x[2],phi=phi,t=t)
+    phitorque= _evaluatephitorques(pot,R,x[2],phi=phi,t=t)
+    zforce= _evaluatezforces(pot,R,x[2],phi=phi,t=t)
+    R2deriv= evaluateR2derivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    z2deriv= evaluatez2derivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    Rzderiv= evaluateRzderivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    phi2deriv= evaluatephi2derivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    Rphideriv= evaluateRphiderivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    phizderiv= evaluatephizderivs(pot,R,x[2],phi=phi,t=t,use_physical=False)
+    #Transform the cylindrical Hessian to the rectangular frame
+    dudx= numpy.array([[cosphi,sinphi,0.],
+                       [-sinphi/R,cosphi/R,0.],
+                       [0.,0.,1.]])
+    hess= numpy.dot(dudx.T,numpy.dot(numpy.array([[R2deriv,Rphideriv,Rzderiv],
+                                                  [Rphideriv,phi2deriv,phizderiv],
+                                                  [Rzderiv,phizderiv,z2deriv]]),
+                                     dudx))
+    hess[:2,:2]-= Rforce/R*numpy.array([[sinphi**2.,-sinphi*cosphi],
+                                        [-sinphi*cosphi,cosphi**2.]])
+    hess[:2,:2]-= phitorque/R**2.*numpy.array([[2.*sinphi*cosphi,
+                                                sinphi**2.-cosphi**2.],
+                                               [sinphi**2.-cosphi**2.,
+                                                -2.*sinphi*cosphi]])
+    return numpy.hstack(([x[3],x[4],x[5],
+                          cosphi*Rforce-1./R*sinphi*phitorque,
+                          sinphi*Rforce+1./R*cosphi*phitorque,
+                          zforce],
+                         x[9:12],
+                         -numpy.dot(hess,x[6:9])))
@@ -13,16 +13,20 @@ from ..util._optional_deps import _TQDM_LOADED
 from ..util.leung_dop853 import dop853
 from ..util.multi import parallel_map
 from .integrateFullOrbit import _parse_pot as _parse_pot_full
-from .integratePlanarOrbit import _parse_integrator, _parse_tol, _prep_tfuncs
+from .integratePlanarOrbit import (_LOCKSTEP_ORDERS, _cost_potential,
+                                   _parse_integrator, _parse_schedule,
+                                   _parse_tol, _prep_tfuncs)
 
 if _TQDM_LOADED:
     import tqdm
 
 _lib, _ext_loaded= _load_extension_libs.load_libgalpy()
 
-def _parse_pot(pot):
+def _parse_pot(pot,tfunc_grid=None):
     """Parse the potential so it can be fed to C"""
     from .integrateFullOrbit import _parse_scf_pot
+    if isinstance(pot,potential.CompiledPotential):
+        return pot._parse('linear',tfunc_grid=tfunc_grid)
 
     #Figure out what's in pot
     if not isinstance(pot,list):
@@ -89,7 +93,7 @@ def _parse_pot(pot):
             pot_args.extend([p._amp*p._sigma2/p._H,2.*p._H])
         # All other potentials can be handled in the same way as follows:
         elif isinstance(p,verticalPotential):
-            _,pt,pa,ptf= _parse_pot_full(p._Pot)
+            _,pt,pa,ptf= _parse_pot_full(p._Pot,tfunc_grid=tfunc_grid)
             pot_type.extend(pt)
             pot_args.extend(pa)
             pot_tfuncs.extend(ptf)
@@ -99,8 +103,18 @@ def _parse_pot(pot):
     pot_args= numpy.array(pot_args,dtype=numpy.float64,order='C')
     return (npot,pot_type,pot_args,pot_tfuncs)
 
+def _orbit_cost(pot,yo,t):
+    """Estimate the relative cost of integrating linear orbits yo [N,2] as the inverse of their dynamical time sqrt(|x|/|F|) at time t"""
+    pot= _cost_potential(pot)
+    x= yo[:,0]
+    force= numpy.fabs(_evaluatelinearForces(pot,x,t=t))
+    with numpy.errstate(divide='ignore',invalid='ignore'):
+        return numpy.sqrt(force/numpy.fabs(x))
+
 def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
-                           progressbar=True,dt=None):
+                           progressbar=True,dt=None,result=None,
+                           tfunc_grid=None,stats=None,
+                           schedule='dynamic',chunksize=None):
     """
     NAME:
        integrateLinearOrbit_c
@@ -114,6 +128,11 @@ def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        rtol, atol
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
        dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+       result= (None) if set, array with shape (N,len(t),2) and dtype float64 (e.g., a numpy.memmap) that the C code writes the result to directly
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+       stats= (None) if set, array with shape (N,6) and dtype float64 that the C code writes the work done by the integrator for each orbit to: the number of (accepted) steps, the number of rejected steps, the number of force evaluations, the minimum absolute time step, the wall time, and the thread that integrated the orbit
+       schedule= ('dynamic') how to distribute the orbits over the OpenMP threads: 'dynamic' (threads take the next orbits in their input order) or 'cost' (threads take the orbits longest-first, estimating the cost of each orbit from its dynamical time at its initial position, which reduces the time that threads sit idle at the end for orbits of very different cost)
+       chunksize= (None) number of orbits that a thread takes at a time (default: 1)
     OUTPUT:
        (y,err)
        y : array, shape (N,len(t),2) or (len(y0),len(t)) if N=1
@@ -124,20 +143,25 @@ def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        2018-10-06 - Written - Bovy (UofT)
        2018-10-14 - Adapted to allow multiple orbits to be integrated at once - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Add stats - agent
+       2026-10-18 - Add schedule and chunksize - agent
     """
     if len(yo.shape) == 1: single_obj= True
     else: single_obj= False
     yo= numpy.atleast_2d(yo)
     nobj= len(yo)
     rtol, atol= _parse_tol(rtol,atol)
-    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot)
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
     pot_tfuncs= _prep_tfuncs(pot_tfuncs)
     int_method_c= _parse_integrator(int_method)
+    order, chunksize= _parse_schedule(schedule,chunksize,_orbit_cost,
+                                      pot,yo,t[0])
     if dt is None:
         dt= -9999.99
 
     #Set up result array
-    result= numpy.empty((nobj,len(t),2))
+    if result is None:
+        result= numpy.empty((nobj,len(t),2))
     err= numpy.zeros(nobj,dtype=numpy.int32)
 
     #Set up progressbar
@@ -165,6 +189,9 @@ def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                                ctypes.c_double,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_void_p,
+                               ctypes.c_int,
                                ctypes.c_int,
                                ctypes.c_void_p]
 
@@ -175,6 +202,9 @@ def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
     t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
     result= numpy.require(result,dtype=numpy.float64,requirements=['C','W'])
     err= numpy.require(err,dtype=numpy.int32,requirements=['C','W'])
+    if not stats is None:
+        stats= numpy.require(stats,dtype=numpy.float64,
+                             requirements=['C','W'])
 
     #Run the C code
     integrationFunc(ctypes.c_int(nobj),
@@ -189,6 +219,11 @@ def integrateLinearOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                     ctypes.c_double(rtol),ctypes.c_double(atol),
                     result,
                     err,
+                    None if stats is None
+                    else stats.ctypes.data_as(ctypes.c_void_p),
+                    None if order is None
+                    else order.ctypes.data_as(ctypes.c_void_p),
+                    ctypes.c_int(chunksize),
                     ctypes.c_int(int_method_c),
                     pbar_c)
 
@@ -217,11 +252,11 @@ def integrateLinearOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
        pot - Potential or list of such instances
        yo - initial condition [q,p], shape [N,2]
        t - set of times at which one wants the result
-       int_method= 'leapfrog', 'odeint', or 'dop853'
+       int_method= 'leapfrog', 'odeint', 'dop853', or 'leapfrog_lockstep', 'symplec4_lockstep', 'symplec6_lockstep' (which integrate all orbits in lockstep, evaluating the forces for all orbits at once)
        rtol, atol= tolerances (not always used...)
        numcores= (1) number of cores to use for multi-processing
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
-       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based and lockstep integrators)
     OUTPUT:
        (y,err)
        y : array, shape (N,len(t),2)
@@ -232,8 +267,17 @@ def integrateLinearOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
        2010-07-13- Written - Bovy (NYU)
        2019-04-08 - Adapted to allow multiple orbits to be integrated at once and moved to integrateLinearOrbit.py - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Added lockstep integrators - agent
     """
-    if int_method.lower() == 'leapfrog':
+    if int_method.lower() in _LOCKSTEP_ORDERS:
+        rtol, atol= _parse_tol(rtol,atol)
+        # Integrate all orbits at once
+        return (symplecticode.symplec_lockstep(\
+                    lambda x,t=0.: _evaluatelinearForces(pot,x,t=t),
+                    yo,t,order=_LOCKSTEP_ORDERS[int_method.lower()],dt=dt,
+                    rtol=rtol,atol=atol),
+                numpy.zeros(len(yo)))
+    elif int_method.lower() == 'leapfrog':
         if rtol is None: rtol= 1e-8
         def integrate_for_map(vxvv):
             return symplecticode.leapfrog(lambda x,t=t: \
@@ -255,8 +299,8 @@ def integrateLinearOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
     if len(yo) == 1: # Can't map a single value...
         return numpy.atleast_3d(integrate_for_map(yo[0]).T).T, 0
     else:
-        return (numpy.array(parallel_map(integrate_for_map,yo,numcores=numcores,
-                                          progressbar=progressbar)),
+        return (parallel_map(integrate_for_map,yo,numcores=numcores,
+                             progressbar=progressbar,as_array=True),
                 numpy.zeros(len(yo)))
 
 def _linearEOM(y,t,pot):
@@ -24,8 +24,19 @@ if _NUMBA_LOADED:
 
 _lib, _ext_loaded= _load_extension_libs.load_libgalpy()
 
-def _parse_pot(pot):
+# Initial number of steps in the dense-output buffer of a single orbit and
+# total size (in number of doubles) of the dense-output buffer of a chunk
+_DENSE_NMAX= 256
+_DENSE_BUFSIZE= 2**23
+_EVENTS_NMAX= 64
+_EVENT_TYPES= {'peri':0,'apo':1,'zcross':2,'phi':3}
+_REDUCE_QUANTITIES= {'R':0,'z':1,'r':2,'E':3,'Lz':4}
+_REDUCE_STATS= {'min':0,'max':1,'mean':2,'var':3}
+
+def _parse_pot(pot,tfunc_grid=None):
     """Parse the potential so it can be fed to C"""
+    if isinstance(pot,potential.CompiledPotential):
+        return pot._parse('planar',tfunc_grid=tfunc_grid)
     #Figure out what's in pot
     if not isinstance(pot,list):
         pot= [pot]
@@ -46,10 +57,11 @@ def _parse_pot(pot):
         or isinstance(p,parentWrapperPotential):
             if not isinstance(p,parentWrapperPotential):
                 wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
-                    _parse_pot(potential.toPlanarPotential(p._Pot._pot))
+                    _parse_pot(potential.toPlanarPotential(p._Pot._pot),
+                               tfunc_grid=tfunc_grid)
             else:
                 wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
-                    _parse_pot(p._pot)
+                    _parse_pot(p._pot,tfunc_grid=tfunc_grid)
         if (isinstance(p,planarPotentialFromRZPotential)
             or isinstance(p,planarPotentialFromFullPotential) ) \
                  and isinstance(p._Pot,potential.LogarithmicHaloPotential):
@@ -281,6 +293,11 @@ def _parse_pot(pot):
         elif isinstance(p,planarPotentialFromRZPotential) \
              and isinstance(p._Pot,potential.NullPotential):
             pot_type.append(40)
+        elif (isinstance(p,planarPotentialFromFullPotential) \
+                  or isinstance(p,planarPotentialFromRZPotential)) \
+             and isinstance(p._Pot,potential.JITPotential):
+            pot_type.append(41)
+            pot_args.extend(p._Pot._c_args())
         ############################## WRAPPERS ###############################
         elif ((isinstance(p,planarPotentialFromFullPotential) or isinstance(p,planarPotentialFromRZPotential)) \
               and isinstance(p._Pot,potential.DehnenSmoothWrapperPotential)) \
@@ -337,7 +354,8 @@ def _parse_pot(pot):
                 p= p._Pot
             pot_type.append(-6)
             wrap_npot, wrap_pot_type, wrap_pot_args, wrap_pot_tfuncs= \
-                    _parse_pot(potential.toPlanarPotential(p._pot))
+                    _parse_pot(potential.toPlanarPotential(p._pot),
+                               tfunc_grid=tfunc_grid)
             pot_args.append(wrap_npot)
             pot_type.extend(wrap_pot_type)
             pot_args.extend(wrap_pot_args)
@@ -365,7 +383,7 @@ def _parse_pot(pot):
             pot_args.extend(wrap_pot_args)
             pot_tfuncs.extend(wrap_pot_tfuncs)
             pot_args.append(p._amp)
-            pot_tfuncs.append(p._A)
+            _add_tfuncs(pot_args,pot_tfuncs,[p._A],tfunc_grid)
     pot_type= numpy.array(pot_type,dtype=numpy.int32,order='C')
     pot_args= numpy.array(pot_args,dtype=numpy.float64,order='C')
     return (npot,pot_type,pot_args,pot_tfuncs)
@@ -385,10 +403,19 @@ def _parse_integrator(int_method):
         int_method_c= 5
     elif int_method.lower() == 'dop853_c':
         int_method_c= 6
+    elif int_method.lower() == 'ttleapfrog_c':
+        int_method_c= 7
+    elif int_method.lower() == 'ttsymplec4_c':
+        int_method_c= 8
     else:
         int_method_c= 0
     return int_method_c
 
+# Orders of the symplectic integrators that advance all orbits in lockstep
+_LOCKSTEP_ORDERS= {'leapfrog_lockstep': 2,
+                   'symplec4_lockstep': 4,
+                   'symplec6_lockstep': 6}
+
 def _parse_tol(rtol,atol):
     """Parse the tolerance keywords"""
     #Process atol and rtol
@@ -402,6 +429,38 @@ def _parse_tol(rtol,atol):
         atol= numpy.log(atol)
     return (rtol,atol)
 
+def _parse_schedule(schedule,chunksize,orbit_cost,*cost_args):
+    """Parse the scheduling of the orbits over the OpenMP threads to pass to C: returns the order in which the orbits are integrated (None: input order) and the number of orbits that each thread takes at a time (0: default); for schedule='cost', the orbits are integrated longest-first, estimating the cost of each orbit as orbit_cost(*cost_args)"""
+    if schedule == 'dynamic':
+        order= None
+    elif schedule == 'cost':
+        cost= numpy.nan_to_num(orbit_cost(*cost_args),nan=numpy.inf)
+        order= numpy.argsort(-cost,kind='stable').astype(numpy.int32)
+    else:
+        raise ValueError(f"schedule={schedule} is not a valid schedule; use 'dynamic' or 'cost'")
+    if chunksize is None:
+        chunksize= 0
+    elif int(chunksize) < 1:
+        raise ValueError('chunksize must be a positive integer')
+    return (order,int(chunksize))
+
+def _cost_potential(pot):
+    """Return the part of a potential that is used to estimate the cost of integrating orbits: the non-dissipative forces (in case of a CompiledPotential, those of the potential it represents)"""
+    from ..potential.DissipativeForce import _isDissipative
+    if isinstance(pot,potential.CompiledPotential):
+        pot= pot.pot
+    return [p for p in potential.flatten([pot])
+            if not _isDissipative(getattr(p,'_Pot',p))]
+
+def _orbit_cost(pot,yo,t):
+    """Estimate the relative cost of integrating planar orbits yo [N,4] as the inverse of their dynamical time sqrt(R/|F|) at time t"""
+    pot= _cost_potential(pot)
+    R, phi= yo[:,0], yo[:,3]
+    force= numpy.sqrt(_evaluateplanarRforces(pot,R,phi=phi,t=t)**2.
+                      +(_evaluateplanarphitorques(pot,R,phi=phi,t=t)/R)**2.)
+    with numpy.errstate(divide='ignore',invalid='ignore'):
+        return numpy.sqrt(force/R)
+
 def _parse_scf_pot(p,extra_amp=1.):
     # Stand-alone parser for SCF, bc re-used
     isNonAxi= p.isNonAxi
@@ -413,6 +472,17 @@ def _parse_scf_pot(p,extra_amp=1.):
     pot_args.extend([-1.,0,0,0,0,0,0])
     return (24,pot_args,[]) # latter is pot_tfuncs
 
+def _add_tfuncs(pot_args,pot_tfuncs,tfuncs,tfunc_grid):
+    """Add a potential's functions of time to pot_tfuncs or, if tfunc_grid is set, add them to pot_args tabulated on tfunc_grid (to be interpolated with splines in C)"""
+    if tfunc_grid is None:
+        pot_tfuncs.extend(tfuncs)
+        return None
+    for tfunc in tfuncs:
+        pot_args.append(len(tfunc_grid))
+        pot_args.extend(tfunc_grid)
+        pot_args.extend([tfunc(t) for t in tfunc_grid])
+    return None
+
 def _prep_tfuncs(pot_tfuncs):
     if len(pot_tfuncs) == 0:
         pot_tfuncs= None # NULL
@@ -430,7 +500,9 @@ def _prep_tfuncs(pot_tfuncs):
     return pot_tfuncs
 
 def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
-                           progressbar=True,dt=None):
+                           progressbar=True,dt=None,result=None,
+                           tfunc_grid=None,stats=None,
+                           schedule='dynamic',chunksize=None):
     """
     NAME:
        integratePlanarOrbit_c
@@ -444,6 +516,11 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        rtol, atol
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
        dt= (None) force integrator to use this stepsize (default is to automatically determine one)
+       result= (None) if set, array with shape (N,len(t),4) and dtype float64 (e.g., a numpy.memmap) that the C code writes the result to directly
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+       stats= (None) if set, array with shape (N,6) and dtype float64 that the C code writes the work done by the integrator for each orbit to: the number of (accepted) steps, the number of rejected steps, the number of force evaluations, the minimum absolute time step, the wall time, and the thread that integrated the orbit
+       schedule= ('dynamic') how to distribute the orbits over the OpenMP threads: 'dynamic' (threads take the next orbits in their input order) or 'cost' (threads take the orbits longest-first, estimating the cost of each orbit from its dynamical time at its initial position, which reduces the time that threads sit idle at the end for orbits of very different cost)
+       chunksize= (None) number of orbits that a thread takes at a time (default: 1)
    OUTPUT:
        (y,err)
        y : array, shape (len(y0),len(t),4)
@@ -454,20 +531,25 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        2011-10-03 - Written - Bovy (IAS)
        2018-12-20 - Adapted to allow multiple objects - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Add stats - agent
+       2026-10-18 - Add schedule and chunksize - agent
     """
     if len(yo.shape) == 1: single_obj= True
     else: single_obj= False
     yo= numpy.atleast_2d(yo)
     nobj= len(yo)
     rtol, atol= _parse_tol(rtol,atol)
-    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot)
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
     pot_tfuncs= _prep_tfuncs(pot_tfuncs)
     int_method_c= _parse_integrator(int_method)
+    order, chunksize= _parse_schedule(schedule,chunksize,_orbit_cost,
+                                      pot,yo,t[0])
     if dt is None:
         dt= -9999.99
 
     #Set up result array
-    result= numpy.empty((nobj,len(t),4))
+    if result is None:
+        result= numpy.empty((nobj,len(t),4))
     err= numpy.zeros(nobj,dtype=numpy.int32)
 
     #Set up progressbar
@@ -495,6 +577,9 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                                ctypes.c_double,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_void_p,
+                               ctypes.c_int,
                                ctypes.c_int,
                                ctypes.c_void_p]
 
@@ -505,6 +590,9 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
     t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
     result= numpy.require(result,dtype=numpy.float64,requirements=['C','W'])
     err= numpy.require(err,dtype=numpy.int32,requirements=['C','W'])
+    if not stats is None:
+        stats= numpy.require(stats,dtype=numpy.float64,
+                             requirements=['C','W'])
 
     #Run the C code
     integrationFunc(ctypes.c_int(nobj),
@@ -520,6 +608,11 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
                     ctypes.c_double(atol),
                     result,
                     err,
+                    None if stats is None
+                    else stats.ctypes.data_as(ctypes.c_void_p),
+                    None if order is None
+                    else order.ctypes.data_as(ctypes.c_void_p),
+                    ctypes.c_int(chunksize),
                     ctypes.c_int(int_method_c),
                     pbar_c)
 
@@ -536,6 +629,434 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
     if single_obj: return (result[0],err[0])
     else: return (result,err)
 
+def integratePlanarOrbit_dense_c(pot,yo,t,int_method,rtol=None,atol=None,
+                                 progressbar=True,
+                                 tfunc_grid=None):
+    """
+    NAME:
+       integratePlanarOrbit_dense_c
+    PURPOSE:
+       C integrate an ode for a planarOrbit, keeping the dense output of the adaptive integrator
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], can be [N,4] or [4]
+       t - set of times at which one wants the result (the dense output covers [t[0],t[-1]])
+       int_method= 'dopr54_c' or 'dop853_c'
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (y,err,tsteps,coeffs,nsteps)
+       y : array, shape (N,len(t),4)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+       tsteps: boundaries of the accepted steps of all orbits, concatenated (sum(nsteps+1))
+       coeffs: dense-output coefficients in rectangular coordinates of all steps, concatenated (sum(nsteps),ncoeffs,4)
+       nsteps: number of accepted steps for each orbit
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_dense_c(_lib.integratePlanarOrbit_dense,4,
+                              npot,pot_type,pot_args,pot_tfuncs,
+                              yo,t,int_method,rtol=rtol,atol=atol,
+                              progressbar=progressbar)
+
+def _integrate_dense_c(integrationFunc,dim,npot,pot_type,pot_args,pot_tfuncs,
+                       yo,t,int_method,rtol=None,atol=None,progressbar=True):
+    """Run a C dense-output integration function in chunks of orbits, only keeping the accepted steps of each orbit and re-running orbits that need more steps than the buffer holds"""
+    yo= numpy.atleast_2d(yo)
+    nobj= len(yo)
+    rtol, atol= _parse_tol(rtol,atol)
+    int_method_c= _parse_integrator(int_method)
+    ncoeffs= 8 if int_method_c == 6 else 5
+
+    #Set up result arrays
+    result= numpy.empty((nobj,len(t),dim))
+    err= numpy.zeros(nobj,dtype=numpy.int32)
+    nsteps= numpy.zeros(nobj,dtype=numpy.int32)
+    tsteps= [None for ii in range(nobj)]
+    coeffs= [None for ii in range(nobj)]
+
+    #Set up progressbar
+    progressbar*= _TQDM_LOADED
+    if nobj > 1 and progressbar:
+        pbar= tqdm.tqdm(total=nobj,leave=False)
+        pbar_func_ctype= ctypes.CFUNCTYPE(None)
+        pbar_c= pbar_func_ctype(pbar.update)
+    else: # pragma: no cover
+        pbar_c= None
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    integrationFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_double,
+                               ctypes.c_double,
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ctypes.c_void_p]
+    t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
+
+    # Integrate in chunks, such that the buffers for the dense output stay
+    # small, and re-integrate orbits that need more steps with larger buffers
+    todo= numpy.arange(nobj)
+    nmax= _DENSE_NMAX
+    while len(todo) > 0:
+        chunksize= numpy.amax([1,_DENSE_BUFSIZE//(nmax*ncoeffs*dim)])
+        overflow= []
+        for ii in range(0,len(todo),chunksize):
+            indx= todo[ii:ii+chunksize]
+            nchunk= len(indx)
+            chunk_yo= numpy.require(yo[indx],dtype=numpy.float64,
+                                    requirements=['C','W'])
+            chunk_result= numpy.empty((nchunk,len(t),dim))
+            chunk_err= numpy.zeros(nchunk,dtype=numpy.int32)
+            chunk_nsteps= numpy.zeros(nchunk,dtype=numpy.int32)
+            chunk_tsteps= numpy.empty((nchunk,nmax+1))
+            chunk_coeffs= numpy.empty((nchunk,nmax,ncoeffs,dim))
+            integrationFunc(ctypes.c_int(nchunk),
+                            chunk_yo,
+                            ctypes.c_int(len(t)),
+                            t,
+                            ctypes.c_int(npot),
+                            pot_type,
+                            pot_args,
+                            pot_tfuncs,
+                            ctypes.c_double(rtol),
+                            ctypes.c_double(atol),
+                            ctypes.c_int(nmax),
+                            chunk_nsteps,
+                            chunk_tsteps,
+                            chunk_coeffs,
+                            chunk_result,
+                            chunk_err,
+                            ctypes.c_int(int_method_c),
+                            pbar_c if nmax == _DENSE_NMAX else None)
+            if numpy.any(chunk_err == -10): #pragma: no cover
+                raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+            for jj,kk in enumerate(indx):
+                if chunk_nsteps[jj] > nmax:
+                    overflow.append(kk)
+                    continue
+                result[kk]= chunk_result[jj]
+                err[kk]= chunk_err[jj]
+                nsteps[kk]= chunk_nsteps[jj]
+                tsteps[kk]= chunk_tsteps[jj,:nsteps[kk]+1]
+                coeffs[kk]= chunk_coeffs[jj,:nsteps[kk]]
+        todo= numpy.array(overflow,dtype='int')
+        nmax*= 4
+
+    if nobj > 1 and progressbar:
+        pbar.close()
+
+    return (result,err,numpy.concatenate(tsteps),
+            numpy.concatenate(coeffs),nsteps)
+
+def integratePlanarOrbit_events_c(pot,yo,t,int_method,events,event_phi=0.,
+                                  rtol=None,atol=None,progressbar=True,
+                                  tfunc_grid=None):
+    """
+    NAME:
+       integratePlanarOrbit_events_c
+    PURPOSE:
+       C integrate an ode for a planarOrbit, finding events along the way using the dense output of the adaptive integrator
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], can be [N,4] or [4]
+       t - set of times at which one wants the result
+       int_method= 'dopr54_c' or 'dop853_c'
+       events - list of events to find: 'peri', 'apo', 'phi'
+       event_phi= (0.) azimuth of the half-plane for 'phi' events
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (y,err,nevents,tevents,ievents,yevents)
+       y : array, shape (N,len(t),4)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+       nevents: number of events found for each orbit (N)
+       tevents: times of the events (N,max(nevents)), padded with NaN
+       ievents: types of the events (N,max(nevents)), padded with -1
+       yevents: phase-space positions at the events (N,max(nevents),4), padded with NaN
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_events_c(_lib.integratePlanarOrbit_events,4,
+                               npot,pot_type,pot_args,pot_tfuncs,
+                               yo,t,int_method,events,event_phi=event_phi,
+                               rtol=rtol,atol=atol,progressbar=progressbar)
+
+def _integrate_events_c(integrationFunc,dim,npot,pot_type,pot_args,
+                        pot_tfuncs,yo,t,int_method,events,event_phi=0.,
+                        rtol=None,atol=None,progressbar=True):
+    """Run a C event-finding integration function, re-running orbits that have more events than the buffer holds"""
+    yo= numpy.atleast_2d(yo)
+    nobj= len(yo)
+    rtol, atol= _parse_tol(rtol,atol)
+    int_method_c= _parse_integrator(int_method)
+    event_types= numpy.array([_EVENT_TYPES[event] for event in events],
+                             dtype=numpy.int32)
+
+    #Set up result arrays
+    result= numpy.empty((nobj,len(t),dim))
+    err= numpy.zeros(nobj,dtype=numpy.int32)
+    nevents= numpy.zeros(nobj,dtype=numpy.int32)
+    tevents= [None for ii in range(nobj)]
+    ievents= [None for ii in range(nobj)]
+    yevents= [None for ii in range(nobj)]
+
+    #Set up progressbar
+    progressbar*= _TQDM_LOADED
+    if nobj > 1 and progressbar:
+        pbar= tqdm.tqdm(total=nobj,leave=False)
+        pbar_func_ctype= ctypes.CFUNCTYPE(None)
+        pbar_c= pbar_func_ctype(pbar.update)
+    else: # pragma: no cover
+        pbar_c= None
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    integrationFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_double,
+                               ctypes.c_double,
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_double,
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ctypes.c_void_p]
+    t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
+
+    # Re-integrate orbits that have more events than fit in the buffer with
+    # a buffer that is large enough
+    todo= numpy.arange(nobj)
+    nmax= _EVENTS_NMAX
+    first= True
+    while len(todo) > 0:
+        nchunk= len(todo)
+        chunk_yo= numpy.require(yo[todo],dtype=numpy.float64,
+                                requirements=['C','W'])
+        chunk_result= numpy.empty((nchunk,len(t),dim))
+        chunk_err= numpy.zeros(nchunk,dtype=numpy.int32)
+        chunk_nevents= numpy.zeros(nchunk,dtype=numpy.int32)
+        chunk_tevents= numpy.empty((nchunk,nmax))
+        chunk_ievents= numpy.empty((nchunk,nmax),dtype=numpy.int32)
+        chunk_yevents= numpy.empty((nchunk,nmax,dim))
+        integrationFunc(ctypes.c_int(nchunk),
+                        chunk_yo,
+                        ctypes.c_int(len(t)),
+                        t,
+                        ctypes.c_int(npot),
+                        pot_type,
+                        pot_args,
+                        pot_tfuncs,
+                        ctypes.c_double(rtol),
+                        ctypes.c_double(atol),
+                        ctypes.c_int(len(event_types)),
+                        event_types,
+                        ctypes.c_double(event_phi),
+                        ctypes.c_int(nmax),
+                        chunk_nevents,
+                        chunk_tevents,
+                        chunk_ievents,
+                        chunk_yevents,
+                        chunk_result,
+                        chunk_err,
+                        ctypes.c_int(int_method_c),
+                        pbar_c if first else None)
+        if numpy.any(chunk_err == -10): #pragma: no cover
+            raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+        overflow= chunk_nevents > nmax
+        for jj,kk in enumerate(todo):
+            if overflow[jj]: continue
+            result[kk]= chunk_result[jj]
+            err[kk]= chunk_err[jj]
+            nevents[kk]= chunk_nevents[jj]
+            tevents[kk]= chunk_tevents[jj,:nevents[kk]]
+            ievents[kk]= chunk_ievents[jj,:nevents[kk]]
+            yevents[kk]= chunk_yevents[jj,:nevents[kk]]
+        if numpy.any(overflow):
+            nmax= numpy.amax(chunk_nevents)
+        todo= todo[overflow]
+        first= False
+
+    if nobj > 1 and progressbar:
+        pbar.close()
+
+    # Pad to the same number of events
+    nmax= numpy.amax(nevents)
+    out_tevents= numpy.full((nobj,nmax),numpy.nan)
+    out_ievents= numpy.full((nobj,nmax),-1,dtype=numpy.int32)
+    out_yevents= numpy.full((nobj,nmax,dim),numpy.nan)
+    for ii in range(nobj):
+        out_tevents[ii,:nevents[ii]]= tevents[ii]
+        out_ievents[ii,:nevents[ii]]= ievents[ii]
+        out_yevents[ii,:nevents[ii]]= yevents[ii]
+    return (result,err,nevents,out_tevents,out_ievents,out_yevents)
+
+def integratePlanarOrbit_reduce_c(pot,yo,t,int_method,reducers,
+                                  hist_bins=None,hist_range=None,
+                                  rtol=None,atol=None,progressbar=True,
+                                  dt=None,
+                                  tfunc_grid=None):
+    """
+    NAME:
+       integratePlanarOrbit_reduce_c
+    PURPOSE:
+       C integrate an ode for a planarOrbit, only returning summary statistics of each orbit
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p], can be [N,4] or [4]
+       t - set of times at which the orbit is sampled for the summary statistics
+       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       reducers - list of 'quantity_stat' with quantity in 'R', 'z', 'r', 'E', 'Lz' and stat in 'min', 'max', 'mean', 'var'
+       hist_bins= (None) if set, [nR,nz] number of bins of a histogram of the (R,z) occupancy of all orbits
+       hist_range= [[Rmin,Rmax],[zmin,zmax]] range of the histogram
+       rtol, atol
+       progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one)
+       tfunc_grid= (None) grid of times on which to tabulate the functions of time of time-dependent potentials (see Orbit.integrate)
+    OUTPUT:
+       (reduced,hist,err)
+       reduced: array, shape (N,len(reducers))
+       hist: array, shape (nR,nz) (None if hist_bins is None)
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    npot, pot_type, pot_args, pot_tfuncs= _parse_pot(pot,tfunc_grid=tfunc_grid)
+    pot_tfuncs= _prep_tfuncs(pot_tfuncs)
+    return _integrate_reduce_c(_lib.integratePlanarOrbit_reduce,
+                               npot,pot_type,pot_args,pot_tfuncs,
+                               yo,t,int_method,reducers,
+                               hist_bins=hist_bins,hist_range=hist_range,
+                               rtol=rtol,atol=atol,progressbar=progressbar,
+                               dt=dt)
+
+def _integrate_reduce_c(integrationFunc,npot,pot_type,pot_args,pot_tfuncs,
+                        yo,t,int_method,reducers,hist_bins=None,
+                        hist_range=None,rtol=None,atol=None,progressbar=True,
+                        dt=None):
+    """Run a C integrate-and-reduce function"""
+    yo= numpy.atleast_2d(yo)
+    nobj= len(yo)
+    rtol, atol= _parse_tol(rtol,atol)
+    int_method_c= _parse_integrator(int_method)
+    if dt is None:
+        dt= -9999.99
+    quantity= numpy.array([_REDUCE_QUANTITIES[reducer.split('_')[0]]
+                           for reducer in reducers],dtype=numpy.int32)
+    stat= numpy.array([_REDUCE_STATS[reducer.split('_')[1]]
+                       for reducer in reducers],dtype=numpy.int32)
+    if hist_bins is None:
+        nhistR, nhistz= 0, 0
+        hist_range= numpy.zeros(4)
+    else:
+        nhistR, nhistz= hist_bins
+        hist_range= numpy.array(hist_range,dtype=numpy.float64).flatten()
+
+    #Set up result arrays
+    reduced= numpy.empty((nobj,len(reducers)))
+    hist= numpy.zeros((nhistR,nhistz))
+    err= numpy.zeros(nobj,dtype=numpy.int32)
+
+    #Set up progressbar
+    progressbar*= _TQDM_LOADED
+    if nobj > 1 and progressbar:
+        pbar= tqdm.tqdm(total=nobj,leave=False)
+        pbar_func_ctype= ctypes.CFUNCTYPE(None)
+        pbar_c= pbar_func_ctype(pbar.update)
+    else: # pragma: no cover
+        pbar_c= None
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    integrationFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_void_p,
+                               ctypes.c_double,
+                               ctypes.c_double,
+                               ctypes.c_double,
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ctypes.c_void_p]
+
+    #Array requirements
+    yo= numpy.require(yo,dtype=numpy.float64,requirements=['C','W'])
+    t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
+                    ctypes.c_int(len(t)),
+                    t,
+                    ctypes.c_int(npot),
+                    pot_type,
+                    pot_args,
+                    pot_tfuncs,
+                    ctypes.c_double(dt),
+                    ctypes.c_double(rtol),
+                    ctypes.c_double(atol),
+                    ctypes.c_int(len(reducers)),
+                    quantity,
+                    stat,
+                    reduced,
+                    ctypes.c_int(nhistR),
+                    ctypes.c_int(nhistz),
+                    hist_range,
+                    hist,
+                    err,
+                    ctypes.c_int(int_method_c),
+                    pbar_c)
+
+    if nobj > 1 and progressbar:
+        pbar.close()
+
+    if numpy.any(err == -10): #pragma: no cover
+        raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+
+    return (reduced,hist if nhistR > 0 else None,err)
+
 def integratePlanarOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
                                 dt=None):
     """
@@ -630,11 +1151,11 @@ def integratePlanarOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
        pot - Potential or list of such instances
        yo - initial condition [q,p], shape [N,3] or [N,4]
        t - set of times at which one wants the result
-       int_method= 'leapfrog', 'odeint', or 'dop853'
+       int_method= 'leapfrog', 'odeint', 'dop853', or 'leapfrog_lockstep', 'symplec4_lockstep', 'symplec6_lockstep' (which integrate all orbits in lockstep, evaluating the forces for all orbits at once)
        rtol, atol= tolerances (not always used...)
        numcores= (1) number of cores to use for multi-processing
        progressbar= (True) if True, display a tqdm progress bar when integrating multiple orbits (requires tqdm to be installed!)
-       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based integrators!)
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one; only for C-based and lockstep integrators!)
     OUTPUT:
        (y,err)
        y : array, shape (N,len(t),3/4)
@@ -645,6 +1166,7 @@ def integratePlanarOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
        2010-07-20 - Written - Bovy (NYU)
        2019-04-09 - Adapted to allow multiple objects and parallel mapping - Bovy (UofT)
        2022-04-12 - Add progressbar - Bovy (UofT)
+       2026-10-18 - Added lockstep integrators - agent
     """
     nophi= False
     if not int_method.lower() == 'dop853' and not int_method == 'odeint':
@@ -652,7 +1174,29 @@ def integratePlanarOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
             nophi= True
             #We hack this by putting in a dummy phi=0
             yo= numpy.pad(yo,((0,0),(0,1)),'constant',constant_values=0)
-    if int_method.lower() == 'leapfrog':
+    if int_method.lower() in _LOCKSTEP_ORDERS:
+        rtol, atol= _parse_tol(rtol,atol)
+        #go to the rectangular frame
+        this_yo= numpy.array([yo[:,0]*numpy.cos(yo[:,3]),
+                              yo[:,0]*numpy.sin(yo[:,3]),
+                              yo[:,1]*numpy.cos(yo[:,3])
+                                  -yo[:,2]*numpy.sin(yo[:,3]),
+                              yo[:,2]*numpy.cos(yo[:,3])
+                                  +yo[:,1]*numpy.sin(yo[:,3])]).T
+        #integrate all orbits at once
+        tmp_out= symplecticode.symplec_lockstep(\
+            _planarRectForce_lockstep,this_yo,t,
+            order=_LOCKSTEP_ORDERS[int_method.lower()],dt=dt,args=(pot,),
+            rtol=rtol,atol=atol)
+        #go back to the cylindrical frame
+        R= numpy.sqrt(tmp_out[:,:,0]**2.+tmp_out[:,:,1]**2.)
+        phi= numpy.arctan2(tmp_out[:,:,1],tmp_out[:,:,0])
+        out= numpy.empty_like(tmp_out)
+        out[:,:,0]= R
+        out[:,:,1]= tmp_out[:,:,2]*numpy.cos(phi)+tmp_out[:,:,3]*numpy.sin(phi)
+        out[:,:,2]= tmp_out[:,:,3]*numpy.cos(phi)-tmp_out[:,:,2]*numpy.sin(phi)
+        out[:,:,3]= phi
+    elif int_method.lower() == 'leapfrog':
         if rtol is None: rtol= 1e-8
         def integrate_for_map(vxvv):
             #go to the rectangular frame
@@ -720,11 +1264,13 @@ def integratePlanarOrbit(pot,yo,t,int_method,rtol=None,atol=None,numcores=1,
         def integrate_for_map(vxvv):
             return integratePlanarOrbit_c(pot,numpy.copy(vxvv),
                                           t,int_method,dt=dt)[0]
-    if len(yo) == 1: # Can't map a single value...
+    if int_method.lower() in _LOCKSTEP_ORDERS:
+        pass # all orbits were integrated at once above
+    elif len(yo) == 1: # Can't map a single value...
         out= numpy.atleast_3d(integrate_for_map(yo[0]).T).T
     else:
-        out= numpy.array(parallel_map(integrate_for_map,yo,numcores=numcores,
-                                       progressbar=progressbar))
+        out= parallel_map(integrate_for_map,yo,numcores=numcores,
+                          progressbar=progressbar,as_array=True)
     if nophi:
         out= out[:,:,:3]
     return out, numpy.zeros(len(yo))
@@ -804,9 +1350,9 @@ def integratePlanarOrbit_dxdv(pot,yo,dyo,t,int_method,
     if len(this_yo) == 1: # Can't map a single value...
         out= numpy.atleast_3d(integrate_for_map(this_yo[0]).T).T
     else:
-        out= numpy.array(parallel_map(integrate_for_map,this_yo,
-                                       progressbar=progressbar,
-                                       numcores=numcores))
+        out= parallel_map(integrate_for_map,this_yo,
+                          progressbar=progressbar,
+                          numcores=numcores,as_array=True)
     #go back to the cylindrical frame
     R= numpy.sqrt(out[...,0]**2.+out[...,1]**2.)
     phi= numpy.arccos(out[...,0]/R)
@@ -958,3 +1504,29 @@ def _planarRectForce(x,pot,t=0.):
     phitorque= _evaluateplanarphitorques(pot,R,phi=phi,t=t)
     return numpy.array([cosphi*Rforce-1./R*sinphi*phitorque,
                      sinphi*Rforce+1./R*cosphi*phitorque])
+
+def _planarRectForce_lockstep(x,pot,t=0.):
+    """
+    NAME:
+       _planarRectForce_lockstep
+    PURPOSE:
+       returns the planar force in the rectangular frame for many objects at once
+    INPUT:
+       x - current positions, shape (2,N)
+       t - current time
+       pot - (list of) Potential instance(s)
+    OUTPUT:
+       force, shape (2,N)
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    #x is rectangular so calculate R and phi
+    R= numpy.sqrt(x[0]**2.+x[1]**2.)
+    phi= numpy.arctan2(x[1],x[0])
+    sinphi= x[1]/R
+    cosphi= x[0]/R
+    #calculate forces
+    Rforce= _evaluateplanarRforces(pot,R,phi=phi,t=t)
+    phitorque= _evaluateplanarphitorques(pot,R,phi=phi,t=t)
+    return numpy.array([cosphi*Rforce-1./R*sinphi*phitorque,
+                        sinphi*Rforce+1./R*cosphi*phitorque])
@@ -14,6 +14,8 @@
 #include <bovy_symplecticode.h>
 #include <leung_dop853.h>
 #include <bovy_rk.h>
+#include <orbit_events.h>
+#include <orbit_reduce.h>
 #include <integrateFullOrbit.h>
 //Potentials
 #include <galpy_potentials.h>
@@ -23,6 +25,8 @@
 #ifndef ORBITS_CHUNKSIZE
 #define ORBITS_CHUNKSIZE 1
 #endif
+// Relative step of the finite-difference force Jacobian for dxdv
+#define DXDV_FD_STEP 6.0554544523933395e-06 // cbrt(DBL_EPSILON)
 //Macros to export functions in DLL on different OS
 #if defined(_WIN32)
 #define EXPORT __declspec(dllexport)
@@ -113,6 +117,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &PowerSphericalPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &PowerSphericalPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 8: //HernquistPotential, 2 arguments
       potentialArgs->potentialEval= &HernquistPotentialEval;
@@ -126,6 +133,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &HernquistPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &HernquistPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 9: //NFWPotential, 2 arguments
       potentialArgs->potentialEval= &NFWPotentialEval;
@@ -139,6 +149,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &NFWPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &NFWPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 10: //JaffePotential, 2 arguments
       potentialArgs->potentialEval= &JaffePotentialEval;
@@ -152,6 +165,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &JaffePotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &JaffePotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 11: //DoubleExponentialDiskPotential, XX arguments
       potentialArgs->potentialEval= &DoubleExponentialDiskPotentialEval;
@@ -230,6 +246,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &IsochronePotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &IsochronePotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 15: //PowerSphericalwCutoffPotential, 3 arguments
       potentialArgs->potentialEval= &PowerSphericalPotentialwCutoffEval;
@@ -243,6 +262,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 3;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &PowerSphericalPotentialwCutoffPlanarRforce;
+      potentialArgs->planarR2deriv= &PowerSphericalPotentialwCutoffPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 16: //KuzminKutuzovStaeckelPotential, 3 arguments
       potentialArgs->potentialEval= &KuzminKutuzovStaeckelPotentialEval;
@@ -264,6 +286,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &PlummerPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &PlummerPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 18: //PseudoIsothermalPotential, 2 arguments
       potentialArgs->potentialEval= &PseudoIsothermalPotentialEval;
@@ -275,6 +300,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &PseudoIsothermalPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &PseudoIsothermalPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 19: //KuzminDiskPotential, 2 arguments
       potentialArgs->potentialEval= &KuzminDiskPotentialEval;
@@ -294,6 +322,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &BurkertPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &BurkertPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 21: //TriaxialHernquistPotential, lots of arguments
       potentialArgs->potentialEval= &EllipsoidalPotentialEval;
@@ -416,6 +447,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 2;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &DehnenCoreSphericalPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &DehnenCoreSphericalPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 34: //DehnenSphericalPotential, 3 arguments
       potentialArgs->potentialEval= &DehnenSphericalPotentialEval;
@@ -429,6 +463,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 3;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &DehnenSphericalPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &DehnenSphericalPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 35: //HomogeneousSpherePotential, 3 arguments
       potentialArgs->potentialEval= &HomogeneousSpherePotentialEval;
@@ -439,6 +476,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 3;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &HomogeneousSpherePotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &HomogeneousSpherePotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 36: //interpSphericalPotential, XX arguments
       // Set up 1 spline in potentialArgs
@@ -468,6 +508,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs = 6;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &SphericalPotentialPlanarRforce;
+      potentialArgs->planarR2deriv= &SphericalPotentialPlanarR2deriv;
+      potentialArgs->hasSphericalHessian= true;
       break;
     case 37: // TriaxialGaussianPotential, lots of arguments
       potentialArgs->potentialEval= &EllipsoidalPotentialEval;
@@ -526,6 +569,18 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->nargs= 0;
       potentialArgs->ntfuncs= 0;
       potentialArgs->requiresVelocity= false;
+      potentialArgs->planarRforce= &ZeroPlanarForce;
+      potentialArgs->planarR2deriv= &ZeroPlanarForce;
+      potentialArgs->hasSphericalHessian= true;
+      break;
+    case 41: //JITPotential, 9 arguments
+      potentialArgs->potentialEval= &JITPotentialEval;
+      potentialArgs->Rforce= &JITPotentialRforce;
+      potentialArgs->zforce= &JITPotentialzforce;
+      potentialArgs->phitorque= &JITPotentialphitorque;
+      potentialArgs->nargs= 9;
+      potentialArgs->ntfuncs= 0;
+      potentialArgs->requiresVelocity= false;
       break;
 //////////////////////////////// WRAPPERS /////////////////////////////////////
     case -1: //DehnenSmoothWrapperPotential
@@ -619,10 +674,7 @@ void parse_leapFuncArgs_Full(int npot,
     }
     potentialArgs->args-= potentialArgs->nargs;
     // and load each potential's time functions
-    if ( potentialArgs->ntfuncs > 0 ) {
-      potentialArgs->tfuncs= (*pot_tfuncs);
-      (*pot_tfuncs)+= potentialArgs->ntfuncs;
-    }
+    parse_tfuncs(potentialArgs,pot_args,pot_tfuncs);
     potentialArgs++;
   }
   potentialArgs-= npot;
@@ -635,30 +687,43 @@ EXPORT void integrateFullOrbit(int nobj,
 			       int * pot_type,
 			       double * pot_args,
              tfuncs_type_arr pot_tfuncs,
+			       int pot_args_stride,
+			       int pot_tfuncs_stride,
 			       double dt,
 			       double rtol,
 			       double atol,
 			       double *result,
 			       int * err,
+			       double * stats,
+			       int * order,
+			       int chunksize,
 			       int odeint_type,
              orbint_callback_type cb){
   //Set up the forces, first count
   int ii,jj;
   int dim;
+  int kk;
   int max_threads;
+  double walltime;
   int * thread_pot_type;
   double * thread_pot_args;
   tfuncs_type_arr thread_pot_tfuncs;
   max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
   // Because potentialArgs may cache, safest to have one / thread
   struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+  // If pot_args_stride > 0, pot_args is a table with one row of potential
+  // arguments for each orbit (and pot_tfuncs one row of pot_tfuncs_stride
+  // functions) and the potential is parsed for each orbit separately below
+  if ( ! pot_args_stride ) {
 #pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
-  for (ii=0; ii < max_threads; ii++) {
-    thread_pot_type= pot_type; // need to make thread-private pointers, bc
-    thread_pot_args= pot_args; // these pointers are changed in parse_...
-    thread_pot_tfuncs= pot_tfuncs; // ...
-    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
-			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+    for (ii=0; ii < max_threads; ii++) {
+      thread_pot_type= pot_type; // need to make thread-private pointers, bc
+      thread_pot_args= pot_args; // these pointers are changed in parse_...
+      thread_pot_tfuncs= pot_tfuncs; // ...
+      parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			      &thread_pot_type,&thread_pot_args,
+			      &thread_pot_tfuncs);
+    }
   }
   //Integrate
   void (*odeint_func)(void (*func)(double, double *, double *,
@@ -697,6 +762,16 @@ EXPORT void integrateFullOrbit(int nobj,
     odeint_deriv_func= &evalRectForce;
     dim= 3;
     break;
+  case 7: //ttleapfrog
+    odeint_func= &ttleapfrog;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 8: //ttsymplec4
+    odeint_func= &ttsymplec4;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
   case 5: //DOPR54
     odeint_func= &bovy_dopr54;
     odeint_deriv_func= &evalRectDeriv;
@@ -708,41 +783,88 @@ EXPORT void integrateFullOrbit(int nobj,
     dim= 6;
     break;
   }
-#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
-  for (ii=0; ii < nobj; ii++) {
+  if ( chunksize < 1 ) chunksize= ORBITS_CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunksize) private(kk,ii,walltime,jj,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (kk=0; kk < nobj; kk++) {
+    ii= order ? *(order+kk) : kk; // order is, e.g., longest orbits first
+    if ( pot_args_stride ) {
+      thread_pot_type= pot_type;
+      thread_pot_args= pot_args+ii*pot_args_stride;
+      thread_pot_tfuncs= pot_tfuncs ? pot_tfuncs+ii*pot_tfuncs_stride : NULL;
+      parse_leapFuncArgs_Full(npot,potentialArgs+omp_get_thread_num()*npot,
+			      &thread_pot_type,&thread_pot_args,
+			      &thread_pot_tfuncs);
+    }
+    if ( stats ) { // collect the integrator's work counters for this orbit
+      reset_integrator_stats();
+      walltime= omp_get_wtime();
+    }
     cyl_to_rect_galpy(yo+6*ii);
     odeint_func(odeint_deriv_func,dim,yo+6*ii,nt,dt,t,
 		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
 		result+6*nt*ii,err+ii);
     for (jj=0; jj < nt; jj++)
       rect_to_cyl_galpy(result+6*jj+6*nt*ii);
+    if ( stats )
+      save_integrator_stats(stats+INTEGRATOR_NSTATS*ii,
+			    omp_get_wtime()-walltime,omp_get_thread_num());
+    if ( pot_args_stride )
+      free_potentialArgs(npot,potentialArgs+omp_get_thread_num()*npot);
     if ( cb ) // Callback if not void
       cb();
   }
   //Free allocated memory
+  if ( ! pot_args_stride ) {
 #pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
-  for (ii=0; ii < max_threads; ii++)
-    free_potentialArgs(npot,potentialArgs+ii*npot);
+    for (ii=0; ii < max_threads; ii++)
+      free_potentialArgs(npot,potentialArgs+ii*npot);
+  }
   free(potentialArgs);
   //Done!
 }
-// LCOV_EXCL_START
-void integrateOrbit_dxdv(double *yo,
-			 int nt,
-			 double *t,
-			 int npot,
-			 int * pot_type,
-			 double * pot_args,
-       tfuncs_type_arr pot_tfuncs,
-			 double rtol,
-			 double atol,
-			 double *result,
-			 int * err,
-			 int odeint_type){
+EXPORT void integrateFullOrbit_reduce(int nobj,
+			       double *yo,
+			       int nt,
+			       double *t,
+			       int npot,
+			       int * pot_type,
+			       double * pot_args,
+             tfuncs_type_arr pot_tfuncs,
+			       double dt,
+			       double rtol,
+			       double atol,
+			       int nred,
+			       int * quantity,
+			       int * stat,
+			       double * reduced,
+			       int nhistR,
+			       int nhistz,
+			       double * hist_range,
+			       double * hist,
+			       int * err,
+			       int odeint_type,
+             orbint_callback_type cb){
   //Set up the forces, first count
+  int ii,jj;
   int dim;
-  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
-  parse_leapFuncArgs_Full(npot,potentialArgs,&pot_type,&pot_args,&pot_tfuncs);
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Scratch space for a single orbit and the histogram, one / thread
+  double * result= (double *) malloc ( max_threads * nt * 6 * sizeof (double) );
+  double * thread_hist= (double *) calloc ( max_threads * nhistR * nhistz , sizeof (double) );
   //Integrate
   void (*odeint_func)(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
@@ -758,28 +880,285 @@ void integrateOrbit_dxdv(double *yo,
   case 0: //leapfrog
     odeint_func= &leapfrog;
     odeint_deriv_func= &evalRectForce;
-    dim= 6;
+    dim= 3;
     break;
   case 1: //RK4
     odeint_func= &bovy_rk4;
-    odeint_deriv_func= &evalRectDeriv_dxdv;
-    dim= 12;
+    odeint_deriv_func= &evalRectDeriv;
+    dim= 6;
     break;
   case 2: //RK6
     odeint_func= &bovy_rk6;
-    odeint_deriv_func= &evalRectDeriv_dxdv;
-    dim= 12;
+    odeint_deriv_func= &evalRectDeriv;
+    dim= 6;
     break;
   case 3: //symplec4
     odeint_func= &symplec4;
     odeint_deriv_func= &evalRectForce;
-    dim= 6;
+    dim= 3;
     break;
   case 4: //symplec6
     odeint_func= &symplec6;
     odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 7: //ttleapfrog
+    odeint_func= &ttleapfrog;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 8: //ttsymplec4
+    odeint_func= &ttsymplec4;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54;
+    odeint_deriv_func= &evalRectDeriv;
+    dim= 6;
+    break;
+  case 6: //DOP853
+    odeint_func= &dop853;
+    odeint_deriv_func= &evalRectDeriv;
     dim= 6;
     break;
+  }
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    cyl_to_rect_galpy(yo+6*ii);
+    odeint_func(odeint_deriv_func,dim,yo+6*ii,nt,dt,t,
+		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		result+6*nt*omp_get_thread_num(),err+ii);
+    for (jj=0; jj < nt; jj++)
+      rect_to_cyl_galpy(result+6*jj+6*nt*omp_get_thread_num());
+    reduce_orbit(nt,t,6,result+6*nt*omp_get_thread_num(),
+		 npot,potentialArgs+omp_get_thread_num()*npot,
+		 nred,quantity,stat,reduced+nred*ii,nhistR,nhistz,hist_range,
+		 thread_hist+nhistR*nhistz*omp_get_thread_num());
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  // Combine the histograms of the different threads
+  for (ii=0; ii < max_threads; ii++)
+    for (jj=0; jj < nhistR * nhistz; jj++)
+      *(hist+jj)+= *(thread_hist+nhistR*nhistz*ii+jj);
+  free(result);
+  free(thread_hist);
+  //Done!
+}
+EXPORT void integrateFullOrbit_dense(int nobj,
+				     double *yo,
+				     int nt,
+				     double *t,
+				     int npot,
+				     int * pot_type,
+				     double * pot_args,
+				     tfuncs_type_arr pot_tfuncs,
+				     double rtol,
+				     double atol,
+				     int nmax,
+				     int * nsteps,
+				     double * tsteps,
+				     double * coeffs,
+				     double *result,
+				     int * err,
+				     int odeint_type,
+				     orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii,jj;
+  int ncoeffs;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Only the Dormand-Prince integrators have dense output
+  ncoeffs= ( odeint_type == 6 ) ? 8 : 5;
+  //Integrate
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    cyl_to_rect_galpy(yo+6*ii);
+    if ( odeint_type == 6 )
+      dop853_dense(&evalRectDeriv,6,yo+6*ii,nt,-9999.99,t,
+		   npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		   result+6*nt*ii,err+ii,
+		   nmax,nsteps+ii,tsteps+(nmax+1)*ii,coeffs+ncoeffs*6*nmax*ii,
+		   NULL,NULL);
+    else
+      bovy_dopr54_dense(&evalRectDeriv,6,yo+6*ii,nt,-9999.99,t,
+			npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+			nmax,nsteps+ii,tsteps+(nmax+1)*ii,
+			coeffs+ncoeffs*6*nmax*ii,
+			result+6*nt*ii,err+ii,NULL,NULL);
+    for (jj=0; jj < nt; jj++)
+      rect_to_cyl_galpy(result+6*jj+6*nt*ii);
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  //Done!
+}
+EXPORT void integrateFullOrbit_events(int nobj,
+				      double *yo,
+				      int nt,
+				      double *t,
+				      int npot,
+				      int * pot_type,
+				      double * pot_args,
+				      tfuncs_type_arr pot_tfuncs,
+				      double rtol,
+				      double atol,
+				      int ntypes,
+				      int * types,
+				      double phi_event,
+				      int nmax,
+				      int * nevents,
+				      double * tevents,
+				      int * ievents,
+				      double * yevents,
+				      double *result,
+				      int * err,
+				      int odeint_type,
+				      orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii,jj;
+  int ncoeffs;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  struct orbitEvents ev;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Only the Dormand-Prince integrators have dense output
+  ncoeffs= ( odeint_type == 6 ) ? 8 : 5;
+  // Scratch space for the dense output of a single step, one / thread
+  double * coeffs= (double *) malloc ( max_threads * ncoeffs * 6 * sizeof (double) );
+  //Integrate
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj,ev) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    ev.dim= 6;
+    ev.ntypes= ntypes;
+    ev.types= types;
+    ev.cosphi= cos(phi_event);
+    ev.sinphi= sin(phi_event);
+    ev.tf= *(t+nt-1);
+    ev.nmax= nmax;
+    ev.nevents= nevents+ii;
+    ev.tevents= tevents+nmax*ii;
+    ev.ievents= ievents+nmax*ii;
+    ev.yevents= yevents+6*nmax*ii;
+    *(nevents+ii)= 0;
+    cyl_to_rect_galpy(yo+6*ii);
+    if ( odeint_type == 6 )
+      dop853_dense(&evalRectDeriv,6,yo+6*ii,nt,-9999.99,t,
+		   npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		   result+6*nt*ii,err+ii,
+		   0,NULL,NULL,coeffs+ncoeffs*6*omp_get_thread_num(),
+		   &find_events,&ev);
+    else
+      bovy_dopr54_dense(&evalRectDeriv,6,yo+6*ii,nt,-9999.99,t,
+			npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+			0,NULL,NULL,coeffs+ncoeffs*6*omp_get_thread_num(),
+			result+6*nt*ii,err+ii,&find_events,&ev);
+    for (jj=0; jj < nt; jj++)
+      rect_to_cyl_galpy(result+6*jj+6*nt*ii);
+    for (jj=0; jj < ( *(nevents+ii) < nmax ? *(nevents+ii) : nmax ); jj++)
+      rect_to_cyl_galpy(yevents+6*jj+6*nmax*ii);
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  free(coeffs);
+  //Done!
+}
+EXPORT void integrateFullOrbit_dxdv(int nobj,
+				    double *yo,
+				    int nt,
+				    double *t,
+				    int npot,
+				    int * pot_type,
+				    double * pot_args,
+				    tfuncs_type_arr pot_tfuncs,
+				    double dt,
+				    double rtol,
+				    double atol,
+				    double *result,
+				    int * err,
+				    int odeint_type,
+				    orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii;
+  int dim;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  //Integrate
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *);
+  void (*odeint_deriv_func)(double, double *, double *,
+			    int,struct potentialArg *);
+  switch ( odeint_type ) {
+  case 1: //RK4
+    odeint_func= &bovy_rk4;
+    odeint_deriv_func= &evalRectDeriv_dxdv;
+    dim= 12;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6;
+    odeint_deriv_func= &evalRectDeriv_dxdv;
+    dim= 12;
+    break;
   case 5: //DOPR54
     odeint_func= &bovy_dopr54;
     odeint_deriv_func= &evalRectDeriv_dxdv;
@@ -791,16 +1170,25 @@ void integrateOrbit_dxdv(double *yo,
     dim= 12;
     break;
   }
-  odeint_func(odeint_deriv_func,dim,yo,nt,-9999.99,t,npot,potentialArgs,
-	      rtol,atol,result,err);
+  // Input and output are rectangular [x,y,z,vx,vy,vz,dx,dy,dz,dvx,dvy,dvz]
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    odeint_func(odeint_deriv_func,dim,yo+12*ii,nt,dt,t,
+		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		result+12*nt*ii,err+ii);
+    if ( cb ) // Callback if not void
+      cb();
+  }
   //Free allocated memory
-  free_potentialArgs(npot,potentialArgs);
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
   free(potentialArgs);
   //Done!
 }
-// LCOV_EXCL_STOP
 void evalRectForce(double t, double *q, double *a,
 		   int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   double sinphi, cosphi, x, y, phi,R,Rforce,phitorque, z, zforce;
   //q is rectangular so calculate R and phi
   x= *q;
@@ -821,6 +1209,7 @@ void evalRectForce(double t, double *q, double *a,
 }
 void evalRectDeriv(double t, double *q, double *a,
 		   int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   double sinphi, cosphi, x, y, phi,R,Rforce,phitorque,z,zforce,vR,vT;
   //first three derivatives are just the velocities
   *a++= *(q+3);
@@ -922,64 +1311,72 @@ void initChandrasekharDynamicalFrictionSplines(struct potentialArg * potentialAr
   free(r);
 }
 
-// LCOV_EXCL_START
+static void evalRectDeriv_dxdv_fd(double t, double *q, double *a,
+				  int nargs,
+				  struct potentialArg * potentialArgs){
+  // Adds the Jacobian of the force times [dx,dv] to a[3:6], with the
+  // Jacobian computed using central finite differences of the force
+  // w.r.t. the position and, for velocity-dependent forces, the velocity
+  int ii,jj,nvar= 3;
+  double h, tmp, rscale, vscale;
+  double qp[6], ap[6], am[6];
+  for (ii=0; ii < nargs; ii++)
+    if ( (potentialArgs+ii)->requiresVelocity ) {
+      nvar= 6;
+      break;
+    }
+  rscale= sqrt( *q * *q + *(q+1) * *(q+1) + *(q+2) * *(q+2) );
+  vscale= sqrt( *(q+3) * *(q+3) + *(q+4) * *(q+4) + *(q+5) * *(q+5) );
+  if ( rscale == 0. ) rscale= 1.;
+  if ( vscale == 0. ) vscale= 1.;
+  for (ii=0; ii < 6; ii++)
+    *(qp+ii)= *(q+ii);
+  for (ii=0; ii < nvar; ii++) {
+    h= DXDV_FD_STEP * ( ii < 3 ? rscale : vscale );
+    tmp= *(q+ii) + h; // make sure h is exactly representable
+    h= tmp - *(q+ii);
+    *(qp+ii)= *(q+ii) + h;
+    evalRectDeriv(t,qp,ap,nargs,potentialArgs);
+    *(qp+ii)= *(q+ii) - h;
+    evalRectDeriv(t,qp,am,nargs,potentialArgs);
+    *(qp+ii)= *(q+ii);
+    for (jj=0; jj < 3; jj++)
+      *(a+3+jj)+= ( *(ap+3+jj) - *(am+3+jj) ) / 2. / h * *(q+6+ii);
+  }
+}
 void evalRectDeriv_dxdv(double t, double *q, double *a,
 			int nargs, struct potentialArg * potentialArgs){
-  double sinphi, cosphi, x, y, phi,R,Rforce,phitorque,z,zforce;
-  double R2deriv, phi2deriv, Rphideriv, dFxdx, dFxdy, dFydx, dFydy;
-  //first three derivatives are just the velocities
-  *a++= *(q+3);
-  *a++= *(q+4);
-  *a++= *(q+5);
-  //Rest is force
-  //q is rectangular so calculate R and phi
-  x= *q;
-  y= *(q+1);
-  z= *(q+2);
-  R= sqrt(x*x+y*y);
-  phi= acos(x/R);
-  sinphi= y/R;
-  cosphi= x/R;
-  if ( y < 0. ) phi= 2.*M_PI-phi;
-  //Calculate the forces
-  Rforce= calcRforce(R,z,phi,t,nargs,potentialArgs);
-  zforce= calczforce(R,z,phi,t,nargs,potentialArgs);
-  phitorque= calcphitorque(R,z,phi,t,nargs,potentialArgs);
-  *a++= cosphi*Rforce-1./R*sinphi*phitorque;
-  *a++= sinphi*Rforce+1./R*cosphi*phitorque;
-  *a++= zforce;
+  int ii,jj,nfd= 0;
+  double r, xdx, d2phidr2, dphidr_r;
+  //first six derivatives are those of the orbit
+  evalRectDeriv(t,q,a,nargs,potentialArgs);
   //dx derivatives are just dv
-  *a++= *(q+9);
-  *a++= *(q+10);
-  *a++= *(q+11);
-  //for the dv derivatives we need also R2deriv, phi2deriv, and Rphideriv
-  R2deriv= calcR2deriv(R,z,phi,t,nargs,potentialArgs);
-  phi2deriv= calcphi2deriv(R,z,phi,t,nargs,potentialArgs);
-  Rphideriv= calcRphideriv(R,z,phi,t,nargs,potentialArgs);
-  //..and dFxdx, dFxdy, dFydx, dFydy
-  dFxdx= -cosphi*cosphi*R2deriv
-    +2.*cosphi*sinphi/R/R*phitorque
-    +sinphi*sinphi/R*Rforce
-    +2.*sinphi*cosphi/R*Rphideriv
-    -sinphi*sinphi/R/R*phi2deriv;
-  dFxdy= -sinphi*cosphi*R2deriv
-    +(sinphi*sinphi-cosphi*cosphi)/R/R*phitorque
-    -cosphi*sinphi/R*Rforce
-    -(cosphi*cosphi-sinphi*sinphi)/R*Rphideriv
-    +cosphi*sinphi/R/R*phi2deriv;
-  dFydx= -cosphi*sinphi*R2deriv
-    +(sinphi*sinphi-cosphi*cosphi)/R/R*phitorque
-    +(sinphi*sinphi-cosphi*cosphi)/R*Rphideriv
-    -sinphi*cosphi/R*Rforce
-    +sinphi*cosphi/R/R*phi2deriv;
-  dFydy= -sinphi*sinphi*R2deriv
-    -2.*sinphi*cosphi/R/R*phitorque
-    -2.*sinphi*cosphi/R*Rphideriv
-    +cosphi*cosphi/R*Rforce
-    -cosphi*cosphi/R/R*phi2deriv;
-  *a++= dFxdx * *(q+4) + dFxdy * *(q+5);
-  *a++= dFydx * *(q+4) + dFydy * *(q+5);
-  *a= 0; //BOVY: PUT IN Z2DERIVS
+  for (ii=0; ii < 3; ii++)
+    *(a+6+ii)= *(q+9+ii);
+  //dv derivatives are the Jacobian of the force times dx (and dv for
+  //velocity-dependent forces)
+  for (ii=0; ii < 3; ii++)
+    *(a+9+ii)= 0.;
+  r= sqrt( *q * *q + *(q+1) * *(q+1) + *(q+2) * *(q+2) );
+  for (ii=0; ii < nargs; ii++)
+    if ( !(potentialArgs+ii)->hasSphericalHessian || r == 0. )
+      nfd++;
+  if ( nfd == nargs ) { // no analytic second derivatives
+    evalRectDeriv_dxdv_fd(t,q,a+6,nargs,potentialArgs);
+    return;
+  }
+  // Spherical potentials: the Hessian is
+  // Phi'' x x^T / r^2 + Phi' / r ( I - x x^T / r^2 )
+  xdx= ( *q * *(q+6) + *(q+1) * *(q+7) + *(q+2) * *(q+8) ) / r / r;
+  for (ii=0; ii < nargs; ii++) {
+    if ( (potentialArgs+ii)->hasSphericalHessian ) {
+      d2phidr2= (potentialArgs+ii)->planarR2deriv(r,0.,t,potentialArgs+ii);
+      dphidr_r= -(potentialArgs+ii)->planarRforce(r,0.,t,potentialArgs+ii)/r;
+      for (jj=0; jj < 3; jj++)
+	*(a+9+jj)-= ( d2phidr2 - dphidr_r ) * *(q+jj) * xdx
+	  + dphidr_r * *(q+6+jj);
+    }
+    else // finite differences for the others
+      evalRectDeriv_dxdv_fd(t,q,a+6,1,potentialArgs+ii);
+  }
 }
-
-// LCOV_EXCL_STOP
@@ -21,9 +21,11 @@ void parse_leapFuncArgs_Full(int, struct potentialArg *,int **,double **,tfuncs_
 #if defined(_OPENMP)
 #include <omp.h>
 #else
+#include <time.h>
 typedef int omp_int_t;
 static inline omp_int_t omp_get_thread_num(void) { return 0;}
 static inline omp_int_t omp_get_max_threads(void) { return 1;}
+static inline double omp_get_wtime(void) { return (double) clock() / CLOCKS_PER_SEC;}
 #endif
 #ifdef __cplusplus
 }
@@ -125,12 +125,17 @@ EXPORT void integrateLinearOrbit(int nobj,
 				 double atol,
 				 double *result,
 				 int * err,
+				 double * stats,
+				 int * order,
+				 int chunksize,
 				 int odeint_type,
          orbint_callback_type cb){
   //Set up the forces, first count
   int dim;
   int ii;
+  int kk;
   int max_threads;
+  double walltime;
   int * thread_pot_type;
   double * thread_pot_args;
   tfuncs_type_arr thread_pot_tfuncs;
@@ -182,6 +187,16 @@ EXPORT void integrateLinearOrbit(int nobj,
     odeint_deriv_func= &evalLinearForce;
     dim= 1;
     break;
+  case 7: //ttleapfrog
+    odeint_func= &ttleapfrog;
+    odeint_deriv_func= &evalLinearForce;
+    dim= 1;
+    break;
+  case 8: //ttsymplec4
+    odeint_func= &ttsymplec4;
+    odeint_deriv_func= &evalLinearForce;
+    dim= 1;
+    break;
   case 5: //DOPR54
     odeint_func= &bovy_dopr54;
     odeint_deriv_func= &evalLinearDeriv;
@@ -193,11 +208,20 @@ EXPORT void integrateLinearOrbit(int nobj,
     dim= 2;
     break;
   }
-#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii) num_threads(max_threads)
-  for (ii=0; ii < nobj; ii++) {
+  if ( chunksize < 1 ) chunksize= ORBITS_CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunksize) private(kk,ii,walltime) num_threads(max_threads)
+  for (kk=0; kk < nobj; kk++) {
+    ii= order ? *(order+kk) : kk; // order is, e.g., longest orbits first
+    if ( stats ) { // collect the integrator's work counters for this orbit
+      reset_integrator_stats();
+      walltime= omp_get_wtime();
+    }
     odeint_func(odeint_deriv_func,dim,yo+2*ii,nt,dt,t,
 		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
 		result+2*nt*ii,err+ii);
+    if ( stats )
+      save_integrator_stats(stats+INTEGRATOR_NSTATS*ii,
+			    omp_get_wtime()-walltime,omp_get_thread_num());
     if ( cb ) // Callback if not void
       cb();
   }
@@ -211,10 +235,12 @@ EXPORT void integrateLinearOrbit(int nobj,
 
 void evalLinearForce(double t, double *q, double *a,
 		     int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   *a= calcLinearForce(*q,t,nargs,potentialArgs);
 }
 void evalLinearDeriv(double t, double *q, double *a,
 		     int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   *a++= *(q+1);
   *a= calcLinearForce(*q,t,nargs,potentialArgs);
 }
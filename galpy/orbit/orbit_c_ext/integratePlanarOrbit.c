@@ -9,6 +9,8 @@
 #include <bovy_symplecticode.h>
 #include <bovy_rk.h>
 #include <leung_dop853.h>
+#include <orbit_events.h>
+#include <orbit_reduce.h>
 #include <integrateFullOrbit.h>
 //Potentials
 #include <galpy_potentials.h>
@@ -445,6 +447,13 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
       potentialArgs->nargs= 0;
       potentialArgs->ntfuncs= 0;
       break;
+    case 41: //JITPotential, 9 arguments
+      potentialArgs->potentialEval= &JITPotentialEval;
+      potentialArgs->planarRforce= &JITPotentialPlanarRforce;
+      potentialArgs->planarphitorque= &JITPotentialPlanarphitorque;
+      potentialArgs->nargs= 9;
+      potentialArgs->ntfuncs= 0;
+      break;
 //////////////////////////////// WRAPPERS /////////////////////////////////////
     case -1: //DehnenSmoothWrapperPotential
       potentialArgs->potentialEval= &DehnenSmoothWrapperPotentialEval;
@@ -498,7 +507,7 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
       potentialArgs->planarR2deriv= &TimeDependentAmplitudeWrapperPotentialPlanarR2deriv;
       potentialArgs->planarphi2deriv= &TimeDependentAmplitudeWrapperPotentialPlanarphi2deriv;
       potentialArgs->planarRphideriv= &TimeDependentAmplitudeWrapperPotentialPlanarRphideriv;
-      potentialArgs->nargs= 4;
+      potentialArgs->nargs= 1;
       potentialArgs->ntfuncs= 1;
       break;
     }
@@ -521,10 +530,7 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
     }
     potentialArgs->args-= potentialArgs->nargs;
     // and load each potential's time functions
-    if ( potentialArgs->ntfuncs > 0 ) {
-      potentialArgs->tfuncs= (*pot_tfuncs);
-      (*pot_tfuncs)+= potentialArgs->ntfuncs;
-    }
+    parse_tfuncs(potentialArgs,pot_args,pot_tfuncs);
     potentialArgs++;
   }
   potentialArgs-= npot;
@@ -542,12 +548,17 @@ EXPORT void integratePlanarOrbit(int nobj,
 				 double atol,
 				 double *result,
 				 int * err,
+				 double * stats,
+				 int * order,
+				 int chunksize,
 				 int odeint_type,
          orbint_callback_type cb){
   //Set up the forces, first count
   int ii,jj;
   int dim;
+  int kk;
   int max_threads;
+  double walltime;
   int * thread_pot_type;
   double * thread_pot_args;
   tfuncs_type_arr thread_pot_tfuncs;
@@ -599,6 +610,16 @@ EXPORT void integratePlanarOrbit(int nobj,
     odeint_deriv_func= &evalPlanarRectForce;
     dim= 2;
     break;
+  case 7: //ttleapfrog
+    odeint_func= &ttleapfrog;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 8: //ttsymplec4
+    odeint_func= &ttsymplec4;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
   case 5: //DOPR54
     odeint_func= &bovy_dopr54;
     odeint_deriv_func= &evalPlanarRectDeriv;
@@ -610,14 +631,146 @@ EXPORT void integratePlanarOrbit(int nobj,
     dim= 4;
     break;
   }
-#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
-  for (ii=0; ii < nobj; ii++) {
+  if ( chunksize < 1 ) chunksize= ORBITS_CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunksize) private(kk,ii,walltime,jj) num_threads(max_threads)
+  for (kk=0; kk < nobj; kk++) {
+    ii= order ? *(order+kk) : kk; // order is, e.g., longest orbits first
+    if ( stats ) { // collect the integrator's work counters for this orbit
+      reset_integrator_stats();
+      walltime= omp_get_wtime();
+    }
     polar_to_rect_galpy(yo+4*ii);
     odeint_func(odeint_deriv_func,dim,yo+4*ii,nt,dt,t,
 		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
 		result+4*nt*ii,err+ii);
     for (jj= 0; jj < nt; jj++)
       rect_to_polar_galpy(result+4*jj+4*nt*ii);
+    if ( stats )
+      save_integrator_stats(stats+INTEGRATOR_NSTATS*ii,
+			    omp_get_wtime()-walltime,omp_get_thread_num());
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  //Done!
+}
+EXPORT void integratePlanarOrbit_reduce(int nobj,
+				 double *yo,
+				 int nt,
+				 double *t,
+				 int npot,
+				 int * pot_type,
+				 double * pot_args,
+         tfuncs_type_arr pot_tfuncs,
+				 double dt,
+				 double rtol,
+				 double atol,
+				 int nred,
+				 int * quantity,
+				 int * stat,
+				 double * reduced,
+				 int nhistR,
+				 int nhistz,
+				 double * hist_range,
+				 double * hist,
+				 int * err,
+				 int odeint_type,
+         orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii,jj;
+  int dim;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs(npot,potentialArgs+ii*npot,
+      &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Scratch space for a single orbit and the histogram, one / thread
+  double * result= (double *) malloc ( max_threads * nt * 4 * sizeof (double) );
+  double * thread_hist= (double *) calloc ( max_threads * nhistR * nhistz , sizeof (double) );
+  //Integrate
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *);
+  void (*odeint_deriv_func)(double, double *, double *,
+			    int,struct potentialArg *);
+  switch ( odeint_type ) {
+  case 0: //leapfrog
+    odeint_func= &leapfrog;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 1: //RK4
+    odeint_func= &bovy_rk4;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 3: //symplec4
+    odeint_func= &symplec4;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 4: //symplec6
+    odeint_func= &symplec6;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 7: //ttleapfrog
+    odeint_func= &ttleapfrog;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 8: //ttsymplec4
+    odeint_func= &ttsymplec4;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 6: //DOP853
+    odeint_func= &dop853;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  }
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    polar_to_rect_galpy(yo+4*ii);
+    odeint_func(odeint_deriv_func,dim,yo+4*ii,nt,dt,t,
+		npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		result+4*nt*omp_get_thread_num(),err+ii);
+    for (jj= 0; jj < nt; jj++)
+      rect_to_polar_galpy(result+4*jj+4*nt*omp_get_thread_num());
+    reduce_orbit(nt,t,4,result+4*nt*omp_get_thread_num(),
+		 npot,potentialArgs+omp_get_thread_num()*npot,
+		 nred,quantity,stat,reduced+nred*ii,nhistR,nhistz,hist_range,
+		 thread_hist+nhistR*nhistz*omp_get_thread_num());
     if ( cb ) // Callback if not void
       cb();
   }
@@ -626,9 +779,168 @@ EXPORT void integratePlanarOrbit(int nobj,
   for (ii=0; ii < max_threads; ii++)
     free_potentialArgs(npot,potentialArgs+ii*npot);
   free(potentialArgs);
+  // Combine the histograms of the different threads
+  for (ii=0; ii < max_threads; ii++)
+    for (jj=0; jj < nhistR * nhistz; jj++)
+      *(hist+jj)+= *(thread_hist+nhistR*nhistz*ii+jj);
+  free(result);
+  free(thread_hist);
   //Done!
 }
 
+EXPORT void integratePlanarOrbit_dense(int nobj,
+				     double *yo,
+				     int nt,
+				     double *t,
+				     int npot,
+				     int * pot_type,
+				     double * pot_args,
+				     tfuncs_type_arr pot_tfuncs,
+				     double rtol,
+				     double atol,
+				     int nmax,
+				     int * nsteps,
+				     double * tsteps,
+				     double * coeffs,
+				     double *result,
+				     int * err,
+				     int odeint_type,
+				     orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii,jj;
+  int ncoeffs;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs(npot,potentialArgs+ii*npot,
+      &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Only the Dormand-Prince integrators have dense output
+  ncoeffs= ( odeint_type == 6 ) ? 8 : 5;
+  //Integrate
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    polar_to_rect_galpy(yo+4*ii);
+    if ( odeint_type == 6 )
+      dop853_dense(&evalPlanarRectDeriv,4,yo+4*ii,nt,-9999.99,t,
+		   npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		   result+4*nt*ii,err+ii,
+		   nmax,nsteps+ii,tsteps+(nmax+1)*ii,coeffs+ncoeffs*4*nmax*ii,
+		   NULL,NULL);
+    else
+      bovy_dopr54_dense(&evalPlanarRectDeriv,4,yo+4*ii,nt,-9999.99,t,
+			npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+			nmax,nsteps+ii,tsteps+(nmax+1)*ii,
+			coeffs+ncoeffs*4*nmax*ii,
+			result+4*nt*ii,err+ii,NULL,NULL);
+    for (jj=0; jj < nt; jj++)
+      rect_to_polar_galpy(result+4*jj+4*nt*ii);
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  //Done!
+}
+EXPORT void integratePlanarOrbit_events(int nobj,
+					double *yo,
+					int nt,
+					double *t,
+					int npot,
+					int * pot_type,
+					double * pot_args,
+					tfuncs_type_arr pot_tfuncs,
+					double rtol,
+					double atol,
+					int ntypes,
+					int * types,
+					double phi_event,
+					int nmax,
+					int * nevents,
+					double * tevents,
+					int * ievents,
+					double * yevents,
+					double *result,
+					int * err,
+					int odeint_type,
+					orbint_callback_type cb){
+  //Set up the forces, first count
+  int ii,jj;
+  int ncoeffs;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  struct orbitEvents ev;
+  max_threads= ( nobj < omp_get_max_threads() ) ? nobj : omp_get_max_threads();
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs(npot,potentialArgs+ii*npot,
+      &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Only the Dormand-Prince integrators have dense output
+  ncoeffs= ( odeint_type == 6 ) ? 8 : 5;
+  // Scratch space for the dense output of a single step, one / thread
+  double * coeffs= (double *) malloc ( max_threads * ncoeffs * 4 * sizeof (double) );
+  //Integrate
+#pragma omp parallel for schedule(dynamic,ORBITS_CHUNKSIZE) private(ii,jj,ev) num_threads(max_threads)
+  for (ii=0; ii < nobj; ii++) {
+    ev.dim= 4;
+    ev.ntypes= ntypes;
+    ev.types= types;
+    ev.cosphi= cos(phi_event);
+    ev.sinphi= sin(phi_event);
+    ev.tf= *(t+nt-1);
+    ev.nmax= nmax;
+    ev.nevents= nevents+ii;
+    ev.tevents= tevents+nmax*ii;
+    ev.ievents= ievents+nmax*ii;
+    ev.yevents= yevents+4*nmax*ii;
+    *(nevents+ii)= 0;
+    polar_to_rect_galpy(yo+4*ii);
+    if ( odeint_type == 6 )
+      dop853_dense(&evalPlanarRectDeriv,4,yo+4*ii,nt,-9999.99,t,
+		   npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+		   result+4*nt*ii,err+ii,
+		   0,NULL,NULL,coeffs+ncoeffs*4*omp_get_thread_num(),
+		   &find_events,&ev);
+    else
+      bovy_dopr54_dense(&evalPlanarRectDeriv,4,yo+4*ii,nt,-9999.99,t,
+			npot,potentialArgs+omp_get_thread_num()*npot,rtol,atol,
+			0,NULL,NULL,coeffs+ncoeffs*4*omp_get_thread_num(),
+			result+4*nt*ii,err+ii,&find_events,&ev);
+    for (jj=0; jj < nt; jj++)
+      rect_to_polar_galpy(result+4*jj+4*nt*ii);
+    for (jj=0; jj < ( *(nevents+ii) < nmax ? *(nevents+ii) : nmax ); jj++)
+      rect_to_polar_galpy(yevents+4*jj+4*nmax*ii);
+    if ( cb ) // Callback if not void
+      cb();
+  }
+  //Free allocated memory
+#pragma omp parallel for schedule(static,1) private(ii) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  free(coeffs);
+  //Done!
+}
 EXPORT void integratePlanarOrbit_dxdv(double *yo,
 				      int nt,
 				      double *t,
@@ -690,6 +1002,7 @@ EXPORT void integratePlanarOrbit_dxdv(double *yo,
 
 void evalPlanarRectForce(double t, double *q, double *a,
 			 int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   double sinphi, cosphi, x, y, phi,R,Rforce,phitorque;
   //q is rectangular so calculate R and phi
   x= *q;
@@ -707,6 +1020,7 @@ void evalPlanarRectForce(double t, double *q, double *a,
 }
 void evalPlanarRectDeriv(double t, double *q, double *a,
 			 int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   double sinphi, cosphi, x, y, phi,R,Rforce,phitorque;
   //first two derivatives are just the velocities
   *a++= *(q+2);
@@ -729,6 +1043,7 @@ void evalPlanarRectDeriv(double t, double *q, double *a,
 
 void evalPlanarRectDeriv_dxdv(double t, double *q, double *a,
 			      int nargs, struct potentialArg * potentialArgs){
+  integrator_stats.nfev+= 1;
   double sinphi, cosphi, x, y, phi,R,Rforce,phitorque;
   double R2deriv, phi2deriv, Rphideriv, dFxdx, dFxdy, dFydx, dFydy;
   //first two derivatives are just the velocities
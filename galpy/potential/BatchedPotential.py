@@ -0,0 +1,132 @@
+###############################################################################
+#   BatchedPotential.py: class that represents a batch of potentials of the
+#                        same type with different parameters
+###############################################################################
+import numpy
+
+from .Potential import Potential
+
+
+class BatchedPotential(Potential):
+    """Class that represents a batch of K potentials of the same type whose parameters are given as arrays of length K (e.g., for evaluating many parameter vectors when fitting a potential); all evaluation functions return arrays with shape (K,*input_shape). When possible, the potential is set up once with array-valued parameters and evaluated for all K parameter vectors at once using numpy broadcasting, otherwise each of the K potentials is set up and evaluated separately"""
+    def __init__(self,pot_type=None,ro=None,vo=None,**kwargs):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           initialize a BatchedPotential
+
+        INPUT:
+
+           pot_type - Potential class (e.g., MiyamotoNagaiPotential)
+
+           ro=, vo= distance and velocity scales for translation into internal units (default from configuration file)
+
+           Any other keyword argument is passed to pot_type; these can be arrays of length K (or Quantity arrays), in which case the k-th potential in the batch uses the k-th element; scalar arguments are used for all potentials
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        Potential.__init__(self,amp=1.,ro=ro,vo=vo)
+        self._pot_type= pot_type
+        self._pot_kwargs= kwargs
+        self._batched_kwargs= [key for key,value in kwargs.items()
+                               if numpy.ndim(value) > 0]
+        sizes= {numpy.size(kwargs[key]) for key in self._batched_kwargs}
+        if len(sizes) > 1:
+            raise ValueError('All array-valued parameters of a BatchedPotential need to have the same length')
+        self._K= sizes.pop() if len(sizes) > 0 else 1
+        # Try to set up a single potential with parameters of shape (K,1),
+        # such that evaluating it at N points returns a (K,N) array; check
+        # this with N != K points against the first and last potential
+        try:
+            self._pot= pot_type(ro=ro,vo=vo,
+                                **{key:(numpy.reshape(value,(-1,1))
+                                        if key in self._batched_kwargs
+                                        else value)
+                                   for key,value in kwargs.items()})
+            R= numpy.linspace(0.5,1.5,self._K+1)
+            z= numpy.linspace(0.1,0.3,self._K+1)
+            out= numpy.broadcast_to(self._pot._amp*self._pot._evaluate(R,z),
+                                    (self._K,self._K+1))
+            for ii in [0,self._K-1]:
+                pot= self[ii]
+                if not numpy.allclose(out[ii],pot._amp*pot._evaluate(R,z),
+                                      rtol=1e-8,atol=0.,equal_nan=True):
+                    raise ValueError('Potential cannot be vectorized')
+        except Exception:
+            self._pot= None
+            self._pots= [self[ii] for ii in range(self._K)]
+        example= self[0] if self._pot is None else self._pot
+        self.isNonAxi= example.isNonAxi
+        self.hasC= False
+        self.hasC_dxdv= False
+        self.hasC_dens= False
+        return None
+
+    def __len__(self):
+        return self._K
+
+    def __getitem__(self,key):
+        """Return the key-th potential in the batch"""
+        return self._pot_type(ro=self._ro if self._roSet else None,
+                              vo=self._vo if self._voSet else None,
+                              **{k:(v[key] if k in self._batched_kwargs else v)
+                                 for k,v in self._pot_kwargs.items()})
+
+    @property
+    def vectorized(self):
+        """Whether the potentials in the batch are evaluated at once using numpy broadcasting (True) or one-by-one (False)"""
+        return not self._pot is None
+
+    def _evaluate_batch(self,method,R,z,phi=0.,t=0.):
+        R,z,phi,t= numpy.broadcast_arrays(R,z,phi,t)
+        shape= R.shape
+        if self._pot is None:
+            return numpy.array([p._amp*getattr(p,method)(R,z,phi=phi,t=t)
+                                *numpy.ones(shape) for p in self._pots])
+        out= self._pot._amp*getattr(self._pot,method)(R.flatten(),
+                                                      z.flatten(),
+                                                      phi=phi.flatten(),
+                                                      t=t.flatten())
+        return numpy.broadcast_to(out,(self._K,R.size))\
+            .reshape((self._K,)+shape)
+
+    def _evaluate(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_evaluate',R,z,phi=phi,t=t)
+
+    def _Rforce(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_Rforce',R,z,phi=phi,t=t)
+
+    def _zforce(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_zforce',R,z,phi=phi,t=t)
+
+    def _phitorque(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_phitorque',R,z,phi=phi,t=t)
+
+    def _dens(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_dens',R,z,phi=phi,t=t)
+
+    def _R2deriv(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_R2deriv',R,z,phi=phi,t=t)
+
+    def _z2deriv(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_z2deriv',R,z,phi=phi,t=t)
+
+    def _Rzderiv(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_Rzderiv',R,z,phi=phi,t=t)
+
+    def _phi2deriv(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_phi2deriv',R,z,phi=phi,t=t)
+
+    def _Rphideriv(self,R,z,phi=0.,t=0.):
+        return self._evaluate_batch('_Rphideriv',R,z,phi=phi,t=t)
@@ -0,0 +1,187 @@
+###############################################################################
+#   CompiledPotential.py: class that caches the parsed form of a potential
+#                         that is passed to the C code
+###############################################################################
+import functools
+import numbers
+
+import numpy
+
+from .Force import Force
+
+# Types of the scalar parameters of potentials, checked before the slower
+# isinstance(value,numbers.Number)
+_SCALAR_TYPES= {float,int,bool,str,type(None),numpy.float64,numpy.int64,
+                numpy.bool_}
+
+
+class CompiledPotential:
+    """Class that caches the parsed form of a potential or list of potentials that is passed to the C code, such that it is not re-parsed on every call; can be used wherever a potential is passed to the C code (orbit integration, actions, ...)"""
+    def __init__(self,pot):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           initialize a CompiledPotential
+
+        INPUT:
+
+           pot - Potential instance or list of such instances (planar and linear potentials are also allowed)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        from .Potential import flatten
+        self._pot= flatten(pot)
+        self.clear()
+        return None
+
+    @property
+    def pot(self):
+        """The (flattened) potential that this CompiledPotential represents"""
+        return self._pot
+
+    def __repr__(self):
+        return f'CompiledPotential({self._pot!r})'
+
+    def is_valid(self):
+        """
+        NAME:
+
+           is_valid
+
+        PURPOSE:
+
+           check whether the cached parsed potential is still valid, that is, whether the parameters of the potential have not changed since it was parsed (including changes to the elements of an array parameter in place)
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           True if the cache is valid, False otherwise
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        values, objects= _potential_state(self._members)
+        return values == self._state[0] \
+            and len(objects) == len(self._state[1]) \
+            and all(o is so for o,so in zip(objects,self._state[1]))
+
+    def clear(self):
+        """
+        NAME:
+
+           clear
+
+        PURPOSE:
+
+           clear the cache of parsed potentials (changes to the potential are detected automatically, so this is only necessary to free memory)
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        self._members= _potential_members(self._pot)
+        self._state= _potential_state(self._members)
+        self._cache= {}
+        return None
+
+    def _parse(self,kind,prep_tfuncs=False,**kwargs):
+        """Return the cached (npot,pot_type,pot_args,pot_tfuncs) for kind='full', 'planar', or 'linear' and the kwargs of the corresponding _parse_pot, parsing the potential if necessary (with prep_tfuncs=True, pot_tfuncs is already converted to the C function pointers); the output should not be modified"""
+        if not self.is_valid():
+            self.clear()
+        key= (kind,)+tuple((k,v.tobytes() if isinstance(v,numpy.ndarray)
+                            else v) for k,v in sorted(kwargs.items()))
+        if prep_tfuncs:
+            if not key+('prep_tfuncs',) in self._cache:
+                from ..orbit.integratePlanarOrbit import _prep_tfuncs
+                npot, pot_type, pot_args, pot_tfuncs= \
+                    self._parse(kind,**kwargs)
+                self._cache[key+('prep_tfuncs',)]= \
+                    (npot,pot_type,pot_args,_prep_tfuncs(pot_tfuncs))
+            return self._cache[key+('prep_tfuncs',)]
+        if not key in self._cache:
+            if kind == 'full':
+                from ..orbit.integrateFullOrbit import _parse_pot
+                pot= self._pot
+            elif kind == 'planar':
+                from ..orbit.integratePlanarOrbit import _parse_pot
+                from .planarPotential import toPlanarPotential
+                if not 'planarpot' in self._cache:
+                    self._cache['planarpot']= toPlanarPotential(self._pot)
+                pot= self._cache['planarpot']
+            elif kind == 'linear':
+                from ..orbit.integrateLinearOrbit import _parse_pot
+                pot= self._pot
+            self._cache[key]= _parse_pot(pot,**kwargs)
+        return self._cache[key]
+
+@functools.lru_cache(maxsize=None)
+def _is_memo_attribute(name):
+    """Whether an attribute of a potential memoises its evaluation (e.g., SCFPotential's _force_hash and _cached_dPhi_dr) rather than being one of its parameters"""
+    return name.startswith('_cached') or name.endswith('_hash')
+
+def _potential_members(pot):
+    """Find all potential instances that make up a (list of) potential(s), including those wrapped by or used inside other potentials"""
+    from .linearPotential import linearPotential
+    from .planarPotential import planarPotential
+    members= []
+    def find(obj):
+        if isinstance(obj,(Force,planarPotential,linearPotential)):
+            if any(obj is m for m in members): return None
+            members.append(obj)
+            for key,value in obj.__dict__.items():
+                if not _is_memo_attribute(key): find(value)
+        elif isinstance(obj,(list,tuple)):
+            for o in obj: find(o)
+        return None
+    find(pot)
+    return members
+
+def _potential_state(members):
+    """Gather the state of the potential instances in members: a list of their numerical parameters (arrays by value) and a list of their other attributes, which are compared by identity"""
+    values= []
+    objects= []
+    def gather(value):
+        if type(value) in _SCALAR_TYPES or isinstance(value,numbers.Number):
+            values.append(value)
+        elif isinstance(value,numpy.ndarray) and value.dtype.kind in 'biufc':
+            values.append((value.shape,value.dtype.char,value.tobytes()))
+        elif isinstance(value,(list,tuple)):
+            values.append(len(value))
+            for v in value: gather(v)
+        else:
+            objects.append(value)
+        return None
+    for m in members:
+        for key,value in m.__dict__.items():
+            if _is_memo_attribute(key):
+                continue
+            elif type(value) in _SCALAR_TYPES: # fast path
+                values.append(value)
+            else:
+                gather(value)
+    return (values,objects)
@@ -0,0 +1,130 @@
+###############################################################################
+#   JITPotential.py: class that compiles the methods of a Python potential
+#                    to native code with numba, such that it can be used
+#                    in the C code
+###############################################################################
+import numpy
+
+from ..util._optional_deps import _NUMBA_LOADED
+from .Potential import Potential, PotentialError
+
+if _NUMBA_LOADED:
+    from numba import cfunc, njit, types
+
+# Methods that are compiled, in the order expected by the C code
+_JIT_METHODS= ['_evaluate','_Rforce','_zforce','_phitorque']
+
+class JITPotential(Potential):
+    """Class that compiles the methods of a Python potential (typically a user-defined subclass of Potential) to native code using numba, such that the potential can be used in the C orbit integrators and the other C code. The ``_evaluate``, ``_Rforce``, ``_zforce``, and (for non-axisymmetric potentials) ``_phitorque`` methods of the potential need to be written in the subset of Python and numpy supported by numba's nopython mode and can only use the potential's numerical attributes (numbers, booleans, and numerical arrays), not call its other methods"""
+    def __init__(self,amp=1.,pot=None,ro=None,vo=None):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           initialize a JITPotential
+
+        INPUT:
+
+           amp - amplitude to be applied to the potential (default: 1.)
+
+           pot - Potential instance whose methods to compile
+
+           ro=, vo= distance and velocity scales for translation into internal units (default from the wrapped potential if set there, otherwise from configuration file)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-18 - Written - agent
+
+        """
+        if not _NUMBA_LOADED:
+            raise ImportError('JITPotential requires numba to be installed')
+        if ro is None and pot._roSet: ro= pot._ro
+        if vo is None and pot._voSet: vo= pot._vo
+        Potential.__init__(self,amp=amp,ro=ro,vo=vo)
+        self._pot= pot
+        self.isNonAxi= pot.isNonAxi
+        self._jit_params= None
+        self._compile()
+        self.hasC= True
+        self.hasC_dxdv= False
+        return None
+
+    def _evaluate(self,R,z,phi=0.,t=0.):
+        return self._pot._amp*self._pot._evaluate(R,z,phi=phi,t=t)
+
+    def _Rforce(self,R,z,phi=0.,t=0.):
+        return self._pot._Rforce_nodecorator(R,z,phi=phi,t=t)
+
+    def _zforce(self,R,z,phi=0.,t=0.):
+        return self._pot._zforce_nodecorator(R,z,phi=phi,t=t)
+
+    def _phitorque(self,R,z,phi=0.,t=0.):
+        return self._pot._phitorque_nodecorator(R,z,phi=phi,t=t)
+
+    def _dens(self,R,z,phi=0.,t=0.):
+        return self._pot._amp*self._pot._dens(R,z,phi=phi,t=t)
+
+    def _compile(self):
+        """Compile the methods of the wrapped potential to C functions of (R,z,phi,t), freezing the current values of its parameters"""
+        params= _parameter_record(self._pot)
+        sig= types.double(types.double,types.double,
+                          types.double,types.double)
+        self._jit_funcs= []
+        for method in _JIT_METHODS:
+            func= getattr(type(self._pot),method,None)
+            if func is None and method == '_phitorque' \
+                    and not self._pot.isNonAxi:
+                func= _zero_torque
+            elif func is None:
+                raise PotentialError(f"'{method}' function not implemented for this potential")
+            try:
+                self._jit_funcs.append(cfunc(sig)(_bind(njit(func),params)))
+            except Exception as e:
+                raise PotentialError(f"Could not compile the '{method}' method of {type(self._pot).__name__} with numba; the method can only use numerical attributes of the potential and the subset of Python and numpy supported by numba's nopython mode") from e
+        self._jit_params= params
+        return None
+
+    def _c_args(self):
+        """Return the arguments to pass to the C code: the amplitude and the addresses of the compiled functions, split into their high and low 32 bits; re-compiles the functions if the parameters of the wrapped potential have changed"""
+        if _parameter_record(self._pot).tobytes() \
+                != self._jit_params.tobytes():
+            self._compile()
+        out= [self._amp*self._pot._amp]
+        for func in self._jit_funcs:
+            out.extend([func.address >> 32,func.address & 0xffffffff])
+        return out
+
+def _parameter_record(pot):
+    """Gather the numerical attributes of a potential in a numpy record, which numba can access as pot.attribute"""
+    fields= []
+    values= []
+    for key,value in pot.__dict__.items():
+        if isinstance(value,(bool,numpy.bool_)):
+            fields.append((key,numpy.bool_))
+        elif isinstance(value,(int,numpy.integer)):
+            fields.append((key,numpy.int64))
+        elif isinstance(value,(float,numpy.floating)):
+            fields.append((key,numpy.float64))
+        elif isinstance(value,numpy.ndarray) and value.size > 0 \
+                and value.dtype.kind in 'biuf':
+            fields.append((key,value.dtype,value.shape))
+        else:
+            continue
+        values.append(value)
+    return numpy.array([tuple(values)],dtype=fields)
+
+def _bind(jitted,params):
+    """Return a function of (R,z,phi,t) that calls the jitted method with the parameter record as self (numba freezes params as a constant)"""
+    def bound(R,z,phi,t):
+        return jitted(params[0],R,z,phi,t)
+    return bound
+
+def _zero_torque(self,R,z,phi=0.,t=0.):
+    return 0.
@@ -13,6 +13,7 @@
 #    for epicycle frequency
 #      function _R2deriv(self,R,z,phi) return d2 Phi dR2
 ###############################################################################
+import ctypes
 import os
 import os.path
 import pickle
@@ -20,12 +21,14 @@ import warnings
 from functools import wraps
 
 import numpy
+from numpy.ctypeslib import ndpointer
 from scipy import integrate, optimize
 
-from ..util import conversion, coords, galpyWarning, plot
+from ..util import _load_extension_libs, conversion, coords, galpyWarning, plot
 from ..util._optional_deps import _APY_LOADED
 from ..util.conversion import (freq_in_Gyr, get_physical, physical_conversion,
                                potential_physical_input, velocity_in_kpcGyr)
+from .CompiledPotential import CompiledPotential
 from .DissipativeForce import DissipativeForce, _isDissipative
 from .Force import Force
 from .plotEscapecurve import _INF, plotEscapecurve
@@ -33,6 +36,18 @@ from .plotRotcurve import plotRotcurve, vcirc
 
 if _APY_LOADED:
     from astropy import units
+_lib, ext_loaded= _load_extension_libs.load_libgalpy()
+# Quantities that evaluate_c can compute (order is that used in the C code)
+# and the type of their physical conversion
+_EVALUATE_C_QUANTITIES= ['potential','Rforce','zforce','phitorque','dens']
+_EVALUATE_C_PHYSICAL= {'potential':'energy','Rforce':'force','zforce':'force',
+                       'phitorque':'energy','dens':'density'}
+# Minimum number of points for which the evaluate* functions switch to C
+_EVALUATE_C_MINSIZE= 1000
+# Cache of the CompiledPotentials used by _evaluate_c, keyed by the identity
+# of the potentials, and the maximum number of potentials that it holds
+_EVALUATE_C_CACHE= {}
+_EVALUATE_C_CACHESIZE= 16
 def check_potential_inputs_not_arrays(func):
     """
     NAME:
@@ -57,6 +72,10 @@ def check_potential_inputs_not_arrays(func):
 
 class Potential(Force):
     """Top-level class for a potential"""
+    # Whether the C implementation agrees with the Python implementation to
+    # numerical precision, such that the evaluate functions can switch to it
+    _evaluate_c_exact= True
+
     def __init__(self,amp=1.,ro=None,vo=None,amp_units=None):
         """
         NAME:
@@ -1881,7 +1900,7 @@ def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
 
     PURPOSE:
 
-       convenience function to evaluate a possible sum of potentials
+       convenience function to evaluate a possible sum of potentials; when evaluating at 1000 or more points (and dR=dphi=0), this function and evaluateDensities, evaluateRforces, evaluatephitorques, and evaluatezforces switch to the OpenMP-parallelized C implementations of the potentials if they all have one that agrees with the Python implementation to numerical precision (see evaluate_c; interpolated potentials are therefore always evaluated in Python)
 
     INPUT:
 
@@ -1905,6 +1924,8 @@ def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
 
        2010-04-16 - Written - Bovy (NYU)
 
+       2026-10-18 - Evaluate at many points in C - agent
+
     """
     return _evaluatePotentials(Pot,R,z,phi=phi,t=t,dR=dR,dphi=dphi)
 
@@ -1913,6 +1934,9 @@ def _evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    if dR == 0 and dphi == 0 and _use_evaluate_c(Pot,R,z,phi,t):
+        out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=['potential'])
+        if err == 0: return out[0]
     isList= isinstance(Pot,list)
     if isList:
         out= 0.
@@ -1935,7 +1959,7 @@ def evaluateDensities(Pot,R,z,phi=None,t=0.,forcepoisson=False):
 
     PURPOSE:
 
-       convenience function to evaluate a possible sum of densities
+       convenience function to evaluate a possible sum of densities (evaluated in C for many points, see evaluatePotentials)
 
     INPUT:
 
@@ -1961,11 +1985,16 @@ def evaluateDensities(Pot,R,z,phi=None,t=0.,forcepoisson=False):
 
        2013-12-28 - Added forcepoisson - Bovy (IAS)
 
+       2026-10-18 - Evaluate at many points in C - agent
+
     """
     isList= isinstance(Pot,list)
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    if not forcepoisson and _use_evaluate_c(Pot,R,z,phi,t,dens=True):
+        out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=['dens'])
+        if err == 0: return out[0]
     if isList:
         out= 0.
         for pot in Pot:
@@ -2093,7 +2122,7 @@ def evaluateRforces(Pot,R,z,phi=None,t=0.,v=None):
 
     PURPOSE:
 
-       convenience function to evaluate a possible sum of potentials
+       convenience function to evaluate a possible sum of potentials (evaluated in C for many points when there are no dissipative forces, see evaluatePotentials)
 
     INPUT:
 
@@ -2119,6 +2148,8 @@ def evaluateRforces(Pot,R,z,phi=None,t=0.,v=None):
 
        2018-03-16 - Added velocity input for dissipative forces - Bovy (UofT)
 
+       2026-10-18 - Evaluate at many points in C - agent
+
     """
     return _evaluateRforces(Pot,R,z,phi=phi,t=t,v=v)
 
@@ -2131,6 +2162,9 @@ def _evaluateRforces(Pot,R,z,phi=None,t=0.,v=None):
     dissipative= _isDissipative(Pot)
     if dissipative and v is None:
         raise PotentialError("The (list of) Potential instances includes dissipative, but you did not provide the 3D velocity (required for dissipative forces")
+    if not dissipative and _use_evaluate_c(Pot,R,z,phi,t):
+        out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=['Rforce'])
+        if err == 0: return out[0]
     if isList:
         out= 0.
         for pot in Pot:
@@ -2160,7 +2194,7 @@ def evaluatephitorques(Pot,R,z,phi=None,t=0.,v=None):
 
     PURPOSE:
 
-       convenience function to evaluate a possible sum of potentials
+       convenience function to evaluate a possible sum of potentials (evaluated in C for many points when there are no dissipative forces, see evaluatePotentials)
 
     INPUT:
        Pot - a potential or list of potentials
@@ -2185,6 +2219,8 @@ def evaluatephitorques(Pot,R,z,phi=None,t=0.,v=None):
 
        2018-03-16 - Added velocity input for dissipative forces - Bovy (UofT)
 
+       2026-10-18 - Evaluate at many points in C - agent
+
     """
     return _evaluatephitorques(Pot,R,z,phi=phi,t=t,v=v)
 
@@ -2197,6 +2233,9 @@ def _evaluatephitorques(Pot,R,z,phi=None,t=0.,v=None):
     dissipative= _isDissipative(Pot)
     if dissipative and v is None:
         raise PotentialError("The (list of) Potential instances includes dissipative, but you did not provide the 3D velocity (required for dissipative forces")
+    if not dissipative and _use_evaluate_c(Pot,R,z,phi,t):
+        out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=['phitorque'])
+        if err == 0: return out[0]
     if isList:
         out= 0.
         for pot in Pot:
@@ -2222,7 +2261,7 @@ def evaluatezforces(Pot,R,z,phi=None,t=0.,v=None):
 
     PURPOSE:
 
-       convenience function to evaluate a possible sum of potentials
+       convenience function to evaluate a possible sum of potentials (evaluated in C for many points when there are no dissipative forces, see evaluatePotentials)
 
     INPUT:
 
@@ -2248,6 +2287,8 @@ def evaluatezforces(Pot,R,z,phi=None,t=0.,v=None):
 
        2018-03-16 - Added velocity input for dissipative forces - Bovy (UofT)
 
+       2026-10-18 - Evaluate at many points in C - agent
+
     """
     return _evaluatezforces(Pot,R,z,phi=phi,t=t,v=v)
 
@@ -2260,6 +2301,9 @@ def _evaluatezforces(Pot,R,z,phi=None,t=0.,v=None):
     dissipative= _isDissipative(Pot)
     if dissipative and v is None:
         raise PotentialError("The (list of) Potential instances includes dissipative, but you did not provide the 3D velocity (required for dissipative forces")
+    if not dissipative and _use_evaluate_c(Pot,R,z,phi,t):
+        out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=['zforce'])
+        if err == 0: return out[0]
     if isList:
         out= 0.
         for pot in Pot:
@@ -2668,6 +2712,140 @@ def evaluater2derivs(Pot,R,z,phi=None,t=0.):
     else: #pragma: no cover
         raise PotentialError("Input to 'evaluater2derivs' is neither a Potential-instance or a list of such instances")
 
+@potential_physical_input
+def evaluate_c(Pot,R,z,phi=None,t=0.,quantities='potential',**kwargs):
+    """
+    NAME:
+
+       evaluate_c
+
+    PURPOSE:
+
+       evaluate the potential, forces, and/or density of a possible sum of potentials at many points at once using the C implementations of the potentials, parallelized over the points with OpenMP
+
+    INPUT:
+
+       Pot - potential or list of potentials (dissipative forces in such a list are ignored for 'potential' and 'dens', but not supported for forces); all need to have a C implementation
+
+       R - cylindrical Galactocentric distance (can be Quantity)
+
+       z - distance above the plane (can be Quantity)
+
+       phi - azimuth (can be Quantity)
+
+       t - time (can be Quantity)
+
+       quantities= ('potential') quantity or list of quantities to evaluate: 'potential', 'Rforce', 'zforce', 'phitorque', or 'dens'
+
+       ro=, vo=, use_physical=, quantity= physical-unit options as for the other evaluate functions
+
+    OUTPUT:
+
+       quantity(R,z,phi,t) with the broadcast shape of R, z, phi, and t or a list of such arrays if quantities is a list
+
+    HISTORY:
+
+       2026-10-18 - Written - agent
+
+    """
+    Pot= flatten(Pot)
+    isList= isinstance(quantities,list)
+    if not isList: quantities= [quantities]
+    for quantity in quantities:
+        if not quantity in _EVALUATE_C_QUANTITIES:
+            raise ValueError(f"{quantity} is not a valid quantity for evaluate_c; should be one of {_EVALUATE_C_QUANTITIES}")
+    if _isNonAxi(Pot) and phi is None:
+        raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    if _isDissipative(Pot) and numpy.any([quantity in ['Rforce','zforce','phitorque']
+                                          for quantity in quantities]):
+        raise NotImplementedError("evaluate_c does not support the forces of dissipative forces")
+    if not ext_loaded or not _check_c(Pot,dens='dens' in quantities):
+        raise PotentialError("evaluate_c requires all potentials to be implemented in C (including their density when evaluating 'dens')")
+    out, err= _evaluate_c(Pot,R,z,phi=phi,t=t,quantities=quantities)
+    if err != 0:
+        raise PotentialError(f"Some of the potentials do not implement all of {quantities} in C")
+    out= [physical_conversion(_EVALUATE_C_PHYSICAL[quantity],pop=True)\
+              (lambda Pot,o: o[()])(Pot,o,**kwargs)
+          for quantity,o in zip(quantities,out)]
+    return out if isList else out[0]
+
+def _evaluate_c(Pot,R,z,phi=None,t=0.,quantities=['potential']):
+    """Raw function to evaluate quantities of a (list of) C potential(s) at many points; returns array [len(quantities),*broadcast_shape] in internal units and the C error code (non-zero when a quantity is not implemented in C)"""
+    cpot= _evaluate_c_compiled(Pot)
+    if phi is None: phi= 0.
+    R,z,phi,t= numpy.broadcast_arrays(R,z,phi,t)
+    shape= R.shape
+    R= numpy.require(R.flatten(),dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z.flatten(),dtype=numpy.float64,requirements=['C','W'])
+    phi= numpy.require(phi.flatten(),dtype=numpy.float64,
+                       requirements=['C','W'])
+    t= numpy.require(t.flatten(),dtype=numpy.float64,requirements=['C','W'])
+    quantity= numpy.array([_EVALUATE_C_QUANTITIES.index(q)
+                           for q in quantities],dtype=numpy.int32)
+    #Parse the potential (cached)
+    npot, pot_type, pot_args, pot_tfuncs= cpot._parse('full',prep_tfuncs=True)
+    #Set up result array
+    out= numpy.empty((len(quantities),len(R)))
+    err= ctypes.c_int(0)
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    evaluate_batch= _lib.evaluate_potentials_batch
+    evaluate_batch.argtypes= [ctypes.c_int,
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ctypes.c_int,
+                              ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                              ctypes.c_int,
+                              ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ctypes.c_void_p,
+                              ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                              ctypes.POINTER(ctypes.c_int)]
+    #Run the C code
+    evaluate_batch(ctypes.c_int(len(R)),R,z,phi,t,
+                   ctypes.c_int(len(quantity)),quantity,
+                   ctypes.c_int(npot),pot_type,pot_args,pot_tfuncs,
+                   out,ctypes.byref(err))
+    return (out.reshape((len(quantities),)+shape),err.value)
+
+def _evaluate_c_compiled(Pot):
+    """Return the CompiledPotential for a (list of) potential(s) used by _evaluate_c, such that repeated evaluations of the same potentials do not re-parse them"""
+    if isinstance(Pot,CompiledPotential): return Pot
+    Pot= flatten(Pot)
+    if isinstance(Pot,list):
+        # Dissipative forces do not contribute to the potential and density
+        Pot= [p for p in Pot if not isinstance(p,DissipativeForce)]
+    # The cached CompiledPotential holds on to the potentials, so their ids
+    # cannot be re-used while they are in the cache
+    key= tuple(id(p) for p in Pot) if isinstance(Pot,list) else id(Pot)
+    if not key in _EVALUATE_C_CACHE:
+        if len(_EVALUATE_C_CACHE) >= _EVALUATE_C_CACHESIZE:
+            del _EVALUATE_C_CACHE[next(iter(_EVALUATE_C_CACHE))]
+        _EVALUATE_C_CACHE[key]= CompiledPotential(Pot)
+    return _EVALUATE_C_CACHE[key]
+
+def _use_evaluate_c(Pot,R,z,phi,t,dens=False):
+    """Determine whether the evaluate functions should use the batched C code: only for large arrays of points and when all potentials have a C implementation"""
+    if not ext_loaded: return False
+    try:
+        npts= numpy.broadcast(R,z,0. if phi is None else phi,t).size
+    except ValueError: # let the Python code deal with this
+        return False
+    return npts >= _EVALUATE_C_MINSIZE and _dim(Pot) == 3 \
+        and bool(_check_c(Pot,dens=dens)) and _check_c_exact(Pot)
+
+def _check_c_exact(Pot):
+    """Check whether the C implementations of a potential or list thereof agree with their Python implementations rather than approximating them (as for interpolated potentials)"""
+    Pot= flatten(Pot)
+    from .WrapperPotential import parentWrapperPotential
+    if isinstance(Pot,list):
+        return all(_check_c_exact(p) for p in Pot)
+    elif isinstance(Pot,parentWrapperPotential):
+        return Pot._evaluate_c_exact and _check_c_exact(Pot._pot)
+    return Pot._evaluate_c_exact
+
 def plotPotentials(Pot,rmin=0.,rmax=1.5,nrs=21,zmin=-0.5,zmax=0.5,nzs=21,
                    phi=None,xy=False,t=0.,effective=False,Lz=None,
                    ncontours=21,savefilename=None,aspect=None,
@@ -3600,6 +3778,9 @@ def turn_physical_on(Pot,ro=None,vo=None):
 
 def _flatten_list(L):
     for item in L:
+        if isinstance(item,Force): # e.g., BatchedPotential is iterable
+            yield item
+            continue
         try:
             yield from _flatten_list(item)
         except TypeError:
@@ -3617,7 +3798,7 @@ def flatten(Pot):
 
     INPUT:
 
-       Pot - list (possibly nested) of Potential instances
+       Pot - list (possibly nested) of Potential instances (or a CompiledPotential, which is replaced by its potential)
 
     OUTPUT:
 
@@ -3627,11 +3808,15 @@ def flatten(Pot):
 
         2018-03-14 - Written - Bovy (UofT)
 
+        2026-10-18 - Unwrap CompiledPotential instances - agent
+
     """
     if isinstance(Pot, Potential):
         return Pot
     elif isinstance(Pot, list):
         return list(_flatten_list(Pot))
+    elif isinstance(Pot, CompiledPotential):
+        return Pot.pot
     else:
         return Pot
 
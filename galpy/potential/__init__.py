@@ -1,6 +1,7 @@
 from . import (AdiabaticContractionWrapperPotential,
                AnyAxisymmetricRazorThinDiskPotential, AnySphericalPotential,
-               BurkertPotential, ChandrasekharDynamicalFrictionForce,
+               BatchedPotential, BurkertPotential,
+               ChandrasekharDynamicalFrictionForce, CompiledPotential,
                CorotatingRotationWrapperPotential, CosmphiDiskPotential,
                DehnenBarPotential, DehnenSmoothWrapperPotential,
                DiskSCFPotential, DoubleExponentialDiskPotential,
@@ -8,11 +9,11 @@ from . import (AdiabaticContractionWrapperPotential,
                FlattenedPowerPotential, Force,
                GaussianAmplitudeWrapperPotential, HenonHeilesPotential,
                HomogeneousSpherePotential, IsochronePotential,
-               IsothermalDiskPotential, KGPotential, KingPotential,
-               KuzminDiskPotential, KuzminKutuzovStaeckelPotential,
-               LogarithmicHaloPotential, MiyamotoNagaiPotential,
-               MN3ExponentialDiskPotential, MovingObjectPotential,
-               NonInertialFrameForce, NullPotential,
+               IsothermalDiskPotential, JITPotential, KGPotential,
+               KingPotential, KuzminDiskPotential,
+               KuzminKutuzovStaeckelPotential, LogarithmicHaloPotential,
+               MiyamotoNagaiPotential, MN3ExponentialDiskPotential,
+               MovingObjectPotential, NonInertialFrameForce, NullPotential,
                NumericalPotentialDerivativesMixin, PerfectEllipsoidPotential,
                PlummerPotential, Potential, PowerSphericalPotential,
                PowerSphericalPotentialwCutoff, PowerTriaxialPotential,
@@ -47,6 +48,7 @@ evaluatephi2derivs= Potential.evaluatephi2derivs
 evaluateRphiderivs= Potential.evaluateRphiderivs
 evaluatephizderivs= Potential.evaluatephizderivs
 evaluater2derivs= Potential.evaluater2derivs
+evaluate_c= Potential.evaluate_c
 RZToplanarPotential= planarPotential.RZToplanarPotential
 toPlanarPotential= planarPotential.toPlanarPotential
 RZToverticalPotential= verticalPotential.RZToverticalPotential
@@ -109,6 +111,9 @@ Potential= Potential.Potential
 planarAxiPotential= planarPotential.planarAxiPotential
 planarPotential= planarPotential.planarPotential
 linearPotential= linearPotential.linearPotential
+BatchedPotential= BatchedPotential.BatchedPotential
+CompiledPotential= CompiledPotential.CompiledPotential
+JITPotential= JITPotential.JITPotential
 MiyamotoNagaiPotential= MiyamotoNagaiPotential.MiyamotoNagaiPotential
 IsochronePotential= IsochronePotential.IsochronePotential
 DoubleExponentialDiskPotential= DoubleExponentialDiskPotential.DoubleExponentialDiskPotential
@@ -74,6 +74,9 @@ def scalarDecorator(func):
 
 class interpRZPotential(Potential):
     """Class that interpolates a given potential on a grid for fast orbit integration"""
+    # Unlike Python, C does not use the original potential off the grid
+    _evaluate_c_exact= False
+
     def __init__(self,
                  RZPot=None,rgrid=(numpy.log(0.01),numpy.log(20.),101),
                  zgrid=(0.,1.,101),logR=True,
@@ -256,7 +259,8 @@ class interpRZPotential(Potential):
             from ..potential import vcirc
             if not numcores is None:
                 self._vcircGrid= multi.parallel_map((lambda x: vcirc(self._origPot,self._rgrid[x])),
-                                                    list(range(len(self._rgrid))),numcores=numcores)
+                                                    list(range(len(self._rgrid))),numcores=numcores,
+                                                    as_array=True)
             else:
                 self._vcircGrid= numpy.array([vcirc(self._origPot,r) for r in self._rgrid])
             if self._logR:
@@ -267,7 +271,8 @@ class interpRZPotential(Potential):
             from ..potential import dvcircdR
             if not numcores is None:
                 self._dvcircdrGrid= multi.parallel_map((lambda x: dvcircdR(self._origPot,self._rgrid[x])),
-                                                       list(range(len(self._rgrid))),numcores=numcores)
+                                                       list(range(len(self._rgrid))),numcores=numcores,
+                                                       as_array=True)
             else:
                 self._dvcircdrGrid= numpy.array([dvcircdR(self._origPot,r) for r in self._rgrid])
             if self._logR:
@@ -277,8 +282,9 @@ class interpRZPotential(Potential):
         if interpepifreq:
             from ..potential import epifreq
             if not numcores is None:
-                self._epifreqGrid= numpy.array(multi.parallel_map((lambda x: epifreq(self._origPot,self._rgrid[x])),
-                                                      list(range(len(self._rgrid))),numcores=numcores))
+                self._epifreqGrid= multi.parallel_map((lambda x: epifreq(self._origPot,self._rgrid[x])),
+                                                      list(range(len(self._rgrid))),numcores=numcores,
+                                                      as_array=True)
             else:
                 self._epifreqGrid= numpy.array([epifreq(self._origPot,r) for r in self._rgrid])
             indx= True^numpy.isnan(self._epifreqGrid)
@@ -296,7 +302,8 @@ class interpRZPotential(Potential):
             from ..potential import verticalfreq
             if not numcores is None:
                 self._verticalfreqGrid= multi.parallel_map((lambda x: verticalfreq(self._origPot,self._rgrid[x])),
-                                                       list(range(len(self._rgrid))),numcores=numcores)
+                                                       list(range(len(self._rgrid))),numcores=numcores,
+                                                       as_array=True)
             else:
                 self._verticalfreqGrid= numpy.array([verticalfreq(self._origPot,r) for r in self._rgrid])
             if self._logR:
@@ -13,6 +13,9 @@ class interpSphericalPotential(SphericalPotential):
     """__init__(self,rforce=None,rgrid=numpy.geomspace(0.01,20,101),Phi0=None,ro=None,vo=None)
 
 Class that interpolates a spherical potential on a grid"""
+    # C uses a different spline than Python
+    _evaluate_c_exact= False
+
     def __init__(self,rforce=None,rgrid=numpy.geomspace(0.01,20,101),Phi0=None,
                  ro=None,vo=None):
         """__init__(self,rforce=None,rgrid=numpy.geomspace(0.01,20,101),Phi0=None,ro=None,vo=None)
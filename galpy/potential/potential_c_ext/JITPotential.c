@@ -0,0 +1,45 @@
+#include <stdint.h>
+#include <galpy_potentials.h>
+//JITPotential: 9 arguments: amp and the addresses of the numba-compiled
+//functions of (R,z,phi,t) for the potential, Rforce, zforce, and phitorque,
+//each split into its high and low 32 bits (such that they are exactly
+//represented as doubles)
+typedef double (*jit_func_type)(double,double,double,double);
+static inline jit_func_type JITPotentialFunc(double * args,int ii){
+  return (jit_func_type) (uintptr_t) \
+    ( ( (uint64_t) *(args+1+2*ii) << 32 ) | (uint64_t) *(args+2+2*ii) );
+}
+double JITPotentialEval(double R,double z, double phi,
+			double t,
+			struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,0)(R,z,phi,t);
+}
+double JITPotentialRforce(double R,double z, double phi,
+			  double t,
+			  struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,1)(R,z,phi,t);
+}
+double JITPotentialzforce(double R,double z, double phi,
+			  double t,
+			  struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,2)(R,z,phi,t);
+}
+double JITPotentialphitorque(double R,double z, double phi,
+			     double t,
+			     struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,3)(R,z,phi,t);
+}
+double JITPotentialPlanarRforce(double R,double phi,double t,
+				struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,1)(R,0.,phi,t);
+}
+double JITPotentialPlanarphitorque(double R,double phi,double t,
+				   struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  return *args * JITPotentialFunc(args,3)(R,0.,phi,t);
+}
@@ -36,7 +36,7 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
     const_freq= (bool) *(args + 14);
     if ( omegaz_only ) {
       if ( Omega_as_func ) {
-        Omegaz= (*(*(potentialArgs->tfuncs+9*lin_acc)))(t);
+        Omegaz= evaluate_tfunc(potentialArgs,9*lin_acc,t);
         Omega2= Omegaz * Omegaz;
       } else {
         Omegaz= *(args + 18);
@@ -51,7 +51,7 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
       *Fy+= -2. * Omegaz * vx + Omega2 * y;
       if ( !const_freq ) {
         if ( Omega_as_func ) {
-          Omegadotz= (*(*(potentialArgs->tfuncs+9*lin_acc+1)))(t);
+          Omegadotz= evaluate_tfunc(potentialArgs,9*lin_acc+1,t);
         } else {
           Omegadotz= *(args + 22);
         }
@@ -59,10 +59,10 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
         *Fy-= Omegadotz * x;
       }
       if ( lin_acc ) {
-        x0x= (*(*(potentialArgs->tfuncs+3)))(t);
-        x0y= (*(*(potentialArgs->tfuncs+4)))(t);
-        v0x= (*(*(potentialArgs->tfuncs+6)))(t);
-        v0y= (*(*(potentialArgs->tfuncs+7)))(t);
+        x0x= evaluate_tfunc(potentialArgs,3,t);
+        x0y= evaluate_tfunc(potentialArgs,4,t);
+        v0x= evaluate_tfunc(potentialArgs,6,t);
+        v0y= evaluate_tfunc(potentialArgs,7,t);
         *Fx+=  2. * Omegaz * v0y + Omega2 * x0x;
         *Fy+= -2. * Omegaz * v0x + Omega2 * x0y;
         if ( !const_freq ) {
@@ -72,9 +72,9 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
       }
     } else {
       if ( Omega_as_func ) {
-        Omegax= (*(*(potentialArgs->tfuncs+9*lin_acc  )))(t);
-        Omegay= (*(*(potentialArgs->tfuncs+9*lin_acc+1)))(t);
-        Omegaz= (*(*(potentialArgs->tfuncs+9*lin_acc+2)))(t);
+        Omegax= evaluate_tfunc(potentialArgs,9*lin_acc,t);
+        Omegay= evaluate_tfunc(potentialArgs,9*lin_acc+1,t);
+        Omegaz= evaluate_tfunc(potentialArgs,9*lin_acc+2,t);
         Omega2= Omegax * Omegax + Omegay * Omegay + Omegaz * Omegaz;
       } else {
         Omegax= *(args + 16);
@@ -95,9 +95,9 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
       *Fz+=  2. * ( Omegay * vx - Omegax * vy ) + Omega2 * z - Omegaz * Omegatimesvecx;
       if ( !const_freq ) {
         if ( Omega_as_func ) {
-          Omegadotx= (*(*(potentialArgs->tfuncs+9*lin_acc+3)))(t);
-          Omegadoty= (*(*(potentialArgs->tfuncs+9*lin_acc+4)))(t);
-          Omegadotz= (*(*(potentialArgs->tfuncs+9*lin_acc+5)))(t);
+          Omegadotx= evaluate_tfunc(potentialArgs,9*lin_acc+3,t);
+          Omegadoty= evaluate_tfunc(potentialArgs,9*lin_acc+4,t);
+          Omegadotz= evaluate_tfunc(potentialArgs,9*lin_acc+5,t);
         } else {
           Omegadotx= *(args + 20);
           Omegadoty= *(args + 21);
@@ -108,12 +108,12 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
         *Fz-= -Omegadoty * x + Omegadotx * y;
       }
       if ( lin_acc ) {
-        x0x= (*(*(potentialArgs->tfuncs+3)))(t);
-        x0y= (*(*(potentialArgs->tfuncs+4)))(t);
-        x0z= (*(*(potentialArgs->tfuncs+5)))(t);
-        v0x= (*(*(potentialArgs->tfuncs+6)))(t);
-        v0y= (*(*(potentialArgs->tfuncs+7)))(t);
-        v0z= (*(*(potentialArgs->tfuncs+8)))(t);
+        x0x= evaluate_tfunc(potentialArgs,3,t);
+        x0y= evaluate_tfunc(potentialArgs,4,t);
+        x0z= evaluate_tfunc(potentialArgs,5,t);
+        v0x= evaluate_tfunc(potentialArgs,6,t);
+        v0y= evaluate_tfunc(potentialArgs,7,t);
+        v0z= evaluate_tfunc(potentialArgs,8,t);
         // Re-use variable
         Omegatimesvecx= Omegax * x0x + Omegay * x0y + Omegaz * x0z;
         *Fx+=  2. * ( Omegaz * v0y - Omegay * v0z ) + Omega2 * x0x - Omegax * Omegatimesvecx;
@@ -129,9 +129,9 @@ void NonInertialFrameForcexyzforces_xyz(double R,double z,double phi,double t,
   }
   // Linear acceleration part
   if ( lin_acc ) {
-    *Fx-= (*(*(potentialArgs->tfuncs  )))(t);
-    *Fy-= (*(*(potentialArgs->tfuncs+1)))(t);
-    *Fz-= (*(*(potentialArgs->tfuncs+2)))(t);
+    *Fx-= evaluate_tfunc(potentialArgs,0,t);
+    *Fy-= evaluate_tfunc(potentialArgs,1,t);
+    *Fz-= evaluate_tfunc(potentialArgs,2,t);
   }
   // Caching
   *(args +  8)= *Fx;
@@ -5,7 +5,7 @@ double TimeDependentAmplitudeWrapperPotentialEval(double R,double z,double phi,
 					struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate potential, only used in actionAngle, so phi=0, t=0
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
               * evaluatePotentials(R,z,potentialArgs->nwrapped,
 			                             potentialArgs->wrappedPotentialArg);
 }
@@ -14,7 +14,7 @@ double TimeDependentAmplitudeWrapperPotentialRforce(double R,double z,double phi
 					  struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate Rforce
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcRforce(R,z,phi,t,potentialArgs->nwrapped,
                  potentialArgs->wrappedPotentialArg);
 }
@@ -23,7 +23,7 @@ double TimeDependentAmplitudeWrapperPotentialphitorque(double R,double z,double
 					    struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate phitorque
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcphitorque(R,z,phi,t,potentialArgs->nwrapped,
                    potentialArgs->wrappedPotentialArg);
 }
@@ -32,7 +32,7 @@ double TimeDependentAmplitudeWrapperPotentialzforce(double R,double z,double phi
 					  struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate zforce
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calczforce(R,z,phi,t,potentialArgs->nwrapped,
                  potentialArgs->wrappedPotentialArg);
 }
@@ -40,7 +40,7 @@ double TimeDependentAmplitudeWrapperPotentialPlanarRforce(double R,double phi,do
 						struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate Rforce
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcPlanarRforce(R,phi,t,potentialArgs->nwrapped,
 		                   potentialArgs->wrappedPotentialArg);
 }
@@ -48,7 +48,7 @@ double TimeDependentAmplitudeWrapperPotentialPlanarphitorque(double R,double phi
 						  struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate phitorque
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcPlanarphitorque(R,phi,t,potentialArgs->nwrapped,
 			                   potentialArgs->wrappedPotentialArg);
 }
@@ -56,7 +56,7 @@ double TimeDependentAmplitudeWrapperPotentialPlanarR2deriv(double R,double phi,d
 						 struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate R2deriv
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcPlanarR2deriv(R,phi,t,potentialArgs->nwrapped,
 			                  potentialArgs->wrappedPotentialArg);
 }
@@ -65,7 +65,7 @@ double TimeDependentAmplitudeWrapperPotentialPlanarphi2deriv(double R,double phi
 						   struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate phi2deriv
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcPlanarphi2deriv(R,phi,t,potentialArgs->nwrapped,
 			                    potentialArgs->wrappedPotentialArg);
 }
@@ -74,7 +74,7 @@ double TimeDependentAmplitudeWrapperPotentialPlanarRphideriv(double R,double phi
 						   struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   //Calculate Rphideriv
-  return *args * (*(*(potentialArgs->tfuncs)))(t)	\
+  return *args * evaluate_tfunc(potentialArgs,0,t)	\
     * calcPlanarRphideriv(R,phi,t,potentialArgs->nwrapped,
 			                    potentialArgs->wrappedPotentialArg);
 }
@@ -0,0 +1,137 @@
+/*
+  C code for evaluating the potential, forces, and density of a (list of)
+  potential(s) at a large number of points in parallel
+*/
+#ifdef _WIN32
+#include <Python.h>
+#endif
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <galpy_potentials.h>
+#include <integrateFullOrbit.h>
+//Macros to export functions in DLL on different OS
+#if defined(_WIN32)
+#define EXPORT __declspec(dllexport)
+#elif defined(__GNUC__)
+#define EXPORT __attribute__((visibility("default")))
+#else
+// Just do nothing?
+#define EXPORT
+#endif
+// Quantities that can be evaluated, same order as _EVALUATE_C_QUANTITIES
+#define EVALUATE_POTENTIAL 0
+#define EVALUATE_RFORCE 1
+#define EVALUATE_ZFORCE 2
+#define EVALUATE_PHITORQUE 3
+#define EVALUATE_DENSITY 4
+static bool has_quantity(int quantity,int npot,
+			 struct potentialArg * potentialArgs){
+  // Check that all potentials (and those they wrap) implement the quantity
+  int ii;
+  bool has;
+  for (ii=0; ii < npot; ii++) {
+    switch ( quantity ) {
+    case EVALUATE_POTENTIAL:
+      has= (potentialArgs+ii)->potentialEval != NULL;
+      break;
+    case EVALUATE_RFORCE:
+      has= (potentialArgs+ii)->Rforce != NULL;
+      break;
+    case EVALUATE_ZFORCE:
+      has= (potentialArgs+ii)->zforce != NULL;
+      break;
+    case EVALUATE_PHITORQUE:
+      has= (potentialArgs+ii)->phitorque != NULL;
+      break;
+    case EVALUATE_DENSITY:
+      has= (potentialArgs+ii)->dens != NULL;
+      break;
+    default:
+      has= false;
+    }
+    if ( !has || (potentialArgs+ii)->requiresVelocity )
+      return false;
+    if ( (potentialArgs+ii)->wrappedPotentialArg
+	 && !has_quantity(quantity,(potentialArgs+ii)->nwrapped,
+			  (potentialArgs+ii)->wrappedPotentialArg) )
+      return false;
+  }
+  return true;
+}
+static inline double evaluate_quantity(int quantity,
+				       double R,double Z,double phi,double t,
+				       int npot,
+				       struct potentialArg * potentialArgs){
+  int ii;
+  double out= 0.;
+  switch ( quantity ) {
+  case EVALUATE_POTENTIAL:
+    // evaluatePotentials only does phi=0,t=0
+    for (ii=0; ii < npot; ii++)
+      out+= (potentialArgs+ii)->potentialEval(R,Z,phi,t,potentialArgs+ii);
+    return out;
+  case EVALUATE_RFORCE:
+    return calcRforce(R,Z,phi,t,npot,potentialArgs);
+  case EVALUATE_ZFORCE:
+    return calczforce(R,Z,phi,t,npot,potentialArgs);
+  case EVALUATE_PHITORQUE:
+    return calcphitorque(R,Z,phi,t,npot,potentialArgs);
+  case EVALUATE_DENSITY:
+    return calcDensity(R,Z,phi,t,npot,potentialArgs);
+  }
+  return out;
+}
+/*
+  MAIN FUNCTIONS
+*/
+EXPORT void evaluate_potentials_batch(int npts,
+				      double *R,
+				      double *z,
+				      double *phi,
+				      double *t,
+				      int nquantity,
+				      int *quantity,
+				      int npot,
+				      int * pot_type,
+				      double * pot_args,
+				      tfuncs_type_arr pot_tfuncs,
+				      double *out,
+				      int * err){
+  int ii, jj, tid;
+  int max_threads;
+  int * thread_pot_type;
+  double * thread_pot_args;
+  tfuncs_type_arr thread_pot_tfuncs;
+  max_threads= ( npts < omp_get_max_threads() ) ? npts : omp_get_max_threads();
+  if ( max_threads < 1 ) max_threads= 1;
+  // Because potentialArgs may cache, safest to have one / thread
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( max_threads * npot * sizeof (struct potentialArg) );
+#pragma omp parallel for schedule(static,1) private(ii,thread_pot_type,thread_pot_args,thread_pot_tfuncs) num_threads(max_threads)
+  for (ii=0; ii < max_threads; ii++) {
+    thread_pot_type= pot_type; // need to make thread-private pointers, bc
+    thread_pot_args= pot_args; // these pointers are changed in parse_...
+    thread_pot_tfuncs= pot_tfuncs; // ...
+    parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,
+			    &thread_pot_type,&thread_pot_args,&thread_pot_tfuncs);
+  }
+  // Check that all quantities are implemented, otherwise return err= -1
+  *err= 0;
+  for (jj=0; jj < nquantity; jj++)
+    if ( !has_quantity(*(quantity+jj),npot,potentialArgs) )
+      *err= -1;
+  // Evaluate in contiguous blocks of points, such that caching works well
+  if ( *err == 0 ) {
+#pragma omp parallel for schedule(static) private(ii,jj,tid) num_threads(max_threads)
+    for (ii=0; ii < npts; ii++) {
+      tid= omp_get_thread_num();
+      for (jj=0; jj < nquantity; jj++)
+	*(out+jj*npts+ii)= evaluate_quantity(*(quantity+jj),
+					     *(R+ii),*(z+ii),*(phi+ii),*(t+ii),
+					     npot,potentialArgs+tid*npot);
+    }
+  }
+  for (ii=0; ii < max_threads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+}
@@ -2,6 +2,13 @@
 void init_potentialArgs(int npot, struct potentialArg * potentialArgs){
   int ii;
   for (ii=0; ii < npot; ii++) {
+    (potentialArgs+ii)->potentialEval= NULL;
+    (potentialArgs+ii)->Rforce= NULL;
+    (potentialArgs+ii)->zforce= NULL;
+    (potentialArgs+ii)->phitorque= NULL;
+    (potentialArgs+ii)->dens= NULL;
+    (potentialArgs+ii)->requiresVelocity= false;
+    (potentialArgs+ii)->hasSphericalHessian= false;
     (potentialArgs+ii)->i2d= NULL;
     (potentialArgs+ii)->accx= NULL;
     (potentialArgs+ii)->accy= NULL;
@@ -15,6 +22,9 @@ void init_potentialArgs(int npot, struct potentialArg * potentialArgs){
     (potentialArgs+ii)->spline1d= NULL;
     (potentialArgs+ii)->acc1d= NULL;
     (potentialArgs+ii)->tfuncs= NULL;
+    (potentialArgs+ii)->tfuncs_acc= NULL;
+    (potentialArgs+ii)->tfuncs_spline= NULL;
+    (potentialArgs+ii)->tfuncs_trange= NULL;
   }
 }
 void free_potentialArgs(int npot, struct potentialArg * potentialArgs){
@@ -53,9 +63,57 @@ void free_potentialArgs(int npot, struct potentialArg * potentialArgs){
 	gsl_interp_accel_free (*((potentialArgs+ii)->acc1d+jj));
       free((potentialArgs+ii)->acc1d);
     }
+    if ( (potentialArgs+ii)->tfuncs_spline ) {
+      for (jj=0; jj < (potentialArgs+ii)->ntfuncs; jj++) {
+	gsl_spline_free(*((potentialArgs+ii)->tfuncs_spline+jj));
+	gsl_interp_accel_free (*((potentialArgs+ii)->tfuncs_acc+jj));
+      }
+      free((potentialArgs+ii)->tfuncs_spline);
+      free((potentialArgs+ii)->tfuncs_acc);
+      free((potentialArgs+ii)->tfuncs_trange);
+    }
     free((potentialArgs+ii)->args);
   }
 }
+void parse_tfuncs(struct potentialArg * potentialArgs,double ** pot_args,
+		  tfuncs_type_arr * pot_tfuncs){
+  // Load a potential's functions of time: either (Python) functions from
+  // pot_tfuncs or, when pot_tfuncs is NULL, the functions tabulated on a grid
+  // in pot_args as [nPts,t_1,...,t_nPts,f(t_1),...,f(t_nPts)] per function
+  int ii, nPts;
+  if ( potentialArgs->ntfuncs == 0 )
+    return;
+  if ( *pot_tfuncs ) {
+    potentialArgs->tfuncs= (*pot_tfuncs);
+    (*pot_tfuncs)+= potentialArgs->ntfuncs;
+    return;
+  }
+  potentialArgs->tfuncs_spline= (gsl_spline **)		    malloc ( potentialArgs->ntfuncs * sizeof ( gsl_spline * ) );
+  potentialArgs->tfuncs_acc= (gsl_interp_accel **)			    malloc ( potentialArgs->ntfuncs * sizeof ( gsl_interp_accel * ) );
+  potentialArgs->tfuncs_trange= (double *) malloc ( 2 * potentialArgs->ntfuncs * sizeof ( double ) );
+  for (ii=0; ii < potentialArgs->ntfuncs; ii++) {
+    nPts= (int) *(*pot_args)++;
+    *(potentialArgs->tfuncs_spline+ii)= gsl_spline_alloc(gsl_interp_cspline,
+							 nPts);
+    gsl_spline_init(*(potentialArgs->tfuncs_spline+ii),
+		    *pot_args,*pot_args+nPts,nPts);
+    *(potentialArgs->tfuncs_acc+ii)= gsl_interp_accel_alloc();
+    *(potentialArgs->tfuncs_trange+2*ii)= **pot_args;
+    *(potentialArgs->tfuncs_trange+2*ii+1)= *(*pot_args+nPts-1);
+    *pot_args+= 2 * nPts;
+  }
+}
+double evaluate_tfunc(struct potentialArg * potentialArgs,int ii,double t){
+  if ( ! potentialArgs->tfuncs_spline )
+    return (*(*(potentialArgs->tfuncs+ii)))(t);
+  // Tabulated: clamp to the range of the grid
+  if ( t < *(potentialArgs->tfuncs_trange+2*ii) )
+    t= *(potentialArgs->tfuncs_trange+2*ii);
+  else if ( t > *(potentialArgs->tfuncs_trange+2*ii+1) )
+    t= *(potentialArgs->tfuncs_trange+2*ii+1);
+  return gsl_spline_eval(*(potentialArgs->tfuncs_spline+ii),t,
+			 *(potentialArgs->tfuncs_acc+ii));
+}
 double evaluatePotentials(double R, double Z,
 			  int nargs, struct potentialArg * potentialArgs){
   int ii;
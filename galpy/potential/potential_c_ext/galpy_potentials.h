@@ -50,6 +50,9 @@ struct potentialArg{
 			   struct potentialArg *,double,double,double);
   double (*phitorqueVelocity)(double R, double Z, double phi, double t,
 			     struct potentialArg *,double,double,double);
+  // For spherical potentials, the Jacobian of the force for integrate_dxdv
+  // is computed from planarRforce and planarR2deriv evaluated at r
+  bool hasSphericalHessian;
   int nargs;
   double * args;
   // To allow 1D interpolation for an arbitrary number of splines
@@ -69,6 +72,10 @@ struct potentialArg{
   // To allow an arbitrary number of functions of time
   int ntfuncs;
   tfuncs_type_arr tfuncs; // see typedef above
+  // or these functions tabulated on a grid in time, interpolated w/ splines
+  gsl_interp_accel ** tfuncs_acc;
+  gsl_spline ** tfuncs_spline;
+  double * tfuncs_trange; // [tmin,tmax] of each tabulated function's grid
   // Wrappers
   int nwrapped;
   struct potentialArg * wrappedPotentialArg;
@@ -88,6 +95,9 @@ struct potentialArg{
 //Dealing with potentialArg
 void init_potentialArgs(int,struct potentialArg *);
 void free_potentialArgs(int,struct potentialArg *);
+//Dealing with functions of time
+void parse_tfuncs(struct potentialArg *,double **,tfuncs_type_arr *);
+double evaluate_tfunc(struct potentialArg *,int,double);
 //Potential and force evaluation
 double evaluatePotentials(double,double,int, struct potentialArg *);
 // Hack to allow optional velocity for dissipative forces
@@ -738,6 +748,19 @@ double TimeDependentAmplitudeWrapperPotentialPlanarphi2deriv(double,double,doubl
 						   struct potentialArg *);
 double TimeDependentAmplitudeWrapperPotentialPlanarRphideriv(double,double,double,
 						   struct potentialArg *);
+//JITPotential
+double JITPotentialEval(double,double,double,double,
+			struct potentialArg *);
+double JITPotentialRforce(double,double,double,double,
+			  struct potentialArg *);
+double JITPotentialzforce(double,double,double,double,
+			  struct potentialArg *);
+double JITPotentialphitorque(double,double,double,double,
+			     struct potentialArg *);
+double JITPotentialPlanarRforce(double,double,double,
+				struct potentialArg *);
+double JITPotentialPlanarphitorque(double,double,double,
+				   struct potentialArg *);
 #ifdef __cplusplus
 }
 #endif
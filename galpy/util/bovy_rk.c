@@ -111,6 +111,7 @@ void bovy_rk4(void (*func)(double t, double *q, double *a,
       break;
 // LCOV_EXCL_STOP
     }
+    count_integrator_steps(ndt,dt);
     for (jj=0; jj < (ndt-1); jj++) {
       bovy_rk4_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a);
       to+= dt;
@@ -220,6 +221,7 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
       break;
 // LCOV_EXCL_STOP
     }
+    count_integrator_steps(ndt,dt);
     for (jj=0; jj < (ndt-1); jj++) {
       bovy_rk6_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a,
 		       k1,k2,k3,k4,k5);
@@ -577,6 +579,175 @@ void bovy_dopr54(void (*func)(double t, double *q, double *a,
   free(yerr);
   free(ynk);
 }
+/*
+Runge-Kutta Dormand-Prince 5/4 integrator that stores the dense output
+Usage:
+   Same as bovy_dopr54, with the additional arguments
+       int nmax: maximum number of steps that can be stored
+  Output:
+       int * nsteps: number of accepted steps (nmax+1 if more than nmax steps were necessary)
+       double * tsteps: start and end times of the accepted steps (nsteps+1)
+       double * coeffs: dense output coefficients of each accepted step (nsteps blocks of 5 x dim); the solution at time t in a step starting at told with stepsize h is rcont1+s*(rcont2+(1-s)*(rcont3+s*(rcont4+(1-s)*rcont5))) with s= (t-told)/h
+       double *result: result at the times t, evaluated using the dense output (nt blocks of size dim)
+       void (*step_callback)(told,h,ncoeffs,dim,rcont,cbdata): if not NULL, called after each accepted step with the step's start time, stepsize, and dense output coefficients
+       void * cbdata: data passed to step_callback
+   Unlike bovy_dopr54, the steps are not forced to end on the output times
+   If tsteps is NULL, coeffs is a scratch block of 5 x dim for a single step and the steps are not stored
+*/
+void bovy_dopr54_dense(void (*func)(double t, double *q, double *a,
+				    int nargs, struct potentialArg * potentialArgs),
+		       int dim,
+		       double * yo,
+		       int nt, double dt_one, double *t,
+		       int nargs, struct potentialArg * potentialArgs,
+		       double rtol, double atol,
+		       int nmax, int * nsteps,
+		       double * tsteps, double * coeffs,
+		       double *result, int * err,
+		       void (*step_callback)(double,double,int,int,
+					     double *,void *),
+		       void * cbdata){
+  //coefficients of the dense output
+  static const double d1= -12715105075./11282082432.;
+  static const double d3= 87487479700./32700410799.;
+  static const double d4= -10690763975./1880347072.;
+  static const double d5= 701980252875./199316789632.;
+  static const double d6= -1453857185./822651844.;
+  static const double d7= 69997945./29380423.;
+  //Declare and initialize
+  double *a= (double *) malloc ( dim * sizeof(double) );
+  double *a1= (double *) malloc ( dim * sizeof(double) );
+  double *k1= (double *) malloc ( dim * sizeof(double) );
+  double *k2= (double *) malloc ( dim * sizeof(double) );
+  double *k3= (double *) malloc ( dim * sizeof(double) );
+  double *k4= (double *) malloc ( dim * sizeof(double) );
+  double *k5= (double *) malloc ( dim * sizeof(double) );
+  double *k6= (double *) malloc ( dim * sizeof(double) );
+  double *yn1= (double *) malloc ( dim * sizeof(double) );
+  double *yerr= (double *) malloc ( dim * sizeof(double) );
+  double *ynk= (double *) malloc ( dim * sizeof(double) );
+  double *yold= (double *) malloc ( dim * sizeof(double) );
+  double *rcont;
+  int ii, jj, out_indx= 1;
+  double ydiff, bspl, h, s, s1, told;
+  unsigned char accept;
+  save_rk(dim,yo,result);
+  result+= dim;
+  *err= 0;
+  if ( tsteps ) {
+    *nsteps= 0;
+    *tsteps= *t;
+  }
+  double to= *t;
+  double tf= *(t+nt-1);
+  double dt= (*(t+1))-(*t);
+  if ( dt_one == -9999.99 ) {
+    dt_one= rk4_estimate_step(*func,dim,yo,dt,t,nargs,potentialArgs,
+			      rtol,atol);
+  }
+  double init_dt_one= dt_one;
+  //set up a1
+  func(to,yo,a1,nargs,potentialArgs);
+  // Handle KeyboardInterrupt gracefully
+#ifndef _WIN32
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+#else
+    if (SetConsoleCtrlHandler(CtrlHandler, TRUE)) {}
+#endif
+  while ( ( dt >= 0. && to < tf ) || ( dt < 0. && to > tf ) ) {
+    if ( interrupted ) {
+      *err= -10;
+      interrupted= 0; // need to reset, bc library and vars stay in memory
+#ifdef USING_COVERAGE
+      __gcov_flush();
+#endif
+// LCOV_EXCL_START
+      break;
+// LCOV_EXCL_STOP
+    }
+    accept= 0;
+    if ( init_dt_one/dt_one > _MAX_STEPREDUCE
+	 || dt_one != dt_one) { // check for NaN
+      dt_one= init_dt_one/_MAX_STEPREDUCE;
+      accept= 1;
+      if ( *err % 2 ==  0) *err+= 1;
+    }
+    if ( dt >= 0. && dt_one > (tf - to) )
+      dt_one= tf - to;
+    if ( dt < 0. && dt_one < (tf - to) )
+      dt_one= tf - to;
+    told= to;
+    for (ii=0; ii < dim; ii++) *(yold+ii)= *(yo+ii);
+    h= dt_one;
+    dt_one= bovy_dopr54_actualstep(func,dim,yo,dt_one,&to,nargs,potentialArgs,
+				   rtol,atol,
+				   a1,a,k1,k2,k3,k4,k5,k6,yn1,yerr,ynk,
+				   accept);
+    if ( to == told ) continue; // step rejected
+    count_integrator_steps(0,h);
+    //store the dense output of the accepted step
+    if ( tsteps ) {
+      if ( *nsteps >= nmax ) {
+	*nsteps= nmax+1;
+	break;
+      }
+      *(tsteps + *nsteps + 1)= to;
+      rcont= coeffs + 5 * dim * *nsteps;
+    }
+    else
+      rcont= coeffs;
+    for (ii=0; ii < dim; ii++) {
+      ydiff= *(yo+ii) - *(yold+ii);
+      bspl= *(k1+ii) - ydiff;
+      *(rcont+ii)= *(yold+ii);
+      *(rcont+dim+ii)= ydiff;
+      *(rcont+2*dim+ii)= bspl;
+      *(rcont+3*dim+ii)= ydiff - h * *(a1+ii) - bspl;
+      *(rcont+4*dim+ii)= d1 * *(k1+ii) + d3 * *(k3+ii) + d4 * *(k4+ii)
+	+ d5 * *(k5+ii) + d6 * *(k6+ii) + d7 * h * *(a1+ii);
+    }
+    if ( tsteps ) *nsteps+= 1;
+    if ( step_callback )
+      step_callback(told,h,5,dim,rcont,cbdata);
+    //evaluate the dense output at the requested times in this step
+    while ( out_indx < nt
+	    && ( ( dt >= 0. && *(t+out_indx) <= to )
+		 || ( dt < 0. && *(t+out_indx) >= to ) ) ) {
+      s= (*(t+out_indx) - told) / h;
+      s1= 1. - s;
+      for (ii=0; ii < dim; ii++)
+	*(result+ii)= *(rcont+ii) + s * ( *(rcont+dim+ii) + s1 * ( *(rcont+2*dim+ii) + s * ( *(rcont+3*dim+ii) + s1 * *(rcont+4*dim+ii))));
+      result+= dim;
+      out_indx++;
+    }
+  }
+  // Output times not reached because of round-off in the final step
+  for (jj=out_indx; jj < nt; jj++) {
+    save_rk(dim,yo,result);
+    result+= dim;
+  }
+  // Back to default handler
+#ifndef _WIN32
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+#endif
+  // Free allocated memory
+  free(a);
+  free(a1);
+  free(k1);
+  free(k2);
+  free(k3);
+  free(k4);
+  free(k5);
+  free(k6);
+  free(yn1);
+  free(yerr);
+  free(ynk);
+  free(yold);
+}
 //one output step, consists of multiple steps potentially
 void bovy_dopr54_onestep(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
 			 int dim, double *yo,
@@ -590,7 +761,8 @@ void bovy_dopr54_onestep(void (*func)(double t, double *y, double *a,int nargs,
 			 double * yn1, double * yerr,double * ynk, int * err){
   double init_dt_one= *dt_one;
   double init_to= *to;
-  unsigned char accept;
+  double told, h;
+  unsigned char accept, clipped;
   //printf("%f,%f\n",*to,init_to+dt);
   while ( ( dt >= 0. && *to < (init_to+dt))
 	  || ( dt < 0. && *to > (init_to+dt)) ) {
@@ -601,14 +773,23 @@ void bovy_dopr54_onestep(void (*func)(double t, double *y, double *a,int nargs,
       accept= 1;
       if ( *err % 2 ==  0) *err+= 1;
     }
-    if ( dt >= 0. && *dt_one > (init_to+dt - *to) )
+    clipped= 0;
+    if ( dt >= 0. && *dt_one > (init_to+dt - *to) ) {
       *dt_one= (init_to + dt - *to);
-    if ( dt < 0. && *dt_one < (init_to+dt - *to) )
+      clipped= 1;
+    }
+    if ( dt < 0. && *dt_one < (init_to+dt - *to) ) {
       *dt_one = (init_to + dt - *to);
+      clipped= 1;
+    }
+    told= *to;
+    h= *dt_one;
     *dt_one= bovy_dopr54_actualstep(func,dim,yo,*dt_one,to,nargs,potentialArgs,
 				    rtol,atol,
 				    a1,a,k1,k2,k3,k4,k5,k6,yn1,yerr,ynk,
 				    accept);
+    // steps shortened to end at the output time do not count for dt_min
+    if ( *to != told && ! clipped ) count_integrator_steps(0,h);
   }
 }
 double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
@@ -751,8 +932,11 @@ double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int na
       *(yo+ii)= *(yn1+ii);
     }
     *to+= dt;
+    integrator_stats.nsteps+= 1; // dt_min is tracked by the callers
     //printf("%f,%f\n",*to,dt);
   }
+  else
+    integrator_stats.nrejected+= 1;
   dt_one= dt*pow(2.,powertwo);
   return dt_one;
 }
@@ -95,6 +95,19 @@ void bovy_dopr54(void (*func)(double, double *, double *,
 		 int, struct potentialArg *,
 		 double, double,
 		 double *,int *);
+void bovy_dopr54_dense(void (*func)(double, double *, double *,
+				    int, struct potentialArg *),
+		       int,
+		       double *,
+		       int, double, double *,
+		       int, struct potentialArg *,
+		       double, double,
+		       int, int *,
+		       double *, double *,
+		       double *,int *,
+		       void (*step_callback)(double,double,int,int,
+					     double *,void *),
+		       void *);
 void bovy_dopr54_onestep(void (*func)(double, double *, double *,int, struct potentialArg *),
 			 int, double *,
 			 double, double *,double *,
@@ -34,8 +34,15 @@ POSSIBILITY OF SUCH DAMAGE.
 #include <math.h>
 #include <bovy_symplecticode.h>
 #define _MAX_DT_REDUCE 10000.
+// Softening length of the time transformation of the ttleapfrog integrators
+#define TT_SOFTENING 1e-4
+// Maximum number of iterations and tolerance of the root finder for
+// the step of the ttleapfrog integrators that ends at an output time
+#define TT_MAX_ROOTITER 20
+#define TT_ROOT_TOL 1e-13
 #include "signal.h"
 volatile sig_atomic_t interrupted= 0;
+GALPY_THREAD_LOCAL struct integratorStats integrator_stats= {0,0,0,INFINITY};
 
 // handle CTRL-C differently on UNIX systems and Windows
 #ifndef _WIN32
@@ -156,6 +163,7 @@ void leapfrog(void (*func)(double t, double *q, double *a,
     //drift half
     leapfrog_leapq(dim,qo,po,dt/2.,q12);
     //now drift full for a while
+    count_integrator_steps(ndt,dt);
     for (jj=0; jj < (ndt-1); jj++){
       //kick
       func(to+dt/2.,q12,a,nargs,potentialArgs);
@@ -282,6 +290,7 @@ void symplec4(void (*func)(double t, double *q, double *a,
     leapfrog_leapq(dim,qo,po,c1*dt,q12);
     to+= c1*dt;
     //steps ignoring q4/p4 when output is not wanted
+    count_integrator_steps(ndt,dt);
     for (jj=0; jj < (ndt-1); jj++){
       //kick for d1*dt
       func(to,q12,a,nargs,potentialArgs);
@@ -442,6 +451,7 @@ void symplec6(void (*func)(double t, double *q, double *a,
     leapfrog_leapq(dim,qo,po,c1*dt,q12);
     to+= c1*dt;
     //steps ignoring q8/p8 when output is not wanted
+    count_integrator_steps(ndt,dt);
     for (jj=0; jj < (ndt-1); jj++){
       //kick for d1*dt
       func(to,q12,a,nargs,potentialArgs);
@@ -999,3 +1009,319 @@ double symplec6_estimate_step(void (*func)(double t, double *q, double *a,int na
   //fflush(stdout);
   return dt;
 }
+/*
+Time-transformed leapfrog integrator (TTL; Mikkola & Aarseth 2002, CeMDA, 84, 343) and its fourth-order composition (Yoshida 1990)
+The equations of motion are integrated in a fictitious time s with ds = Omega(q) dt, where Omega(q) = 1/sqrt(|q|^2+TT_SOFTENING^2), such that the physical time step is proportional to the distance from the center and automatically shrinks near pericenter; the integrator is symplectic in the extended phase space and uses an auxiliary variable W (= Omega(q) along the exact solution) that is integrated along with the orbit
+Because the steps in physical time are not constant, the output at each requested time is obtained by a separate step from the start of the step that brackets the time, with its fictitious-time step solved for such that it ends at the requested time (the integration itself continues with the regular steps)
+Usage:
+   Provide the acceleration function func with calling sequence
+       func (t,q,a,nargs,args)
+   where
+       double t: time
+       double * q: current position (dimension: dim)
+       double * a: will be set to the derivative
+       int nargs: number of arguments the function takes
+       struct potentialArg * potentialArg structure pointer, see header file
+  Other arguments are:
+       int dim: dimension
+       double *yo: initial value [qo,po], dimension: 2*dim
+       int nt: number of times at which the output is wanted
+       double dt: (optional) physical stepsize at the initial position (the fictitious-time step is dt x Omega(qo))
+       double *t: times at which the output is wanted (EQUALLY SPACED)
+       int nargs: see above
+       double *args: see above
+       double rtol, double atol: relative and absolute tolerance levels desired
+  Output:
+       double *result: result (nt blocks of size 2dim)
+       int *err: error: -10 if interrupted by CTRL-C (SIGINT), 1 if the physical time stopped advancing
+*/
+static inline double ttleapfrog_omega(int dim,double *q,double *dOmega){
+  int ii;
+  double Omega= TT_SOFTENING * TT_SOFTENING;
+  for (ii=0; ii < dim; ii++) Omega+= *(q+ii) * *(q+ii);
+  Omega= 1./sqrt(Omega);
+  for (ii=0; ii < dim; ii++)
+    *(dOmega+ii)= - *(q+ii) * Omega * Omega * Omega;
+  return Omega;
+}
+static void ttleapfrog_step(void (*func)(double t, double *q, double *a,
+					 int nargs, struct potentialArg *),
+			    int dim,double h,double *q,double *p,
+			    double *to,double *W,double *a,double *dOmega,
+			    int nargs,struct potentialArg * potentialArgs){
+  int ii;
+  double dt, pn, dW= 0.;
+  //drift half
+  dt= h / 2. / *W;
+  leapfrog_leapq(dim,q,p,dt,q);
+  *to+= dt;
+  //kick, updating W with the average velocity over the kick
+  dt= h / ttleapfrog_omega(dim,q,dOmega);
+  func(*to,q,a,nargs,potentialArgs);
+  for (ii=0; ii < dim; ii++) {
+    pn= *(p+ii) + dt * *(a+ii);
+    dW+= *(dOmega+ii) * ( *(p+ii) + pn ) / 2.;
+    *(p+ii)= pn;
+  }
+  *W+= dt * dW;
+  //drift half
+  dt= h / 2. / *W;
+  leapfrog_leapq(dim,q,p,dt,q);
+  *to+= dt;
+}
+static void ttsymplec_step(int order,
+			   void (*func)(double t, double *q, double *a,
+					int nargs, struct potentialArg *),
+			   int dim,double h,double *q,double *p,
+			   double *to,double *W,double *a,double *dOmega,
+			   int nargs,struct potentialArg * potentialArgs){
+  //Fourth order: triple-jump composition of the second-order step
+  double w1= 1.3512071919596578; // 1/(2-2^(1/3))
+  double w0= -1.7024143839193153; // -2^(1/3)/(2-2^(1/3))
+  if ( order == 2 )
+    ttleapfrog_step(func,dim,h,q,p,to,W,a,dOmega,nargs,potentialArgs);
+  else {
+    ttleapfrog_step(func,dim,w1*h,q,p,to,W,a,dOmega,nargs,potentialArgs);
+    ttleapfrog_step(func,dim,w0*h,q,p,to,W,a,dOmega,nargs,potentialArgs);
+    ttleapfrog_step(func,dim,w1*h,q,p,to,W,a,dOmega,nargs,potentialArgs);
+  }
+}
+static void ttsymplec_partial_step(int order,
+				   void (*func)(double t, double *q, double *a,
+						int nargs, struct potentialArg *),
+				   int dim,double h,double tout,
+				   double tp,double *qp,double *pp,double Wp,
+				   double to,double *qout,double *pout,
+				   double *a,double *dOmega,
+				   int nargs,struct potentialArg * potentialArgs){
+  // Take a step from (qp,pp,tp,Wp) that ends at tout, given that a step h
+  // ends at to; the fictitious-time step is found using the Illinois
+  // variant of the regula-falsi method, which keeps it bracketed
+  int ii, kk, side= 0;
+  double h0= 0., f0= tp - tout, h1= h, f1= to - tout, hn, fn, tn, Wn;
+  for (kk=0; kk < dim; kk++) {
+    *(qout+kk)= *(qp+kk);
+    *(pout+kk)= *(pp+kk);
+  }
+  if ( f0 == 0. ) return;
+  for (ii=0; ii < TT_MAX_ROOTITER; ii++) {
+    hn= ( h0 * f1 - h1 * f0 ) / ( f1 - f0 );
+    for (kk=0; kk < dim; kk++) {
+      *(qout+kk)= *(qp+kk);
+      *(pout+kk)= *(pp+kk);
+    }
+    tn= tp;
+    Wn= Wp;
+    ttsymplec_step(order,func,dim,hn,qout,pout,&tn,&Wn,a,dOmega,
+		   nargs,potentialArgs);
+    fn= tn - tout;
+    if ( fabs(fn) <= TT_ROOT_TOL * fabs(to - tp) ) break;
+    if ( fn * f1 > 0. ) {
+      h1= hn;
+      f1= fn;
+      if ( side == -1 ) f0/= 2.;
+      side= -1;
+    }
+    else {
+      h0= hn;
+      f0= fn;
+      if ( side == 1 ) f1/= 2.;
+      side= 1;
+    }
+  }
+}
+static void ttsymplec(int order,
+		      void (*func)(double t, double *q, double *a,
+				   int nargs, struct potentialArg * potentialArgs),
+		      int dim,
+		      double * yo,
+		      int nt, double dt, double *t,
+		      int nargs, struct potentialArg * potentialArgs,
+		      double rtol, double atol,
+		      double *result,int * err){
+  //Initialize
+  double *qo= (double *) malloc ( dim * sizeof(double) );
+  double *po= (double *) malloc ( dim * sizeof(double) );
+  double *qp= (double *) malloc ( dim * sizeof(double) );
+  double *pp= (double *) malloc ( dim * sizeof(double) );
+  double *qout= (double *) malloc ( dim * sizeof(double) );
+  double *pout= (double *) malloc ( dim * sizeof(double) );
+  double *a= (double *) malloc ( dim * sizeof(double) );
+  double *dOmega= (double *) malloc ( dim * sizeof(double) );
+  int ii, kk;
+  for (ii=0; ii < dim; ii++) {
+    *(qo+ii)= *(yo+ii);
+    *(po+ii)= *(yo+dim+ii);
+  }
+  save_qp(dim,qo,po,result);
+  result+= 2 * dim;
+  *err= 0;
+  double W= ttleapfrog_omega(dim,qo,dOmega);
+  //Estimate necessary stepsize in the fictitious time
+  double init_dt= (*(t+1))-(*t);
+  double h;
+  if ( dt == -9999.99 )
+    h= ttsymplec_estimate_step(order,*func,dim,qo,po,init_dt * W,t,
+			       nargs,potentialArgs,rtol,atol);
+  else
+    h= copysign(fabs(dt),init_dt) * W;
+  //Integrate the system
+  double to= *t, tp= *t, Wp= W;
+  // Handle KeyboardInterrupt gracefully
+#ifndef _WIN32
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+#else
+    if (SetConsoleCtrlHandler(CtrlHandler, TRUE)) {}
+#endif
+  for (ii=1; ii < nt; ii++){
+    if ( interrupted ) {
+      *err= -10;
+      interrupted= 0; // need to reset, bc library and vars stay in memory
+#ifdef USING_COVERAGE
+      __gcov_flush();
+#endif
+// LCOV_EXCL_START
+      break;
+// LCOV_EXCL_STOP
+    }
+    //step until the output time is bracketed by [tp,to]
+    while ( ( *(t+ii) - to ) * init_dt > 0. ) {
+      tp= to;
+      Wp= W;
+      for (kk=0; kk < dim; kk++) {
+	*(qp+kk)= *(qo+kk);
+	*(pp+kk)= *(po+kk);
+      }
+      ttsymplec_step(order,func,dim,h,qo,po,&to,&W,a,dOmega,
+		     nargs,potentialArgs);
+      count_integrator_steps(1,to-tp);
+      if ( ! isfinite(to) || ! ( ( to - tp ) * init_dt > 0. ) ) {
+	*err= 1;
+	break;
+      }
+    }
+    if ( *err == 1 ) {
+      for (kk=0; kk < 2 * dim * (nt-ii); kk++) *(result+kk)= NAN;
+      break;
+    }
+    //output from a partial step that ends at the output time
+    ttsymplec_partial_step(order,func,dim,h,*(t+ii),tp,qp,pp,Wp,to,
+			   qout,pout,a,dOmega,nargs,potentialArgs);
+    save_qp(dim,qout,pout,result);
+    result+= 2 * dim;
+  }
+  // Back to default handler
+#ifndef _WIN32
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+#endif
+  //Free allocated memory
+  free(qo);
+  free(po);
+  free(qp);
+  free(pp);
+  free(qout);
+  free(pout);
+  free(a);
+  free(dOmega);
+  //We're done
+}
+void ttleapfrog(void (*func)(double t, double *q, double *a,
+			     int nargs, struct potentialArg * potentialArgs),
+		int dim,
+		double * yo,
+		int nt, double dt, double *t,
+		int nargs, struct potentialArg * potentialArgs,
+		double rtol, double atol,
+		double *result,int * err){
+  ttsymplec(2,func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,result,err);
+}
+void ttsymplec4(void (*func)(double t, double *q, double *a,
+			     int nargs, struct potentialArg * potentialArgs),
+		int dim,
+		double * yo,
+		int nt, double dt, double *t,
+		int nargs, struct potentialArg * potentialArgs,
+		double rtol, double atol,
+		double *result,int * err){
+  ttsymplec(4,func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,result,err);
+}
+double ttsymplec_estimate_step(int order,
+			       void (*func)(double t, double *q, double *a,int nargs, struct potentialArg *),
+			       int dim, double *qo,double *po,
+			       double h, double *t,
+			       int nargs,struct potentialArg * potentialArgs,
+			       double rtol,double atol){
+  //scalars
+  double err= 2.;
+  double max_val_q, max_val_p;
+  double to, W, W0;
+  double init_h= h;
+  //allocate and initialize
+  double *q11= (double *) malloc ( dim * sizeof(double) );
+  double *q12= (double *) malloc ( dim * sizeof(double) );
+  double *p11= (double *) malloc ( dim * sizeof(double) );
+  double *p12= (double *) malloc ( dim * sizeof(double) );
+  double *a= (double *) malloc ( dim * sizeof(double) );
+  double *dOmega= (double *) malloc ( dim * sizeof(double) );
+  double *scale= (double *) malloc ( 2 * dim * sizeof(double) );
+  int ii;
+  W0= ttleapfrog_omega(dim,qo,dOmega);
+  //find maximum values
+  max_val_q= fabs(*qo);
+  for (ii=1; ii < dim; ii++)
+    if ( fabs(*(qo+ii)) > max_val_q )
+      max_val_q= fabs(*(qo+ii));
+  max_val_p= fabs(*po);
+  for (ii=1; ii < dim; ii++)
+    if ( fabs(*(po+ii)) > max_val_p )
+      max_val_p= fabs(*(po+ii));
+  //set up scale
+  double c= fmax(atol, rtol * max_val_q);
+  double s= log(exp(atol-c)+exp(rtol*max_val_q-c))+c;
+  for (ii=0; ii < dim; ii++) *(scale+ii)= s;
+  c= fmax(atol, rtol * max_val_p);
+  s= log(exp(atol-c)+exp(rtol*max_val_p-c))+c;
+  for (ii=0; ii < dim; ii++) *(scale+ii+dim)= s;
+  //find good h
+  h*= 2.;
+  while ( err > 1.  && init_h / h < _MAX_DT_REDUCE){
+    h/= 2.;
+    //do one step with step h, and two with step h/2.
+    for (ii=0; ii < dim; ii++) {
+      *(q11+ii)= *(qo+ii);
+      *(p11+ii)= *(po+ii);
+      *(q12+ii)= *(qo+ii);
+      *(p12+ii)= *(po+ii);
+    }
+    to= *t;
+    W= W0;
+    ttsymplec_step(order,func,dim,h,q11,p11,&to,&W,a,dOmega,
+		   nargs,potentialArgs);
+    to= *t;
+    W= W0;
+    ttsymplec_step(order,func,dim,h/2.,q12,p12,&to,&W,a,dOmega,
+		   nargs,potentialArgs);
+    ttsymplec_step(order,func,dim,h/2.,q12,p12,&to,&W,a,dOmega,
+		   nargs,potentialArgs);
+    //Norm
+    err= 0.;
+    for (ii=0; ii < dim; ii++) {
+      err+= exp(2.*log(fabs(*(q11+ii)-*(q12+ii)))-2.* *(scale+ii));
+      err+= exp(2.*log(fabs(*(p11+ii)-*(p12+ii)))-2.* *(scale+ii+dim));
+    }
+    err= sqrt(err/2./dim);
+  }
+  //free what we allocated
+  free(q11);
+  free(q12);
+  free(p11);
+  free(p12);
+  free(a);
+  free(dOmega);
+  free(scale);
+  return h;
+}
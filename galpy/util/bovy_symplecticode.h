@@ -35,11 +35,51 @@ POSSIBILITY OF SUCH DAMAGE.
 extern "C" {
 #endif
 #include "signal.h"
+#include <math.h>
 #include <galpy_potentials.h>
 /*
   Global variables
 */
 extern volatile sig_atomic_t interrupted;
+/*
+  Counters of the work done by the integrators, kept per thread such that the
+  orbit integration loops can collect them for each orbit
+*/
+#if defined(_MSC_VER)
+#define GALPY_THREAD_LOCAL __declspec(thread)
+#else
+#define GALPY_THREAD_LOCAL __thread
+#endif
+struct integratorStats{
+  long nsteps; // number of (accepted) steps
+  long nrejected; // number of rejected steps (adaptive integrators only)
+  long nfev; // number of force evaluations
+  double dt_min; // smallest absolute time step taken
+};
+extern GALPY_THREAD_LOCAL struct integratorStats integrator_stats;
+static inline void reset_integrator_stats(void){
+  integrator_stats.nsteps= 0;
+  integrator_stats.nrejected= 0;
+  integrator_stats.nfev= 0;
+  integrator_stats.dt_min= INFINITY;
+}
+static inline void count_integrator_steps(long nsteps,double dt){
+  integrator_stats.nsteps+= nsteps;
+  if ( fabs(dt) < integrator_stats.dt_min )
+    integrator_stats.dt_min= fabs(dt);
+}
+// Per-orbit output of the counters: nsteps, nrejected, nfev, dt_min, the
+// wall time spent on the orbit, and the thread that integrated it
+#define INTEGRATOR_NSTATS 6
+static inline void save_integrator_stats(double *stats,double walltime,
+					 int thread){
+  *stats++= (double) integrator_stats.nsteps;
+  *stats++= (double) integrator_stats.nrejected;
+  *stats++= (double) integrator_stats.nfev;
+  *stats++= integrator_stats.dt_min;
+  *stats++= walltime;
+  *stats= (double) thread;
+}
 /*
   Function declarations
 */
@@ -88,6 +128,28 @@ double symplec6_estimate_step(void (*func)(double , double *, double *,int, stru
 			      double, double *,
 			      int,struct potentialArg *,
 			      double,double);
+void ttleapfrog(void (*func)(double, double *, double *,
+			     int, struct potentialArg *),
+		int,
+		double *,
+		int, double, double *,
+		int, struct potentialArg *,
+		double, double,
+		double *,int *);
+void ttsymplec4(void (*func)(double, double *, double *,
+			     int, struct potentialArg *),
+		int,
+		double *,
+		int, double, double *,
+		int, struct potentialArg *,
+		double, double,
+		double *,int *);
+double ttsymplec_estimate_step(int,
+			       void (*func)(double , double *, double *,int, struct potentialArg *),
+			       int, double *,double *,
+			       double, double *,
+			       int,struct potentialArg *,
+			       double,double);
 #ifdef __cplusplus
 }
 #endif
@@ -240,6 +240,41 @@ void dop853(void(*func)(double t, double *q, double *a, int nargs, struct potent
 	double atol,
 	double *result,
 	int *err_)
+{
+	dop853_dense(func,dim,y0,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		     result,err_,0,NULL,NULL,NULL,NULL,NULL);
+}
+/*
+DOP8(5, 3) integration that also stores the dense output
+Usage:
+   Same as dop853, with the additional arguments
+	   int nmax: maximum number of steps that can be stored
+  Output:
+	   int * nsteps: number of accepted steps (nmax+1 if more than nmax steps were necessary)
+	   double * tsteps: start and end times of the accepted steps (nsteps+1)
+	   double * coeffs: dense output coefficients of each accepted step (nsteps blocks of 8 x dim)
+	   void (*step_callback)(told,h,ncoeffs,dim,rcont,cbdata): if not NULL, called after each accepted step with the step's start time, stepsize, and dense output coefficients
+	   void * cbdata: data passed to step_callback
+   If coeffs is NULL, the dense output is not computed (this is what dop853 does); if tsteps is NULL, coeffs is a scratch block of 8 x dim for a single step and the steps are not stored
+*/
+void dop853_dense(void(*func)(double t, double *q, double *a, int nargs, struct potentialArg * potentialArgs),
+	int dim,
+	double * y0,
+	int nt,
+	double dt,
+	double *t,
+	int nargs,
+	struct potentialArg * potentialArgs,
+	double rtol,
+	double atol,
+	double *result,
+	int *err_,
+	int nmax,
+	int *nsteps,
+	double *tsteps,
+	double *coeffs,
+	void (*step_callback)(double,double,int,int,double *,void *),
+	void *cbdata)
 {
 	rtol = exp(rtol);
 	atol = exp(atol);
@@ -282,8 +317,13 @@ void dop853(void(*func)(double t, double *q, double *a, int nargs, struct potent
 	double sqr, err, err2, erri, deno;
 	double fac, fac11;
 	double s, s1;
+	double *rcont;
 	save_dop853(dim, y0, result);  // save first result which is the initials
 	result += dim;  // shift to next memory
+	if ( tsteps ) {
+		*nsteps= 0;
+		*tsteps= t[0];
+	}
 
 	#ifndef _WIN32
 		struct sigaction action;
@@ -422,6 +462,7 @@ void dop853(void(*func)(double t, double *q, double *a, int nargs, struct potent
 
 		if (err <= 1.0)  // step accepted
 		{
+			count_integrator_steps(1, h);
 			facold = max(err, 1.0e-4);
 			func(t_current, k5, k4, nargs, potentialArgs);
 
@@ -461,6 +502,33 @@ void dop853(void(*func)(double t, double *q, double *a, int nargs, struct potent
 				y0[i] = k5[i];
 			}
 
+			// store the dense output
+			if ( coeffs ) {
+				if ( tsteps ) {
+					if ( *nsteps >= nmax ) {
+						*nsteps= nmax+1;
+						break;
+					}
+					*(tsteps + *nsteps + 1)= t_current;
+					rcont= coeffs + 8 * dim * *nsteps;
+				}
+				else
+					rcont= coeffs;
+				for (i = 0; i < dim; i++) {
+					*(rcont + i)= rcont1[i];
+					*(rcont + dim + i)= rcont2[i];
+					*(rcont + 2 * dim + i)= rcont3[i];
+					*(rcont + 3 * dim + i)= rcont4[i];
+					*(rcont + 4 * dim + i)= rcont5[i];
+					*(rcont + 5 * dim + i)= rcont6[i];
+					*(rcont + 6 * dim + i)= rcont7[i];
+					*(rcont + 7 * dim + i)= rcont8[i];
+				}
+				if ( tsteps ) *nsteps+= 1;
+				if ( step_callback )
+					step_callback(t_old,h,8,dim,rcont,cbdata);
+			}
+
 			// loop for dense output in this time slot
 			while ((finished_user_t_ii < nt - 1) && (fabs(t[finished_user_t_ii + 1]) < fabs(t_current)))
 			{
@@ -482,6 +550,7 @@ void dop853(void(*func)(double t, double *q, double *a, int nargs, struct potent
 			// step rejected since error too big
 			hnew = h / min(facc1, fac11 / safe);
 			reject = 1;
+			integrator_stats.nrejected += 1;
 
 			// reverse time increment since error rejected
 			t_current = t_old;
@@ -86,6 +86,26 @@ void dop853 (
 	double *,
 	int *
 );
+void dop853_dense (
+	void(*func)(double, double *, double *, int, struct potentialArg *),
+	int,
+	double *,
+	int,
+	double,
+	double *,
+	int,
+	struct potentialArg *,
+	double,
+	double,
+	double *,
+	int *,
+	int,
+	int *,
+	double *,
+	double *,
+	void(*step_callback)(double, double, int, int, double *, void *),
+	void *
+);
 #ifdef __cplusplus
 }
 #endif
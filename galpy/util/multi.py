@@ -30,7 +30,16 @@
 #THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 #(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 #OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The implementation below was rewritten for galpy to use dynamic, chunked
+# scheduling and to return the results through shared memory
+import os
+import pickle
 import platform
+import shutil
+import tempfile
+import time
+import traceback
 
 import numpy
 
@@ -40,6 +49,7 @@ _ncpus=1
 try:
   # May raise ImportError
   import multiprocessing
+  import multiprocessing.connection
   _multi=True
 
   # May raise NotImplementedError
@@ -56,113 +66,295 @@ except ImportError: #pragma: no cover
 __all__ = ('parallel_map',)
 
 
-def worker(f, ii, chunk, out_q, err_q, lock,
-           progressbar, iter_elapsed, tot_iter, pbar_proc):
-  """
-  A worker function that maps an input function over a
-  slice of the input iterable.
-
-  :param f  : callable function that accepts argument from iterable
-  :param ii  : process ID
-  :param chunk: slice of input iterable
-  :param out_q: thread-safe output queue
-  :param err_q: thread-safe queue to populate on exception
-  :param lock : thread-safe lock to protect a resource
-         ( useful in extending parallel_map() )
-  :param progressbar: if True, display a progress bar
-  :param iter_elapsed: shared-memory Value to track progress
-  :param tot_iter: total number of iterations (for progressbar)
-  :param pbar_proc: process to use to display the progressbar
-  """
-  vals = []
+class _RemoteTraceback(Exception):
+  """Exception that holds the traceback of an exception in a worker"""
+  def __init__(self, tb):
+    self.tb = tb
+  def __str__(self):
+    return self.tb
 
-  progressbar*= _TQDM_LOADED
-  if progressbar and ii == pbar_proc:
-    pbar= tqdm.tqdm(total=tot_iter,leave=False)
 
-  # iterate over slice
-  for val in chunk:
+def _flatten_result(result):
+  """
+  Flatten a result that is a (nested) tuple or list of numbers and
+  numeric arrays into its leaves, returned as arrays, and a description
+  of its structure that is used to rebuild it; raises TypeError if any
+  of the leaves is not numeric.
+  """
+  if type(result) in (tuple, list):
+    leaves = []
+    structure = []
+    for res in result:
+      sub_leaves, sub_structure = _flatten_result(res)
+      leaves.extend(sub_leaves)
+      structure.append(sub_structure)
+    return leaves, (type(result), tuple(structure))
+  leaf = numpy.asarray(result)
+  if not (numpy.issubdtype(leaf.dtype, numpy.number)
+          or leaf.dtype == numpy.bool_):
+    raise TypeError("result '%s' is not numeric" % repr(result))
+  return [leaf], None
+
+
+def _rebuild_result(structure, leaves, ii):
+  """Rebuild result ii from the shared output arrays leaves (an iterator)"""
+  if structure is None:
+    return next(leaves)[ii]
+  typ, sub_structures = structure
+  return typ([_rebuild_result(sub, leaves, ii) for sub in sub_structures])
+
+
+def _store_dtype(dtype):
+  """The dtype of a shared output array for results of type dtype, which
+  is promoted to at least float64, such that results of mixed integer and
+  floating-point type can be stored"""
+  return numpy.result_type(dtype, numpy.float64)
+
+
+class _SharedOutputs:
+  """
+  Output arrays in shared memory, one per leaf of the results. The worker
+  processes are forked before any result is known, so the main process
+  allocates the arrays as memory-mapped files when the first result comes
+  back and the workers attach to them once they are ready; results that
+  are obtained before that are sent back by pickling them.
+  """
+  def __init__(self, ctx, size):
+    self.size = size
+    self.ready = ctx.Value('b', False)
+    # Directory for the description of the arrays, in memory if possible;
+    # the arrays themselves are also put here if there is room
+    self.dir = tempfile.mkdtemp(
+      dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    self.datadir = None
+    self.allocated = False
+    self.outs = None
+    self.layout = None
+    self.dtypes = None
+    self.mixed = None
+
+  def allocate(self, result):
+    """Allocate the output arrays for results like result (in the main
+    process); only the first call does anything"""
+    if self.allocated:
+      return
+    self.allocated = True
     try:
-      result = f(val)
-    except Exception as e:
-      err_q.put(e)
+      leaves, layout = _flatten_result(result)
+    except TypeError:
       return
-    # Update progress bar; only update in first process, accumulate in others
-    if progressbar:
-      if ii == pbar_proc:
-        pbar.update(iter_elapsed.value+1)
-        iter_elapsed.value= 0
-      else:
-        iter_elapsed.value+= 1
-
-    vals.append(result)
-
-  if progressbar and ii == pbar_proc:
-    pbar.close()
+    shapes = [(self.size,)+leaf.shape for leaf in leaves]
+    dtypes = [_store_dtype(leaf.dtype) for leaf in leaves]
+    nbytes = [int(numpy.prod(shape))*dtype.itemsize
+              for shape, dtype in zip(shapes, dtypes)]
+    if min(nbytes) == 0: # empty files cannot be mapped
+      return
+    stat = os.statvfs(self.dir)
+    if stat.f_bavail*stat.f_frsize > 2*sum(nbytes):
+      self.datadir = self.dir
+    else:
+      self.datadir = tempfile.mkdtemp()
+    files = [os.path.join(self.datadir, 'out%i' % jj)
+             for jj in range(len(leaves))]
+    files.append(os.path.join(self.datadir, 'mixed'))
+    self.layout = layout
+    self.dtypes = [leaf.dtype for leaf in leaves]
+    self._map(files, dtypes, shapes, 'w+')
+    # Write the description atomically, such that workers never see part
+    with open(os.path.join(self.dir, 'layout.tmp'), 'wb') as savefile:
+      pickle.dump((layout, self.dtypes, files, dtypes, shapes), savefile)
+    os.replace(os.path.join(self.dir, 'layout.tmp'),
+               os.path.join(self.dir, 'layout'))
+    self.ready.value = True
+
+  def attach(self):
+    """Attach to the output arrays once they are ready (in a worker)"""
+    if not self.outs is None or not self.ready.value:
+      return
+    with open(os.path.join(self.dir, 'layout'), 'rb') as savefile:
+      self.layout, self.dtypes, files, dtypes, shapes = pickle.load(savefile)
+    self._map(files, dtypes, shapes, 'r+')
+
+  def _map(self, files, dtypes, shapes, mode):
+    self.outs = [numpy.memmap(filename, dtype=dtype, mode=mode, shape=shape)
+                 for filename, dtype, shape in zip(files, dtypes, shapes)]
+    self.mixed = numpy.memmap(files[-1], dtype=numpy.bool_, mode=mode,
+                              shape=(len(self.outs),))
+
+  def store(self, result, ii):
+    """Store result ii in the output arrays, return False if this is not
+    possible because they are not (yet) available, because the result
+    does not match their layout, or because it does not fit in their
+    dtype; mixed[jj] is set if leaf jj does not have the type dtypes[jj]
+    of the first result"""
+    if self.outs is None:
+      return False
+    try:
+      leaves, structure = _flatten_result(result)
+    except TypeError:
+      return False
+    if structure != self.layout or len(leaves) != len(self.outs) \
+       or any(leaf.shape != out.shape[1:]
+              or not numpy.can_cast(leaf.dtype, out.dtype, casting='safe')
+              for leaf, out in zip(leaves, self.outs)):
+      return False
+    for jj, (leaf, out) in enumerate(zip(leaves, self.outs)):
+      out[ii] = leaf
+      if leaf.dtype != self.dtypes[jj]:
+        self.mixed[jj] = True
+    return True
+
+  def close(self):
+    """Remove the files that back the output arrays (in the main process);
+    the mapped arrays remain valid"""
+    shutil.rmtree(self.dir, ignore_errors=True)
+    if not self.datadir is None:
+      shutil.rmtree(self.datadir, ignore_errors=True)
+
+
+def worker(f, sequence, chunksize, counter, ndone, abort, shared, result_q):
+  """
+  A worker function that maps an input function over chunks of the
+  input sequence, obtaining the next chunk from a shared counter until
+  the sequence is exhausted.
 
-  # output the result and task ID to output queue
-  out_q.put( (ii, vals) )
+  :param f  : callable function that accepts argument from iterable
+  :param sequence: input sequence
+  :param chunksize: number of elements of the sequence per chunk
+  :param counter: shared-memory Value with the start of the next chunk
+  :param ndone: shared-memory Value with the number of evaluated elements
+  :param abort: shared-memory Value that is set when any worker fails
+  :param shared: _SharedOutputs instance with the output arrays
+  :param result_q: queue for errors and for results that cannot be
+         stored in the shared output arrays
+  """
+  size = len(sequence)
+  try:
+    while not abort.value:
+      with counter.get_lock():
+        start = counter.value
+        counter.value += chunksize
+      if start >= size:
+        break
+      for ii in range(start, min(start+chunksize, size)):
+        if abort.value:
+          return
+        result = f(sequence[ii])
+        shared.attach()
+        if not shared.store(result, ii):
+          result_q.put(('result', ii, result))
+        with ndone.get_lock():
+          ndone.value += 1
+  except BaseException as e:
+    abort.value = True
+    tb = traceback.format_exc()
+    try:
+      result_q.put(('error', e, tb))
+    except Exception: # exception cannot be pickled
+      result_q.put(('error', None, tb))
 
 
-def run_tasks(procs, err_q, out_q, num):
+def run_tasks(procs, result_q, ndone, abort, size, progressbar, shared):
   """
-  A function that executes populated processes and processes
-  the resultant array. Checks error queue for any exceptions.
+  A function that executes populated processes, allocates the shared
+  output arrays from the first result, collects the results that were
+  not written to them, and displays the progress. Raises the first
+  exception raised in any of the processes.
 
   :param procs: list of Process objects
-  :param out_q: thread-safe output queue
-  :param err_q: thread-safe queue to populate on exception
-  :param num : length of resultant array
+  :param result_q: queue for errors and results
+  :param ndone: shared-memory Value with the number of evaluated elements
+  :param abort: shared-memory Value that is set to stop all processes
+  :param size: length of the input sequence
+  :param progressbar: if True, display a progress bar
+  :param shared: _SharedOutputs instance with the output arrays
 
   """
   # function to terminate processes that are still running.
   die = (lambda vals : [val.terminate() for val in vals
              if val.exitcode is None])
 
+  results = {}
+  error = None
+  if progressbar and _TQDM_LOADED:
+    pbar = tqdm.tqdm(total=size, leave=False)
+  else:
+    pbar = None
   try:
     for proc in procs:
       proc.start()
-
+    while True:
+      alive = any(proc.is_alive() for proc in procs)
+      # Drain the queue while the processes run, such that they never
+      # block on writing to it
+      while not result_q.empty():
+        msg = result_q.get()
+        if msg[0] == 'result':
+          shared.allocate(msg[2])
+          if not shared.store(msg[2], msg[1]):
+            results[msg[1]] = msg[2]
+        elif error is None:
+          error = msg
+      if not pbar is None:
+        pbar.update(ndone.value-pbar.n)
+      if not alive:
+        break
+      multiprocessing.connection.wait([proc.sentinel for proc in procs],
+                                      timeout=0.01)
     for proc in procs:
       proc.join()
-
-  except Exception as e:
+  except BaseException as e:
     # kill all slave processes on ctrl-C
+    abort.value = True
     try:
       die(procs)
     finally:
       raise e
-
-  if not err_q.empty():
-    # kill all on any exception from any one slave
-    try:
-      die(procs)
-    finally:
-      raise err_q.get()
-
-  # Processes finish in arbitrary order. Process IDs double
-  # as index in the resultant array.
-  results=[None]*num;
-  while not out_q.empty():
-    idx, result = out_q.get()
-    results[idx] = result
-
-  # Remove extra dimension added by array_split
-  return list(numpy.concatenate(results))
-
-
-def parallel_map(function, sequence, numcores=None, progressbar=False):
+  finally:
+    if not pbar is None:
+      pbar.close()
+
+  if not error is None:
+    if error[1] is None:
+      raise RuntimeError('parallel_map worker failed with an exception '
+                         'that cannot be transferred:\n%s' % error[2])
+    raise error[1] from _RemoteTraceback(error[2])
+  if any(proc.exitcode != 0 for proc in procs):
+    raise RuntimeError('parallel_map worker process exited unexpectedly')
+  return results
+
+
+def parallel_map(function, sequence, numcores=None, progressbar=False,
+                 chunksize=None, as_array=False):
   """
   A parallelized version of the native Python map function that
   utilizes the Python multiprocessing module to divide and
   conquer sequence.
 
+  The sequence is evaluated in chunks that the worker processes obtain
+  dynamically, such that the load is balanced. The first result that
+  comes back determines the structure of the results; results that are
+  (nested tuples or lists of) numbers or numeric arrays with the same
+  shape as that result are written directly into output arrays in
+  shared memory, other results (and those obtained before the output
+  arrays are set up) are returned by pickling them. The output arrays
+  have at least float64 precision, such that results of mixed integer
+  and floating-point type are returned as floating-point numbers; when
+  all results have the type of the first result, they are returned with
+  that type. Exceptions raised in the worker processes are re-raised in
+  the main process.
+
   parallel_map does not yet support multiple argument sequences.
 
   :param function: callable function that accepts argument from iterable
-  :param sequence: iterable sequence
+  :param sequence: iterable sequence that supports len and indexing
   :param numcores: number of cores to use
   :param progressbar: if True, display a progressbar using tqdm
+  :param chunksize: number of elements of the sequence per chunk
+         (default: such that each process evaluates about four chunks)
+  :param as_array: if True, return the results as a single array with
+         the results along the first axis (without copying if the
+         results were written to shared memory)
   """
   if not callable(function):
     raise TypeError("input function '%s' is not callable" %
@@ -174,49 +366,60 @@ def parallel_map(function, sequence, numcores=None, progressbar=False):
 
   size = len(sequence)
 
-  if not _multi or size == 1:
-    return map(function, sequence)
-
   if numcores is None:
     numcores = _ncpus
 
-  if platform.system() == 'Windows': # JB: don't think this works on Win
-    return list(map(function,sequence))
+  if not _multi or size == 1 or numcores < 2 \
+        or platform.system() == 'Windows': # JB: don't think this works on Win
+    if as_array:
+      return numpy.array(list(map(function, sequence)))
+    return map(function, sequence) if size == 1 else \
+      list(map(function, sequence))
 
-  # Use fork-based parallelism (because spawn fails with pickling issues, #457)
-  ctx= multiprocessing.get_context('fork')
-
-  # Returns a started SyncManager object which can be used for sharing
-  # objects between processes. The returned manager object corresponds
-  # to a spawned child process and has methods which will create shared
-  # objects and return corresponding proxies.
-  manager = ctx.Manager()
-
-  # Create FIFO queue and lock shared objects and return proxies to them.
-  # The managers handles a server process that manages shared objects that
-  # each slave process has access to. Bottom line -- thread-safe.
-  out_q = manager.Queue()
-  err_q = manager.Queue()
-  lock = manager.Lock()
+  # Use fork-based parallelism (because spawn fails with pickling issues,
+  # #457); this is also necessary because function is typically a closure
+  ctx = multiprocessing.get_context('fork')
 
   # if sequence is less than numcores, only use len sequence number of
   # processes
-  if size < numcores:
-    numcores = size
-
-  # group sequence into numcores-worth of chunks
-  sequence = numpy.array_split(sequence, numcores)
-
-  # For progressbar: shared-memory variable to track iterations elapsed
-  # in non-displaying processes
-  iter_elapsed= multiprocessing.Value('i',0)
+  numcores = min(numcores, size)
+  if chunksize is None:
+    chunksize = max(1, size//(4*numcores))
+
+  # Shared-memory variables for the scheduling, to track progress, and
+  # for the output
+  counter = ctx.Value('l', 0)
+  ndone = ctx.Value('l', 0)
+  abort = ctx.Value('b', False)
+  result_q = ctx.SimpleQueue()
+  shared = _SharedOutputs(ctx, size)
 
   procs = [ctx.Process(target=worker,
-           args=(function, ii, chunk, out_q, err_q, lock,
-                 progressbar,iter_elapsed,size,numcores-1))
-         for ii, chunk in enumerate(sequence)]
+           args=(function, sequence, chunksize, counter, ndone, abort,
+                 shared, result_q))
+           for ii in range(numcores)]
 
-  return run_tasks(procs, err_q, out_q, numcores)
+  try:
+    results = run_tasks(procs, result_q, ndone, abort, size, progressbar,
+                        shared)
+  finally:
+    shared.close()
+
+  outs, layout = shared.outs, shared.layout
+  if not outs is None:
+    # Return the type of the first result when all results had that type;
+    # as plain arrays rather than memory-mapped files
+    outs = [numpy.asarray(out) if shared.mixed[jj]
+            or out.dtype == shared.dtypes[jj]
+            else numpy.asarray(out).astype(shared.dtypes[jj])
+            for jj, out in enumerate(outs)]
+
+  if as_array and not outs is None and layout is None and not results:
+    return outs[0]
+  out = [results[ii] if ii in results
+         else _rebuild_result(layout, iter(outs), ii)
+         for ii in range(size)]
+  return numpy.array(out) if as_array else out
 
 
 if __name__ == "__main__":
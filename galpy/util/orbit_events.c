@@ -0,0 +1,155 @@
+/*
+  Event detection on the dense output of the adaptive orbit integrators
+*/
+/*
+Copyright (c) 2026, agent
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+   Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+   Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+   The name of the author may not be used to endorse or promote products
+      derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+*/
+#include <math.h>
+#include <orbit_events.h>
+#define _EVENT_MAXITER 100
+#define _EVENT_STOL 1.e-15
+/*
+NAME: eval_dense
+PURPOSE: evaluate the dense output of a step at fractional time s
+INPUT:
+   double s - fractional time in the step (0 <= s <= 1)
+   int ncoeffs - number of dense output coefficients
+   int dim - dimension
+   double * rcont - dense output coefficients (ncoeffs x dim)
+OUTPUT (as arguments):
+   double * y - solution at s
+ */
+static void eval_dense(double s,int ncoeffs,int dim,double * rcont,double * y){
+  int ii,kk;
+  double s1= 1. - s;
+  for (ii=0; ii < dim; ii++) {
+    *(y+ii)= *(rcont+(ncoeffs-1)*dim+ii);
+    for (kk=ncoeffs-2; kk >= 0; kk--)
+      *(y+ii)= *(rcont+kk*dim+ii) + ( kk % 2 == 0 ? s : s1 ) * *(y+ii);
+  }
+}
+/*
+NAME: event_func
+PURPOSE: evaluate the function whose roots are the events of a given type
+INPUT:
+   int type - event type
+   struct orbitEvents * ev - events structure
+   double * y - rectangular phase-space position
+OUTPUT:
+   value of the event function
+ */
+static double event_func(int type,struct orbitEvents * ev,double * y){
+  int ii;
+  double out= 0.;
+  switch ( type ) {
+  case EVENT_PERI: case EVENT_APO: // dr/dt = 0 <-> x.v = 0
+    for (ii=0; ii < ev->dim/2; ii++)
+      out+= *(y+ii) * *(y+ii+ev->dim/2);
+    break;
+  case EVENT_ZCROSS:
+    out= *(y+2);
+    break;
+  case EVENT_PHI:
+    out= - *y * ev->sinphi + *(y+1) * ev->cosphi;
+    break;
+  }
+  return out;
+}
+/*
+NAME: find_events
+PURPOSE: find the events in an accepted step of a dense-output integrator and
+         store them; to be used as the step_callback of the dense-output
+         integrators
+INPUT:
+   double told - start time of the step
+   double h - stepsize
+   int ncoeffs - number of dense output coefficients
+   int dim - dimension
+   double * rcont - dense output coefficients of the step (ncoeffs x dim)
+   void * cbdata - pointer to the struct orbitEvents of this orbit
+OUTPUT (as arguments, in cbdata):
+   events are added to tevents, ievents, and yevents (if fewer than nmax
+   events have been found so far) and nevents is incremented
+ */
+void find_events(double told,double h,int ncoeffs,int dim,double * rcont,
+		 void * cbdata){
+  struct orbitEvents * ev= (struct orbitEvents *) cbdata;
+  int ii,jj,kk,type,side;
+  double y[6];
+  double g0,g1,gm,s0,s1,sm;
+  for (ii=0; ii < ev->ntypes; ii++) {
+    type= *(ev->types+ii);
+    eval_dense(0.,ncoeffs,dim,rcont,y);
+    g0= event_func(type,ev,y);
+    eval_dense(1.,ncoeffs,dim,rcont,y);
+    g1= event_func(type,ev,y);
+    // Only count sign changes in the direction of the event, a root at the
+    // end of a step is then not counted again at the start of the next step
+    if ( !( ( g0 < 0. && g1 >= 0. && type != EVENT_APO )
+	    || ( g0 > 0. && g1 <= 0. && type != EVENT_PERI ) ) )
+      continue;
+    // Find the root using the Illinois variant of regula falsi
+    s0= 0.;
+    s1= 1.;
+    sm= 1.;
+    side= 0;
+    for (jj=0; jj < _EVENT_MAXITER; jj++) {
+      sm= ( s0 * g1 - s1 * g0 ) / ( g1 - g0 );
+      eval_dense(sm,ncoeffs,dim,rcont,y);
+      gm= event_func(type,ev,y);
+      if ( gm * g1 > 0. ) {
+	s1= sm;
+	g1= gm;
+	if ( side == -1 ) g0/= 2.;
+	side= -1;
+      }
+      else if ( gm * g0 > 0. ) {
+	s0= sm;
+	g0= gm;
+	if ( side == 1 ) g1/= 2.;
+	side= 1;
+      }
+      else
+	break;
+      if ( fabs(s1-s0) < _EVENT_STOL ) break;
+    }
+    // The final step of the integrator can overshoot the end time
+    if ( ( told + sm * h - ev->tf ) * h > 0. ) continue;
+    eval_dense(sm,ncoeffs,dim,rcont,y);
+    // Crossings of the phi plane need to be in the positive half-plane
+    if ( type == EVENT_PHI && *y * ev->cosphi + *(y+1) * ev->sinphi <= 0. )
+      continue;
+    if ( *(ev->nevents) < ev->nmax ) {
+      *(ev->tevents + *(ev->nevents))= told + sm * h;
+      *(ev->ievents + *(ev->nevents))= type;
+      for (kk=0; kk < dim; kk++)
+	*(ev->yevents + *(ev->nevents) * dim + kk)= *(y+kk);
+    }
+    *(ev->nevents)+= 1;
+  }
+}
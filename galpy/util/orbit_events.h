@@ -0,0 +1,67 @@
+/*
+  Event detection on the dense output of the adaptive orbit integrators
+ */
+/*
+Copyright (c) 2026, agent
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+   Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+   Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+   The name of the author may not be used to endorse or promote products
+      derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+*/
+#ifndef __ORBIT_EVENTS_H__
+#define __ORBIT_EVENTS_H__
+#ifdef __cplusplus
+extern "C" {
+#endif
+/*
+  Event types
+*/
+#define EVENT_PERI 0
+#define EVENT_APO 1
+#define EVENT_ZCROSS 2
+#define EVENT_PHI 3
+/*
+  Structure holding the events of a single orbit
+*/
+struct orbitEvents{
+  int dim; // rectangular phase-space dimension (4 or 6)
+  int ntypes; // number of event types to look for
+  int * types;
+  double cosphi; // cos and sin of the azimuth of the EVENT_PHI half-plane
+  double sinphi;
+  double tf; // end time of the integration, later events are ignored
+  int nmax; // maximum number of events that can be stored
+  int * nevents; // number of events found (can be > nmax)
+  double * tevents; // times of the events (nmax)
+  int * ievents; // types of the events (nmax)
+  double * yevents; // phase-space position at the events (nmax x dim)
+};
+/*
+  Function declarations
+*/
+void find_events(double,double,int,int,double *,void *);
+#ifdef __cplusplus
+}
+#endif
+#endif /* orbit_events.h */
@@ -0,0 +1,161 @@
+/*
+  Reductions of integrated orbits to summary statistics
+*/
+/*
+Copyright (c) 2026, agent
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+   Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+   Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+   The name of the author may not be used to endorse or promote products
+      derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+*/
+#include <math.h>
+#include <orbit_reduce.h>
+/*
+NAME: has_potentialEval
+PURPOSE: check whether all potentials (including wrapped ones) have a C
+         implementation of the potential
+INPUT:
+   int npot - number of potentials
+   struct potentialArg * potentialArgs - potentials
+OUTPUT:
+   1 if all potentials have a potentialEval, 0 otherwise
+ */
+static int has_potentialEval(int npot,struct potentialArg * potentialArgs){
+  int ii;
+  for (ii=0; ii < npot; ii++) {
+    if ( (potentialArgs+ii)->potentialEval == NULL )
+      return 0;
+    if ( (potentialArgs+ii)->wrappedPotentialArg
+	 && !has_potentialEval((potentialArgs+ii)->nwrapped,
+			       (potentialArgs+ii)->wrappedPotentialArg) )
+      return 0;
+  }
+  return 1;
+}
+/*
+NAME: reduce_quantity
+PURPOSE: compute a quantity along the orbit at a single time
+INPUT:
+   int quantity - REDUCE_R, REDUCE_Z, REDUCE_SPHR, REDUCE_E, REDUCE_LZ
+   double t - time
+   int dim - phase-space dimension (4: [R,vR,vT,phi], 6: [R,vR,vT,z,vz,phi])
+   double * y - phase-space position
+   int npot - number of potentials
+   struct potentialArg * potentialArgs - potentials (for the energy)
+OUTPUT:
+   quantity (NaN for the energy if a potential does not have a C potential)
+ */
+static double reduce_quantity(int quantity,double t,int dim,double * y,
+			      int npot,struct potentialArg * potentialArgs){
+  int ii;
+  double z= ( dim == 6 ) ? *(y+3) : 0.;
+  double vz= ( dim == 6 ) ? *(y+4) : 0.;
+  double out= 0.;
+  switch ( quantity ) {
+  case REDUCE_R:
+    out= *y;
+    break;
+  case REDUCE_Z:
+    out= z;
+    break;
+  case REDUCE_SPHR:
+    out= sqrt( *y * *y + z * z );
+    break;
+  case REDUCE_E:
+    if ( !has_potentialEval(npot,potentialArgs) )
+      return NAN;
+    out= 0.5 * ( *(y+1) * *(y+1) + *(y+2) * *(y+2) + vz * vz );
+    for (ii=0; ii < npot; ii++)
+      out+= (potentialArgs+ii)->potentialEval(*y,z,*(y+dim-1),t,
+					      potentialArgs+ii);
+    break;
+  case REDUCE_LZ:
+    out= *y * *(y+2);
+    break;
+  }
+  return out;
+}
+/*
+NAME: reduce_orbit
+PURPOSE: reduce a single integrated orbit to summary statistics and add it
+         to an (R,z) occupancy histogram
+INPUT:
+   int nt - number of times
+   double * t - times
+   int dim - phase-space dimension (4: [R,vR,vT,phi], 6: [R,vR,vT,z,vz,phi])
+   double * orbit - orbit (nt x dim)
+   int npot - number of potentials
+   struct potentialArg * potentialArgs - potentials (for the energy)
+   int nred - number of reductions
+   int * quantity - quantity to reduce for each reduction
+   int * stat - statistic to compute for each reduction (REDUCE_MIN, ...)
+   int nhistR, nhistz - number of R and z bins of the histogram (0: none)
+   double * hist_range - [Rmin,Rmax,zmin,zmax] of the histogram
+OUTPUT (as arguments):
+   double * out - reductions (nred)
+   double * hist - histogram (nhistR x nhistz) to which the number of
+                   times that the orbit spends in each bin is added
+ */
+void reduce_orbit(int nt,double * t,int dim,double * orbit,
+		  int npot,struct potentialArg * potentialArgs,
+		  int nred,int * quantity,int * stat,double * out,
+		  int nhistR,int nhistz,double * hist_range,double * hist){
+  int ii,jj,iR,iz;
+  double q,delta,mean,m2;
+  for (ii=0; ii < nred; ii++) {
+    mean= 0.;
+    m2= 0.;
+    for (jj=0; jj < nt; jj++) {
+      q= reduce_quantity(*(quantity+ii),*(t+jj),dim,orbit+dim*jj,
+			 npot,potentialArgs);
+      switch ( *(stat+ii) ) {
+      case REDUCE_MIN:
+	if ( jj == 0 || q < mean ) mean= q;
+	break;
+      case REDUCE_MAX:
+	if ( jj == 0 || q > mean ) mean= q;
+	break;
+      default: // Welford's algorithm for the mean and variance
+	delta= q - mean;
+	mean+= delta / ( jj + 1 );
+	m2+= delta * ( q - mean );
+	break;
+      }
+    }
+    *(out+ii)= ( *(stat+ii) == REDUCE_VAR ) ? m2 / nt : mean;
+  }
+  if ( nhistR > 0 )
+    for (jj=0; jj < nt; jj++) {
+      iR= (int) floor( ( *(orbit+dim*jj) - *hist_range )
+		       / ( *(hist_range+1) - *hist_range ) * nhistR );
+      if ( dim == 6 )
+	iz= (int) floor( ( *(orbit+dim*jj+3) - *(hist_range+2) )
+			 / ( *(hist_range+3) - *(hist_range+2) ) * nhistz );
+      else
+	iz= (int) floor( ( 0. - *(hist_range+2) )
+			 / ( *(hist_range+3) - *(hist_range+2) ) * nhistz );
+      if ( iR < 0 || iR >= nhistR || iz < 0 || iz >= nhistz ) continue;
+      *(hist+iR*nhistz+iz)+= 1.;
+    }
+}
@@ -0,0 +1,58 @@
+/*
+  Reductions of integrated orbits to summary statistics
+ */
+/*
+Copyright (c) 2026, agent
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+   Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+   Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+   The name of the author may not be used to endorse or promote products
+      derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+*/
+#ifndef __ORBIT_REDUCE_H__
+#define __ORBIT_REDUCE_H__
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <galpy_potentials.h>
+/*
+  Quantities and statistics
+*/
+#define REDUCE_R 0
+#define REDUCE_Z 1
+#define REDUCE_SPHR 2
+#define REDUCE_E 3
+#define REDUCE_LZ 4
+#define REDUCE_MIN 0
+#define REDUCE_MAX 1
+#define REDUCE_MEAN 2
+#define REDUCE_VAR 3
+/*
+  Function declarations
+*/
+void reduce_orbit(int,double *,int,double *,int,struct potentialArg *,
+		  int,int *,int *,double *,int,int,double *,double *);
+#ifdef __cplusplus
+}
+#endif
+#endif /* orbit_reduce.h */
@@ -112,3 +112,119 @@ def _leapfrog_estimate_step(func,qo,po,dt,to,args,rtol,atol):
         err= numpy.sqrt(numpy.mean((delta/scale)**2.))
         dt/= 2.
     return dt
+
+# Coefficients of the drifts (c) and kicks (d) of the symplectic integrators,
+# the same as those used in the C code
+_LOCKSTEP_COEFFS= {\
+    2: (numpy.array([0.5,0.5]),numpy.array([1.])),
+    4: (numpy.array([0.6756035959798289,-0.1756035959798288,
+                     -0.1756035959798288,0.6756035959798289]),
+        numpy.array([1.3512071919596578,-1.7024143839193153,
+                     1.3512071919596578])),
+    6: (numpy.array([0.392256805238780,0.510043411918458,
+                     -0.471053385409758,0.687531682525198e-1,
+                     0.687531682525198e-1,-0.471053385409758,
+                     0.510043411918458,0.392256805238780]),
+        numpy.array([0.784513610477560,0.235573213359357,
+                     -0.117767998417887e1,0.131518632068391e1,
+                     -0.117767998417887e1,0.235573213359357,
+                     0.784513610477560]))}
+def symplec_lockstep(func,yo,t,order=4,dt=None,args=(),
+                     rtol=-12.*numpy.log(10.),atol=-12.*numpy.log(10.)):
+    """
+    NAME:
+       symplec_lockstep
+    PURPOSE:
+       integrate an ode for many initial conditions at once with a symplectic integrator, advancing all initial conditions in lockstep with a shared stepsize such that the force is evaluated for all of them in a single call per force evaluation
+    INPUT:
+       func - force function of (q,*args,t=t), with q the positions of shape (dim,N), returning the forces with shape (dim,N); if func raises an error or returns the wrong shape for array input, the force is evaluated for each initial condition separately
+       yo - initial conditions [q,p], shape (N,2*dim)
+       t - set of equally-spaced times at which one wants the result
+       order= (4) order of the integrator: 2 (leapfrog), 4, or 6 (same schemes as the C integrators)
+       dt= (None) stepsize to use, must be an integer divisor of the output stepsize; default is to estimate it as the smallest of the stepsizes needed by the individual initial conditions
+       rtol, atol= natural logarithm of the relative and absolute tolerance used to estimate the stepsize (same convention as the C integrators)
+    OUTPUT:
+       y : array, shape (N,len(t),2*dim)
+       Array containing the value of y for each desired time in t, \
+       with the initial value y0 in the first row.
+    HISTORY:
+       2026-10-18 - Written - agent
+    """
+    yo= numpy.atleast_2d(yo)
+    dim= yo.shape[1]//2
+    cs, ds= _LOCKSTEP_COEFFS[order]
+    func= _lockstep_force(func,args)
+    qo= numpy.array(yo[:,:dim].T)
+    po= numpy.array(yo[:,dim:].T)
+    out= numpy.empty((yo.shape[0],len(t),2*dim))
+    out[:,0]= yo
+    if len(t) < 2: return out
+    init_dt= t[1]-t[0] #assumes that the steps are equally spaced
+    if dt is None:
+        dt= _lockstep_estimate_step(func,qo,po,init_dt,t[0],cs,ds,rtol,atol)
+    ndt= int(round(init_dt/dt))
+    dt= init_dt/ndt
+    to= t[0]
+    for ii in range(1,len(t)):
+        for jj in range(ndt):
+            qo, po= _lockstep_step(func,qo,po,to,dt,cs,ds)
+            to+= dt
+        out[:,ii,:dim]= qo.T
+        out[:,ii,dim:]= po.T
+    return out
+
+def _lockstep_step(func,qo,po,to,dt,cs,ds):
+    """Take a single step of the symplectic integrator with drifts cs and kicks ds"""
+    q= qo+cs[0]*dt*po
+    tc= to+cs[0]*dt
+    p= po
+    for c,d in zip(cs[1:],ds):
+        p= p+d*dt*func(q,t=tc)
+        q= q+c*dt*p
+        tc+= c*dt
+    return (q,p)
+
+def _lockstep_estimate_step(func,qo,po,dt,to,cs,ds,rtol,atol):
+    """Estimate the stepsize for each initial condition in the same way as the C code, by comparing one step with two half steps, and return the smallest"""
+    init_dt= dt
+    dim= qo.shape[0]
+    # Scales, as in the C code
+    scaleq= numpy.logaddexp(atol,rtol*numpy.amax(numpy.fabs(qo),axis=0))
+    scalep= numpy.logaddexp(atol,rtol*numpy.amax(numpy.fabs(po),axis=0))
+    err= 2.
+    dt*= 2.
+    while err > 1. and init_dt/dt < _MAX_DT_REDUCE:
+        dt/= 2.
+        q11, p11= _lockstep_step(func,qo,po,to,dt,cs,ds)
+        q12, p12= _lockstep_step(func,qo,po,to,dt/2.,cs,ds)
+        q12, p12= _lockstep_step(func,q12,p12,to+dt/2.,dt/2.,cs,ds)
+        with numpy.errstate(divide='ignore'):
+            err= numpy.sqrt((numpy.sum(numpy.exp(\
+                2.*numpy.log(numpy.fabs(q11-q12))-2.*scaleq),axis=0)
+                             +numpy.sum(numpy.exp(\
+                2.*numpy.log(numpy.fabs(p11-p12))-2.*scalep),axis=0))
+                            /2./dim)
+        err= numpy.amax(err)
+    return dt
+
+def _lockstep_force(func,args):
+    """Return the force function of (q,t=t) to use in the lockstep integrators, falling back to evaluating the force for each object separately if func does not support array input"""
+    def vectorized_force(q,t=0.):
+        return func(q,*args,t=t)
+    def looped_force(q,t=0.):
+        return numpy.array([func(q[:,ii],*args,t=t)
+                            for ii in range(q.shape[1])]).T
+    def force(q,t=0.):
+        if force.func is None:
+            try:
+                out= numpy.asarray(vectorized_force(q,t=t))
+            except Exception:
+                out= None
+            if out is None or out.shape != q.shape:
+                force.func= looped_force
+                return looped_force(q,t=t)
+            force.func= vectorized_force
+            return out
+        return force.func(q,t=t)
+    force.func= None
+    return force
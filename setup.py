@@ -146,12 +146,14 @@ if WIN32:
 
 #main C extension
 galpy_c_src= ['galpy/util/bovy_symplecticode.c', 'galpy/util/bovy_rk.c',
-              'galpy/util/leung_dop853.c','galpy/util/bovy_coords.c']
+              'galpy/util/leung_dop853.c','galpy/util/bovy_coords.c',
+              'galpy/util/orbit_events.c','galpy/util/orbit_reduce.c']
 galpy_c_src.extend(glob.glob('galpy/potential/potential_c_ext/*.c'))
 galpy_c_src.extend(glob.glob('galpy/potential/interppotential_c_ext/*.c'))
 galpy_c_src.extend(glob.glob('galpy/util/interp_2d/*.c'))
 galpy_c_src.extend(glob.glob('galpy/orbit/orbit_c_ext/*.c'))
 galpy_c_src.extend(glob.glob('galpy/actionAngle/actionAngle_c_ext/*.c'))
+galpy_c_src.extend(glob.glob('galpy/df/df_c_ext/*.c'))
 
 galpy_c_include_dirs= ['galpy/util',
                        'galpy/util/interp_2d',
@@ -2124,6 +2124,51 @@ def test_actionAngleStaeckelGrid_conserved_EccZmaxRperiRap_c():
                                                 inclphi=True)
     return None
 
+# Test that computing the grid in parallel gives the same grid
+def test_actionAngleStaeckelGrid_numcores():
+    from galpy.actionAngle import actionAngleStaeckelGrid
+    from galpy.potential import MWPotential
+    aAA= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=False,
+                                 nLz=6,nE=6,npsi=6,interpecc=True)
+    aAAp= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=False,
+                                  nLz=6,nE=6,npsi=6,interpecc=True,
+                                  numcores=2)
+    for name in ['jr','jz','ecc','zmax','rperi','rap']:
+        assert numpy.all(numpy.fabs(getattr(aAA,f'_{name}')
+                                    -getattr(aAAp,f'_{name}')) < 10.**-10.), f'actionAngleStaeckelGrid {name} grid computed in parallel differs from that computed serially'
+    return None
+
+# Test saving and loading the grid
+def test_actionAngleStaeckelGrid_saveload(tmp_path):
+    from galpy.actionAngle import actionAngleStaeckelGrid
+    from galpy.potential import MiyamotoNagaiPotential, MWPotential
+    aAA= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                 nLz=10,nE=10,npsi=10,interpecc=True)
+    aAA.save(tmp_path/'grid')
+    aAAl= actionAngleStaeckelGrid.load(tmp_path/'grid',pot=MWPotential,c=True)
+    assert isinstance(aAAl._jr,numpy.memmap), 'Loaded actionAngleStaeckelGrid is not memory-mapped'
+    R,vR,vT,z,vz= (numpy.array([1.05,0.9,1.2]),numpy.array([0.02,0.1,-0.1]),
+                   numpy.array([1.05,0.9,1.1]),numpy.array([0.03,0.1,-0.2]),
+                   numpy.array([0.,0.05,0.02]))
+    for out,outl in zip(aAA(R,vR,vT,z,vz)+aAA.EccZmaxRperiRap(R,vR,vT,z,vz),
+                        aAAl(R,vR,vT,z,vz)+aAAl.EccZmaxRperiRap(R,vR,vT,z,vz)):
+        assert numpy.all(numpy.fabs(out-outl) < 10.**-10.), 'Loaded actionAngleStaeckelGrid does not agree with the original'
+    # Grid without interpecc, loaded into memory
+    aAA= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                 nLz=10,nE=10,npsi=10)
+    aAA.save(tmp_path/'grid2')
+    aAAl= actionAngleStaeckelGrid.load(tmp_path/'grid2',pot=MWPotential,
+                                       c=True,mmap_mode=None)
+    for out,outl in zip(aAA(R,vR,vT,z,vz),aAAl(R,vR,vT,z,vz)):
+        assert numpy.all(numpy.fabs(out-outl) < 10.**-10.), 'Loaded actionAngleStaeckelGrid does not agree with the original'
+    # Loading with a different potential should raise an error
+    with pytest.raises(ValueError) as excinfo:
+        actionAngleStaeckelGrid.load(tmp_path/'grid',
+                                     pot=MiyamotoNagaiPotential(normalize=1.))
+    with pytest.raises(OSError) as excinfo:
+        actionAngleStaeckelGrid.load(tmp_path/'grid')
+    return None
+
 #Test the actionAngleIsochroneApprox against an isochrone potential: actions
 def test_actionAngleIsochroneApprox_otherIsochrone_actions():
     from galpy.actionAngle import (actionAngleIsochrone,
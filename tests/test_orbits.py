@@ -366,6 +366,64 @@ def test_integration_dxdv_2d_rectInOut():
     assert numpy.amax(numpy.fabs(orbits.getOrbit_dxdv()-numpy.array([o.getOrbit_dxdv() for o in orbits_list]))) < 1e-8, 'Integration of the phase-space volume of multiple orbits as Orbits does not agree with integrating the phase-space volume of multiple orbits'
     return None
 
+def test_integration_dxdv_3d():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.8)
+    dp= potential.DehnenBarPotential(omegab=1.8,rb=0.5,Af=0.03)
+    # Spherical potentials use analytic second derivatives in C
+    hp= potential.HernquistPotential(normalize=0.5,a=2.)
+    mp= potential.MiyamotoNagaiPotential(normalize=0.5,a=0.5,b=0.05)
+    times= numpy.linspace(0.,10.,1001)
+    orbits_list= [Orbit([1.,0.1,1.,0.1,-0.2,0.]),
+                  Orbit([.9,0.3,1.,-0.1,0.1,-0.3]),
+                  Orbit([1.2,-0.3,0.7,0.05,0.3,5.])]
+    orbits= Orbit(orbits_list)
+    numpy.random.seed(1)
+    dxdv= (2.*numpy.random.uniform(size=orbits.shape+(6,))-1)/10.
+    for pot in [lp,[lp,dp],hp,[hp,mp]]:
+        # Default, C integration
+        orbits.integrate_dxdv(dxdv,times,pot,method='dopr54_c')
+        c_dxdv= orbits.getOrbit_dxdv()
+        # Integrate as multiple Orbits
+        for o,tdxdv in zip(orbits_list,dxdv):
+            o.integrate_dxdv(tdxdv,times,pot,method='dopr54_c')
+        assert numpy.amax(numpy.fabs(c_dxdv-numpy.array([o.getOrbit_dxdv() for o in orbits_list]))) < 1e-8, 'Integration of the phase-space volume of multiple 3D orbits as Orbits does not agree with integrating the phase-space volume of multiple orbits'
+        # The orbit itself should be the same as a regular integration
+        oo= Orbit(orbits_list)
+        oo.integrate(times,pot,method='dopr54_c')
+        assert numpy.amax(numpy.fabs(orbits.getOrbit()[...,:5]-oo.getOrbit()[...,:5])) < 1e-8, 'Orbit integrated with integrate_dxdv does not agree with a regular integration'
+        assert numpy.amax(numpy.fabs((((orbits.getOrbit()[...,5]-oo.getOrbit()[...,5])+numpy.pi) % (2.*numpy.pi)) - numpy.pi)) < 1e-8, 'Orbit integrated with integrate_dxdv does not agree with a regular integration'
+        # Python integration with analytic second derivatives
+        orbits.integrate_dxdv(dxdv,times,pot,method='odeint')
+        assert numpy.amax(numpy.fabs(c_dxdv-orbits.getOrbit_dxdv())) < 1e-5, 'Integration of the phase-space volume of 3D orbits in C does not agree with that in Python'
+        # Compare to the difference of two nearby orbits
+        eps= 1e-6
+        o1= Orbit(orbits.vxvv+eps*dxdv)
+        o1.integrate(times,pot,method='dop853_c')
+        o2= Orbit(orbits.vxvv-eps*dxdv)
+        o2.integrate(times,pot,method='dop853_c')
+        assert numpy.amax(numpy.fabs(c_dxdv-(o1.getOrbit()-o2.getOrbit())/2./eps)) < 1e-4, 'Integration of the phase-space volume of 3D orbits does not agree with the difference between two nearby orbits'
+    # Rectangular in and out
+    rdxdv= numpy.zeros_like(dxdv)
+    rdxdv[:,2]= 1.
+    orbits.integrate_dxdv(rdxdv,times,lp,method='dop853_c',
+                          rectIn=True,rectOut=True)
+    assert numpy.amax(numpy.fabs(orbits.getOrbit_dxdv()[:,0]-rdxdv)) < 1e-10, 'integrate_dxdv with rectIn=True does not start at the input dxdv'
+    # Planar orbits in the plane of an axisymmetric potential should agree
+    # with the planar integration
+    porbits= Orbit([[1.,0.1,1.,0.],[.9,0.3,1.,-0.3]])
+    morbits= Orbit([[1.,0.1,1.,0.,0.,0.],[.9,0.3,1.,0.,0.,-0.3]])
+    pdxdv= (2.*numpy.random.uniform(size=porbits.shape+(4,))-1)/10.
+    mdxdv= numpy.zeros((2,6))
+    mdxdv[:,:3]= pdxdv[:,:3]
+    mdxdv[:,5]= pdxdv[:,3]
+    porbits.integrate_dxdv(pdxdv,times,lp,method='dop853_c')
+    morbits.integrate_dxdv(mdxdv,times,lp,method='dop853_c')
+    assert numpy.amax(numpy.fabs(porbits.getOrbit_dxdv()[...,:3]-morbits.getOrbit_dxdv()[...,:3])) < 1e-8, 'integrate_dxdv of a 3D orbit in the plane does not agree with that of a planar orbit'
+    assert numpy.amax(numpy.fabs(porbits.getOrbit_dxdv()[...,3]-morbits.getOrbit_dxdv()[...,5])) < 1e-8, 'integrate_dxdv of a 3D orbit in the plane does not agree with that of a planar orbit'
+    assert numpy.amax(numpy.fabs(morbits.getOrbit_dxdv()[...,3:5])) < 1e-10, 'integrate_dxdv of a 3D orbit in the plane does not stay in the plane'
+    return None
+
 # Test slicing of orbits
 def test_slice_singleobject():
     from galpy.orbit import Orbit
@@ -1378,6 +1436,55 @@ def test_interpolate_outsiderange():
     with pytest.raises(ValueError) as excinfo:
         os.R(numpy.linspace(-5.,5.,1001))
 
+# Test that the Hermite interpolation agrees with a finer integration, also
+# for backward integration, flipped orbits, and orbits stored on disk
+def test_interpolation_hermite():
+    import os
+    import tempfile
+
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,201)
+    fine_times= numpy.linspace(0.,10.,2001)
+    itimes= times[:-1]+0.0237
+    def maxdiff(o1,o2):
+        diff= numpy.fabs(o1.vxvv-o2.vxvv)
+        if o1.phasedim() % 2 == 0 and o1.phasedim() > 2: # phi wraps
+            diff[:,-1]= numpy.fabs((diff[:,-1]+numpy.pi) % (2.*numpy.pi)
+                                   -numpy.pi)
+        return numpy.amax(diff)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]],
+                 [[1.,0.1],[0.2,-0.3]]]:
+        for sign in [1.,-1.]:
+            o= Orbit(vxvv)
+            of= Orbit(vxvv)
+            thispot= lp if o.dim() > 1 else potential.toVerticalPotential(lp,1.)
+            o.integrate(sign*times,thispot)
+            of.integrate(sign*fine_times,thispot)
+            assert maxdiff(o(sign*itimes),of(sign*itimes)) < 10.**-5., 'Hermite interpolation does not agree with a finer integration'
+            # After flipping
+            o.flip(inplace=True)
+            of.flip(inplace=True)
+            assert maxdiff(o(sign*itimes),of(sign*itimes)) < 10.**-5., 'Hermite interpolation does not agree with a finer integration after flipping'
+    # Orbits stored on disk in single precision
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]]
+    o= Orbit(vxvv)
+    o.integrate(times,lp)
+    savefile, tmp_savefilename= tempfile.mkstemp(suffix='.npy')
+    try:
+        os.close(savefile)
+        om= Orbit(vxvv)
+        om.integrate(times,lp,out=tmp_savefilename,
+                     storage_dtype=numpy.float32)
+        assert numpy.amax(numpy.fabs(o.vR(itimes)-om.vR(itimes))) < 10.**-5., 'Hermite interpolation of orbits stored on disk in single precision does not agree with regular interpolation'
+        del om
+    finally:
+        os.remove(tmp_savefilename)
+    return None
+
 def test_output_shape():
     # Test that the output shape is correct and that the shaped output is correct
     from galpy.orbit import Orbit
@@ -1921,9 +2028,10 @@ def test_badinterpolation():
     assert numpy.all(numpy.fabs(nos.phi()-o.phi(ts[-2:])) < 10.**-10.), "New orbit formed from calling an old orbit does not have the correct phi"
     assert not nos._roSet, "New orbit formed from calling an old orbit does not have the correct roSet"
     assert not nos._voSet, "New orbit formed from calling an old orbit does not have the correct roSet"
-    #Try point in between, shouldn't work
-    with pytest.raises(LookupError) as exc_info:
-        no= o(0.6)
+    #Point in between is interpolated using the velocities
+    of= o()
+    of.integrate(numpy.linspace(0.,1.,101),lp)
+    assert numpy.all(numpy.fabs(o(0.6).R()-of(0.6).R()) < 10.**-3.), "Orbit interpolated with few points does not agree with a finely-integrated orbit"
     return None
 
 # Check plotting routines
@@ -2147,6 +2255,694 @@ def setup_orbits_flip(tp,ro,vo,zo,solarmotion,axi=False):
                       ro=ro,vo=vo,zo=zo,
                       solarmotion=solarmotion)
     return o
+# Test that the dense output of the adaptive C integrators agrees with
+# integrating on a fine grid
+def test_integrate_dense_output():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    fine_times= numpy.linspace(0.,10.,10001)
+    coarse_times= numpy.linspace(0.,10.,3)
+    eval_times= numpy.linspace(0.,10.,1001)[1:-1]+0.0037
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.],
+                  [1.2,0.3,0.8,0.2,-0.1,-1.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.],[1.2,0.3,0.8,-1.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]]]:
+        for method in ['dopr54_c','dop853_c']:
+            o= Orbit(vxvv)
+            od= Orbit(vxvv)
+            o.integrate(fine_times,lp,method=method)
+            od.integrate(coarse_times,lp,method=method,dense_output=True)
+            for attr in ['R','vR','vT','z','vz','phi']:
+                if attr in ['z','vz'] and o.dim() == 2: continue
+                if attr == 'phi' and o.phasedim() % 2 == 1: continue
+                assert numpy.amax(numpy.fabs(getattr(o,attr)(eval_times)
+                                             -getattr(od,attr)(eval_times))) < 10.**-5., f'Dense output of {method} does not agree with integration on a fine grid for {attr}'
+            # Also test single times and slicing
+            assert numpy.amax(numpy.fabs(o.R(eval_times[17])
+                                         -od.R(eval_times[17]))) < 10.**-5., f'Dense output of {method} does not agree with integration on a fine grid'
+            assert numpy.amax(numpy.fabs(o[1].vR(eval_times)
+                                         -od[1].vR(eval_times))) < 10.**-5., f'Dense output of {method} does not agree with integration on a fine grid for sliced Orbit'
+            # Output at the integration times is the regular output
+            assert numpy.amax(numpy.fabs(o.R(coarse_times)
+                                         -od.R(coarse_times))) < 10.**-5., f'Dense output of {method} does not agree with integration on a fine grid'
+    return None
+
+def test_integrate_dense_output_backward_flip():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]]
+    fine_times= numpy.linspace(0.,-10.,10001)
+    eval_times= numpy.linspace(0.,-10.,101)[1:-1]-0.0037
+    o= Orbit(vxvv)
+    od= Orbit(vxvv)
+    o.integrate(fine_times,lp,method='dop853_c')
+    od.integrate(fine_times[::1000],lp,method='dop853_c',dense_output=True)
+    assert numpy.amax(numpy.fabs(o.x(eval_times)-od.x(eval_times))) < 10.**-5., 'Dense output does not agree with integration on a fine grid for backward integration'
+    o.flip(inplace=True)
+    od.flip(inplace=True)
+    assert numpy.amax(numpy.fabs(o.vy(eval_times)-od.vy(eval_times))) < 10.**-5., 'Dense output does not agree with integration on a fine grid after flipping'
+    return None
+
+def test_integrate_dense_output_errors():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,3)
+    o= Orbit([[1.,0.1,1.1,0.1,0.02,0.]])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,method='symplec4_c',dense_output=True)
+    o= Orbit([[1.,0.1]])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,potential.toVerticalPotential(lp,1.),
+                    method='dop853_c',dense_output=True)
+    return None
+
+# Test that integrating into an out-of-core store gives the same result
+def test_integrate_out_memmap():
+    import os
+    import tempfile
+
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,1001)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.],
+                  [1.2,0.3,0.8,0.2,-0.1,-1.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.],[1.2,0.3,0.8,-1.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]],
+                 [[1.,0.1],[0.2,-0.3]]]:
+        for method in ['dop853_c','odeint']:
+            o= Orbit(vxvv)
+            om= Orbit(vxvv)
+            thispot= lp if o.dim() > 1 else potential.toVerticalPotential(lp,1.)
+            savefile, tmp_savefilename= tempfile.mkstemp(suffix='.npy')
+            try:
+                os.close(savefile)
+                o.integrate(times,thispot,method=method)
+                om.integrate(times,thispot,method=method,out=tmp_savefilename)
+                assert isinstance(om.orbit,numpy.memmap), 'Orbit integrated with out= is not stored in a memmap'
+                assert numpy.amax(numpy.fabs(o.getOrbit()-om.getOrbit())) < 10.**-10., 'Orbit integrated with out= does not agree with regular integration'
+                assert numpy.amax(numpy.fabs(o.vR(times)-om.vR(times))) < 10.**-10., 'Orbit integrated with out= does not agree with regular integration'
+                assert numpy.amax(numpy.fabs(o.vR(times[:-1]+0.003)
+                                             -om.vR(times[:-1]+0.003))) < 10.**-10., 'Orbit integrated with out= does not agree with regular integration'
+                assert numpy.amax(numpy.fabs(o[1].vR(times)-om[1].vR(times))) < 10.**-10., 'Orbit integrated with out= does not agree with regular integration'
+                # Stored file should contain the orbits
+                assert numpy.amax(numpy.fabs(o.getOrbit()
+                                             -numpy.load(tmp_savefilename))) < 10.**-10., 'File written by out= in Orbit.integrate does not contain the orbits'
+                del om
+            finally:
+                os.remove(tmp_savefilename)
+    # Also directly with a memmap and with the output evaluated as a view
+    o= Orbit(vxvv)
+    om= Orbit(vxvv)
+    thispot= potential.toVerticalPotential(lp,1.)
+    o.integrate(times,thispot,method='dop853_c')
+    out= numpy.memmap(tempfile.TemporaryFile(),dtype=numpy.float64,
+                      mode='w+',shape=(len(o),len(times),2))
+    om.integrate(times,thispot,method='dop853_c',out=out)
+    assert numpy.amax(numpy.fabs(o.getOrbit()-out)) < 10.**-10., 'Orbit integrated with out= does not agree with regular integration'
+    with pytest.raises(ValueError) as excinfo:
+        om.x(times)[0]= 1.
+    return None
+
+def test_integrate_out_errors():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,1001)
+    o= Orbit([[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]])
+    with pytest.raises(TypeError) as excinfo:
+        o.integrate(times,lp,out=[])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,out=numpy.empty((2,len(times),5)))
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,out=numpy.empty((2,len(times),6),
+                                             dtype=numpy.float32))
+    return None
+
+# Test that storing orbits in single precision gives the same result up to
+# single-precision round-off
+def test_integrate_storage_dtype():
+    import tempfile
+
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,1001)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]],
+                 [[1.,0.1],[0.2,-0.3]]]:
+        for method in ['dop853_c','odeint']:
+            o= Orbit(vxvv)
+            o32= Orbit(vxvv)
+            thispot= lp if o.dim() > 1 else potential.toVerticalPotential(lp,1.)
+            o.integrate(times,thispot,method=method)
+            o32.integrate(times,thispot,method=method,
+                         storage_dtype=numpy.float32)
+            assert o32.getOrbit().dtype == numpy.float32, 'Orbit integrated with storage_dtype=numpy.float32 is not stored in single precision'
+            assert numpy.amax(numpy.fabs(o.getOrbit()-o32.getOrbit())) < 10.**-6., 'Orbit integrated with storage_dtype=numpy.float32 does not agree with regular integration'
+            assert o32.R(times).dtype == numpy.float64, 'Outputs of an orbit stored in single precision are not computed in double precision'
+            assert numpy.amax(numpy.fabs(o.R(times)-o32.R(times))) < 10.**-6., 'Orbit integrated with storage_dtype=numpy.float32 does not agree with regular integration'
+            assert numpy.amax(numpy.fabs(o.E(times)-o32.E(times))) < 10.**-6., 'Orbit integrated with storage_dtype=numpy.float32 does not agree with regular integration'
+            assert numpy.amax(numpy.fabs(o.vR(times[:-1]+0.003)
+                                         -o32.vR(times[:-1]+0.003))) < 10.**-6., 'Orbit integrated with storage_dtype=numpy.float32 does not agree with regular integration'
+            assert numpy.amax(numpy.fabs(o.vR(times[2])-o32.vR(times[2]))) < 10.**-6., 'Orbit integrated with storage_dtype=numpy.float32 does not agree with regular integration'
+    # Also combined with out=
+    o= Orbit(vxvv)
+    om= Orbit(vxvv)
+    thispot= potential.toVerticalPotential(lp,1.)
+    o.integrate(times,thispot,method='dop853_c')
+    out= numpy.memmap(tempfile.TemporaryFile(),dtype=numpy.float32,
+                      mode='w+',shape=(len(o),len(times),2))
+    om.integrate(times,thispot,method='dop853_c',out=out,
+                 storage_dtype=numpy.float32)
+    assert numpy.amax(numpy.fabs(o.getOrbit()-out)) < 10.**-6., 'Orbit integrated with out= and storage_dtype=numpy.float32 does not agree with regular integration'
+    with pytest.raises(ValueError) as excinfo:
+        om.integrate(times,thispot,storage_dtype=numpy.int32)
+    return None
+
+def test_integrate_resume():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,1001)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]],
+                 [[1.,0.1],[0.2,-0.3]]]:
+        for method in ['symplec4_c','dop853_c','odeint']:
+            o= Orbit(vxvv)
+            thispot= lp if o.dim() > 1 else potential.toVerticalPotential(lp,1.)
+            o.integrate(times,thispot,method=method)
+            # Resume, both starting at the last time and not
+            for tstart in [500,501]:
+                oo= Orbit(vxvv)
+                oo.integrate(times[:501],thispot,method=method)
+                oo.integrate(times[tstart:],thispot,method=method,resume=True)
+                assert numpy.all(oo.t == times), 'Resuming an orbit integration does not append the times'
+                assert numpy.all(oo.vxvv == o.vxvv), 'Resuming an orbit integration changes the initial conditions'
+                # odeint's restart is less precise
+                tol= -5. if method == 'odeint' else -7.
+                assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < 10.**tol, 'Resumed orbit integration does not agree with regular integration'
+    # Resuming an orbit that was not integrated just integrates it
+    o= Orbit(vxvv)
+    o.integrate(times,thispot)
+    oo= Orbit(vxvv)
+    oo.integrate(times,thispot,resume=True)
+    assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < 10.**-10., 'Resuming an orbit that was not integrated does not agree with regular integration'
+    # The new times need to continue the stored times in the same direction
+    oo= Orbit(vxvv)
+    oo.integrate(times[:501],thispot)
+    for badt in [times[400:],times[:501],times[500::-1],[times[501],times[499]]]:
+        with pytest.raises(ValueError) as excinfo:
+            oo.integrate(badt,thispot,resume=True)
+        assert numpy.all(oo.t == times[:501]), 'Failed resume changes the stored times'
+    oo= Orbit(vxvv)
+    oo.integrate(-times[:501],thispot)
+    oo.integrate(-times[500:],thispot,resume=True)
+    assert numpy.all(oo.t == -times), 'Resuming a backwards orbit integration does not append the times'
+    with pytest.raises(ValueError) as excinfo:
+        oo.integrate(times,thispot,resume=True)
+    # Cannot be combined with out, dense_output, or events
+    with pytest.raises(ValueError) as excinfo:
+        oo.integrate(times,thispot,resume=True,method='dop853_c',
+                     dense_output=True)
+    return None
+
+def test_integrate_checkpoint():
+    import os
+    import tempfile
+
+    from galpy.orbit import Orbit
+    from galpy.orbit.Orbits import _write_checkpoint
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,1001)
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]]
+    o= Orbit(vxvv)
+    o.integrate(times,lp)
+    savefile, tmp_savefilename= tempfile.mkstemp(suffix='.npz')
+    try:
+        os.close(savefile)
+        os.remove(tmp_savefilename)
+        # Integrating with checkpoints gives the same result and removes the
+        # checkpoint at the end
+        oc= Orbit(vxvv)
+        oc.integrate(times,lp,checkpoint=tmp_savefilename,checkpoint_every=77)
+        assert numpy.amax(numpy.fabs(o.getOrbit()-oc.getOrbit())) < 10.**-7., 'Orbit integration with checkpoints does not agree with regular integration'
+        assert not os.path.exists(tmp_savefilename), 'Checkpoint file not removed at the end of the integration'
+        # Simulate a job that was killed after writing a checkpoint
+        ok= Orbit(vxvv)
+        ok.integrate(times[:345],lp)
+        _write_checkpoint(tmp_savefilename,ok.t,ok.getOrbit(),ok.vxvv)
+        oc= Orbit(vxvv)
+        oc.integrate(times,lp,checkpoint=tmp_savefilename)
+        assert numpy.amax(numpy.fabs(o.getOrbit()-oc.getOrbit())) < 10.**-7., 'Orbit integration continued from a checkpoint does not agree with regular integration'
+        assert numpy.all(oc.getOrbit()[:,:345] == ok.getOrbit()), 'Orbit integration continued from a checkpoint does not use the checkpoint'
+        # Checkpoint that does not match the integration
+        _write_checkpoint(tmp_savefilename,ok.t,ok.getOrbit(),ok.vxvv)
+        oc= Orbit([[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,1.]])
+        with pytest.raises(ValueError) as excinfo:
+            oc.integrate(times,lp,checkpoint=tmp_savefilename)
+        oc= Orbit(vxvv)
+        with pytest.raises(ValueError) as excinfo:
+            oc.integrate(2.*times,lp,checkpoint=tmp_savefilename)
+        with pytest.raises(ValueError) as excinfo:
+            oc.integrate(times,lp,checkpoint=tmp_savefilename,
+                         checkpoint_every=0)
+    finally:
+        if os.path.exists(tmp_savefilename):
+            os.remove(tmp_savefilename)
+    return None
+
+def test_integrate_lockstep():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,101)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.]],
+                 [[1.,0.1,1.1],[0.9,-0.3,1.]],
+                 [[1.,0.1],[0.2,-0.3]]]:
+        for method in ['leapfrog','symplec4','symplec6']:
+            o= Orbit(vxvv)
+            thispot= lp if o.dim() > 1 else potential.toVerticalPotential(lp,1.)
+            # With the same stepsize, should agree with the C integrator
+            o.integrate(times,thispot,method=f'{method}_c',dt=0.01)
+            oo= Orbit(vxvv)
+            oo.integrate(times,thispot,method=f'{method}_lockstep',dt=0.01)
+            assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < 10.**-10., f'Lockstep orbit integration with {method} does not agree with the C integrator'
+            # With the automatically-determined stepsize
+            o.integrate(times,thispot,method='dop853_c')
+            oo.integrate(times,thispot,method=f'{method}_lockstep')
+            assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < 10.**-5., f'Lockstep orbit integration with {method} does not agree with dop853_c'
+    # Potentials whose forces cannot be evaluated for arrays also work
+    class ScalarKeplerPotential(potential.Potential):
+        def __init__(self):
+            potential.Potential.__init__(self,amp=1.)
+        def _evaluate(self,R,z,phi=0.,t=0.):
+            return -1./numpy.sqrt(float(R)**2.+float(z)**2.)
+        def _Rforce(self,R,z,phi=0.,t=0.):
+            return -float(R)/(float(R)**2.+float(z)**2.)**1.5
+        def _zforce(self,R,z,phi=0.,t=0.):
+            return -float(z)/(float(R)**2.+float(z)**2.)**1.5
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]]
+    o= Orbit(vxvv)
+    o.integrate(times,potential.KeplerPotential(),method='symplec4_lockstep')
+    oo= Orbit(vxvv)
+    oo.integrate(times,ScalarKeplerPotential(),method='symplec4_lockstep')
+    assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < 10.**-10., 'Lockstep orbit integration does not work for potentials that do not support array input'
+    return None
+
+# Test the time-transformed symplectic integrators on very eccentric orbits
+def test_integrate_ttsymplec():
+    from galpy.orbit import Orbit
+    from galpy.util import galpyWarning
+    kp= potential.KeplerPotential()
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,20.,201)
+    for vxvv,pot in [([[1.,0.02,0.15,0.1,0.01,0.],[1.,0.1,0.3,0.,0.1,1.]],kp),
+                     ([[1.,0.02,0.15,0.],[1.,0.1,0.3,1.]],kp),
+                     ([[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                      lp)]:
+        o= Orbit(vxvv)
+        o.integrate(times,pot,method='dop853_c')
+        for method,tol,etol in [('ttleapfrog_c',10.**-2.,10.**-6.),
+                                ('ttsymplec4_c',10.**-4.,10.**-8.)]:
+            oo= Orbit(vxvv)
+            oo.integrate(times,pot,method=method)
+            assert numpy.amax(numpy.fabs(o.getOrbit()-oo.getOrbit())) < tol, f'Orbit integration with {method} does not agree with dop853_c'
+            Es= oo.E(times)
+            assert numpy.amax(numpy.fabs(Es/Es[:,:1]-1.)) < etol, f'Energy is not conserved by {method}'
+    # On a very eccentric Kepler orbit, the fixed-step symplec4_c with the
+    # same initial stepsize fails, while ttsymplec4_c conserves energy
+    vxvv= [1.,0.02,0.15,0.1,0.01,0.]
+    times= numpy.linspace(0.,100.,1001)
+    o= Orbit(vxvv)
+    o.integrate(times,kp,method='ttsymplec4_c',dt=0.01)
+    Es= o.E(times)
+    assert numpy.amax(numpy.fabs(Es/Es[0]-1.)) < 10.**-7., 'Energy is not conserved by ttsymplec4_c on a very eccentric orbit'
+    o.integrate(times,kp,method='symplec4_c',dt=0.01)
+    Es= o.E(times)
+    assert numpy.amax(numpy.fabs(Es/Es[0]-1.)) > 10.**-2., 'symplec4_c unexpectedly conserves energy on a very eccentric orbit'
+    # At the same energy error, ttsymplec4_c needs several times fewer force
+    # evaluations than symplec4_c on very eccentric orbits in cusps
+    times= numpy.linspace(0.,20.,201)
+    for pot,dt,minratio in [(kp,0.05,10.),
+                            (potential.PowerSphericalPotential(alpha=1.5,
+                                                               normalize=1.),
+                             0.02,2.)]:
+        o= Orbit(vxvv)
+        nfev_tt= o.integrate(times,pot,method='ttsymplec4_c',dt=dt,
+                             return_stats=True)['nfev'][0]
+        Es= o.E(times)
+        dE_tt= numpy.amax(numpy.fabs(Es/Es[0]-1.))
+        for dt in [0.01,0.005,0.002,0.001,0.0005,0.0002]:
+            nfev= o.integrate(times,pot,method='symplec4_c',dt=dt,
+                              return_stats=True)['nfev'][0]
+            Es= o.E(times)
+            if numpy.amax(numpy.fabs(Es/Es[0]-1.)) < dE_tt: break
+        assert nfev > minratio*nfev_tt, f'ttsymplec4_c does not need fewer force evaluations than symplec4_c at the same energy error for an eccentric orbit in {pot}'
+    # For 1D orbits, the time-transformed integrators fall back onto the
+    # regular symplectic integrators
+    vp= potential.toVerticalPotential(potential.MWPotential2014,1.)
+    o= Orbit([0.1,0.1])
+    o.integrate(times,vp,method='symplec4_c')
+    for method in ['ttleapfrog_c','ttsymplec4_c']:
+        oo= Orbit([0.1,0.1])
+        with pytest.warns(galpyWarning) as record:
+            oo.integrate(times,vp,method=method)
+        assert any('not efficient for 1D orbits' in str(r.message) for r in record), f'{method} for a 1D orbit does not warn that it falls back onto a regular symplectic integrator'
+    assert numpy.all(oo.getOrbit() == o.getOrbit()), 'ttsymplec4_c for a 1D orbit does not fall back onto symplec4_c'
+    return None
+
+# Test the work counters returned by the C integrators with return_stats=True
+def test_integrate_return_stats():
+    from galpy.orbit import Orbit
+    from galpy.potential import MWPotential2014
+    times= numpy.linspace(0.,10.,101)
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.5,0.3,0.6,0.2,0.1,1.]]
+    # Fixed-step integrators take dt steps between outputs
+    for method,nfev_per_step in [('leapfrog_c',1),('symplec4_c',3),
+                                 ('rk4_c',4),('rk6_c',7)]:
+        o= Orbit(vxvv)
+        stats= o.integrate(times,MWPotential2014,method=method,dt=0.01,
+                           return_stats=True)
+        assert numpy.all(stats['nsteps'] == 1000), f'Number of steps returned by {method} is incorrect'
+        assert numpy.all(stats['nrejected'] == 0), f'{method} should not reject steps'
+        assert numpy.all(stats['nfev'] >= nfev_per_step*stats['nsteps']), f'Number of force evaluations returned by {method} is too small'
+        assert numpy.all(numpy.fabs(stats['dt_min']-0.01) < 10.**-10.), f'Minimum time step returned by {method} is incorrect'
+    # Adaptive and time-transformed integrators, also for 2D, 1D, and
+    # chunked output
+    for method in ['dopr54_c','dop853_c','ttleapfrog_c','ttsymplec4_c']:
+        for o,pot,kwargs in [(Orbit(vxvv),MWPotential2014,{}),
+                             (Orbit([v[:4] for v in vxvv]),MWPotential2014,{}),
+                             (Orbit([v[:5] for v in vxvv]),MWPotential2014,
+                              {'storage_dtype':numpy.float32}),
+                             (Orbit([[1.,0.1],[0.1,0.2]]),
+                              potential.toVerticalPotential(MWPotential2014,
+                                                            1.),{})]:
+            stats= o.integrate(times,pot,method=method,return_stats=True,
+                               **kwargs)
+            assert sorted(stats.keys()) == ['dt_min','nfev','nrejected','nsteps','thread','walltime'], 'return_stats does not return the expected counters'
+            for key in stats:
+                assert stats[key].shape == (2,), f'{key} returned by return_stats does not have the expected shape'
+            assert numpy.all(stats['nsteps'] > 0), f'Number of steps returned by {method} is not positive'
+            assert numpy.all(stats['nfev'] > stats['nsteps']), f'Number of force evaluations returned by {method} is too small'
+            assert numpy.all(stats['dt_min'] > 0.) \
+                and numpy.all(stats['dt_min'] <= 0.1), f'Minimum time step returned by {method} is not in the expected range'
+            assert numpy.all(stats['walltime'] >= 0.), f'Wall time returned by {method} is negative'
+            assert numpy.all(stats['thread'] >= 0), f'Thread returned by {method} is negative'
+    # Collecting the stats does not change the orbit
+    o= Orbit(vxvv)
+    o.integrate(times,MWPotential2014,method='dop853_c',return_stats=True)
+    oo= Orbit(vxvv)
+    oo.integrate(times,MWPotential2014,method='dop853_c')
+    assert numpy.all(o.getOrbit() == oo.getOrbit()), 'Orbit integrated with return_stats=True differs from that without'
+    # dt_min is a Quantity if the times are
+    from astropy import units
+    o= Orbit(vxvv,ro=8.,vo=220.)
+    stats= o.integrate(times*units.Gyr,MWPotential2014,method='rk4_c',
+                       return_stats=True)
+    assert stats['dt_min'].unit == units.Gyr, 'dt_min is not returned as a Quantity when the times are a Quantity'
+    # Without return_stats, integrate returns None
+    assert o.integrate(times,MWPotential2014,method='rk4_c') is None, 'integrate without return_stats does not return None'
+    # Only supported for the C integrators, without dense_output and events
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,MWPotential2014,method='dop853',return_stats=True)
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,MWPotential2014,method='dop853_c',
+                    dense_output=True,return_stats=True)
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,MWPotential2014,method='dop853_c',events=['peri'],
+                    return_stats=True)
+    # and for potentials implemented in C
+    lp= potential.LogarithmicHaloPotential(normalize=1.)
+    lp.hasC= False
+    with pytest.raises(NotImplementedError) as excinfo:
+        o.integrate(times,lp,method='dop853_c',return_stats=True)
+    return None
+
+# Test that scheduling the orbits over the OpenMP threads longest-first and with
+# different chunk sizes does not change the integrated orbits
+def test_integrate_schedule():
+    from galpy.orbit import Orbit
+    from galpy.orbit.integrateFullOrbit import _orbit_cost
+    from galpy.potential import MWPotential2014
+    times= numpy.linspace(0.,10.,101)
+    vxvv= numpy.array([[R,0.1,1.,0.1,0.1,0.] for R in [2.,0.05,1.,0.3]])
+    # The estimated cost orders the orbits by the work needed to integrate
+    o= Orbit(vxvv)
+    stats= o.integrate(times,MWPotential2014,method='dop853_c',
+                       return_stats=True)
+    assert numpy.all(numpy.argsort(-_orbit_cost(MWPotential2014,vxvv,0.))
+                     == numpy.argsort(-stats['nfev'])), 'Estimated cost of integrating orbits does not order them by the number of force evaluations'
+    for indx in [[0,1,2,3,4,5],[0,1,2,5],[0,1,2,3,4],[0,1,2],[3,4]]:
+        if len(indx) == 2:
+            pot= potential.toVerticalPotential(MWPotential2014,1.)
+        else:
+            pot= MWPotential2014
+        o= Orbit(vxvv[:,indx])
+        o.integrate(times,pot,method='dop853_c')
+        for kwargs in [{'schedule':'cost'},{'chunksize':3},
+                       {'schedule':'cost','chunksize':2}]:
+            oo= Orbit(vxvv[:,indx])
+            oo.integrate(times,pot,method='dop853_c',**kwargs)
+            assert numpy.all(o.getOrbit() == oo.getOrbit()), f'Orbit integration with {kwargs} does not agree with the default schedule'
+    # Chunked output and BatchedPotentials
+    o= Orbit(vxvv[:,:5])
+    o.integrate(times,MWPotential2014,method='symplec4_c',
+                storage_dtype=numpy.float32)
+    oo= Orbit(vxvv[:,:5])
+    oo.integrate(times,MWPotential2014,method='symplec4_c',
+                 storage_dtype=numpy.float32,schedule='cost',chunksize=2)
+    assert numpy.all(o.getOrbit() == oo.getOrbit()), 'Orbit integration with schedule=\'cost\' does not agree with the default schedule for chunked output'
+    bdisk= potential.BatchedPotential(\
+        pot_type=potential.MiyamotoNagaiPotential,
+        amp=MWPotential2014[1]._amp,a=numpy.linspace(2.5,3.5,4)/8.,b=0.035)
+    bpot= [MWPotential2014[0],bdisk,MWPotential2014[2]]
+    o= Orbit(vxvv)
+    o.integrate(times,bpot,method='dop853_c')
+    oo= Orbit(vxvv)
+    oo.integrate(times,bpot,method='dop853_c',schedule='cost')
+    assert numpy.all(o.getOrbit() == oo.getOrbit()), 'Orbit integration with schedule=\'cost\' does not agree with the default schedule for BatchedPotentials'
+    # Invalid input
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,MWPotential2014,method='dop853_c',
+                    schedule='static')
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,MWPotential2014,method='dop853_c',chunksize=0)
+    return None
+
+# Test that integrating orbits in BatchedPotentials, with one member per orbit,
+# agrees with integrating each orbit in its own potential
+def test_integrate_batched_potential():
+    from galpy.orbit import Orbit
+    from galpy.potential import MWPotential2014
+    nobj= 4
+    vxvv= [[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.],
+           [1.2,0.2,0.9,0.05,-0.1,1.],[1.1,0.,1.05,0.,0.1,-1.]]
+    disk_a= numpy.linspace(2.5,3.5,nobj)/8.
+    halo_amp= numpy.linspace(0.9,1.1,nobj)*MWPotential2014[2]._amp
+    bdisk= potential.BatchedPotential(\
+        pot_type=potential.MiyamotoNagaiPotential,
+        amp=MWPotential2014[1]._amp,a=disk_a,b=0.28/8.)
+    bhalo= potential.BatchedPotential(pot_type=potential.NFWPotential,
+                                      amp=halo_amp,a=16./8.)
+    # Time-dependent wrapper with a different function of time for each orbit
+    As= [lambda t, s=s: 1.+s*t for s in numpy.linspace(-0.01,0.01,nobj)]
+    btd= potential.BatchedPotential(\
+        pot_type=potential.TimeDependentAmplitudeWrapperPotential,
+        pot=potential.PlummerPotential(amp=0.1,b=0.5),A=As)
+    times= numpy.linspace(0.,10.,101)
+    for pot in [[MWPotential2014[0],bdisk,bhalo],
+                [MWPotential2014[0],bdisk,bhalo,btd]]:
+        for method in ['symplec4_c','dop853_c']:
+            o= Orbit(vxvv)
+            o.integrate(times,pot,method=method)
+            for ii in range(nobj):
+                oo= Orbit(vxvv[ii])
+                oo.integrate(times,[p[ii] if isinstance(p,potential.BatchedPotential) else p for p in pot],method=method)
+                assert numpy.amax(numpy.fabs(o.getOrbit()[ii]-oo.getOrbit())) < 10.**-10., 'Orbit integrated in a BatchedPotential does not agree with that integrated in the corresponding member'
+    # BatchedPotentials need to have one member for each orbit
+    with pytest.raises(ValueError) as excinfo:
+        Orbit(vxvv[:3]).integrate(times,[MWPotential2014[0],bdisk])
+    # Only supported for 3D orbits in C
+    with pytest.raises(NotImplementedError) as excinfo:
+        Orbit(vxvv).integrate(times,bdisk,method='odeint')
+    with pytest.raises(NotImplementedError) as excinfo:
+        Orbit([v[:4] for v in vxvv]).integrate(times,bdisk)
+    return None
+
+# Test that integrating with tabulated functions of time agrees with calling
+# back into Python
+def test_integrate_tfunc_grid():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    A= lambda t: 1.+0.1*numpy.sin(0.3*t)
+    tdlp= potential.TimeDependentAmplitudeWrapperPotential(pot=lp,A=A)
+    nip= potential.NonInertialFrameForce(\
+        a0=[lambda t: 0.01*numpy.cos(0.2*t),lambda t: 0.01*numpy.sin(0.2*t),
+            lambda t: 0.])
+    times= numpy.linspace(0.,10.,1001)
+    for vxvv,pot in [([[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                      [tdlp,nip]),
+                     ([[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.]],
+                      [tdlp,potential.toPlanarPotential(lp)])]:
+        for method in ['dop853_c','symplec4_c']:
+            o= Orbit(vxvv)
+            otab= Orbit(vxvv)
+            o.integrate(times,pot,method=method)
+            otab.integrate(times,pot,method=method,tfunc_grid=4001)
+            assert numpy.amax(numpy.fabs(o.getOrbit()-otab.getOrbit())) < 10.**-6., 'Orbit integrated with tabulated functions of time does not agree with regular integration'
+    # Regression check of the planar C TimeDependentAmplitudeWrapperPotential
+    # followed by another potential against the Python integration
+    o= Orbit([1.,0.1,1.1,0.])
+    oc= Orbit([1.,0.1,1.1,0.])
+    pot= [potential.TimeDependentAmplitudeWrapperPotential(\
+            pot=potential.toPlanarPotential(lp),A=A),
+          potential.toPlanarPotential(lp)]
+    o.integrate(times,pot,method='odeint')
+    oc.integrate(times,pot,method='dop853_c')
+    assert numpy.amax(numpy.fabs(o.getOrbit()[...,:3]-oc.getOrbit()[...,:3])) < 10.**-5., 'Planar TimeDependentAmplitudeWrapperPotential followed by another potential in C does not agree with Python integration'
+    # Bad grids
+    with pytest.raises(ValueError) as excinfo:
+        otab.integrate(times,pot,tfunc_grid=2)
+    with pytest.raises(ValueError) as excinfo:
+        otab.integrate(times,pot,tfunc_grid=[0.,2.,1.,3.])
+    return None
+
+# Test that the events found during integration are consistent with the orbit
+def test_integrate_events():
+    from galpy.orbit import Orbit
+    pot= potential.MWPotential2014
+    times= numpy.linspace(0.,100.,100001)
+    for vxvv in [[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.3,1.,-0.1,0.3,2.]],
+                 [[1.,0.1,1.1,0.],[0.9,-0.3,1.,2.],[1.2,0.3,0.8,-1.]],
+                 [[1.,0.1,1.1,0.1,0.02],[0.9,-0.3,1.,-0.1,0.3]]]:
+        for method in ['dopr54_c','dop853_c']:
+            o= Orbit(vxvv)
+            oe= Orbit(vxvv)
+            events= ['peri','apo','phi'] if o.phasedim() % 2 == 0 \
+                else ['peri','apo']
+            if o.dim() == 3: events.append('zcross')
+            o.integrate(times,pot,method=method)
+            oe.integrate(times[::50000],pot,method=method,events=events,
+                         event_phi=0.3)
+            # Orbit at the integration times should be the same
+            assert numpy.amax(numpy.fabs(o.R(times[::50000])
+                                         -oe.R(times[::50000]))) < 10.**-8., 'Orbit integrated with events does not agree with regular integration'
+            # Peri- and apocenters
+            assert numpy.amax(numpy.fabs(o.rperi()-oe.rperi())) < 10.**-6., 'Pericenter from events does not agree with that from a finely-sampled orbit'
+            assert numpy.all(oe.rperi() <= o.rperi()), 'Pericenter from events is larger than that from a finely-sampled orbit'
+            assert numpy.amax(numpy.fabs(o.rap()-oe.rap())) < 10.**-6., 'Apocenter from events does not agree with that from a finely-sampled orbit'
+            for ii in range(len(o)):
+                for event in ['peri','apo']:
+                    ev= oe.getEvents(event)[ii]
+                    ev= ev[True^numpy.isnan(ev[:,0])]
+                    assert len(ev) > 3, 'Not enough events found'
+                    assert numpy.amax(numpy.fabs(o[ii].R(ev[:,0])-ev[:,1])) < 10.**-6., 'Phase-space position at events does not agree with the orbit'
+                    assert numpy.amax(numpy.fabs(o[ii].vR(ev[:,0])-ev[:,2])) < 10.**-6., 'Phase-space position at events does not agree with the orbit'
+                    # r-dot should be zero
+                    if o.dim() == 3:
+                        rdot= ev[:,1]*ev[:,2]+ev[:,4]*ev[:,5]
+                    else:
+                        rdot= ev[:,1]*ev[:,2]
+                    assert numpy.amax(numpy.fabs(rdot)) < 10.**-10., 'rdot is not zero at peri/apocenter events'
+                    # Sliced Orbit has the same events
+                    assert numpy.all(numpy.fabs(oe[ii].getEvents(event)[:len(ev)]-ev) < 10.**-12.), 'Events of sliced Orbit do not agree with those of the original'
+            if 'zcross' in events:
+                ev= oe.getEvents('zcross')
+                assert numpy.nanmax(numpy.fabs(ev[...,4])) < 10.**-10., 'z is not zero at zcross events'
+                assert numpy.sum(True^numpy.isnan(ev[0,:,0])) > 10, 'Not enough zcross events found'
+            if 'phi' in events:
+                ev= oe.getEvents('phi')
+                assert numpy.nanmax(numpy.fabs(numpy.sin(ev[...,-1]-0.3))) < 10.**-10., 'phi is not event_phi at phi events'
+                assert numpy.nanmin(numpy.cos(ev[...,-1]-0.3)) > 0., 'phi is not event_phi at phi events'
+                assert numpy.sum(True^numpy.isnan(ev[0,:,0])) > 10, 'Not enough phi events found'
+    return None
+
+def test_integrate_events_errors():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,3)
+    o= Orbit([[1.,0.1,1.1,0.1,0.02,0.]])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,method='symplec4_c',events=['peri'])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,method='dop853_c',events=['peri'],
+                    dense_output=True)
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,method='dop853_c',events=['rperi'])
+    with pytest.raises(AttributeError) as excinfo:
+        o.integrate(times,lp,method='dop853_c',events=['peri'])
+        o.getEvents('apo')
+    o= Orbit([[1.,0.1,1.1,0.]])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,lp,method='dop853_c',events=['zcross'])
+    o= Orbit([[1.,0.1]])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(times,potential.toVerticalPotential(lp,1.),
+                    method='dop853_c',events=['peri'])
+    return None
+
+def test_integrate_reduce():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,20.,2001)
+    reducers= ['R_min','R_max','z_mean','r_max','E_mean','E_var',
+               'Lz_mean','Lz_var']
+    for vxvv,pot in zip([[[1.,0.1,1.1,0.1,0.02,0.],[0.9,-0.2,1.,0.,0.1,1.]],
+                         [[1.,0.1,1.1,0.1,0.02],[0.9,-0.2,1.,0.,0.1]],
+                         [[1.,0.1,1.1,0.],[0.9,-0.2,1.,1.]]],
+                        [lp,lp,lp.toPlanar()]):
+        hist_range= [[0.,2.],[-0.6,0.6]]
+        for method in ['symplec4_c','dopr54_c','leapfrog']:
+            o= Orbit(vxvv)
+            red= o.integrate_reduce(times,pot,reducers,method=method,
+                                    hist_bins=[10,5],hist_range=hist_range)
+            o.integrate(times,pot,method=method)
+            R= o.R(times)
+            z= o.z(times) if o.dim() == 3 else numpy.zeros_like(R)
+            E= o.E(times)
+            Lz= o.Lz(times)
+            assert numpy.all(numpy.fabs(red['R_min']-numpy.amin(R,axis=1)) < 1e-8), 'integrate_reduce R_min does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['R_max']-numpy.amax(R,axis=1)) < 1e-8), 'integrate_reduce R_max does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['z_mean']-numpy.mean(z,axis=1)) < 1e-8), 'integrate_reduce z_mean does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['r_max']-numpy.amax(numpy.sqrt(R**2.+z**2.),axis=1)) < 1e-8), 'integrate_reduce r_max does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['E_mean']-numpy.mean(E,axis=1)) < 1e-8), 'integrate_reduce E_mean does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['E_var']-numpy.var(E,axis=1)) < 1e-10), 'integrate_reduce E_var does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['Lz_mean']-numpy.mean(Lz,axis=1)) < 1e-8), 'integrate_reduce Lz_mean does not agree with the integrated orbit'
+            assert numpy.all(numpy.fabs(red['Lz_var']-numpy.var(Lz,axis=1)) < 1e-10), 'integrate_reduce Lz_var does not agree with the integrated orbit'
+            hist= numpy.histogram2d(R.flatten(),z.flatten(),bins=[10,5],
+                                    range=hist_range)[0]
+            assert numpy.all(red['hist'] == hist), 'integrate_reduce histogram does not agree with the integrated orbit'
+    # Physical units
+    o= Orbit([1.,0.1,1.1,0.1,0.02,0.],ro=8.,vo=220.)
+    red= o.integrate_reduce(times,lp,['r_max','E_mean','Lz_var'])
+    redn= o.integrate_reduce(times,lp,['r_max','E_mean','Lz_var'],
+                             use_physical=False)
+    assert numpy.fabs(red['r_max']-8.*redn['r_max']) < 1e-8, 'integrate_reduce does not return physical lengths'
+    assert numpy.fabs(red['E_mean']-220.**2.*redn['E_mean']) < 1e-6, 'integrate_reduce does not return physical energies'
+    assert numpy.fabs(red['Lz_var']-(8.*220.)**2.*redn['Lz_var']) < 1e-6, 'integrate_reduce does not return physical angular momentum variances'
+    return None
+
+def test_integrate_reduce_errors():
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    times= numpy.linspace(0.,10.,3)
+    o= Orbit([1.,0.1,1.1,0.1,0.02,0.])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate_reduce(times,lp,['R_median'])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate_reduce(times,lp,['Rmin'])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate_reduce(times,lp,['R_min'],method='bovy')
+    o= Orbit([1.,0.1])
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate_reduce(times,potential.toVerticalPotential(lp,1.),
+                           ['R_min'])
+    return None
+
 def test_flip():
     from galpy.potential import LogarithmicHaloPotential
     lp= LogarithmicHaloPotential(normalize=1.,q=0.9)
@@ -38,6 +38,7 @@ def test_normalize_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -177,6 +178,7 @@ def test_forceAsDeriv_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -356,6 +358,7 @@ def test_2ndDeriv_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -609,6 +612,7 @@ def test_poisson_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -723,6 +727,7 @@ def test_poisson_surfdens_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -859,6 +864,7 @@ def test_evaluateAndDerivs_potential():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -1076,6 +1082,7 @@ def test_amp_mult_divide():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -1126,6 +1133,7 @@ def test_potential_array_input():
     pots.append('mockAdiabaticContractionMWP14ExplicitfbarWrapperPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
              'SphericalPotential','interpSphericalPotential']
@@ -1237,6 +1245,7 @@ def test_toVertical_array():
     pots.append('mockInterpSphericalPotentialwForce')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
              'SphericalPotential','interpSphericalPotential']
@@ -1354,6 +1363,7 @@ def test_potential_at_zero():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -1473,6 +1483,7 @@ def test_potential_at_infinity():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -1796,6 +1807,7 @@ def test_toVertical_toPlanar():
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
              'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'CompiledPotential','JITPotential','BatchedPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential',
              'EllipsoidalPotential','NumericalPotentialDerivativesMixin',
@@ -4399,6 +4411,303 @@ def test_TimeDependentAmplitudeWrapperPotential_inputerrors():
         tp= TimeDependentAmplitudeWrapperPotential(pot=lp,A=lambda t: numpy.array([t]))
     return None
 
+# Test that the batched C evaluation agrees with the Python evaluation
+def test_evaluate_c():
+    from galpy.potential.Potential import _check_c
+    numpy.random.seed(1)
+    R= numpy.random.uniform(0.1,2.,101)
+    z= numpy.random.uniform(-1.,1.,101)
+    phi= numpy.random.uniform(0.,2.*numpy.pi,101)
+    t= numpy.random.uniform(-1.,1.,101)
+    pots= [potential.MWPotential2014,
+           [potential.DehnenBarPotential(),
+            potential.LogarithmicHaloPotential(q=0.8)],
+           potential.TriaxialNFWPotential(b=0.8,c=0.6,pa=0.3),
+           potential.DehnenSmoothWrapperPotential(\
+               pot=potential.SpiralArmsPotential(),tform=-0.5,tsteady=1.),
+           potential.TimeDependentAmplitudeWrapperPotential(\
+               pot=potential.MiyamotoNagaiPotential(),
+               A=lambda t: 1.+0.1*numpy.cos(t)),
+           potential.SCFPotential(\
+               Acos=numpy.tril(numpy.ones((3,3)))[None]*numpy.ones((4,1,1)),
+               Asin=0.1*numpy.tril(numpy.ones((3,3)))[None]*numpy.ones((4,1,1)))]
+    funcs= {'potential':lambda p,R,z,phi,t: p(R,z,phi=phi,t=t),
+            'Rforce':lambda p,R,z,phi,t: p.Rforce(R,z,phi=phi,t=t),
+            'zforce':lambda p,R,z,phi,t: p.zforce(R,z,phi=phi,t=t),
+            'phitorque':lambda p,R,z,phi,t: p.phitorque(R,z,phi=phi,t=t),
+            'dens':lambda p,R,z,phi,t: p.dens(R,z,phi=phi,t=t)}
+    for pot in pots:
+        pot= potential.flatten(pot)
+        plist= pot if isinstance(pot,list) else [pot]
+        quantities= [q for q in funcs
+                     if (q != 'potential' or not any([isinstance(p,(potential.DehnenBarPotential,potential.DehnenSmoothWrapperPotential)) for p in plist]))
+                     and (q != 'dens' or _check_c(pot,dens=True))]
+        out= potential.evaluate_c(pot,R,z,phi=phi,t=t,quantities=quantities)
+        for quantity,o in zip(quantities,out):
+            assert numpy.all(numpy.fabs(o-numpy.sum([[funcs[quantity](p,R[ii],z[ii],phi[ii],t[ii]) for ii in range(len(R))] for p in plist],axis=0)) < 10.**-10.), f'evaluate_c does not agree with Python evaluation for {quantity} of {pot}'
+    # The evaluate functions use evaluate_c for large arrays
+    R= numpy.tile(R,20)
+    z= numpy.tile(z,20)
+    phi= numpy.tile(phi,20)
+    pot= potential.MWPotential2014
+    assert numpy.all(numpy.fabs(potential.evaluatePotentials(pot,R,z)-numpy.sum([p(R,z) for p in pot],axis=0)) < 10.**-10.), 'evaluatePotentials for large arrays does not agree with Python evaluation'
+    assert numpy.all(numpy.fabs(potential.evaluateRforces(pot,R,z)-numpy.sum([p.Rforce(R,z) for p in pot],axis=0)) < 10.**-10.), 'evaluateRforces for large arrays does not agree with Python evaluation'
+    assert numpy.all(numpy.fabs(potential.evaluatezforces(pot,R,z)-numpy.sum([p.zforce(R,z) for p in pot],axis=0)) < 10.**-10.), 'evaluatezforces for large arrays does not agree with Python evaluation'
+    assert numpy.all(numpy.fabs(potential.evaluateDensities(pot,R,z)-numpy.sum([p.dens(R,z) for p in pot],axis=0)) < 10.**-10.), 'evaluateDensities for large arrays does not agree with Python evaluation'
+    # Also for potentials that do not allow array input in Python
+    dp= potential.DoubleExponentialDiskPotential()
+    assert numpy.fabs(potential.evaluateRforces(dp,R,z)[3]-dp.Rforce(R[3],z[3])) < 10.**-10., 'evaluateRforces for large arrays does not agree with Python evaluation'
+    # Repeated evaluations re-use the parsed potential, unless it changed
+    from galpy.potential.Potential import _evaluate_c_compiled
+    parsed= _evaluate_c_compiled(pot)._parse('full',prep_tfuncs=True)
+    potential.evaluatePotentials(pot,R,z)
+    assert _evaluate_c_compiled(list(pot))._parse('full',prep_tfuncs=True) is parsed, 'evaluatePotentials for large arrays re-parses the potential'
+    hp= potential.HernquistPotential(normalize=1.)
+    phi_before= potential.evaluatePotentials(hp,R,z)
+    hp.a*= 2.
+    assert numpy.all(numpy.fabs(potential.evaluatePotentials(hp,R,z)-hp(R,z)) < 10.**-10.), 'evaluatePotentials for large arrays does not pick up a change of the potential'
+    assert numpy.all(phi_before != potential.evaluatePotentials(hp,R,z)), 'evaluatePotentials for large arrays does not pick up a change of the potential'
+    sp= potential.SCFPotential(Acos=numpy.array([[[1.]],[[0.5]]]),a=2.)
+    potential.evaluatePotentials(sp,R,z)
+    sp._Acos[1,0,0]= 0.
+    assert numpy.all(numpy.fabs(potential.evaluatePotentials(sp,R,z)-sp(R,z)) < 10.**-10.), 'evaluatePotentials for large arrays does not pick up an in-place change of the potential'
+    # Scalar input and physical output
+    mp= potential.MiyamotoNagaiPotential(ro=8.,vo=220.)
+    assert numpy.fabs(potential.evaluate_c(mp,1.,0.1,quantities='Rforce',use_physical=False)-mp.Rforce(1.,0.1,use_physical=False)) < 10.**-10., 'evaluate_c does not agree with Python evaluation for scalar input'
+    assert numpy.fabs(potential.evaluate_c(mp,1.,0.1,quantities='Rforce',quantity=False)-mp.Rforce(1.,0.1,quantity=False)) < 10.**-10., 'evaluate_c does not return physical output correctly'
+    # Errors
+    with pytest.raises(ValueError) as excinfo:
+        potential.evaluate_c(mp,R,z,quantities='R2deriv')
+    with pytest.raises(potential.PotentialError) as excinfo:
+        potential.evaluate_c(potential.DehnenBarPotential(),R,z,phi=phi,
+                             quantities='potential')
+    with pytest.raises(potential.PotentialError) as excinfo:
+        potential.evaluate_c(potential.DehnenBarPotential(),R,z)
+    return None
+
+def test_evaluate_c_minsize():
+    # The evaluate functions give the same results just below and at the
+    # number of points at which they switch to C, for all potentials with C
+    import inspect
+
+    from galpy.potential.Potential import _check_c, _dim
+    numpy.random.seed(2)
+    R= numpy.random.uniform(0.2,2.,1000)
+    z= numpy.random.uniform(-1.,1.,1000)
+    phi= numpy.random.uniform(0.,2.*numpy.pi,1000)
+    t= numpy.random.uniform(0.,1.,1000)
+    pots= []
+    tclasses= {tclass for tclass in list(vars(potential).values())
+               +list(vars(sys.modules[__name__]).values())
+               if inspect.isclass(tclass)
+               and issubclass(tclass,potential.Potential)}
+    for tclass in tclasses:
+        try:
+            pots.append(tclass())
+        except Exception: # needs arguments
+            pass
+    # Python evaluates the interpolated potential off the grid, C does not
+    pots.append(potential.interpRZPotential(\
+        RZPot=potential.MWPotential2014,rgrid=(0.01,2.,101),
+        zgrid=(0.,0.2,101),logR=False,interpPot=True,interpRforce=True,
+        interpzforce=True,interpDens=True,zsym=True,enable_c=True))
+    funcs= [potential.evaluatePotentials,potential.evaluateRforces,
+            potential.evaluatezforces,potential.evaluatephitorques,
+            potential.evaluateDensities]
+    for pot in pots:
+        try:
+            if _dim(pot) != 3 or not _check_c(pot): continue
+        except KeyError: # not fully set up
+            continue
+        for func in funcs:
+            try:
+                below= func(pot,R[:999],z[:999],phi=phi[:999],t=t[:999])
+            except Exception: # Python code does not support array input
+                continue
+            at= func(pot,R,z,phi=phi,t=t)
+            assert numpy.all(numpy.fabs(numpy.broadcast_to(at,(1000,))[:999]-below) < 10.**-10.*(1.+numpy.fabs(below))), f'{func.__name__} for {type(pot).__name__} changes when switching to C'
+    return None
+
+def test_CompiledPotential():
+    from galpy.actionAngle import actionAngleStaeckel
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    pot= [potential.MiyamotoNagaiPotential(normalize=0.5,a=0.5,b=0.05),lp]
+    cpot= potential.CompiledPotential(pot)
+    # flatten unwraps the compiled potential
+    assert potential.flatten(cpot) is cpot.pot, 'flatten does not unwrap a CompiledPotential'
+    # Orbits integrated in the compiled potential are the same
+    ts= numpy.linspace(0.,10.,101)
+    for vxvv in [[1.,0.1,1.1,0.1,0.2,0.],[1.,0.1,1.1,0.],[1.,0.1]]:
+        o= Orbit(vxvv)
+        o.integrate(ts,pot if len(vxvv) > 2 else potential.toVerticalPotential(pot,1.))
+        oc= Orbit(vxvv)
+        oc.integrate(ts,cpot if len(vxvv) > 2 else
+                     potential.CompiledPotential(\
+                        potential.toVerticalPotential(pot,1.)))
+        assert numpy.amax(numpy.fabs(o.getOrbit()-oc.getOrbit())) < 1e-10, 'Orbit integrated in CompiledPotential differs from that in the original potential'
+    # The parsed potential is cached and re-used
+    parsed= cpot._parse('full')
+    o= Orbit([1.,0.1,1.1,0.1,0.2,0.])
+    o.integrate(ts,cpot)
+    assert cpot._parse('full') is parsed, 'CompiledPotential does not re-use the parsed potential'
+    assert cpot.is_valid(), 'CompiledPotential becomes invalid upon use'
+    # Changing a parameter invalidates the cache
+    lp._amp*= 2.
+    assert not cpot.is_valid(), 'CompiledPotential does not detect a change in the potential'
+    assert not cpot._parse('full') is parsed, 'CompiledPotential does not re-parse a changed potential'
+    o.integrate(ts,cpot)
+    oc= Orbit([1.,0.1,1.1,0.1,0.2,0.])
+    oc.integrate(ts,pot)
+    assert numpy.amax(numpy.fabs(o.getOrbit()-oc.getOrbit())) < 1e-10, 'Orbit integrated in changed CompiledPotential differs from that in the original potential'
+    lp._amp/= 2.
+    # Potentials that memoise their evaluation in Python remain valid
+    scfp= potential.SCFPotential(Acos=numpy.array([[[1.]],[[0.2]]]),a=2.)
+    cscfp= potential.CompiledPotential(scfp)
+    parsed_scf= cscfp._parse('full')
+    scfp(1.,0.1)
+    scfp.Rforce(1.,0.2)
+    assert cscfp.is_valid() and cscfp._parse('full') is parsed_scf, 'CompiledPotential becomes invalid when the potential memoises its evaluation'
+    # Changing the elements of an array parameter in place invalidates it
+    scfp._Acos[1,0,0]= 0.
+    assert not cscfp.is_valid(), 'CompiledPotential does not detect an in-place change of an array parameter'
+    scfp._Acos[1,0,0]= 0.2
+    # clear resets the cache
+    cpot.clear()
+    assert cpot.is_valid() and len(cpot._cache) == 0, 'CompiledPotential.clear does not clear the cache'
+    # actionAngleStaeckel compiles its potential and gives the same actions
+    aA= actionAngleStaeckel(pot=cpot,delta=0.4,c=True)
+    aAp= actionAngleStaeckel(pot=pot,delta=0.4,c=True)
+    assert numpy.all(numpy.fabs(numpy.array(aA(1.,0.1,1.1,0.1,0.2))
+                                -numpy.array(aAp(1.,0.1,1.1,0.1,0.2))) < 1e-10), 'actionAngleStaeckel with CompiledPotential gives different actions'
+    return None
+
+def test_JITPotential():
+    pytest.importorskip('numba')
+    from galpy.orbit import Orbit
+
+    # A user-defined, non-axisymmetric logarithmic potential
+    class TriaxialLogPotential(potential.Potential):
+        def __init__(self,amp=1.,q=0.9,b=0.8,core=0.1):
+            potential.Potential.__init__(self,amp=amp)
+            self._q= q
+            self._b= b
+            self._core2= core**2.
+            self.isNonAxi= True
+        def _evaluate(self,R,z,phi=0.,t=0.):
+            return 0.5*numpy.log(R**2.*(numpy.cos(phi)**2.
+                                        +numpy.sin(phi)**2./self._b**2.)
+                                 +(z/self._q)**2.+self._core2)
+        def _Rforce(self,R,z,phi=0.,t=0.):
+            return -R*(numpy.cos(phi)**2.+numpy.sin(phi)**2./self._b**2.)\
+                /(R**2.*(numpy.cos(phi)**2.+numpy.sin(phi)**2./self._b**2.)
+                  +(z/self._q)**2.+self._core2)
+        def _zforce(self,R,z,phi=0.,t=0.):
+            return -z/self._q**2.\
+                /(R**2.*(numpy.cos(phi)**2.+numpy.sin(phi)**2./self._b**2.)
+                  +(z/self._q)**2.+self._core2)
+        def _phitorque(self,R,z,phi=0.,t=0.):
+            return -R**2.*numpy.cos(phi)*numpy.sin(phi)*(1./self._b**2.-1.)\
+                /(R**2.*(numpy.cos(phi)**2.+numpy.sin(phi)**2./self._b**2.)
+                  +(z/self._q)**2.+self._core2)
+    tp= TriaxialLogPotential(amp=1.3)
+    jp= potential.JITPotential(pot=tp)
+    lp= potential.LogarithmicHaloPotential(amp=1.3,q=0.9,b=0.8,core=0.1)
+    assert jp.hasC, 'JITPotential should have a C implementation'
+    assert numpy.fabs(jp.Rforce(1.,0.2,phi=0.3)-lp.Rforce(1.,0.2,phi=0.3)) < 1e-10, 'JITPotential Rforce does not agree with that of the wrapped potential'
+    # Orbits integrated in C agree with those in the equivalent potential
+    ts= numpy.linspace(0.,10.,101)
+    for vxvv in [[1.,0.1,1.1,0.1,0.2,0.],[1.,0.1,1.1,0.1,0.2],
+                 [1.,0.1,1.1,0.],[1.,0.1]]:
+        for method in ['symplec4_c','dopr54_c']:
+            o= Orbit(vxvv)
+            oj= Orbit(vxvv)
+            if len(vxvv) > 2:
+                o.integrate(ts,lp,method=method)
+                oj.integrate(ts,jp,method=method)
+            else:
+                o.integrate(ts,potential.toVerticalPotential(lp,1.,phi=0.3),
+                            method=method)
+                oj.integrate(ts,potential.toVerticalPotential(jp,1.,phi=0.3),
+                             method=method)
+            assert numpy.amax(numpy.fabs(o.getOrbit()-oj.getOrbit())) < 1e-8, 'Orbit integrated in JITPotential differs from that in the equivalent potential'
+    # Changing a parameter of the wrapped potential re-compiles its methods
+    tp._b= 0.7
+    lp= potential.LogarithmicHaloPotential(amp=1.3,q=0.9,b=0.7,core=0.1)
+    o= Orbit([1.,0.1,1.1,0.1,0.2,0.])
+    o.integrate(ts,lp)
+    oj= Orbit([1.,0.1,1.1,0.1,0.2,0.])
+    oj.integrate(ts,jp)
+    assert numpy.amax(numpy.fabs(o.getOrbit()-oj.getOrbit())) < 1e-8, 'JITPotential does not re-compile when the parameters of the wrapped potential change'
+    # Methods that cannot be compiled raise an error
+    class BadPotential(potential.Potential):
+        def __init__(self):
+            potential.Potential.__init__(self,amp=1.)
+            self._name= 'bad'
+        def _evaluate(self,R,z,phi=0.,t=0.):
+            return len(self._name)*numpy.log(R)
+        def _Rforce(self,R,z,phi=0.,t=0.):
+            return -1./R
+        def _zforce(self,R,z,phi=0.,t=0.):
+            return 0.
+    with pytest.raises(potential.PotentialError) as excinfo:
+        potential.JITPotential(pot=BadPotential())
+    return None
+
+def test_BatchedPotential():
+    # A batch of Miyamoto-Nagai potentials with array-valued parameters
+    amps= numpy.array([0.8,1.,1.2])
+    as_= numpy.array([0.5,1.,1.5])
+    bp= potential.BatchedPotential(pot_type=potential.MiyamotoNagaiPotential,
+                                   amp=amps,a=as_,b=0.3)
+    assert len(bp) == 3, 'Length of BatchedPotential is not the number of potentials in the batch'
+    assert bp.vectorized, 'BatchedPotential of MiyamotoNagaiPotentials should be vectorized'
+    mps= [potential.MiyamotoNagaiPotential(amp=amp,a=a,b=0.3)
+          for amp,a in zip(amps,as_)]
+    Rs= numpy.linspace(0.1,2.,11)
+    zs= numpy.linspace(-0.5,0.5,11)
+    for func in [potential.evaluatePotentials,potential.evaluateRforces,
+                 potential.evaluatezforces,potential.evaluateDensities,
+                 potential.evaluateR2derivs,potential.evaluatez2derivs,
+                 potential.evaluateRzderivs]:
+        out= func(bp,Rs,zs)
+        assert out.shape == (3,11), 'BatchedPotential evaluation does not return an array with shape (K,N)'
+        for ii,mp in enumerate(mps):
+            assert numpy.all(numpy.fabs(out[ii]-func(mp,Rs,zs)) < 1e-10), 'BatchedPotential evaluation does not agree with that of the individual potentials'
+    # Scalar inputs give shape (K,)
+    assert bp(1.,0.1).shape == (3,), 'BatchedPotential evaluation at a single point does not return an array with shape (K,)'
+    # Combining with a regular potential and vcirc
+    np= potential.NFWPotential(amp=2.,a=3.)
+    vc= potential.vcirc([bp,np],Rs)
+    assert vc.shape == (3,11), 'vcirc of a list including a BatchedPotential does not return an array with shape (K,N)'
+    for ii,mp in enumerate(mps):
+        assert numpy.all(numpy.fabs(vc[ii]-potential.vcirc([mp,np],Rs)) < 1e-10), 'vcirc of a list including a BatchedPotential does not agree with that of the individual potentials'
+    # Individual potentials can be extracted
+    assert numpy.fabs(bp[1](1.,0.1)-mps[1](1.,0.1)) < 1e-10, 'Potential extracted from BatchedPotential does not agree with the individual potential'
+    # Potentials that cannot be set up with array parameters are evaluated one-by-one
+    bp= potential.BatchedPotential(pot_type=potential.MiyamotoNagaiPotential,
+                                   amp=amps,a=as_,b=0.3,
+                                   normalize=numpy.array([0.5,0.6,0.7]))
+    assert not bp.vectorized, 'BatchedPotential with normalize should not be vectorized'
+    for ii,norm in enumerate([0.5,0.6,0.7]):
+        mp= potential.MiyamotoNagaiPotential(a=as_[ii],b=0.3,normalize=norm)
+        assert numpy.all(numpy.fabs(bp.Rforce(Rs,zs)[ii]-mp.Rforce(Rs,zs)) < 1e-10), 'BatchedPotential evaluated one-by-one does not agree with the individual potentials'
+    # Potentials whose evaluation with array parameters only happens to have
+    # the right shape for N == K are evaluated one-by-one (here K=2)
+    bp= potential.BatchedPotential(\
+        pot_type=potential.PowerSphericalPotentialwCutoff,
+        alpha=numpy.array([1.,1.8]),rc=numpy.array([1.,2.]))
+    assert not bp.vectorized, 'BatchedPotential of PowerSphericalPotentialwCutoffs should not be vectorized'
+    for ii,(alpha,rc) in enumerate([(1.,1.),(1.8,2.)]):
+        pp= potential.PowerSphericalPotentialwCutoff(alpha=alpha,rc=rc)
+        assert numpy.fabs(bp(1.,0.)[ii]-pp(1.,0.)) < 1e-10, 'BatchedPotential evaluated one-by-one does not agree with the individual potentials'
+        assert numpy.all(numpy.fabs(bp.Rforce(Rs[:2],zs[:2])[ii]-pp.Rforce(Rs[:2],zs[:2])) < 1e-10), 'BatchedPotential evaluated one-by-one does not agree with the individual potentials'
+    # Array parameters need to have the same length
+    with pytest.raises(ValueError) as excinfo:
+        potential.BatchedPotential(pot_type=potential.MiyamotoNagaiPotential,
+                                   amp=amps,a=as_[:2])
+    return None
+
 def test_phiforce_deprecation():
     # Test that phiforce is being deprecated correctly for phitorque
     import warnings
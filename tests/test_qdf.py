@@ -423,6 +423,57 @@ def test_sampleV_physical():
     assert numpy.fabs(numpy.log(numpy.std(samples[:,2]))-0.5*numpy.log(qdf.sigmaz2(0.8,0.1,vo=vo))) < 0.05, 'sampleV vz stddev is not equal to sigmaz'
     return None
 
+def test_sample():
+    # Full 6D samples in a small volume have the velocity moments of the DF
+    from galpy.orbit import Orbit
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAS,cutcounter=True)
+    numpy.random.seed(1)
+    os= qdf.sample(10000,[0.75,0.85],[0.05,0.15],nR=11,nz=11)
+    assert isinstance(os,Orbit) and len(os) == 10000, 'qdf.sample does not return an Orbit instance with n orbits'
+    assert numpy.all((os.R() >= 0.75)*(os.R() <= 0.85)*(os.z() >= 0.05)*(os.z() <= 0.15)), 'qdf.sample returns positions outside of the requested range'
+    assert numpy.fabs(numpy.mean(os.R())-0.8) < 0.01, 'qdf.sample mean R is not close to the center of the range'
+    assert numpy.mean(os.z()) < 0.1, 'qdf.sample does not give more stars closer to the plane'
+    # Velocity moments averaged over the sampled box, weighted by R x density
+    Rs= numpy.linspace(0.75,0.85,11)
+    zs= numpy.linspace(0.05,0.15,11)
+    moms= qdf.moments(Rs[:,None],zs[None,:],
+                      moments=[(0,0,0),(2,0,0),(0,1,0),(0,2,0),(0,0,2)])
+    w= numpy.outer([0.5]+[1.]*9+[0.5],[0.5]+[1.]*9+[0.5])*Rs[:,None]
+    boxmom= {mom:numpy.sum(w*moms[mom])/numpy.sum(w*moms[(0,0,0)])
+             for mom in moms}
+    #test vR
+    assert numpy.fabs(numpy.mean(os.vR())) < 0.01, 'qdf.sample vR mean is not zero'
+    assert numpy.fabs(numpy.log(numpy.std(os.vR()))-0.5*numpy.log(boxmom[(2,0,0)])) < 0.03, 'qdf.sample vR stddev is not equal to sigmaR'
+    #test vT
+    assert numpy.fabs(numpy.mean(os.vT())-boxmom[(0,1,0)]) < 0.005, 'qdf.sample vT mean is not equal to meanvT'
+    assert numpy.fabs(numpy.log(numpy.std(os.vT()))-0.5*numpy.log(boxmom[(0,2,0)]-boxmom[(0,1,0)]**2.)) < 0.03, 'qdf.sample vT stddev is not equal to sigmaT'
+    #test vz
+    assert numpy.fabs(numpy.mean(os.vz())) < 0.01, 'qdf.sample vz mean is not zero'
+    assert numpy.fabs(numpy.log(numpy.std(os.vz()))-0.5*numpy.log(boxmom[(0,0,2)])) < 0.03, 'qdf.sample vz stddev is not equal to sigmaz'
+    # phi is uniform
+    assert numpy.fabs(numpy.mean(os.phi())-numpy.pi) < 0.1, 'qdf.sample phi is not uniform'
+    # Small batches, for which the envelope is increased several times, give
+    # the same distribution
+    os= qdf.sample(10000,[0.75,0.85],[0.05,0.15],nR=11,nz=11,nbatch=100)
+    assert numpy.fabs(numpy.mean(os.vT())-boxmom[(0,1,0)]) < 0.005, 'qdf.sample vT mean is not equal to meanvT when using small batches'
+    assert numpy.fabs(numpy.log(numpy.std(os.vT()))-0.5*numpy.log(boxmom[(0,2,0)]-boxmom[(0,1,0)]**2.)) < 0.03, 'qdf.sample vT stddev is not equal to sigmaT when using small batches'
+    return None
+
+def test_sample_physical():
+    # Samples are returned in physical units when the DF has them on
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAS,cutcounter=True,
+                           ro=8.,vo=220.)
+    numpy.random.seed(1)
+    os= qdf.sample(100,[0.75,0.875],[0.05,0.15],nR=5,nz=5)
+    assert numpy.all((os.R() >= 6.)*(os.R() <= 7.)), 'qdf.sample with physical output returns positions outside of the requested range'
+    assert numpy.fabs(numpy.mean(os.vT())/220.-qdf.meanvT(0.8,0.1,use_physical=False)) < 0.1, 'qdf.sample physical vT mean is not close to meanvT'
+    R,vR,vT,z,vz,phi= qdf.sample(100,[0.75,0.875],[0.05,0.15],nR=5,nz=5,
+                                 return_orbit=False)
+    assert len(R) == 100, 'qdf.sample with return_orbit=False does not return n samples'
+    return None
+
 def test_sampleV_interpolate():
     qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
                        pot=MWPotential,aA=aAS,cutcounter=True)
@@ -802,6 +853,109 @@ def test_vmomentdensity_diffinoutputs():
                                                              _vzs=vzs))) < 0.0001, 'qdf.vmomentdensity w/ rawgausssamples and mc=True does not agree with that w/o rawgausssamples'
     return None
 
+def test_vmomentdensity_c():
+    # Test that the velocity moments computed in C agree with those in Python
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAS,cutcounter=True)
+    for R,z in [(0.8,0.1),(1.1,-0.2)]:
+        for meth in ['density','sigmaR2','sigmaz2','sigmaRz','meanvT',
+                     'meanvR','meanvz','sigmaT2']:
+            cval= getattr(qdf,meth)(R,z,gl=True,c=True)
+            pyval= getattr(qdf,meth)(R,z,gl=True,c=False)
+            assert numpy.fabs(cval-pyval) < 10.**-4.*numpy.fabs(pyval)+10.**-8., f'qdf.{meth} computed in C does not agree with that computed in Python'
+        assert numpy.fabs(qdf.vmomentdensity(R,z,1,1,0,gl=True,ngl=12,c=True)
+                          -qdf.vmomentdensity(R,z,1,1,0,gl=True,ngl=12,c=False)) < 10.**-6., 'qdf.vmomentdensity computed in C does not agree with that computed in Python'
+    # Arrays of (R,z) are computed in a single call
+    Rs= numpy.array([0.8,1.1,1.4])
+    zs= numpy.array([0.1,-0.2,0.])
+    dens= qdf.density(Rs,zs,gl=True)
+    for ii in range(len(Rs)):
+        assert numpy.fabs(dens[ii]-qdf.density(Rs[ii],zs[ii],gl=True,c=False)) < 10.**-4.*dens[ii], 'qdf.density for an array of (R,z) does not agree with that for individual (R,z)'
+    return None
+
+def test_vmomentdensity_c_warning():
+    # Asking for the C implementation when it is not available raises a warning
+    import warnings
+
+    from galpy.util import galpyWarning
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAA,cutcounter=True)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always",galpyWarning)
+        dens= qdf.density(0.8,0.1,gl=True,c=True)
+        raisedWarning= False
+        for wa in w:
+            raisedWarning= ('C implementation of the velocity moments not used' in str(wa.message))
+            if raisedWarning: break
+        assert raisedWarning, "qdf.density with c=True for actionAngleAdiabatic did not raise galpyWarning"
+    assert numpy.fabs(dens-qdf.density(0.8,0.1,gl=True)) < 10.**-10., 'qdf.density with c=True for actionAngleAdiabatic does not fall back to Python'
+    return None
+
+def test_moments():
+    # Moments at many (R,z) at once agree with vmomentdensity at each (R,z)
+    moms= [(0,0,0),(2,0,0),(0,1,0),(0,0,2),(1,0,1)]
+    Rs= numpy.array([[0.8,1.1],[0.9,1.2]])
+    zs= numpy.array([0.1,0.])
+    # For aAS, both in C and in Python
+    for aA,c in [(aAA,None),(aAS,True),(aAS,False)]:
+        qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                               pot=MWPotential,aA=aA,cutcounter=True)
+        out= qdf.moments(Rs,zs,moments=moms,ngl=12,c=c)
+        for mom in moms:
+            assert out[mom].shape == Rs.shape, 'qdf.moments does not return arrays with the shape of the input positions'
+            for ii in range(Rs.shape[0]):
+                for jj in range(Rs.shape[1]):
+                    assert numpy.fabs(out[mom][ii,jj]-qdf.vmomentdensity(Rs[ii,jj],zs[jj],*mom,gl=True,ngl=12,c=c)) < 10.**-4.*numpy.fabs(out[(0,0,0)][ii,jj]), f'qdf.moments does not agree with qdf.vmomentdensity for moment {mom}'
+        if c is False:
+            for mom in moms:
+                assert numpy.all(numpy.fabs(out[mom]-out_c[mom]) < 10.**-4.*numpy.fabs(out_c[(0,0,0)])), f'qdf.moments computed in Python does not agree with that computed in C for moment {mom}'
+        out_c= out
+    return None
+
+def test_actioncache():
+    # Moments at the same (R,z) re-use the actions on the velocity grid
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAA,cutcounter=True)
+    qdfnc= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                             pot=MWPotential,aA=aAA,cutcounter=True,
+                             cachesize=0)
+    R,z= 0.8,0.1
+    for meth in ['density','sigmaR2','sigmaz2','meanvT','sigmaT2']:
+        assert numpy.fabs(getattr(qdf,meth)(R,z)/getattr(qdfnc,meth)(R,z)-1.) < 10.**-10., f'qdf.{meth} with the action cache does not agree with that without'
+    assert len(qdf._actioncache) == 1, 'qdf action cache does not contain a single velocity grid after computing moments at a single (R,z)'
+    assert qdf._actioncache.hits > 0, 'qdf action cache was not used for different moments at the same (R,z)'
+    assert len(qdfnc._actioncache) == 0, 'qdf action cache with cachesize=0 is not empty'
+    # Different (R,z) get their own entry, explicit invalidation clears it
+    qdf.density(1.,0.)
+    assert len(qdf._actioncache) == 2, 'qdf action cache does not contain an entry for each (R,z)'
+    qdf.clear_cache()
+    assert len(qdf._actioncache) == 0, 'qdf.clear_cache does not clear the action cache'
+    # Repeated MC samples also re-use the actions
+    dens, vrs, vts, vzs= qdf.density(R,z,gl=False,mc=True,_returnmc=True,
+                                     _rawgausssamples=True)
+    hits= qdf._actioncache.hits
+    assert numpy.fabs(qdf.vmomentdensity(R,z,0,2,0,gl=False,mc=True,_vrs=vrs,_vts=vts,_vzs=vzs,_rawgausssamples=True)/qdfnc.vmomentdensity(R,z,0,2,0,gl=False,mc=True,_vrs=vrs,_vts=vts,_vzs=vzs,_rawgausssamples=True)-1.) < 10.**-10., 'qdf.vmomentdensity with MC samples and the action cache does not agree with that without'
+    assert qdf._actioncache.hits == hits+1, 'qdf action cache was not used for repeated MC samples'
+    return None
+
+def test_actioncache_budget():
+    # The action cache is least-recently-used and stays within its budget
+    qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
+                           pot=MWPotential,aA=aAA,cutcounter=True,
+                           cachesize=2.5*7*8*1000/2**20)
+    qdf.density(0.8,0.1)
+    qdf.density(0.9,0.1)
+    qdf.density(0.8,0.1) # most recently used
+    qdf.density(1.,0.1) # evicts (0.9,0.1)
+    assert len(qdf._actioncache) == 2, 'qdf action cache does not evict entries beyond its memory budget'
+    assert qdf._actioncache.nbytes <= qdf._actioncache.maxbytes, 'qdf action cache exceeds its memory budget'
+    hits= qdf._actioncache.hits
+    qdf.density(0.8,0.1)
+    assert qdf._actioncache.hits == hits+1, 'qdf action cache did not keep the most recently used entry'
+    qdf.density(0.9,0.1)
+    assert qdf._actioncache.hits == hits+1, 'qdf action cache did not evict the least recently used entry'
+    return None
+
 def test_vmomentdensity_physical():
     # Test physical output of vmomentdensity
     qdf= quasiisothermaldf(1./4.,0.2,0.1,1.,1.,
@@ -65,3 +65,47 @@ def test_quadpack():
     int= dblquad(lambda y,x: 4.*x*y,0.,1.,lambda z: 0.,lambda z: 1.)
     assert numpy.fabs(int[0]-1.) < int[1], 'galpy.util.quadpack.dblquad did not work as expected'
     return None
+
+def test_parallel_map():
+    import pytest
+
+    from galpy.util.multi import parallel_map
+    xs= numpy.linspace(0.,1.,101)
+    # Scalar and array results, also as a single array
+    out= parallel_map(lambda x: x**2.,xs,numcores=4)
+    assert numpy.all(numpy.array(out) == xs**2.), 'parallel_map did not work as expected'
+    out= parallel_map(lambda x: numpy.array([x,2.*x]),xs,numcores=4,
+                      chunksize=7,as_array=True)
+    assert out.shape == (101,2), 'parallel_map with as_array=True does not return an array of the expected shape'
+    assert numpy.all(out[:,1] == 2.*xs), 'parallel_map did not work as expected'
+    # Tuple results
+    out= parallel_map(lambda x: (x,numpy.array([x,3.*x])),xs,numcores=4)
+    assert isinstance(out[0],tuple), 'parallel_map does not preserve tuple results'
+    assert numpy.all(numpy.array([o[1][1] for o in out]) == 3.*xs), 'parallel_map did not work as expected'
+    # Results that cannot be stored in shared memory
+    out= parallel_map(lambda x: str(x) if x > 0.5 else x,xs,numcores=4)
+    assert out[-1] == str(xs[-1]) and out[0] == xs[0], 'parallel_map did not work as expected for non-numeric results'
+    out= parallel_map(lambda x: numpy.ones(int(100*x)),xs,numcores=4)
+    assert numpy.all([len(o) == int(100*x) for o,x in zip(out,xs)]), 'parallel_map did not work as expected for results of different shapes'
+    # Results of mixed integer and floating-point type are not truncated
+    out= parallel_map(lambda x: 0 if x == 0 else x/3.,range(8),numcores=2)
+    assert numpy.all(numpy.array(out) == numpy.arange(8)/3.), 'parallel_map truncates floating-point results when the first result is an integer'
+    out= parallel_map(lambda x: numpy.array([x,x]) if x % 2 else numpy.array([x/3.,x]),range(8),numcores=2,as_array=True)
+    assert numpy.all(out[:,0] == numpy.where(numpy.arange(8) % 2,numpy.arange(8),numpy.arange(8)/3.)), 'parallel_map truncates floating-point results when the first result is an integer'
+    # Results that do not fit in the type of the first result are pickled
+    out= parallel_map(lambda x: 1j*x if x > 4 else x/3.,range(8),numcores=2)
+    assert out[7] == 7j and out[1] == 1./3., 'parallel_map did not work as expected for results that do not fit in the type of the first result'
+    # The type of the first result is kept when all results have that type
+    out= parallel_map(lambda x: 2*x,range(8),numcores=2,as_array=True)
+    assert numpy.issubdtype(out.dtype,numpy.integer) and numpy.all(out == 2*numpy.arange(8)), 'parallel_map does not return integer results as integers'
+    # All elements are evaluated in the worker processes
+    import os
+    out= parallel_map(lambda x: os.getpid(),range(4),numcores=4,as_array=True)
+    assert not os.getpid() in out, 'parallel_map evaluates elements in the main process'
+    # Exceptions are propagated
+    def fail(x):
+        if x > 0.5: raise ValueError('x > 0.5')
+        return x
+    with pytest.raises(ValueError):
+        parallel_map(fail,xs,numcores=4)
+    return None